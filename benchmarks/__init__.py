@@ -0,0 +1,6 @@
+"""
+ベンチマーク
+
+パイプラインの処理時間を計測するスクリプト群。
+外部APIを使わず、合成データのみで実行できる。
+"""
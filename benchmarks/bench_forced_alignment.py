@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Whisper タイミング取得方式（transcribe / align）の比較
+
+既存の audio_timing.json（Phase 2 の出力）に記録されたセクション音声と台本を使い、
+- transcribe: 音声認識 → DTW で台本に再アライメント（従来方式）
+- align: 台本を音声に直接強制アライメント
+の処理時間と、audio_timing.json に記録済みの文字タイミング（基準）との
+開始時刻の誤差を並べて表示する。基準はその出力を作った方式
+（ElevenLabs Forced Alignment または Whisper）によるもの。
+
+使用例:
+    python -m benchmarks.bench_forced_alignment
+    python -m benchmarks.bench_forced_alignment data/working/織田信長/02_audio/audio_timing.json --model small
+    python -m benchmarks.bench_forced_alignment --sections 3 --json benchmarks/results/forced_alignment.json
+"""
+
+import argparse
+import difflib
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.whisper_timing import STABLE_WHISPER_AVAILABLE, WHISPER_AVAILABLE, WhisperTimingExtractor
+
+BACKENDS = ("transcribe", "align")
+
+
+def load_sections(timing_files: List[Path], limit: Optional[int]) -> List[Dict[str, Any]]:
+    """
+    audio_timing.json から比較対象セクションを読み込む
+
+    タイトル付きセクションはタイトル + ナレーションを1本の音声として扱い、
+    ナレーションの文字タイミングをセクション音声上の時刻に直す。
+    """
+    sections = []
+    for timing_file in timing_files:
+        with open(timing_file, encoding="utf-8") as f:
+            entries = json.load(f)
+
+        for entry in entries:
+            audio_path = Path(entry.get("audio_path", ""))
+            if not audio_path.exists():
+                continue
+
+            if "narration_timing" in entry:
+                title = entry.get("title_timing", {})
+                narration = entry["narration_timing"]
+                offset = narration.get("start_time", 0.0)
+                text = title.get("text", "") + entry.get("tts_text", narration.get("text", ""))
+                chars = title.get("characters", []) + narration.get("characters", [])
+                starts = title.get("char_start_times", []) + [
+                    t + offset for t in narration.get("char_start_times", [])
+                ]
+            else:
+                text = entry.get("tts_text", entry.get("text", ""))
+                chars = entry.get("characters", [])
+                starts = entry.get("char_start_times", [])
+
+            if not text or not chars:
+                continue
+
+            sections.append({
+                "label": f"{timing_file.parent.parent.name}/{entry.get('section_id')}",
+                "audio_path": audio_path,
+                "text": text,
+                "duration": entry.get("total_duration", 0.0),
+                "ref_chars": chars,
+                "ref_starts": starts,
+            })
+            if limit and len(sections) >= limit:
+                return sections
+    return sections
+
+
+def start_errors(ref_chars: List[str], ref_starts: List[float], timings: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """基準と一致した文字の開始時刻の絶対誤差（秒）"""
+    timings = [t for t in timings if t.get("word", "").strip()]
+    cand_chars = [t["word"] for t in timings]
+    matcher = difflib.SequenceMatcher(None, ref_chars, cand_chars, autojunk=False)
+
+    errors = []
+    for block in matcher.get_matching_blocks():
+        for k in range(block.size):
+            errors.append(abs(timings[block.b + k]["start"] - ref_starts[block.a + k]))
+
+    if not errors:
+        return {"matched": 0, "coverage": 0.0, "mean_ms": None, "p95_ms": None}
+    errors.sort()
+    return {
+        "matched": len(errors),
+        "coverage": len(errors) / max(len(ref_chars), 1),
+        "mean_ms": statistics.fmean(errors) * 1000,
+        "p95_ms": errors[min(len(errors) - 1, int(len(errors) * 0.95))] * 1000,
+    }
+
+
+def bench_backend(backend: str, sections: List[Dict[str, Any]], args, logger) -> Dict[str, Any]:
+    """1方式で全セクションのタイミングを取得して計測"""
+    start = time.perf_counter()
+    extractor = WhisperTimingExtractor(
+        model_name=args.model,
+        logger=logger,
+        language=args.language,
+        use_stable_ts=True,
+        backend=backend
+    )
+    load_seconds = time.perf_counter() - start
+
+    per_section = []
+    for section in sections:
+        best = float("inf")
+        timings: List[Dict[str, Any]] = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            timings = extractor.extract_word_timings(section["audio_path"], text=section["text"])
+            best = min(best, time.perf_counter() - start)
+        per_section.append({
+            "label": section["label"],
+            "seconds": best,
+            "audio_seconds": section["duration"],
+            **start_errors(section["ref_chars"], section["ref_starts"], timings),
+        })
+
+    seconds = sum(s["seconds"] for s in per_section)
+    audio_seconds = sum(s["audio_seconds"] for s in per_section)
+    means = [s["mean_ms"] for s in per_section if s["mean_ms"] is not None]
+    return {
+        "backend": extractor.backend,
+        "load_seconds": load_seconds,
+        "seconds": seconds,
+        "realtime_factor": seconds / audio_seconds if audio_seconds > 0 else None,
+        "mean_error_ms": statistics.fmean(means) if means else None,
+        "coverage": statistics.fmean(s["coverage"] for s in per_section) if per_section else 0.0,
+        "sections": per_section,
+    }
+
+
+def _fmt_ms(value: Optional[float]) -> str:
+    return f"{value:7.1f}" if value is not None else "      -"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Whisper transcribe vs forced-alignment comparison")
+    parser.add_argument("timing_files", nargs="*", type=Path,
+                        help="audio_timing.json files (default: data/working/*/02_audio/audio_timing.json)")
+    parser.add_argument("--model", default="small", help="Whisper model name")
+    parser.add_argument("--language", default="ja", help="Language code")
+    parser.add_argument("--sections", type=int, default=None, help="Limit number of sections")
+    parser.add_argument("--repeat", type=int, default=1, help="Repetitions per section (best time is used)")
+    parser.add_argument("--json", type=Path, default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    if not (WHISPER_AVAILABLE and STABLE_WHISPER_AVAILABLE):
+        print("openai-whisper and stable-ts are required: pip install openai-whisper stable-ts")
+        return 1
+
+    timing_files = args.timing_files or sorted(
+        (project_root / "data" / "working").glob("*/02_audio/audio_timing.json")
+    )
+    sections = load_sections(timing_files, args.sections)
+    if not sections:
+        print("No sections with existing audio found in audio_timing.json")
+        return 1
+
+    logger = logging.getLogger("bench")
+    logger.setLevel(logging.ERROR)
+
+    audio_seconds = sum(s["duration"] for s in sections)
+    print(f"{len(sections)} sections, {audio_seconds:.1f}s audio (model: {args.model})")
+    print(f"  {'backend':<11} {'load':>7} {'align':>8} {'RTF':>6} {'err ms':>7} {'coverage':>9}")
+
+    results: Dict[str, Any] = {"model": args.model, "backends": {}}
+    for backend in BACKENDS:
+        r = bench_backend(backend, sections, args, logger)
+        results["backends"][backend] = r
+        rtf = f"{r['realtime_factor']:6.3f}" if r["realtime_factor"] is not None else "     -"
+        print(
+            f"  {backend:<11} {r['load_seconds']:6.1f}s {r['seconds']:7.2f}s {rtf} "
+            f"{_fmt_ms(r['mean_error_ms'])} {r['coverage']:8.1%}"
+        )
+        if r["backend"] != backend:
+            print(f"    (fell back to {r['backend']})")
+
+    transcribe = results["backends"]["transcribe"]["seconds"]
+    align = results["backends"]["align"]["seconds"]
+    if align > 0:
+        print(f"  align speedup: {transcribe / align:.2f}x")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False, default=str)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
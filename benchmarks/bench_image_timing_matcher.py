@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+画像タイミングマッチャーのベンチマーク
+
+合成した台本（15分〜1時間）で ImageTimingMatcherFixed を実行し、
+キーワード転置インデックス（use_keyword_index=True）と
+従来の全件走査（use_keyword_index=False）の処理時間を比較する。
+両者の出力が一致することも検証する。
+
+使用例:
+    python -m benchmarks.bench_image_timing_matcher
+    python -m benchmarks.bench_image_timing_matcher --minutes 15 30 60 120 --repeat 3
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.image_timing_matcher_fixed import ImageTimingMatcherFixed
+
+
+# 合成テキスト用の語彙（漢字・カタカナ語を混在させる）
+VOCABULARY = [
+    "織田信長", "本能寺", "桶狭間", "天下統一", "安土城", "明智光秀", "豊臣秀吉",
+    "徳川家康", "鉄砲", "楽市楽座", "比叡山", "長篠", "武田勝頼", "今川義元",
+    "ルネサンス", "モナリザ", "最後の晩餐", "フィレンツェ", "ミラノ", "解剖学",
+    "飛行機械", "手稿", "遠近法", "ヴェロッキオ", "メディチ家", "教皇",
+    "戦国時代", "城下町", "茶の湯", "南蛮貿易", "宣教師", "天守閣", "合戦",
+]
+FILLERS = ["は", "が", "を", "に", "で", "と", "の", "から", "まで", "そして", "しかし"]
+
+CHARS_PER_SECOND = 7.0
+SECTION_SECONDS = 120.0
+SUBTITLE_SECONDS = 2.5
+IMAGES_PER_SECTION = 20
+KEYWORDS_PER_IMAGE = 5
+
+
+def build_synthetic_subject(
+    work_dir: Path,
+    minutes: float,
+    seed: int = 0
+) -> Tuple[dict, dict, List[dict], List[int]]:
+    """
+    合成された被写体データを生成
+
+    Args:
+        work_dir: 作業ディレクトリ（02_audio/audio_timing.json を書き出す）
+        minutes: 動画の長さ（分）
+        seed: 乱数シード
+
+    Returns:
+        (script_data, classified_images, subtitle_timing, section_ids)
+    """
+    rng = random.Random(seed)
+    total_seconds = minutes * 60.0
+    section_count = max(1, int(round(total_seconds / SECTION_SECONDS)))
+
+    # audio_timing.json（セクション境界の計算に使用）
+    audio_sections = []
+    for section_id in range(1, section_count + 1):
+        char_count = int(SECTION_SECONDS * CHARS_PER_SECOND)
+        step = SECTION_SECONDS / char_count
+        audio_sections.append({
+            "section_id": section_id,
+            "char_end_times": [round((i + 1) * step, 3) for i in range(char_count)],
+        })
+    audio_dir = work_dir / "02_audio"
+    audio_dir.mkdir(parents=True, exist_ok=True)
+    with open(audio_dir / "audio_timing.json", "w", encoding="utf-8") as f:
+        json.dump(audio_sections, f, ensure_ascii=False)
+
+    # 画像（ファイル名にセクション番号を含める）
+    images = []
+    for section_id in range(1, section_count + 1):
+        for n in range(IMAGES_PER_SECTION):
+            keywords = []
+            for _ in range(KEYWORDS_PER_IMAGE):
+                if rng.random() < 0.3:
+                    # 空白区切りの複合キーワード（部分一致の対象）
+                    keywords.append(f"{rng.choice(VOCABULARY)} {rng.choice(VOCABULARY)}")
+                else:
+                    keywords.append(rng.choice(VOCABULARY))
+            images.append({
+                "file_path": str(work_dir / "03_images" / f"section_{section_id:02d}_{n:03d}.png"),
+                "keywords": keywords,
+            })
+
+    # 字幕
+    subtitles = []
+    t = 0.0
+    index = 1
+    while t < total_seconds:
+        words = []
+        for _ in range(rng.randint(3, 6)):
+            words.append(rng.choice(VOCABULARY) if rng.random() < 0.3 else f"言葉{rng.randint(0, 999)}")
+            words.append(rng.choice(FILLERS))
+        text = "".join(words)
+        half = len(text) // 2
+        subtitles.append({
+            "index": index,
+            "start_time": round(t, 3),
+            "end_time": round(t + SUBTITLE_SECONDS, 3),
+            "text_line1": text[:half],
+            "text_line2": text[half:],
+        })
+        t += SUBTITLE_SECONDS
+        index += 1
+
+    script_data = {
+        "sections": [
+            {"section_id": sid, "estimated_duration": SECTION_SECONDS}
+            for sid in range(1, section_count + 1)
+        ]
+    }
+    return script_data, {"images": images}, subtitles, list(range(1, section_count + 1))
+
+
+def run_matcher(
+    work_dir: Path,
+    script_data: dict,
+    classified_images: dict,
+    subtitle_timing: List[dict],
+    section_ids: List[int],
+    use_keyword_index: bool
+) -> Tuple[float, List[dict]]:
+    """
+    全セクションのマッチングを実行し、処理時間を返す
+
+    Returns:
+        (経過秒, 画像クリップ一覧)
+    """
+    logger = logging.getLogger("bench_image_timing_matcher")
+    logger.setLevel(logging.ERROR)
+
+    start = time.perf_counter()
+    matcher = ImageTimingMatcherFixed(
+        working_dir=work_dir,
+        use_keyword_index=use_keyword_index,
+        logger=logger
+    )
+    clips = []
+    for section_id in section_ids:
+        clips.extend(matcher.match_images_to_subtitles(
+            script_data=script_data,
+            classified_images=classified_images,
+            subtitle_timing=subtitle_timing,
+            section_id=section_id
+        ))
+    elapsed = time.perf_counter() - start
+    return elapsed, clips
+
+
+def benchmark(minutes_list: List[float], repeat: int) -> List[Dict[str, float]]:
+    """
+    長さごとに全件走査とインデックスを比較
+
+    Returns:
+        計測結果のリスト
+    """
+    results = []
+    for minutes in minutes_list:
+        with tempfile.TemporaryDirectory() as tmp:
+            work_dir = Path(tmp)
+            script_data, classified, subtitles, section_ids = build_synthetic_subject(work_dir, minutes)
+
+            scan_times, index_times = [], []
+            scan_clips = index_clips = None
+            for _ in range(repeat):
+                elapsed, scan_clips = run_matcher(
+                    work_dir, script_data, classified, subtitles, section_ids, use_keyword_index=False
+                )
+                scan_times.append(elapsed)
+                elapsed, index_clips = run_matcher(
+                    work_dir, script_data, classified, subtitles, section_ids, use_keyword_index=True
+                )
+                index_times.append(elapsed)
+
+            if scan_clips != index_clips:
+                raise AssertionError(f"{minutes}min: index result differs from linear scan")
+
+            scan = min(scan_times)
+            index = min(index_times)
+            results.append({
+                "minutes": minutes,
+                "subtitles": len(subtitles),
+                "images": len(classified["images"]),
+                "clips": len(index_clips),
+                "scan_seconds": scan,
+                "index_seconds": index,
+                "speedup": scan / index if index > 0 else float("inf"),
+            })
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="ImageTimingMatcherFixed benchmark")
+    parser.add_argument("--minutes", type=float, nargs="+", default=[15, 30, 60],
+                        help="Synthetic video lengths in minutes")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best time is reported)")
+    parser.add_argument("--json", type=Path, default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = benchmark(args.minutes, args.repeat)
+
+    print(f"{'minutes':>8} {'subs':>6} {'images':>7} {'scan[s]':>9} {'index[s]':>9} {'speedup':>8}")
+    for r in results:
+        print(
+            f"{r['minutes']:>8.0f} {r['subtitles']:>6} {r['images']:>7} "
+            f"{r['scan_seconds']:>9.3f} {r['index_seconds']:>9.3f} {r['speedup']:>7.1f}x"
+        )
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
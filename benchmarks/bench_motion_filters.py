@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+ズーム・パン描画方式（motion_filters）の速度・画質比較
+
+Phase 3 の実画像（data/working/*/03_images/resized|generated/*.png）で
+各方式のセグメントを生成し、
+- 生成時間（zoompan_4k に対する速度比）
+- zoompan_4k（従来方式）の出力に対する SSIM / PSNR
+- フレーム間の動きの滑らかさ（ジッター）
+を並べて表示する。動きの種類は本番と同じく画像の番号から決める（--move で固定可）。
+
+ジッターは画面中央の領域で隣接フレーム間の移動量（位相相関、サブピクセル）を求め、
+その変化量（2階差分）の RMS をピクセル単位で表したもの。ズーム・パンの速度は一定なので
+滑らかな方式ほど 0 に近い。zoompan は整数ピクセル単位で切り出すため、出力解像度で
+直接切り出す margin 方式は移動量が 0 と 1 を行き来してジッターが大きくなる。
+既定の描画方式を変える前に SSIM だけでなくこの値も確認すること。
+
+使用例:
+    python -m benchmarks.bench_motion_filters
+    python -m benchmarks.bench_motion_filters data/working/織田信長/03_images/resized --limit 4 --seconds 6
+    python -m benchmarks.bench_motion_filters --modes zoompan_4k margin --json benchmarks/results/motion.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks import fixtures
+from src.utils.video_composition.motion_filters import (
+    MOTION_MODES,
+    MOVES,
+    choose_move,
+    motion_segment_command,
+    render_affine_segment,
+)
+
+REFERENCE_MODE = "zoompan_4k"
+ENCODE_ARGS = ['-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '18']
+JITTER_CROP = 256  # ジッター解析に使う中央領域（ピクセル）
+
+
+def find_images(paths: List[Path], limit: int) -> List[Path]:
+    """指定ディレクトリ（既定: 全題材の Phase 3 出力）から画像を集める"""
+    if not paths:
+        paths = sorted((project_root / "data" / "working").glob("*/03_images/resized"))
+        paths += sorted((project_root / "data" / "working").glob("*/03_images/generated"))
+
+    images: List[Path] = []
+    for path in paths:
+        if path.is_file():
+            images.append(path)
+        else:
+            images.extend(sorted(path.glob("*.png")) + sorted(path.glob("*.jpg")))
+        if len(images) >= limit:
+            break
+    return images[:limit]
+
+
+def render(mode: str, image: Path, seconds: float, move: str, output: Path) -> float:
+    """1セグメントを生成して所要時間（秒）を返す"""
+    start = time.perf_counter()
+    if mode == "affine":
+        render_affine_segment(image, seconds, output, move, encode_args=ENCODE_ARGS)
+    else:
+        cmd = motion_segment_command(image, seconds, output, move, mode=mode, encode_args=ENCODE_ARGS)
+        subprocess.run(cmd, check=True, stdin=subprocess.DEVNULL,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def compare(reference: Path, candidate: Path) -> Dict[str, Optional[float]]:
+    """ffmpeg の ssim / psnr フィルタで比較（全フレーム平均）"""
+    result = subprocess.run(
+        ['ffmpeg', '-i', str(candidate), '-i', str(reference),
+         '-lavfi', '[0:v][1:v]ssim;[0:v][1:v]psnr', '-f', 'null', '-'],
+        capture_output=True, text=True
+    )
+    scores: Dict[str, Optional[float]] = {"ssim": None, "psnr_db": None}
+    for line in result.stderr.splitlines():
+        if "SSIM" in line and "All:" in line:
+            scores["ssim"] = float(line.split("All:")[1].split()[0])
+        elif "PSNR" in line and "average:" in line:
+            value = line.split("average:")[1].split()[0]
+            scores["psnr_db"] = float("inf") if value == "inf" else float(value)
+    return scores
+
+
+def read_center_frames(video: Path, size: int = JITTER_CROP) -> np.ndarray:
+    """動画の中央 size x size をグレースケールで全フレーム読み込む（frames, size, size）"""
+    result = subprocess.run(
+        ['ffmpeg', '-v', 'error', '-i', str(video),
+         '-vf', f'crop={size}:{size},format=gray', '-f', 'rawvideo', '-'],
+        capture_output=True, check=True
+    )
+    frames = np.frombuffer(result.stdout, dtype=np.uint8)
+    return frames.reshape(-1, size, size).astype(np.float64)
+
+
+def _parabolic_offset(left: float, center: float, right: float) -> float:
+    """3点の放物線近似でピークのサブピクセル位置を求める"""
+    denominator = left - 2 * center + right
+    return 0.0 if denominator == 0 else 0.5 * (left - right) / denominator
+
+
+def frame_shift(previous: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """位相相関で previous → current の移動量 (dx, dy) を求める（サブピクセル）"""
+    window = np.outer(np.hanning(previous.shape[0]), np.hanning(previous.shape[1]))
+    a = np.fft.fft2((previous - previous.mean()) * window)
+    b = np.fft.fft2((current - current.mean()) * window)
+    cross = b * np.conj(a)
+    cross /= np.abs(cross) + 1e-9
+    correlation = np.fft.ifft2(cross).real
+
+    peak_y, peak_x = np.unravel_index(np.argmax(correlation), correlation.shape)
+    height, width = correlation.shape
+    dy = peak_y + _parabolic_offset(
+        correlation[(peak_y - 1) % height, peak_x], correlation[peak_y, peak_x], correlation[(peak_y + 1) % height, peak_x]
+    )
+    dx = peak_x + _parabolic_offset(
+        correlation[peak_y, (peak_x - 1) % width], correlation[peak_y, peak_x], correlation[peak_y, (peak_x + 1) % width]
+    )
+    # 折り返しを負の移動量に戻す
+    if dy > height / 2:
+        dy -= height
+    if dx > width / 2:
+        dx -= width
+    return np.array([dx, dy])
+
+
+def motion_jitter(video: Path) -> Optional[float]:
+    """
+    フレーム間の動きのジッター（ピクセル）
+
+    隣接フレーム間の移動量の2階差分（速度の変化）の RMS。
+    一定速度のズーム・パンなら 0、整数ピクセル単位の切り出しでガタつくと大きくなる。
+    """
+    frames = read_center_frames(video)
+    if len(frames) < 3:
+        return None
+    shifts = np.array([frame_shift(frames[i], frames[i + 1]) for i in range(len(frames) - 1)])
+    acceleration = np.diff(shifts, axis=0)
+    return float(np.sqrt(np.mean(np.sum(acceleration ** 2, axis=1))))
+
+
+def _mean(values: List[Optional[float]]) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return statistics.fmean(values) if values else None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Motion filter speed/quality comparison")
+    parser.add_argument("paths", nargs="*", type=Path,
+                        help="Image files or directories (default: data/working/*/03_images/{resized,generated})")
+    parser.add_argument("--limit", type=int, default=6, help="Maximum number of images")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Segment duration")
+    parser.add_argument("--modes", nargs="+", choices=MOTION_MODES, default=list(MOTION_MODES))
+    parser.add_argument("--move", choices=MOVES, default=None, help="Use one move for all images")
+    parser.add_argument("--json", type=Path, default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    if not fixtures.ffmpeg_available():
+        print("ffmpeg not found")
+        return 1
+
+    images = find_images(args.paths, args.limit)
+    if not images:
+        print("No Phase 3 images found (run Phase 3 first or pass image paths)")
+        return 1
+
+    modes = [REFERENCE_MODE] + [m for m in args.modes if m != REFERENCE_MODE]
+    if "affine" in modes:
+        from src.utils.video_composition.frame_server import CV2_AVAILABLE
+        if not CV2_AVAILABLE:
+            print("affine: skipped, opencv-python not installed")
+            modes.remove("affine")
+
+    print(f"{len(images)} images, {args.seconds:.1f}s per segment")
+    results: Dict[str, Any] = {"images": [str(p) for p in images], "seconds": args.seconds, "modes": {}}
+
+    with tempfile.TemporaryDirectory(prefix="bench_motion_") as tmp:
+        work_dir = Path(tmp)
+        per_mode: Dict[str, Dict[str, list]] = {
+            m: {"seconds": [], "ssim": [], "psnr_db": [], "jitter_px": []} for m in modes
+        }
+
+        for n, image in enumerate(images):
+            move = args.move or choose_move(n)
+            reference = work_dir / f"{REFERENCE_MODE}_{n}.mp4"
+            for mode in modes:
+                output = work_dir / f"{mode}_{n}.mp4"
+                per_mode[mode]["seconds"].append(render(mode, image, args.seconds, move, output))
+                per_mode[mode]["jitter_px"].append(motion_jitter(output))
+                if mode != REFERENCE_MODE:
+                    scores = compare(reference, output)
+                    per_mode[mode]["ssim"].append(scores["ssim"])
+                    per_mode[mode]["psnr_db"].append(scores["psnr_db"])
+            print(f"  [{n + 1}/{len(images)}] {image.name} ({move})")
+
+        reference_seconds = sum(per_mode[REFERENCE_MODE]["seconds"])
+        print(f"  {'mode':<11} {'seconds':>8} {'speedup':>8} {'SSIM':>7} {'PSNR':>7} {'jitter':>7}")
+        for mode in modes:
+            seconds = sum(per_mode[mode]["seconds"])
+            ssim = _mean(per_mode[mode]["ssim"])
+            psnr = _mean(per_mode[mode]["psnr_db"])
+            jitter = _mean(per_mode[mode]["jitter_px"])
+            results["modes"][mode] = {
+                "seconds": seconds,
+                "speedup": reference_seconds / seconds if seconds > 0 else None,
+                "ssim": ssim,
+                "psnr_db": psnr,
+                "jitter_px": jitter,
+            }
+            ssim_text = f"{ssim:7.4f}" if ssim is not None else "      -"
+            psnr_text = f"{psnr:7.2f}" if psnr is not None else "      -"
+            jitter_text = f"{jitter:6.3f}px" if jitter is not None else "      -"
+            print(f"  {mode:<11} {seconds:7.2f}s {reference_seconds / seconds:7.2f}x {ssim_text} {psnr_text} {jitter_text}")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+静的オーバーレイ焼き込みのベンチマーク
+
+グラデーション座布団 + 字幕バーを
+- 毎フレーム合成する従来方式（ffmpeg の overlay + drawbox）
+- 静止画に一度だけ焼き込む方式（StaticOverlayBaker）
+で比較する。
+
+計測内容:
+1. 合成コストのみ（NumPy）: 毎フレーム合成 vs 画像ごとに1回
+2. セグメントエンコード（ffmpeg がある場合）:
+   overlay/drawbox 付きグラフ vs 焼き込み済み静止画をそのままエンコード
+   両者の出力フレームの PSNR も記録する
+
+使用例:
+    python -m benchmarks.bench_overlay_baking
+    python -m benchmarks.bench_overlay_baking --images 8 --seconds 6 --repeat 3
+"""
+
+import argparse
+import json
+import logging
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from PIL import Image
+
+from benchmarks import fixtures
+from src.utils.video_composition.gradient_processor import GradientProcessor
+from src.utils.video_composition.overlay_baker import StaticOverlayBaker, overlay_multiplier
+
+FPS = 30
+BAR_HEIGHT = 216
+GRADIENT_RATIO = 0.35
+
+
+def write_images(work_dir: Path, count: int, size=(1920, 1080)) -> List[Path]:
+    paths = []
+    for n in range(count):
+        path = work_dir / f"image_{n:03d}.png"
+        Image.fromarray(fixtures.make_image_array(size[0], size[1], "procedural", seed=n)).save(
+            path, compress_level=1
+        )
+        paths.append(path)
+    return paths
+
+
+def bench_numpy(paths: List[Path], seconds: float, repeat: int, work_dir: Path) -> Dict[str, Any]:
+    """毎フレーム合成と焼き込みの合成コストを比較"""
+    multiplier = overlay_multiplier(1080, GRADIENT_RATIO, BAR_HEIGHT)[:, None, None]
+    frames_per_image = int(seconds * FPS)
+    frames = [np.asarray(Image.open(p).convert("RGB"), dtype=np.float32) for p in paths]
+
+    per_frame_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for frame in frames:
+            for _ in range(frames_per_image):
+                (frame * multiplier).astype(np.uint8)
+        per_frame_times.append(time.perf_counter() - start)
+
+    baked_times = []
+    for n in range(repeat):
+        baker = StaticOverlayBaker(
+            logger=logging.getLogger("bench"),
+            cache_dir=work_dir / f"baked_{n}",
+            gradient_ratio=GRADIENT_RATIO,
+            bar_height=BAR_HEIGHT
+        )
+        start = time.perf_counter()
+        baker.bake_many(paths)
+        baked_times.append(time.perf_counter() - start)
+
+    per_frame = min(per_frame_times)
+    baked = min(baked_times)
+    return {
+        "images": len(paths),
+        "frames": len(paths) * frames_per_image,
+        "per_frame_seconds": per_frame,
+        "baked_seconds": baked,
+        "speedup": per_frame / baked if baked > 0 else float("inf"),
+    }
+
+
+def _encode(cmd: List[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def _psnr(a: Path, b: Path) -> float:
+    """2つの動画の平均PSNR（ffmpeg psnr フィルタ）"""
+    result = subprocess.run(
+        ['ffmpeg', '-i', str(a), '-i', str(b), '-lavfi', 'psnr', '-f', 'null', '-'],
+        capture_output=True, text=True
+    )
+    for line in result.stderr.splitlines():
+        if "average:" in line:
+            value = line.split("average:")[1].split()[0]
+            return float("inf") if value == "inf" else float(value)
+    return float("nan")
+
+
+def bench_ffmpeg(paths: List[Path], seconds: float, repeat: int, work_dir: Path) -> Dict[str, Any]:
+    """セグメントエンコードで overlay/drawbox の有無を比較"""
+    gradient_path = GradientProcessor(logging.getLogger("bench"), work_dir).create_gradient_image(
+        width=1920, height=1080, gradient_ratio=GRADIENT_RATIO, cache_dir=work_dir / "gradient"
+    )
+    baker = StaticOverlayBaker(
+        logger=logging.getLogger("bench"),
+        cache_dir=work_dir / "baked_ffmpeg",
+        gradient_ratio=GRADIENT_RATIO,
+        bar_height=BAR_HEIGHT
+    )
+    start = time.perf_counter()
+    baked = baker.bake_many(paths)
+    bake_seconds = time.perf_counter() - start
+
+    encode_args = ['-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '18', '-pix_fmt', 'yuv420p', '-r', str(FPS)]
+    filter_graph = (
+        "[0:v]scale=1920:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2[base];"
+        "[base][1:v]overlay=0:0:format=auto,"
+        f"drawbox=y=ih-{BAR_HEIGHT}:color=black@1.0:width=iw:height={BAR_HEIGHT}:t=fill[out]"
+    )
+
+    filter_times, baked_times, psnrs = [], [], []
+    for _ in range(repeat):
+        filter_total = baked_total = 0.0
+        for n, path in enumerate(paths):
+            filtered_out = work_dir / f"filtered_{n}.mp4"
+            baked_out = work_dir / f"baked_{n}.mp4"
+            filter_total += _encode([
+                'ffmpeg', '-y', '-loop', '1', '-i', str(path), '-loop', '1', '-i', str(gradient_path),
+                '-t', f"{seconds:.3f}", '-filter_complex', filter_graph, '-map', '[out]',
+                *encode_args, str(filtered_out)
+            ])
+            baked_total += _encode([
+                'ffmpeg', '-y', '-loop', '1', '-i', str(baked[path]),
+                '-t', f"{seconds:.3f}", *encode_args, str(baked_out)
+            ])
+        filter_times.append(filter_total)
+        baked_times.append(baked_total)
+
+    for n in range(len(paths)):
+        psnrs.append(_psnr(work_dir / f"filtered_{n}.mp4", work_dir / f"baked_{n}.mp4"))
+
+    filtered = min(filter_times)
+    baked_seconds = min(baked_times)
+    return {
+        "segments": len(paths),
+        "seconds_per_segment": seconds,
+        "filter_seconds": filtered,
+        "baked_seconds": baked_seconds,
+        "bake_seconds": bake_seconds,
+        "speedup": filtered / baked_seconds if baked_seconds > 0 else float("inf"),
+        "min_psnr_db": min(psnrs) if psnrs else None,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Static overlay baking benchmark")
+    parser.add_argument("--images", type=int, default=6, help="Number of synthetic images")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Display time per image")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best time is reported)")
+    parser.add_argument("--json", type=Path, default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="bench_overlay_") as tmp:
+        work_dir = Path(tmp)
+        paths = write_images(work_dir, args.images)
+
+        results["compositing"] = bench_numpy(paths, args.seconds, args.repeat, work_dir)
+        r = results["compositing"]
+        print("Compositing cost (NumPy)")
+        print(f"  per-frame: {r['per_frame_seconds']:.3f}s for {r['frames']} frames")
+        print(f"  baked    : {r['baked_seconds']:.3f}s for {r['images']} images ({r['speedup']:.1f}x)")
+
+        if fixtures.ffmpeg_available():
+            results["segment_encode"] = bench_ffmpeg(paths, args.seconds, args.repeat, work_dir)
+            r = results["segment_encode"]
+            print("Segment encode (ffmpeg)")
+            print(f"  overlay+drawbox: {r['filter_seconds']:.3f}s")
+            print(f"  baked stills   : {r['baked_seconds']:.3f}s ({r['speedup']:.2f}x, +{r['bake_seconds']:.3f}s bake)")
+            print(f"  min PSNR       : {r['min_psnr_db']:.1f} dB")
+        else:
+            print("Segment encode (ffmpeg): skipped, ffmpeg not found")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+縦型変換（ぼかし背景）のベンチマーク
+
+AspectRatioConverter の
+- blur_bg（フル解像度 1080x1920 で boxblur）
+- fast_blur_bg（1/blur_downscale に縮小してぼかし → 拡大）
+- fast_blur_bg + 事前ぼかし静止画（Ken Burns の元画像から1回だけぼかす）
+を同じクリップで比較し、速度と画質（blur_bg を基準にした PSNR / SSIM）を並べて表示する。
+あわせて複数クリップの逐次変換と convert_many() の並列変換を比較する。
+
+入力は ffmpeg の testsrc2 から作る静止画と、それに Ken Burns（zoompan）を掛けたクリップ。
+
+使用例:
+    python -m benchmarks.bench_vertical_blur
+    python -m benchmarks.bench_vertical_blur --clips 4 --seconds 10 --repeat 3
+"""
+
+import argparse
+import json
+import logging
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks import fixtures
+from src.utils.aspect_ratio_converter import AspectRatioConverter
+
+FPS = 30
+
+
+def write_sources(work_dir: Path, count: int, seconds: float) -> List[Dict[str, Path]]:
+    """静止画と Ken Burns クリップを作成"""
+    sources = []
+    frames = int(seconds * FPS)
+    for n in range(count):
+        still = work_dir / f"still_{n:03d}.png"
+        clip = work_dir / f"clip_{n:03d}.mp4"
+        subprocess.run(
+            ['ffmpeg', '-y', '-v', 'error', '-f', 'lavfi',
+             '-i', f"testsrc2=size=1920x1080:rate=1,hue=h={n * 40}",
+             '-frames:v', '1', str(still)],
+            check=True, capture_output=True
+        )
+        subprocess.run(
+            ['ffmpeg', '-y', '-v', 'error', '-loop', '1', '-i', str(still),
+             '-f', 'lavfi', '-i', f"sine=frequency=220:sample_rate=48000:duration={seconds:.3f}",
+             '-vf', f"zoompan=z='min(zoom+0.0005,1.15)':d={frames}:s=1920x1080:fps={FPS}",
+             '-t', f"{seconds:.3f}", '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p',
+             '-c:a', 'aac', '-shortest', str(clip)],
+            check=True, capture_output=True
+        )
+        sources.append({"still": still, "clip": clip})
+    return sources
+
+
+def _compare(reference: Path, candidate: Path) -> Dict[str, Optional[float]]:
+    """基準との平均 PSNR / SSIM"""
+    result = subprocess.run(
+        ['ffmpeg', '-i', str(candidate), '-i', str(reference),
+         '-lavfi', '[0:v][1:v]psnr;[0:v][1:v]ssim', '-f', 'null', '-'],
+        capture_output=True, text=True
+    )
+    psnr = ssim = None
+    for line in result.stderr.splitlines():
+        if "PSNR" in line and "average:" in line:
+            value = line.split("average:")[1].split()[0]
+            psnr = float("inf") if value == "inf" else float(value)
+        if "SSIM" in line and "All:" in line:
+            ssim = float(line.split("All:")[1].split()[0])
+    return {"psnr_db": psnr, "ssim": ssim}
+
+
+def bench_modes(
+    converter: AspectRatioConverter,
+    sources: List[Dict[str, Path]],
+    repeat: int,
+    work_dir: Path
+) -> Dict[str, Any]:
+    """1クリップずつ各モードで変換し、速度と画質を比較"""
+    source = sources[0]
+    variants = {
+        "blur_bg": {"mode": "blur_bg"},
+        "fast_blur_bg": {"mode": "fast_blur_bg"},
+        "fast_blur_bg+still": {"mode": "fast_blur_bg", "still": True},
+    }
+
+    results: Dict[str, Any] = {}
+    outputs: Dict[str, Path] = {}
+    for name, variant in variants.items():
+        times = []
+        prepare_seconds = 0.0
+        for n in range(repeat):
+            background = None
+            if variant.get("still"):
+                # 静止画のぼかしは画像ごとに1回（キャッシュを消して毎回計測）
+                start = time.perf_counter()
+                converter.cache_dir = work_dir / f"blur_cache_{name}_{n}"
+                background = converter.create_blurred_still(source["still"])
+                prepare_seconds = time.perf_counter() - start
+
+            output = work_dir / f"vertical_{name.replace('+', '_')}.mp4"
+            start = time.perf_counter()
+            converter.convert_to_vertical(
+                input_path=source["clip"],
+                output_path=output,
+                mode=variant["mode"],
+                background_image=background
+            )
+            times.append(time.perf_counter() - start)
+            outputs[name] = output
+
+        results[name] = {"seconds": min(times), "prepare_seconds": prepare_seconds}
+
+    reference = outputs["blur_bg"]
+    for name, output in outputs.items():
+        base = results["blur_bg"]["seconds"]
+        results[name]["speedup"] = base / results[name]["seconds"] if results[name]["seconds"] > 0 else None
+        results[name].update(
+            {"psnr_db": None, "ssim": 1.0} if name == "blur_bg" else _compare(reference, output)
+        )
+    return results
+
+
+def bench_parallel(
+    converter: AspectRatioConverter,
+    sources: List[Dict[str, Path]],
+    repeat: int,
+    work_dir: Path
+) -> Dict[str, Any]:
+    """fast_blur_bg で全クリップを逐次変換 vs convert_many() で並列変換"""
+    serial_times, parallel_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for n, source in enumerate(sources):
+            converter.convert_to_vertical(
+                input_path=source["clip"],
+                output_path=work_dir / f"serial_{n:03d}.mp4",
+                mode="fast_blur_bg"
+            )
+        serial_times.append(time.perf_counter() - start)
+
+        jobs = [
+            {"input_path": source["clip"], "output_path": work_dir / f"parallel_{n:03d}.mp4"}
+            for n, source in enumerate(sources)
+        ]
+        start = time.perf_counter()
+        converter.convert_many(jobs, mode="fast_blur_bg")
+        parallel_times.append(time.perf_counter() - start)
+
+    serial = min(serial_times)
+    parallel = min(parallel_times)
+    return {
+        "clips": len(sources),
+        "serial_seconds": serial,
+        "parallel_seconds": parallel,
+        "speedup": serial / parallel if parallel > 0 else float("inf"),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Vertical blur-background conversion benchmark")
+    parser.add_argument("--clips", type=int, default=4, help="Number of synthetic clips")
+    parser.add_argument("--seconds", type=float, default=8.0, help="Length of each clip")
+    parser.add_argument("--repeat", type=int, default=2, help="Repetitions (best time is reported)")
+    parser.add_argument("--blur-downscale", type=int, default=10, help="fast_blur_bg downscale factor")
+    parser.add_argument("--json", type=Path, default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    if not fixtures.ffmpeg_available():
+        print("ffmpeg/ffprobe not found, skipped")
+        return 0
+
+    logger = logging.getLogger("bench")
+    logger.setLevel(logging.ERROR)
+
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="bench_vertical_") as tmp:
+        work_dir = Path(tmp)
+        sources = write_sources(work_dir, args.clips, args.seconds)
+        converter = AspectRatioConverter(logger=logger, blur_downscale=args.blur_downscale)
+
+        results["modes"] = bench_modes(converter, sources, args.repeat, work_dir)
+        print(f"Single clip ({args.seconds:.0f}s, 1920x1080 → 1080x1920)")
+        print(f"  {'mode':<20} {'time':>8} {'speedup':>8} {'PSNR':>8} {'SSIM':>7}")
+        for name, r in results["modes"].items():
+            psnr = "ref" if name == "blur_bg" else (
+                "n/a" if r["psnr_db"] is None else f"{r['psnr_db']:.1f}dB"
+            )
+            ssim = "n/a" if r["ssim"] is None else f"{r['ssim']:.4f}"
+            extra = f"  (+{r['prepare_seconds']:.3f}s still)" if r["prepare_seconds"] else ""
+            print(
+                f"  {name:<20} {r['seconds']:>7.3f}s {r['speedup']:>7.2f}x "
+                f"{psnr:>8} {ssim:>7}{extra}"
+            )
+
+        results["parallel"] = bench_parallel(converter, sources, args.repeat, work_dir)
+        r = results["parallel"]
+        print(f"{r['clips']} clips (fast_blur_bg)")
+        print(f"  serial  : {r['serial_seconds']:.3f}s")
+        print(f"  parallel: {r['parallel_seconds']:.3f}s ({r['speedup']:.2f}x)")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
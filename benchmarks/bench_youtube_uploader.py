@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+YouTube アップロードエンジンのベンチマーク
+
+FakeYouTubeUploadServer（往復遅延・帯域制限・障害注入付き）に対して
+- 従来方式相当: 1ファイルずつ、固定 1MB チャンク
+- ResumableUploader: 適応チャンク + 並列アップロード
+を比較する。あわせて、途中で落ちたアップロードを保存済みセッションから
+再開したときの再送バイト数を計測する。
+
+使用例:
+    python -m benchmarks.bench_youtube_uploader
+    python -m benchmarks.bench_youtube_uploader --clips 5 --size-mb 20 --latency 0.05
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import requests
+
+from benchmarks.stub_servers import FakeYouTubeUploadServer
+from src.core.exceptions import YouTubeUploadError
+from src.utils.youtube_uploader import MB, ResumableUploader, UploadJob, UploadSessionStore
+
+BODY = {"snippet": {"title": "bench"}, "status": {"privacyStatus": "private"}}
+
+
+def write_files(work_dir: Path, count: int, size_mb: float) -> List[Path]:
+    paths = []
+    for n in range(count):
+        path = work_dir / f"clip_{n:03d}.mp4"
+        path.write_bytes(os.urandom(int(size_mb * MB)))
+        paths.append(path)
+    return paths
+
+
+def bench_throughput(paths: List[Path], args, logger) -> Dict[str, Any]:
+    """固定チャンク・逐次 vs 適応チャンク・並列"""
+    server_args = dict(latency=args.latency, bandwidth=args.bandwidth_mb * MB, fail_every=args.fail_every)
+
+    with FakeYouTubeUploadServer(**server_args) as server:
+        legacy = ResumableUploader(
+            requests.Session, logger, upload_url=server.upload_url,
+            initial_chunk_size=MB, min_chunk_size=MB, max_chunk_size=MB, sleep=lambda s: None
+        )
+        start = time.perf_counter()
+        for path in paths:
+            legacy.upload(path, BODY)
+        legacy_seconds = time.perf_counter() - start
+        legacy_puts = server.stats["puts"]
+
+    with FakeYouTubeUploadServer(**server_args) as server:
+        engine = ResumableUploader(
+            requests.Session, logger, upload_url=server.upload_url,
+            initial_chunk_size=MB, target_chunk_seconds=args.target_seconds, sleep=lambda s: None
+        )
+        start = time.perf_counter()
+        results = engine.upload_many([UploadJob(path, BODY) for path in paths], max_workers=args.workers)
+        engine_seconds = time.perf_counter() - start
+        engine_puts = server.stats["puts"]
+
+    failed = [r["label"] for r in results if not r["video_id"]]
+    return {
+        "files": len(paths),
+        "legacy_seconds": legacy_seconds,
+        "legacy_requests": legacy_puts,
+        "engine_seconds": engine_seconds,
+        "engine_requests": engine_puts,
+        "speedup": legacy_seconds / engine_seconds if engine_seconds > 0 else float("inf"),
+        "failed": failed,
+    }
+
+
+def bench_resume(path: Path, work_dir: Path, args, logger) -> Dict[str, Any]:
+    """途中で失敗したアップロードを別プロセス相当の新しいエンジンで再開"""
+    store = UploadSessionStore(work_dir / "sessions.json")
+    size = path.stat().st_size
+
+    # 1MB 固定チャンクの3回目で失敗させ、再試行せずに終了する
+    with FakeYouTubeUploadServer(latency=args.latency, fail_every=3) as server:
+        crashing = ResumableUploader(
+            requests.Session, logger, upload_url=server.upload_url, session_store=store,
+            initial_chunk_size=MB, max_chunk_size=MB, max_retries=0, sleep=lambda s: None
+        )
+        try:
+            crashing.upload(path, BODY)
+        except YouTubeUploadError:
+            pass
+        received_before = server.stats["bytes_received"]
+
+        server.fail_every = 0
+        resumed = ResumableUploader(
+            requests.Session, logger, upload_url=server.upload_url, session_store=store,
+            initial_chunk_size=MB, sleep=lambda s: None
+        )
+        resumed.upload(path, BODY)
+        received_total = server.stats["bytes_received"]
+
+    return {
+        "file_bytes": size,
+        "received_before_crash": received_before,
+        "resent_bytes": received_total - size,
+        "sessions_created": server.stats["sessions"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="YouTube resumable uploader benchmark")
+    parser.add_argument("--clips", type=int, default=5, help="Number of files")
+    parser.add_argument("--size-mb", type=float, default=8.0, help="Size of each file")
+    parser.add_argument("--latency", type=float, default=0.03, help="Per-request round-trip delay (s)")
+    parser.add_argument("--bandwidth-mb", type=float, default=40.0, help="Per-connection bandwidth (MB/s)")
+    parser.add_argument("--fail-every", type=int, default=0, help="Fail every Nth chunk with 503")
+    parser.add_argument("--workers", type=int, default=3, help="Parallel uploads")
+    parser.add_argument("--target-seconds", type=float, default=1.0, help="Adaptive chunk target duration")
+    parser.add_argument("--json", type=Path, default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench")
+    logger.setLevel(logging.ERROR)
+
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="bench_upload_") as tmp:
+        work_dir = Path(tmp)
+        paths = write_files(work_dir, args.clips, args.size_mb)
+
+        results["throughput"] = bench_throughput(paths, args, logger)
+        r = results["throughput"]
+        print(f"{r['files']} files × {args.size_mb:.0f}MB (latency {args.latency * 1000:.0f}ms, {args.bandwidth_mb:.0f}MB/s)")
+        print(f"  serial, 1MB chunks  : {r['legacy_seconds']:.2f}s ({r['legacy_requests']} requests)")
+        print(f"  engine, {args.workers} parallel : {r['engine_seconds']:.2f}s ({r['engine_requests']} requests, {r['speedup']:.2f}x)")
+        if r["failed"]:
+            print(f"  failed: {r['failed']}")
+
+        results["resume"] = bench_resume(paths[0], work_dir, args, logger)
+        r = results["resume"]
+        print("Resume after failure")
+        print(f"  received before crash: {r['received_before_crash'] / MB:.1f}MB of {r['file_bytes'] / MB:.1f}MB")
+        print(f"  re-sent bytes        : {r['resent_bytes']} (sessions created: {r['sessions_created']})")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,442 @@
+"""
+ベンチマーク用の合成データ
+
+外部APIを使わずに「被写体」一式を生成する。
+
+- 台本（script.json）: 指定した長さの合成ナレーション
+- 画像: 単色 / 手続き生成（グラデーション + ノイズ）の PNG
+- 音声: サイン波 / 無音の WAV（ffmpeg があれば MP3 に変換）
+- audio_timing.json: 一定の話速で文字タイミングを割り当てたもの
+- BGMライブラリ、Phase 7 の最終動画、Phase 9 のアップロードログ
+
+使用例:
+    config = make_sandbox_config(Path("/tmp/bench"))
+    spec = SubjectSpec(sections=6, chars_per_section=400)
+    build_synthetic_subject(config, "合成偉人", spec)
+"""
+
+import json
+import math
+import random
+import shutil
+import struct
+import subprocess
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+    from PIL import Image
+    IMAGING_AVAILABLE = True
+except ImportError:
+    IMAGING_AVAILABLE = False
+
+
+# 合成ナレーション用の語彙
+VOCABULARY = [
+    "織田信長", "本能寺", "桶狭間", "天下統一", "安土城", "明智光秀", "豊臣秀吉",
+    "徳川家康", "鉄砲", "楽市楽座", "比叡山", "長篠", "武田勝頼", "今川義元",
+    "ルネサンス", "モナリザ", "最後の晩餐", "フィレンツェ", "ミラノ", "解剖学",
+    "戦国時代", "城下町", "茶の湯", "南蛮貿易", "宣教師", "天守閣", "合戦",
+]
+PARTICLES = ["は", "が", "を", "に", "で", "と", "の", "から", "まで"]
+PREDICATES = ["を目指しました", "と呼ばれています", "が始まったのです", "を変えました", "でした"]
+
+SAMPLE_RATE = 24000
+BGM_TYPES = ["opening", "main", "ending"]
+
+
+@dataclass
+class SubjectSpec:
+    """合成する被写体の規模"""
+    sections: int = 6
+    chars_per_section: int = 400
+    images_per_section: int = 4
+    chars_per_second: float = 7.0
+    image_mode: str = "procedural"   # solid / procedural
+    audio_mode: str = "sine"         # sine / silent
+    image_size: tuple = (1920, 1080)
+    seed: int = 0
+
+
+def ffmpeg_available() -> bool:
+    """ffmpeg / ffprobe が使えるか"""
+    return shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
+
+
+def make_sandbox_config(root: Path):
+    """
+    パス設定を root 配下に差し替えた ConfigManager を作成
+
+    working_dir / output_dir / cache_dir / logs_dir を隔離し、
+    実データを汚さずにフェーズを実行できるようにする。
+    """
+    from src.core.config_manager import ConfigManager
+
+    root = Path(root)
+    config = ConfigManager()
+    paths = config.main_config.setdefault("paths", {})
+    for key in ("working_dir", "output_dir", "cache_dir", "logs_dir"):
+        paths[key] = str(root / key)
+        (root / key).mkdir(parents=True, exist_ok=True)
+    paths["bgm_library"] = str(root / "bgm")
+    config.main_config.setdefault("telemetry", {})["enabled"] = False
+    return config
+
+
+# ========================================
+# テキスト
+# ========================================
+
+def make_narration(rng: random.Random, length: int) -> str:
+    """おおよそ length 文字の合成ナレーション"""
+    sentences = []
+    total = 0
+    while total < length:
+        words = []
+        for _ in range(rng.randint(2, 4)):
+            words.append(rng.choice(VOCABULARY))
+            words.append(rng.choice(PARTICLES))
+        words.append(rng.choice(VOCABULARY))
+        words.append(rng.choice(PREDICATES))
+        sentence = "".join(words)
+        # 読点を適度に入れる
+        if len(sentence) > 20:
+            cut = len(sentence) // 2
+            sentence = sentence[:cut] + "、" + sentence[cut:]
+        sentence += "。"
+        sentences.append(sentence)
+        total += len(sentence)
+    return "".join(sentences)
+
+
+def write_script(subject_dir: Path, subject: str, spec: SubjectSpec) -> Dict[str, Any]:
+    """01_script/script.json を生成"""
+    rng = random.Random(spec.seed)
+    sections = []
+    for section_id in range(1, spec.sections + 1):
+        narration = make_narration(rng, spec.chars_per_section)
+        if section_id == 1:
+            bgm = "opening"
+        elif section_id == spec.sections:
+            bgm = "ending"
+        else:
+            bgm = "main"
+        sections.append({
+            "section_id": section_id,
+            "title": f"第{section_id}章",
+            "narration": narration,
+            "estimated_duration": round(len(narration) / spec.chars_per_second, 1),
+            "image_keywords": rng.sample(VOCABULARY, 3),
+            "atmosphere": "壮大",
+            "requires_ai_video": False,
+            "bgm_suggestion": bgm,
+        })
+
+    script = {
+        "subject": subject,
+        "title": f"{subject}の生涯",
+        "description": f"{subject}の合成台本（ベンチマーク用）",
+        "sections": sections,
+        "total_estimated_duration": sum(s["estimated_duration"] for s in sections),
+        "thumbnail": {"upper_text": subject, "lower_text": "合成"},
+    }
+
+    script_dir = subject_dir / "01_script"
+    script_dir.mkdir(parents=True, exist_ok=True)
+    with open(script_dir / "script.json", "w", encoding="utf-8") as f:
+        json.dump(script, f, indent=2, ensure_ascii=False)
+    return script
+
+
+# ========================================
+# 画像
+# ========================================
+
+def make_image_array(width: int, height: int, mode: str, seed: int):
+    """単色 / 手続き生成の RGB 画像（numpy配列）"""
+    rng = np.random.default_rng(seed)
+    if mode == "solid":
+        color = rng.integers(0, 256, size=3, dtype=np.uint8)
+        return np.broadcast_to(color, (height, width, 3)).copy()
+
+    # グラデーション + 低周波ノイズ（フィルタ処理が素通りしない程度の模様）
+    y = np.linspace(0.0, 1.0, height, dtype=np.float32)[:, None]
+    x = np.linspace(0.0, 1.0, width, dtype=np.float32)[None, :]
+    base = rng.random(3, dtype=np.float32)
+    img = np.empty((height, width, 3), dtype=np.float32)
+    for c in range(3):
+        phase = rng.random() * math.tau
+        img[:, :, c] = 0.5 + 0.35 * np.sin(math.tau * (x * (c + 1) + y * (3 - c)) + phase) + 0.15 * base[c]
+    noise = rng.random((height // 16 + 1, width // 16 + 1, 3), dtype=np.float32)
+    noise = np.repeat(np.repeat(noise, 16, axis=0), 16, axis=1)[:height, :width]
+    img = np.clip(img * 0.85 + noise * 0.15, 0.0, 1.0)
+    return (img * 255).astype(np.uint8)
+
+
+def write_images(subject_dir: Path, script: Dict[str, Any], spec: SubjectSpec) -> List[Dict[str, Any]]:
+    """03_images/generated/*.png と classified.json を生成"""
+    if not IMAGING_AVAILABLE:
+        raise ImportError("numpy and Pillow are required for synthetic images")
+
+    rng = random.Random(spec.seed + 1)
+    images_dir = subject_dir / "03_images" / "generated"
+    images_dir.mkdir(parents=True, exist_ok=True)
+    width, height = spec.image_size
+
+    images = []
+    for section in script["sections"]:
+        section_id = section["section_id"]
+        for n in range(spec.images_per_section):
+            path = images_dir / f"section_{section_id:02d}_sd_{n + 1:02d}.png"
+            array = make_image_array(width, height, spec.image_mode, seed=section_id * 1000 + n)
+            Image.fromarray(array).save(path, compress_level=1)
+            images.append({
+                "file_path": str(path),
+                "section_id": section_id,
+                "keywords": rng.sample(section["image_keywords"] + VOCABULARY[:5], 3),
+                "classification": "portrait" if n % 2 == 0 else "landscape",
+            })
+
+    with open(subject_dir / "03_images" / "classified.json", "w", encoding="utf-8") as f:
+        json.dump({"images": images}, f, indent=2, ensure_ascii=False)
+    return images
+
+
+# ========================================
+# 音声
+# ========================================
+
+def make_wav_bytes(duration: float, mode: str = "sine", frequency: float = 220.0) -> bytes:
+    """サイン波 / 無音の 16bit モノラル WAV"""
+    import io
+
+    frames = int(duration * SAMPLE_RATE)
+    if mode == "silent":
+        data = b"\x00\x00" * frames
+    else:
+        # 整数周波数なら1秒分で周期が閉じるので、1秒を繰り返して長尺でも高速に生成
+        amplitude = 0.2 * 32767
+        step = math.tau * round(frequency) / SAMPLE_RATE
+        one_second = b"".join(
+            struct.pack("<h", int(amplitude * math.sin(step * i))) for i in range(SAMPLE_RATE)
+        )
+        repeats, rest = divmod(frames, SAMPLE_RATE)
+        data = one_second * repeats + one_second[:rest * 2]
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(data)
+    return buffer.getvalue()
+
+
+def write_audio(path: Path, duration: float, mode: str = "sine", frequency: float = 220.0) -> Path:
+    """
+    合成音声を書き出す
+
+    拡張子が .mp3 で ffmpeg が使える場合は MP3 にエンコードする。
+    ffmpeg がない場合は WAV の中身をそのまま書く（ffprobe 系はコンテナを自動判別する）。
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    wav_bytes = make_wav_bytes(duration, mode, frequency)
+
+    if path.suffix == ".mp3" and ffmpeg_available():
+        wav_path = path.with_suffix(".wav")
+        wav_path.write_bytes(wav_bytes)
+        subprocess.run(
+            ["ffmpeg", "-y", "-v", "error", "-i", str(wav_path), "-b:a", "96k", str(path)],
+            check=True, capture_output=True
+        )
+        wav_path.unlink()
+    else:
+        path.write_bytes(wav_bytes)
+    return path
+
+
+def char_timings(text: str, start: float, chars_per_second: float) -> Dict[str, Any]:
+    """一定の話速で文字タイミングを割り当てる（句点の後は少し間を空ける）"""
+    characters, starts, ends = [], [], []
+    t = start
+    step = 1.0 / chars_per_second
+    for char in text:
+        characters.append(char)
+        starts.append(round(t, 3))
+        t += step
+        ends.append(round(t, 3))
+        if char == "。":
+            t += 0.3
+    return {"characters": characters, "char_start_times": starts, "char_end_times": ends, "end": t}
+
+
+def write_audio_outputs(subject_dir: Path, script: Dict[str, Any], spec: SubjectSpec) -> List[Dict[str, Any]]:
+    """
+    Phase 2 の出力一式を生成
+
+    audio_timing.json（タイトル + ナレーション形式）、narration_full.mp3、
+    audio_analysis.json を書き出す。
+    """
+    audio_dir = subject_dir / "02_audio"
+    audio_dir.mkdir(parents=True, exist_ok=True)
+    title_silence = 1.0
+
+    timing_data = []
+    offset = 0.0
+    for section in script["sections"]:
+        title = char_timings(section["title"], 0.0, spec.chars_per_second * 0.8)
+        narration_start = title["end"] + title_silence
+        narration = char_timings(section["narration"], narration_start, spec.chars_per_second)
+        total = narration["end"]
+
+        timing_data.append({
+            "section_id": section["section_id"],
+            "section_title": section["title"],
+            "text": section["narration"],
+            "tts_text": section["narration"],
+            "display_text": section["narration"],
+            "audio_path": str(audio_dir / "sections" / f"section_{section['section_id']:02d}.mp3"),
+            "offset": round(offset, 3),
+            "total_duration": round(total, 3),
+            "title_timing": {
+                "text": section["title"],
+                "start_time": 0.0,
+                "end_time": round(title["end"], 3),
+                "special_type": "section_title",
+                "characters": title["characters"],
+                "char_start_times": title["char_start_times"],
+                "char_end_times": title["char_end_times"],
+            },
+            "silence_after_title": {
+                "start_time": round(title["end"], 3),
+                "end_time": round(narration_start, 3),
+                "duration": title_silence,
+            },
+            "narration_timing": {
+                "text": section["narration"],
+                "start_time": round(narration_start, 3),
+                "end_time": round(total, 3),
+                "characters": narration["characters"],
+                "char_start_times": narration["char_start_times"],
+                "char_end_times": narration["char_end_times"],
+            },
+        })
+        offset += total
+
+    with open(audio_dir / "audio_timing.json", "w", encoding="utf-8") as f:
+        json.dump(timing_data, f, indent=2, ensure_ascii=False)
+
+    write_audio(audio_dir / "narration_full.mp3", offset, mode=spec.audio_mode)
+
+    analysis = {
+        "subject": script["subject"],
+        "total_duration": round(offset, 3),
+        "segments": [
+            {"section_id": t["section_id"], "audio_path": t["audio_path"], "duration": t["total_duration"]}
+            for t in timing_data
+        ],
+    }
+    with open(audio_dir / "audio_analysis.json", "w", encoding="utf-8") as f:
+        json.dump(analysis, f, indent=2, ensure_ascii=False)
+
+    return timing_data
+
+
+def write_bgm_library(bgm_dir: Path, duration: float = 20.0) -> Path:
+    """BGMライブラリ（opening / main / ending に1曲ずつ）を生成"""
+    for i, bgm_type in enumerate(BGM_TYPES):
+        write_audio(bgm_dir / bgm_type / f"synthetic_{bgm_type}.mp3", duration, "sine", 110.0 * (i + 2))
+    return bgm_dir
+
+
+# ========================================
+# 動画（Phase 10 の入力）
+# ========================================
+
+def write_final_video(config, subject: str, duration: float) -> Path:
+    """Phase 7 の最終動画（テストパターン + サイン波）を生成"""
+    if not ffmpeg_available():
+        raise RuntimeError("ffmpeg is required to synthesize the final video")
+
+    output = config.get_path("output_dir") / "videos" / f"{subject}.mp4"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-v", "error",
+            "-f", "lavfi", "-i", f"testsrc2=size=1920x1080:rate=30:duration={duration:.3f}",
+            "-f", "lavfi", "-i", f"sine=frequency=220:sample_rate=48000:duration={duration:.3f}",
+            "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+            "-c:a", "aac", "-shortest", str(output)
+        ],
+        check=True, capture_output=True
+    )
+    return output
+
+
+def write_upload_log(subject_dir: Path, subject: str) -> Path:
+    """Phase 9 のアップロードログ（Phase 10 の入力）"""
+    log_dir = subject_dir / "09_youtube"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    path = log_dir / "upload_log.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "status": "success",
+            "video_id": "synthetic0001",
+            "url": "https://www.youtube.com/watch?v=synthetic0001",
+            "title": f"{subject}の生涯",
+            "description": "synthetic",
+            "tags": [subject],
+            "privacy_status": "private",
+        }, f, indent=2, ensure_ascii=False)
+    return path
+
+
+# ========================================
+# まとめて生成
+# ========================================
+
+def build_synthetic_subject(
+    config,
+    subject: str,
+    spec: SubjectSpec,
+    with_images: bool = True,
+    with_audio: bool = True,
+    with_bgm: bool = True
+) -> Dict[str, Any]:
+    """
+    合成被写体を生成（Phase 1〜5 の出力に相当）
+
+    Args:
+        config: make_sandbox_config() で作成した ConfigManager
+        subject: 被写体名
+        spec: 規模
+        with_images: 画像を生成するか
+        with_audio: Phase 2 の出力を生成するか
+        with_bgm: BGMライブラリを生成するか
+
+    Returns:
+        {"script", "timing", "images", "duration"}
+    """
+    subject_dir = config.get_working_dir(subject)
+    subject_dir.mkdir(parents=True, exist_ok=True)
+
+    script = write_script(subject_dir, subject, spec)
+    timing: Optional[List[Dict[str, Any]]] = None
+    images: Optional[List[Dict[str, Any]]] = None
+    duration = script["total_estimated_duration"]
+
+    if with_audio:
+        timing = write_audio_outputs(subject_dir, script, spec)
+        duration = sum(t["total_duration"] for t in timing)
+    if with_images:
+        images = write_images(subject_dir, script, spec)
+    if with_bgm:
+        bgm_dir = Path(config.get("paths.bgm_library"))
+        if not bgm_dir.exists():
+            write_bgm_library(bgm_dir)
+
+    return {"script": script, "timing": timing, "images": images, "duration": duration}
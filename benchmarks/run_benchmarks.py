@@ -0,0 +1,924 @@
+#!/usr/bin/env python3
+"""
+パイプラインのベンチマークスイート
+
+合成被写体（benchmarks/fixtures.py）とスタブサーバー（benchmarks/stub_servers.py）で
+外部APIを使わずに以下を計測し、結果を JSON で保存する。
+
+- フェーズ: Phase 2（音声）/ 6（字幕）/ 7（動画統合）/ 10（Shorts）
+- ホット関数: DTWアライメント、改行位置の決定、build_audio_filter、
+  CinematicFilter.process、画像タイミングマッチング、オーバーレイ焼き込み、
+  縦型変換（fast_blur_bg）、YouTube 再開可能アップロード（偽エンドポイント）
+
+基準結果（baseline）と比較し、thresholds.yaml の閾値を超えて遅くなった
+ケースがあれば終了コード 1 を返す。依存ライブラリや ffmpeg が無いケースは
+skipped として記録する。
+
+使用例:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --size medium --repeat 3
+    python -m benchmarks.run_benchmarks --cases line_breaking dtw_alignment
+    python -m benchmarks.run_benchmarks --update-baseline
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks import fixtures
+from benchmarks.fixtures import SubjectSpec
+
+
+BENCHMARKS_DIR = Path(__file__).parent
+DEFAULT_THRESHOLDS = BENCHMARKS_DIR / "thresholds.yaml"
+DEFAULT_RESULTS_DIR = BENCHMARKS_DIR / "results"
+
+# 規模プリセット
+SIZES: Dict[str, SubjectSpec] = {
+    "small": SubjectSpec(sections=3, chars_per_section=300, images_per_section=3),
+    "medium": SubjectSpec(sections=6, chars_per_section=600, images_per_section=4),
+    "large": SubjectSpec(sections=12, chars_per_section=1200, images_per_section=6),
+}
+
+SUBJECT = "合成偉人"
+
+
+class SkipCase(Exception):
+    """ケースを実行できない（依存ライブラリ・ffmpeg が無いなど）"""
+
+
+@dataclass
+class CaseContext:
+    """ケースに渡す実行環境"""
+    work_dir: Path
+    spec: SubjectSpec
+    logger: logging.Logger
+    stub_latency: float = 0.0
+
+
+@dataclass
+class BenchmarkCase:
+    """ベンチマークケース"""
+    name: str
+    group: str
+    setup: Callable[[CaseContext], Callable[[], Optional[Dict[str, Any]]]]
+    description: str = ""
+
+
+CASES: Dict[str, BenchmarkCase] = {}
+
+
+def benchmark_case(name: str, group: str):
+    """
+    ケースを登録するデコレーター
+
+    関数は準備（計測対象外）を行い、計測対象の処理を返す。
+    処理の戻り値（dict）は結果の extra に記録される。
+    """
+    def decorator(func):
+        CASES[name] = BenchmarkCase(
+            name=name,
+            group=group,
+            setup=func,
+            description=(func.__doc__ or "").strip().splitlines()[0] if func.__doc__ else ""
+        )
+        return func
+    return decorator
+
+
+def _require(*modules: str):
+    """モジュールが無ければ SkipCase"""
+    import importlib
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            raise SkipCase(f"missing dependency: {e.name or module}")
+
+
+def _require_ffmpeg():
+    if not fixtures.ffmpeg_available():
+        raise SkipCase("ffmpeg/ffprobe not found")
+
+
+def _load_phase_yaml(filename: str) -> Dict[str, Any]:
+    with open(project_root / "config" / "phases" / filename, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def _deep_update(target: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _deep_update(target[key], value)
+        else:
+            target[key] = value
+    return target
+
+
+def _sandbox(
+    ctx: CaseContext,
+    overrides: Optional[Dict[int, Dict[str, Any]]] = None,
+    llm_latency: Optional[float] = None
+):
+    """隔離した ConfigManager を作成し、フェーズ設定を上書き（LLM はスタブ、遅延は llm_latency）"""
+    _require("dotenv", "jinja2", "pydantic")
+    config = fixtures.make_sandbox_config(ctx.work_dir)
+    for phase_number, phase_overrides in (overrides or {}).items():
+        _deep_update(config.get_phase_config(phase_number), phase_overrides)
+
+    # LLM 呼び出しはすべてローカルスタブへ（キャッシュなし・決定的）
+    from src.utils.cost_calculator import CostCalculator
+    from src.utils.llm_gateway import LLMGateway, StubBackend, set_llm_gateway
+    set_llm_gateway(LLMGateway(
+        StubBackend(
+            responders={"TextOptimizer": _text_optimizer_responder},
+            latency=ctx.stub_latency if llm_latency is None else llm_latency
+        ),
+        cost_calculator=CostCalculator(),
+        logger=ctx.logger
+    ))
+    return config
+
+
+def _text_optimizer_responder(request: Dict[str, Any]) -> str:
+    """TextOptimizer 用のスタブ応答（入力テキストをそのまま tts_text / display_text に入れる）"""
+    prompt = request["messages"][-1]["content"]
+    text = prompt.split("【入力テキスト】", 1)[-1].split("【出力ルール】", 1)[0].strip()
+    return json.dumps({"tts_text": text, "display_text": text}, ensure_ascii=False)
+
+
+def _run_phase(phase) -> Dict[str, Any]:
+    """フェーズを実行し、失敗なら例外にする"""
+    from src.core.models import PhaseStatus
+
+    execution = phase.run(skip_if_exists=False)
+    if execution.status != PhaseStatus.COMPLETED:
+        raise RuntimeError(f"{phase.__class__.__name__} {execution.status.value}: {execution.error_message}")
+    return {"phase_seconds": execution.duration_seconds}
+
+
+# ========================================
+# ホット関数
+# ========================================
+
+@benchmark_case("line_breaking", group="hot")
+def case_line_breaking(ctx: CaseContext):
+    """LineBreaker.find_breaks（字幕の改行位置DP）"""
+    _require("src.generators.subtitle_generator.line_breaker")
+    from src.generators.subtitle_generator.line_breaker import LineBreaker
+
+    breaker = LineBreaker(_load_phase_yaml("subtitle_generation.yaml"), logger=ctx.logger)
+    rng = random.Random(ctx.spec.seed)
+    text = fixtures.make_narration(rng, ctx.spec.sections * ctx.spec.chars_per_section)
+    sentences = [s + "。" for s in text.split("。") if s]
+
+    def run():
+        lines = 0
+        for sentence in sentences:
+            lines += len(breaker.find_breaks(list(sentence), max_len=16, max_segments=2)) + 1
+        # 長いチャンクの分割（行数上限なし）
+        chunks = len(breaker.find_breaks(list(text), max_len=36, min_len=10)) + 1
+        return {"sentences": len(sentences), "lines": lines, "chunks": chunks}
+
+    return run
+
+
+@benchmark_case("dtw_alignment", group="hot")
+def case_dtw_alignment(ctx: CaseContext):
+    """DTWAligner.align（元テキストと認識結果の文字アライメント）"""
+    _require("fastdtw", "scipy", "src.utils.dtw_aligner")
+    from src.utils.dtw_aligner import DTWAligner
+
+    rng = random.Random(ctx.spec.seed)
+    original = fixtures.make_narration(rng, ctx.spec.chars_per_section)
+    # 認識結果: 一部の文字を置換・脱落させる
+    recognized_chars = []
+    for char in original:
+        r = rng.random()
+        if r < 0.03:
+            continue
+        recognized_chars.append("あ" if r < 0.08 else char)
+    recognized = "".join(recognized_chars)
+
+    word_timings = []
+    t = 0.0
+    i = 0
+    while i < len(recognized):
+        size = rng.randint(2, 4)
+        word = recognized[i:i + size]
+        duration = len(word) / ctx.spec.chars_per_second
+        word_timings.append({"word": word, "start": round(t, 3), "end": round(t + duration, 3)})
+        t += duration
+        i += size
+
+    aligner = DTWAligner(logger=ctx.logger, debug_mode=False, output_dir=ctx.work_dir / "dtw")
+
+    def run():
+        aligned = aligner.align(original, recognized, word_timings)
+        return {"chars": len(original), "aligned": len(aligned)}
+
+    return run
+
+
+@benchmark_case("build_audio_filter", group="hot")
+def case_build_audio_filter(ctx: CaseContext):
+    """BGMProcessor.build_audio_filter（BGMミックス用フィルタ生成）"""
+    _require("src.utils.video_composition.bgm_processor")
+    from src.utils.video_composition.bgm_processor import BGMProcessor
+
+    processor = BGMProcessor(project_root=project_root, logger=ctx.logger)
+    segments = []
+    start = 0.0
+    for i in range(ctx.spec.sections * 4):
+        duration = 20.0 + (i % 5) * 7.5
+        segments.append({
+            "bgm_type": fixtures.BGM_TYPES[i % 3],
+            "file_path": str(ctx.work_dir / "missing" / f"bgm_{i}.mp3"),  # ffprobe を呼ばない
+            "start_time": start,
+            "duration": duration,
+            "volume": 0.1,
+        })
+        start += duration
+
+    def run():
+        filter_str = processor.build_audio_filter(segments)
+        return {"segments": len(segments), "filter_chars": len(filter_str)}
+
+    return run
+
+
+@benchmark_case("cinematic_filter", group="hot")
+def case_cinematic_filter(ctx: CaseContext):
+    """CinematicFilter.process（シネマティック画像フィルタ）"""
+    _require("numpy", "cv2", "PIL", "src.processors.image_filter")
+    from PIL import Image
+    from src.processors.image_filter import CinematicFilter
+
+    filter_config = _load_phase_yaml("image_processing.yaml").get("ijin", {}).get("filters", {})
+    cinematic = CinematicFilter(filter_config, logger=ctx.logger)
+
+    width, height = ctx.spec.image_size
+    paths = []
+    for n in range(3):
+        path = ctx.work_dir / f"cinematic_{n}.png"
+        Image.fromarray(fixtures.make_image_array(width, height, "procedural", seed=n)).save(path, compress_level=1)
+        paths.append(path)
+
+    def run():
+        for path in paths:
+            cinematic.process(path)
+        return {"images": len(paths), "resolution": f"{width}x{height}"}
+
+    return run
+
+
+@benchmark_case("overlay_baking", group="hot")
+def case_overlay_baking(ctx: CaseContext):
+    """StaticOverlayBaker.bake_many（グラデーション + 字幕バーの焼き込み）"""
+    _require("numpy", "PIL", "src.utils.video_composition.overlay_baker")
+    from PIL import Image
+    from src.utils.video_composition.overlay_baker import StaticOverlayBaker
+
+    width, height = ctx.spec.image_size
+    count = ctx.spec.sections * ctx.spec.images_per_section
+    paths = []
+    for n in range(count):
+        path = ctx.work_dir / f"overlay_{n}.png"
+        Image.fromarray(fixtures.make_image_array(width, height, "procedural", seed=n)).save(path, compress_level=1)
+        paths.append(path)
+    runs = {"n": 0}
+
+    def run():
+        # 毎回新しいキャッシュ先にして焼き込み自体を計測する
+        runs["n"] += 1
+        baker = StaticOverlayBaker(
+            logger=ctx.logger,
+            cache_dir=ctx.work_dir / f"baked_{runs['n']}",
+            gradient_ratio=0.35,
+            bar_height=216
+        )
+        baker.bake_many(paths)
+        return {"images": count, "resolution": f"{width}x{height}"}
+
+    return run
+
+
+@benchmark_case("vertical_blur", group="hot")
+def case_vertical_blur(ctx: CaseContext):
+    """AspectRatioConverter.convert_many（fast_blur_bg、並列）"""
+    _require_ffmpeg()
+    import subprocess
+    from src.utils.aspect_ratio_converter import AspectRatioConverter
+
+    clips = []
+    for n in range(3):
+        clip = ctx.work_dir / f"clip_{n}.mp4"
+        subprocess.run(
+            ["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "testsrc2=size=1920x1080:rate=30:duration=5",
+             "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p", str(clip)],
+            check=True, capture_output=True
+        )
+        clips.append(clip)
+    converter = AspectRatioConverter(logger=ctx.logger)
+
+    def run():
+        jobs = [
+            {"input_path": clip, "output_path": ctx.work_dir / f"vertical_{n}.mp4"}
+            for n, clip in enumerate(clips)
+        ]
+        converter.convert_many(jobs, mode="fast_blur_bg")
+        return {"clips": len(clips), "seconds_per_clip": 5}
+
+    return run
+
+
+@benchmark_case("youtube_uploader", group="hot")
+def case_youtube_uploader(ctx: CaseContext):
+    """ResumableUploader.upload_many（偽エンドポイント、503 注入あり）"""
+    _require("requests", "src.utils.youtube_uploader")
+    import requests
+    from benchmarks.stub_servers import FakeYouTubeUploadServer
+    from src.utils.youtube_uploader import MB, ResumableUploader, UploadJob
+
+    paths = []
+    for n in range(ctx.spec.sections):
+        path = ctx.work_dir / f"clip_{n}.mp4"
+        path.write_bytes(random.Random(n).randbytes(4 * MB))
+        paths.append(path)
+    server = FakeYouTubeUploadServer(latency=ctx.stub_latency or 0.01, fail_every=7).start()
+    uploader = ResumableUploader(
+        requests.Session, ctx.logger, upload_url=server.upload_url,
+        initial_chunk_size=MB, target_chunk_seconds=0.5, sleep=lambda s: None
+    )
+
+    def run():
+        jobs = [UploadJob(path, {"snippet": {"title": path.stem}}) for path in paths]
+        results = uploader.upload_many(jobs, max_workers=3)
+        failed = [r["label"] for r in results if not r["video_id"]]
+        if failed:
+            raise RuntimeError(f"uploads failed: {failed}")
+        return {"files": len(paths), "mb_per_file": 4}
+
+    run.teardown = server.stop
+    return run
+
+
+@benchmark_case("llm_gateway", group="hot")
+def case_llm_gateway(ctx: CaseContext):
+    """LLMGateway.create_many（stub バックエンド、セクション単位の一括呼び出し + キャッシュ）"""
+    _require("src.utils.llm_gateway")
+    from src.utils.cost_calculator import CostCalculator
+    from src.utils.llm_gateway import LLMGateway, StubBackend
+
+    rng = random.Random(ctx.spec.seed)
+    requests = [
+        {
+            "model": "claude-sonnet-4-20250514",
+            "max_tokens": 1000,
+            "messages": [{"role": "user", "content": fixtures.make_narration(rng, ctx.spec.chars_per_section)}],
+            "caller": "bench",
+        }
+        for _ in range(ctx.spec.sections)
+    ]
+    gateway = LLMGateway(
+        StubBackend(latency=ctx.stub_latency or 0.05),
+        cache_dir=ctx.work_dir / "llm_cache",
+        cost_calculator=CostCalculator(),
+        logger=ctx.logger
+    )
+
+    def run():
+        gateway.cache.clear()
+        hits_before = gateway.stats["cache_hits"]
+        gateway.create_many(requests)   # 未キャッシュ（並列）
+        gateway.create_many(requests)   # キャッシュ済み
+        return {"requests": len(requests), "cache_hits": gateway.stats["cache_hits"] - hits_before}
+
+    return run
+
+
+@benchmark_case("kana_conversion", group="hot")
+def case_kana_conversion(ctx: CaseContext):
+    """KanaConverter.convert_many（MeCab + ユーザー辞書、キャッシュなし）"""
+    _require("MeCab", "src.utils.kana_converter")
+    from src.utils.kana_converter import KanaConverter
+    from src.utils.morphology import MorphologyService
+
+    rng = random.Random(ctx.spec.seed)
+    texts = [fixtures.make_narration(rng, ctx.spec.chars_per_section) for _ in range(ctx.spec.sections)]
+    user_dictionary = project_root / "config" / "dictionaries" / "kana_user_dict.yaml"
+
+    def run():
+        converter = KanaConverter(
+            morphology=MorphologyService(logger=ctx.logger),
+            user_dictionary=user_dictionary,
+            llm_fallback=False,
+            logger=ctx.logger
+        )
+        converter.convert_many(texts)
+        return {"sections": len(texts), "oov_tokens": converter.stats["oov_tokens"]}
+
+    return run
+
+
+@benchmark_case("synthesis_timing", group="hot")
+def case_synthesis_timing(ctx: CaseContext):
+    """SynthesisTimingBuilder.build（文ごとの音声長から文字タイミングを生成、ASRなし）"""
+    from src.utils.synthesis_timing import SynthesisChunk, SynthesisTimingBuilder
+
+    rng = random.Random(ctx.spec.seed)
+    sections = []
+    for _ in range(ctx.spec.sections):
+        narration = fixtures.make_narration(rng, ctx.spec.chars_per_section)
+        sentences = [s + "。" for s in narration.split("。") if s]
+        sections.append([
+            SynthesisChunk(s, duration=len(s) / ctx.spec.chars_per_second, pause_after=0.8)
+            for s in sentences
+        ])
+    builder = SynthesisTimingBuilder(lead_in=0.05, tail=0.1, logger=ctx.logger)
+
+    def run():
+        chars = sum(len(builder.build(chunks)['characters']) for chunks in sections)
+        return {"sections": len(sections), "chars": chars}
+
+    return run
+
+
+@benchmark_case("timing_store", group="hot")
+def case_timing_store(ctx: CaseContext):
+    """audio_timing のセクション境界取得（列指向ストアのメモリマップ読み込み）"""
+    _require("numpy")
+    from src.utils.timing_store import clear_timing_cache, load_timing_store, save_timing_data
+
+    rng = random.Random(ctx.spec.seed)
+    timing_data = []
+    offset = 0.0
+    for i in range(ctx.spec.sections):
+        narration = fixtures.make_narration(rng, ctx.spec.chars_per_section)
+        step = 1.0 / ctx.spec.chars_per_second
+        starts = [offset + k * step for k in range(len(narration))]
+        timing_data.append({
+            "section_id": i + 1,
+            "text": narration,
+            "characters": list(narration),
+            "char_start_times": starts,
+            "char_end_times": [t + step for t in starts],
+            "total_duration": len(narration) * step,
+        })
+        offset += len(narration) * step
+    json_path = ctx.work_dir / "audio_timing.json"
+    save_timing_data(json_path, timing_data)
+
+    def run():
+        clear_timing_cache()
+        store = load_timing_store(json_path)
+        duration = sum(float(store.char_timings(s)[2][-1]) for s in store.records)
+        return {"sections": len(store.records), "end": round(duration, 1)}
+
+    return run
+
+
+@benchmark_case("cli_import", group="hot")
+def case_cli_import(ctx: CaseContext):
+    """CLI の起動時 import（python -X importtime -c "import src.cli"）"""
+    import subprocess
+
+    cmd = [sys.executable, "-X", "importtime", "-c", "import src.cli"]
+
+    def import_cli() -> subprocess.CompletedProcess:
+        return subprocess.run(cmd, cwd=project_root, capture_output=True, text=True)
+
+    probe = import_cli()
+    if probe.returncode != 0:
+        last_line = (probe.stderr.strip().splitlines() or ["import failed"])[-1]
+        raise SkipCase(f"cannot import src.cli: {last_line}")
+
+    def run():
+        result = import_cli()
+        # "import time: self [us] | cumulative | imported package" の行を集計
+        imports = []
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "imported package" in line:
+                continue
+            self_us, cumulative_us, package = line[len("import time:"):].split("|")
+            imports.append((int(self_us), int(cumulative_us), package.strip()))
+        cli_us = next((cum for _, cum, package in imports if package == "src.cli"), None)
+        slowest = sorted(imports, reverse=True)[:3]
+        return {
+            "src.cli_ms": round(cli_us / 1000, 1) if cli_us is not None else None,
+            "modules": len(imports),
+            "slowest_self": [f"{package} {us / 1000:.0f}ms" for us, _, package in slowest],
+        }
+
+    return run
+
+
+@benchmark_case("image_timing_matcher", group="hot")
+def case_image_timing_matcher(ctx: CaseContext):
+    """ImageTimingMatcherFixed（キーワード転置インデックス使用）"""
+    _require("src.utils.image_timing_matcher_fixed")
+    from benchmarks.bench_image_timing_matcher import build_synthetic_subject, run_matcher
+
+    minutes = ctx.spec.sections * ctx.spec.chars_per_section / ctx.spec.chars_per_second / 60.0
+    work_dir = ctx.work_dir / "matcher"
+    work_dir.mkdir(parents=True, exist_ok=True)
+    data = build_synthetic_subject(work_dir, minutes, seed=ctx.spec.seed)
+
+    def run():
+        _, clips = run_matcher(work_dir, *data, use_keyword_index=True)
+        return {"minutes": round(minutes, 1), "clips": len(clips)}
+
+    return run
+
+
+# ========================================
+# フェーズ
+# ========================================
+
+@benchmark_case("phase_02_audio", group="phase")
+def case_phase_02(ctx: CaseContext):
+    """Phase 2 音声生成（Kokoro スタブ、推定タイミング）"""
+    _require("requests", "src.phases.phase_02_audio")
+    _require_ffmpeg()
+    from benchmarks.stub_servers import StubServer
+    from src.phases.phase_02_audio import Phase02Audio
+
+    config = _sandbox(ctx, {2: {
+        "service": "kokoro",
+        "text_optimization": {"enabled": False},
+        "whisper": {"enabled": False},
+        "use_elevenlabs_fa": False,
+    }})
+    fixtures.build_synthetic_subject(config, SUBJECT, ctx.spec, with_images=False, with_audio=False, with_bgm=False)
+    server = StubServer(latency=ctx.stub_latency).start()
+
+    def run():
+        with server.patched_env():
+            phase = Phase02Audio(SUBJECT, config, ctx.logger)
+            result = _run_phase(phase)
+        result["tts_requests"] = server.stats["tts"]
+        return result
+
+    run.teardown = server.stop
+    return run
+
+
+@benchmark_case("phase_02_audio_text_opt", group="phase")
+def case_phase_02_text_opt(ctx: CaseContext):
+    """Phase 2 音声生成（テキスト最適化あり。LLM スタブ遅延と TTS が重なる）"""
+    _require("requests", "src.phases.phase_02_audio")
+    _require_ffmpeg()
+    from benchmarks.stub_servers import StubServer
+    from src.phases.phase_02_audio import Phase02Audio
+
+    config = _sandbox(ctx, {2: {
+        "service": "kokoro",
+        "text_optimization": {"enabled": True, "max_workers": 4},
+        "whisper": {"enabled": False},
+        "use_elevenlabs_fa": False,
+    }}, llm_latency=max(ctx.stub_latency, 0.2))  # LLM の往復は TTS より長い想定
+    from src.utils.llm_gateway import get_llm_gateway
+    fixtures.build_synthetic_subject(config, SUBJECT, ctx.spec, with_images=False, with_audio=False, with_bgm=False)
+    server = StubServer(latency=ctx.stub_latency).start()
+
+    def run():
+        with server.patched_env():
+            phase = Phase02Audio(SUBJECT, config, ctx.logger)
+            result = _run_phase(phase)
+        result["tts_requests"] = server.stats["tts"]
+        result["llm_requests"] = get_llm_gateway().stats["calls"]
+        return result
+
+    run.teardown = server.stop
+    return run
+
+
+@benchmark_case("phase_06_subtitles", group="phase")
+def case_phase_06(ctx: CaseContext):
+    """Phase 6 字幕生成（文字タイミングから）"""
+    _require("src.phases.phase_06_subtitles")
+    from src.phases.phase_06_subtitles import Phase06Subtitles
+
+    config = _sandbox(ctx, {6: {"whisper": {"enabled": False}}})
+    fixtures.build_synthetic_subject(config, SUBJECT, ctx.spec, with_images=False, with_bgm=False)
+
+    def run():
+        return _run_phase(Phase06Subtitles(SUBJECT, config, ctx.logger))
+
+    return run
+
+
+@benchmark_case("phase_07_composition", group="phase")
+def case_phase_07(ctx: CaseContext):
+    """Phase 7 動画統合（ffmpeg direct、合成画像・BGM）"""
+    _require("numpy", "PIL", "src.phases.phase_07_composition", "src.phases.phase_06_subtitles")
+    _require_ffmpeg()
+    from benchmarks.stub_servers import StubServer
+    from src.phases.phase_06_subtitles import Phase06Subtitles
+    from src.phases.phase_07_composition import Phase07Composition
+
+    config = _sandbox(ctx, {6: {"whisper": {"enabled": False}}})
+    fixtures.build_synthetic_subject(config, SUBJECT, ctx.spec)
+    _run_phase(Phase06Subtitles(SUBJECT, config, ctx.logger))
+    server = StubServer(latency=ctx.stub_latency).start()
+
+    def run():
+        with server.patched_env():
+            return _run_phase(Phase07Composition(SUBJECT, config, ctx.logger))
+
+    run.teardown = server.stop
+    return run
+
+
+@benchmark_case("phase_07_composition_frame_server", group="phase")
+def case_phase_07_frame_server(ctx: CaseContext):
+    """Phase 7 動画統合（フレームサーバー: NumPy/OpenCV でフレーム生成 → ffmpeg にパイプ）"""
+    _require("numpy", "PIL", "cv2", "src.phases.phase_07_composition", "src.phases.phase_06_subtitles")
+    _require_ffmpeg()
+    from benchmarks.stub_servers import StubServer
+    from src.phases.phase_06_subtitles import Phase06Subtitles
+    from src.phases.phase_07_composition import Phase07Composition
+
+    config = _sandbox(ctx, {
+        6: {"whisper": {"enabled": False}},
+        7: {"performance": {"use_frame_server": True}},
+    })
+    fixtures.build_synthetic_subject(config, SUBJECT, ctx.spec)
+    _run_phase(Phase06Subtitles(SUBJECT, config, ctx.logger))
+    server = StubServer(latency=ctx.stub_latency).start()
+
+    def run():
+        with server.patched_env():
+            return _run_phase(Phase07Composition(SUBJECT, config, ctx.logger))
+
+    run.teardown = server.stop
+    return run
+
+
+@benchmark_case("phase_07_composition_prefetched", group="phase")
+def case_phase_07_prefetched(ctx: CaseContext):
+    """Phase 7 動画統合（ストリーミング受け渡し: Phase 2/3 のセクション通知でセグメントを先行エンコード）"""
+    _require("numpy", "PIL", "src.phases.phase_07_composition", "src.phases.phase_06_subtitles")
+    _require_ffmpeg()
+    from benchmarks.stub_servers import StubServer
+    from src.core.section_events import (
+        AUDIO_COMPLETE, AUDIO_READY, IMAGES_COMPLETE, IMAGES_READY, SectionEventBus
+    )
+    from src.phases.phase_06_subtitles import Phase06Subtitles
+    from src.phases.phase_07_composition import Phase07Composition
+
+    config = _sandbox(ctx, {6: {"whisper": {"enabled": False}}})
+    subject_data = fixtures.build_synthetic_subject(config, SUBJECT, ctx.spec)
+    _run_phase(Phase06Subtitles(SUBJECT, config, ctx.logger))
+    server = StubServer(latency=ctx.stub_latency).start()
+
+    def run():
+        with server.patched_env():
+            phase = Phase07Composition(SUBJECT, config, ctx.logger)
+            section_events = SectionEventBus(ctx.logger)
+            prefetcher = phase.start_segment_prefetch(section_events)
+
+            # Phase 2/3 がセクションごとに出す通知を再現（先行エンコードは Phase 3 の実行中に進む分）
+            prefetch_start = time.perf_counter()
+            for timing in subject_data["timing"]:
+                section_id = timing["section_id"]
+                section_events.publish(AUDIO_READY, section_id, duration=timing["total_duration"])
+                section_events.publish(IMAGES_READY, section_id, paths=[
+                    image["file_path"] for image in subject_data["images"] if image["section_id"] == section_id
+                ])
+            section_events.publish(AUDIO_COMPLETE)
+            section_events.publish(IMAGES_COMPLETE)
+            encoded, _ = prefetcher.wait()
+            prefetch_seconds = time.perf_counter() - prefetch_start
+
+            # phase_seconds = Phase 3 完了後に残る Phase 7 の時間
+            result = _run_phase(phase)
+        result.update(prefetch_seconds=prefetch_seconds, prefetched_segments=encoded)
+        return result
+
+    run.teardown = server.stop
+    return run
+
+
+@benchmark_case("phase_10_shorts", group="phase")
+def case_phase_10(ctx: CaseContext):
+    """Phase 10 Shorts 生成（描画ソースなし → 分割 + 並列縦型変換、アップロードなし）"""
+    _require("src.phases.phase_10_shorts")
+    _require_ffmpeg()
+    from src.phases.phase_10_shorts import Phase10Shorts
+
+    config = _sandbox(ctx, {10: {
+        "upload": {"mode": "manual_approval"},
+        "video_split": {"segment_duration": 30, "max_clips": 3},
+    }})
+    fixtures.build_synthetic_subject(config, SUBJECT, ctx.spec, with_images=False, with_audio=False, with_bgm=False)
+    fixtures.write_final_video(config, SUBJECT, duration=min(90.0, 30.0 * 3))
+    fixtures.write_upload_log(config.get_working_dir(SUBJECT), SUBJECT)
+
+    def run():
+        return _run_phase(Phase10Shorts(SUBJECT, config, ctx.logger))
+
+    return run
+
+
+# ========================================
+# 実行・比較
+# ========================================
+
+def run_case(case: BenchmarkCase, spec: SubjectSpec, repeat: int, stub_latency: float) -> Dict[str, Any]:
+    """1ケースを実行して結果を返す"""
+    logger = logging.getLogger(f"bench.{case.name}")
+    logger.setLevel(logging.ERROR)
+
+    result: Dict[str, Any] = {"group": case.group, "description": case.description}
+    with tempfile.TemporaryDirectory(prefix=f"bench_{case.name}_") as tmp:
+        ctx = CaseContext(work_dir=Path(tmp), spec=spec, logger=logger, stub_latency=stub_latency)
+        run = None
+        try:
+            run = case.setup(ctx)
+            runs = []
+            extra: Optional[Dict[str, Any]] = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                extra = run()
+                runs.append(time.perf_counter() - start)
+            result.update({
+                "status": "ok",
+                "best_seconds": min(runs),
+                "mean_seconds": statistics.mean(runs),
+                "runs": runs,
+                "extra": extra or {},
+            })
+        except SkipCase as e:
+            result.update({"status": "skipped", "reason": str(e)})
+        except Exception as e:
+            result.update({
+                "status": "error",
+                "reason": f"{type(e).__name__}: {e}",
+                "traceback": traceback.format_exc(limit=5),
+            })
+        finally:
+            teardown = getattr(run, "teardown", None)
+            if teardown:
+                teardown()
+    return result
+
+
+def load_thresholds(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    thresholds: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    基準結果と比較して回帰を検出
+
+    ケースごとに best_seconds の比を計算し、
+    max_ratio を超え、かつ差が min_seconds を超えたら回帰とみなす。
+    max_seconds が設定されていれば、基準なしでも絶対値で判定する。
+
+    Returns:
+        比較結果のリスト（regression=True が回帰）
+    """
+    default = thresholds.get("default", {})
+    overrides = thresholds.get("cases", {}) or {}
+    baseline_cases = baseline.get("cases", {}) if baseline else {}
+    if baseline and baseline.get("size") != current.get("size"):
+        baseline_cases = {}  # 規模が違う基準とは比較しない
+
+    comparisons = []
+    for name, result in current["cases"].items():
+        if result.get("status") != "ok":
+            continue
+        limits = {**default, **overrides.get(name, {})}
+        max_ratio = limits.get("max_ratio", 1.25)
+        min_seconds = limits.get("min_seconds", 0.05)
+        max_seconds = limits.get("max_seconds")
+
+        entry = {"case": name, "current": result["best_seconds"], "regression": False}
+        base = baseline_cases.get(name, {})
+        if base.get("status") == "ok":
+            entry["baseline"] = base["best_seconds"]
+            ratio = result["best_seconds"] / base["best_seconds"] if base["best_seconds"] > 0 else float("inf")
+            entry["ratio"] = ratio
+            if ratio > max_ratio and result["best_seconds"] - base["best_seconds"] > min_seconds:
+                entry["regression"] = True
+                entry["reason"] = f"{ratio:.2f}x slower than baseline (limit {max_ratio:.2f}x)"
+        if max_seconds is not None and result["best_seconds"] > max_seconds:
+            entry["regression"] = True
+            entry["reason"] = f"{result['best_seconds']:.3f}s exceeds max_seconds {max_seconds}"
+        comparisons.append(entry)
+    return comparisons
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pipeline benchmark suite")
+    parser.add_argument("--cases", nargs="+", default=None, help=f"Cases to run (default: all). Available: {', '.join(CASES)}")
+    parser.add_argument("--group", choices=["hot", "phase"], default=None, help="Run only one group")
+    parser.add_argument("--size", choices=list(SIZES), default="small", help="Synthetic subject size")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best time is compared)")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="Added latency per stub API request (seconds)")
+    parser.add_argument("--output", type=Path, default=None, help="Result JSON path (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--thresholds", type=Path, default=DEFAULT_THRESHOLDS, help="Regression thresholds YAML")
+    parser.add_argument("--baseline", type=Path, default=None, help="Baseline result JSON (default: from thresholds.yaml)")
+    parser.add_argument("--update-baseline", action="store_true", help="Write this run as the new baseline")
+    args = parser.parse_args()
+
+    names = args.cases or [n for n, c in CASES.items() if args.group in (None, c.group)]
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+
+    spec = SIZES[args.size]
+    current = {
+        "created_at": datetime.now().isoformat(),
+        "size": args.size,
+        "repeat": args.repeat,
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "ffmpeg": fixtures.ffmpeg_available(),
+        },
+        "cases": {},
+    }
+
+    print(f"{'case':<24} {'status':<8} {'best[s]':>9} {'mean[s]':>9}  note")
+    for name in names:
+        result = run_case(CASES[name], spec, args.repeat, args.stub_latency)
+        current["cases"][name] = result
+        if result["status"] == "ok":
+            note = ", ".join(f"{k}={v}" for k, v in result["extra"].items())
+            print(f"{name:<24} {'ok':<8} {result['best_seconds']:>9.3f} {result['mean_seconds']:>9.3f}  {note}")
+        else:
+            print(f"{name:<24} {result['status']:<8} {'-':>9} {'-':>9}  {result['reason']}")
+
+    output = args.output or DEFAULT_RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{args.size}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2, ensure_ascii=False)
+    print(f"\nResults saved to: {output}")
+
+    thresholds = load_thresholds(args.thresholds)
+    baseline_path = args.baseline or Path(thresholds.get("baseline", BENCHMARKS_DIR / "baseline.json"))
+    if not baseline_path.is_absolute():
+        baseline_path = project_root / baseline_path
+
+    if args.update_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+        print(f"Baseline updated: {baseline_path}")
+        return 0
+
+    baseline = {}
+    if baseline_path.exists():
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    else:
+        print(f"No baseline found ({baseline_path}); only max_seconds limits are checked")
+
+    comparisons = compare_results(current, baseline, thresholds)
+    regressions = [c for c in comparisons if c["regression"]]
+    for c in comparisons:
+        if "ratio" in c:
+            mark = "REGRESSION" if c["regression"] else "ok"
+            print(f"  {c['case']:<24} {c['baseline']:>9.3f} -> {c['current']:>9.3f}  ({c['ratio']:.2f}x) {mark}")
+
+    errors = [n for n, r in current["cases"].items() if r["status"] == "error"]
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s):")
+        for c in regressions:
+            print(f"  - {c['case']}: {c['reason']}")
+    if errors:
+        print(f"\n❌ {len(errors)} case(s) failed: {', '.join(errors)}")
+
+    return 1 if regressions or errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
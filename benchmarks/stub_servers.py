@@ -0,0 +1,378 @@
+"""
+ベンチマーク用のスタブサーバー
+
+ローカルの HTTP サーバー1つで以下の API を模倣する。
+
+- Kokoro TTS (OpenAI互換): GET /v1/audio/voices, POST /v1/audio/speech
+  → 入力文字数に比例した長さのサイン波 WAV を返す
+- Anthropic Messages API: POST /v1/messages
+  → 決定的なテキスト応答（responder で差し替え可能）
+- 画像生成: GET /images/<seed>.png, POST /v1/images/generations
+  → 手続き生成の PNG
+
+YouTube の resumable upload は FakeYouTubeUploadServer（障害注入付き）で模倣する。
+
+環境変数 KOKORO_API_URL / ANTHROPIC_BASE_URL を差し替えれば、
+既存のクライアントコードはそのままスタブに接続する。
+
+使用例:
+    with StubServer(latency=0.05) as server, server.patched_env():
+        phase.run()
+    print(server.stats)
+"""
+
+import base64
+import io
+import json
+import os
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional
+
+from src.utils.llm_gateway import echo_responder
+
+from .fixtures import IMAGING_AVAILABLE, make_wav_bytes
+
+if IMAGING_AVAILABLE:
+    from PIL import Image
+    from .fixtures import make_image_array
+
+
+# TTS スタブの話速（文字/秒）
+STUB_CHARS_PER_SECOND = 7.0
+
+
+# Anthropic スタブの既定応答（LLM ゲートウェイの stub バックエンドと同じ）
+default_responder = echo_responder
+
+
+class StubServer:
+    """
+    TTS / LLM / 画像 API のスタブサーバー
+
+    Args:
+        latency: 各リクエストに加える遅延（秒）。実APIの往復時間を模す
+        responder: Anthropic 応答テキストを返す関数（リクエストJSON → str）
+        voices: TTS の音声一覧
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        responder: Optional[Callable[[Dict[str, Any]], str]] = None,
+        voices: Optional[list] = None
+    ):
+        self.latency = latency
+        self.responder = responder or default_responder
+        self.voices = voices or ["jf_alpha", "jf_gongitsune", "af_bella"]
+        self.stats: Dict[str, int] = {"tts": 0, "llm": 0, "image": 0, "other": 0}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def start(self) -> "StubServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):  # 標準エラーへのアクセスログを抑止
+                pass
+
+            def _read_json(self) -> Dict[str, Any]:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                try:
+                    return json.loads(body or b"{}")
+                except json.JSONDecodeError:
+                    return {}
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                if stub.latency:
+                    time.sleep(stub.latency)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_json(self, payload: Dict[str, Any], status: int = 200):
+                self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json")
+
+            def do_GET(self):
+                if self.path.startswith("/v1/audio/voices"):
+                    stub._count("tts")
+                    self._send_json({"voices": stub.voices})
+                elif self.path.startswith("/images/") and IMAGING_AVAILABLE:
+                    stub._count("image")
+                    seed = zlib.crc32(self.path.encode("utf-8"))
+                    self._send(200, _png_bytes(seed), "image/png")
+                else:
+                    stub._count("other")
+                    self._send_json({"error": "not found"}, status=404)
+
+            def do_POST(self):
+                request = self._read_json()
+                if self.path.startswith("/v1/audio/speech"):
+                    stub._count("tts")
+                    text = request.get("input", "")
+                    speed = float(request.get("speed") or 1.0)
+                    duration = max(0.2, len(text) / (STUB_CHARS_PER_SECOND * speed))
+                    self._send(200, make_wav_bytes(duration, "sine"), "audio/wav")
+                elif self.path.startswith("/v1/messages"):
+                    stub._count("llm")
+                    self._send_json(_anthropic_message(request, stub.responder(request)))
+                elif self.path.startswith("/v1/images/generations") and IMAGING_AVAILABLE:
+                    stub._count("image")
+                    seed = zlib.crc32(str(request.get("prompt", "")).encode("utf-8"))
+                    image = base64.b64encode(_png_bytes(seed)).decode("ascii")
+                    self._send_json({"created": int(time.time()), "data": [{"b64_json": image}]})
+                else:
+                    stub._count("other")
+                    self._send_json({"error": "not found"}, status=404)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def env(self) -> Dict[str, str]:
+        """既存クライアントをスタブへ向ける環境変数"""
+        return {
+            "KOKORO_API_URL": self.url,
+            "ANTHROPIC_BASE_URL": self.url,
+            "ANTHROPIC_API_KEY": "stub-key",
+            "CLAUDE_API_KEY": "stub-key",
+        }
+
+    @contextmanager
+    def patched_env(self):
+        """env() を一時的に os.environ へ適用"""
+        saved = {key: os.environ.get(key) for key in self.env()}
+        os.environ.update(self.env())
+        try:
+            yield self
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+
+def _anthropic_message(request: Dict[str, Any], text: str) -> Dict[str, Any]:
+    """Anthropic Messages API 形式の応答"""
+    prompt_chars = len(json.dumps(request.get("messages", []), ensure_ascii=False))
+    return {
+        "id": f"msg_stub_{zlib.crc32(text.encode('utf-8')):08x}",
+        "type": "message",
+        "role": "assistant",
+        "model": request.get("model", "stub"),
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": prompt_chars // 2, "output_tokens": len(text) // 2},
+    }
+
+
+def _png_bytes(seed: int, size=(512, 512)) -> bytes:
+    array = make_image_array(size[0], size[1], "procedural", seed)
+    buffer = io.BytesIO()
+    Image.fromarray(array).save(buffer, format="PNG", compress_level=1)
+    return buffer.getvalue()
+
+
+class FakeYouTubeUploadServer:
+    """
+    YouTube resumable upload の偽エンドポイント
+
+    - POST /upload/youtube/v3/videos?uploadType=resumable → Location にセッションURI
+    - PUT  /upload/session/<id>（Content-Range 付き）→ 308 + Range / 完了時 200 + 動画JSON
+    - PUT  /upload/session/<id>（bytes */total）→ 受け取り済みの位置を返す
+
+    障害注入:
+        fail_every: N 回に1回の PUT を 503 で失敗させる（0 で無効）
+        partial_bytes: 1回の PUT で受け取る最大バイト数（超えた分は未受信として 308）
+        bandwidth: 受信速度（バイト/秒、0 で無制限）
+        expire_after: N 回目の PUT でセッションを失効させる（404、0 で無効）
+
+    使用例:
+        with FakeYouTubeUploadServer(fail_every=5) as server:
+            uploader = ResumableUploader(requests.Session, upload_url=server.upload_url)
+            uploader.upload(path, body)
+        print(server.stats)
+    """
+
+    def __init__(
+        self,
+        fail_every: int = 0,
+        partial_bytes: int = 0,
+        bandwidth: float = 0.0,
+        expire_after: int = 0,
+        latency: float = 0.0
+    ):
+        self.fail_every = fail_every
+        self.partial_bytes = partial_bytes
+        self.bandwidth = bandwidth
+        self.expire_after = expire_after
+        self.latency = latency
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.stats: Dict[str, int] = {
+            "sessions": 0, "puts": 0, "failures": 0, "queries": 0,
+            "bytes_received": 0, "completed": 0, "expired": 0,
+        }
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def upload_url(self) -> str:
+        return f"{self.url}/upload/youtube/v3/videos"
+
+    def expire_all(self):
+        """全セッションを失効させる（期限切れの再現）"""
+        with self._lock:
+            self.sessions.clear()
+
+    def start(self) -> "FakeYouTubeUploadServer":
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):  # 標準エラーへのアクセスログを抑止
+                pass
+
+            def _read_body(self) -> bytes:
+                length = int(self.headers.get("Content-Length") or 0)
+                data = b""
+                while len(data) < length:
+                    block = self.rfile.read(min(length - len(data), 1024 * 1024))
+                    if not block:
+                        break
+                    data += block
+                    if fake.bandwidth:
+                        time.sleep(len(block) / fake.bandwidth)
+                return data
+
+            def _send(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None):
+                if fake.latency:
+                    time.sleep(fake.latency)
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _range_headers(self, received: int) -> Dict[str, str]:
+                return {"Range": f"bytes=0-{received - 1}"} if received > 0 else {}
+
+            def do_POST(self):
+                if not self.path.startswith("/upload/youtube/v3/videos"):
+                    self._send(404, b'{"error": "not found"}')
+                    return
+                metadata = json.loads(self._read_body() or b"{}")
+                total = int(self.headers.get("X-Upload-Content-Length") or 0)
+                with fake._lock:
+                    fake.stats["sessions"] += 1
+                    session_id = f"s{fake.stats['sessions']:04d}"
+                    fake.sessions[session_id] = {"total": total, "received": 0, "metadata": metadata, "puts": 0}
+                self._send(200, b"", {"Location": f"{fake.url}/upload/session/{session_id}"})
+
+            def do_PUT(self):
+                session_id = self.path.rsplit("/", 1)[-1]
+                data = self._read_body()
+                content_range = self.headers.get("Content-Range", "")
+
+                with fake._lock:
+                    session = fake.sessions.get(session_id)
+                    if session is None:
+                        fake.stats["expired"] += 1
+                        status = 404
+                    else:
+                        session["puts"] += 1
+                        fake.stats["puts"] += 1
+                        status = None
+                        if fake.expire_after and session["puts"] >= fake.expire_after and not session.get("expired_once"):
+                            session["expired_once"] = True
+                            fake.sessions.pop(session_id, None)
+                            fake.stats["expired"] += 1
+                            status = 404
+                        elif content_range.startswith("bytes */"):
+                            fake.stats["queries"] += 1
+                        elif fake.fail_every and fake.stats["puts"] % fake.fail_every == 0:
+                            fake.stats["failures"] += 1
+                            status = 503
+                        else:
+                            # "bytes start-end/total"
+                            start = int(content_range.split()[1].split("-")[0])
+                            if start == session["received"]:
+                                accepted = data
+                                if fake.partial_bytes:
+                                    accepted = data[:fake.partial_bytes]
+                                session["received"] += len(accepted)
+                                fake.stats["bytes_received"] += len(accepted)
+                        if status is None:
+                            received = session["received"]
+                            done = received >= session["total"]
+                            if done:
+                                fake.stats["completed"] += 1 if not session.get("done") else 0
+                                session["done"] = True
+
+                if status is not None:
+                    self._send(status, json.dumps({"error": {"code": status}}).encode("utf-8"))
+                elif done:
+                    payload = {"id": f"fake_{session_id}", "kind": "youtube#video", **session["metadata"]}
+                    self._send(200, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+                else:
+                    self._send(308, b"", self._range_headers(received))
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-youtube", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeYouTubeUploadServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
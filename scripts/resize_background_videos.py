@@ -1,12 +1,27 @@
 #!/usr/bin/env python3
 """
 背景動画を1920x1080にリサイズするスクリプト
+
+--mezzanine を付けると、リサイズ後に合成用メザニン
+（1920x864・速度調整済み・固定GOP）と長さのインデックスを生成する。
+
+使用例:
+    python scripts/resize_background_videos.py
+    python scripts/resize_background_videos.py --mezzanine
+    python scripts/resize_background_videos.py --mezzanine-only --force --workers 4
 """
+import argparse
+import logging
 import subprocess
 import json
+import sys
 from pathlib import Path
 from typing import List, Tuple
 
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
 
 def get_video_resolution(video_path: Path) -> Tuple[int, int]:
     """動画の解像度を取得"""
@@ -114,9 +129,68 @@ def process_folder(folder_path: Path, overwrite: bool = False) -> Tuple[int, int
     return processed, skipped
 
 
+def prepare_mezzanines(base_dir: Path, force: bool = False, workers: int = 2) -> int:
+    """合成用メザニンライブラリを生成"""
+    from src.utils.video_composition.background_mezzanine import (
+        MezzanineLibrary,
+        load_mezzanine_library,
+    )
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger = logging.getLogger("mezzanine")
+
+    library = load_mezzanine_library(base_dir, logger)
+    if library is None:
+        # 設定で無効化されていても、明示的に実行された場合は既定値で生成する
+        library = MezzanineLibrary(base_dir / 'assets' / 'background_videos', logger)
+
+    print("\n" + "=" * 60)
+    print("🎞️  メザニン生成")
+    print("=" * 60)
+    print(f"📂 出力先: {library.mezzanine_dir}")
+    print(f"🎯 解像度: 1920x864, 速度: {library.track_speeds}")
+
+    result = library.prepare(force=force, max_workers=workers)
+
+    print(f"✅ 生成: {result['prepared']}個")
+    print(f"⏭️  最新のためスキップ: {result['skipped']}個")
+    print(f"❌ 失敗: {result['failed']}個")
+    print(f"📄 インデックス: {library.index_path}")
+    print("=" * 60)
+    return result['failed']
+
+
 def main():
     """メイン処理"""
+    parser = argparse.ArgumentParser(description="背景動画のリサイズ・メザニン生成")
+    parser.add_argument(
+        "--mezzanine",
+        action="store_true",
+        help="リサイズ後に合成用メザニンを生成"
+    )
+    parser.add_argument(
+        "--mezzanine-only",
+        action="store_true",
+        help="リサイズを行わずメザニンのみ生成"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="既存のメザニンも作り直す"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="メザニンの並列エンコード数（デフォルト: 2）"
+    )
+    args = parser.parse_args()
+
     base_dir = Path(__file__).parent.parent
+
+    if args.mezzanine_only:
+        sys.exit(1 if prepare_mezzanines(base_dir, args.force, args.workers) else 0)
+
     folders = [
         base_dir / 'assets' / 'background_videos' / 'opening',
         base_dir / 'assets' / 'background_videos' / 'main',
@@ -151,6 +225,9 @@ def main():
     print(f"⏭️  スキップ: {total_skipped}個")
     print("=" * 60)
 
+    if args.mezzanine:
+        sys.exit(1 if prepare_mezzanines(base_dir, args.force, args.workers) else 0)
+
 
 if __name__ == '__main__':
     main()
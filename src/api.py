@@ -1 +1,261 @@
-﻿# future API
+﻿"""
+レンダリングジョブのローカル API（HTTP / Unix ソケット）
+
+常駐ワーカー（src/core/render_worker.py）にジョブを渡す窓口。
+ジョブはキュー（SQLite）に永続化されるので、API やワーカーを再起動しても失われない。
+外部公開は想定していない（既定で 127.0.0.1 のみで待ち受け、認証なし）。
+
+エンドポイント:
+    GET    /health                    死活確認
+    GET    /stats                     状態ごとの件数・スループット
+    GET    /jobs?status=&limit=       ジョブ一覧（新しい順）
+    POST   /jobs                      ジョブ登録 {"subject": ..., "priority": 0, "from_phase": 2, ...}
+    GET    /jobs/<id>                 ジョブの状態
+    DELETE /jobs/<id>                 待機中のジョブを取り消し
+    GET    /jobs/<id>/events?after=N  進捗イベント（seq > N）
+    GET    /jobs/<id>/events?stream=1 進捗イベントを NDJSON で配信（ジョブ終了まで）
+
+使用例:
+    python -m src.cli serve --workers 2
+    curl -X POST localhost:8765/jobs -d '{"subject": "織田信長", "from_phase": 2}'
+    curl -N "localhost:8765/jobs/<id>/events?stream=1"
+
+    python -m src.cli serve --socket /tmp/video-render.sock
+    curl --unix-socket /tmp/video-render.sock http://localhost/stats
+"""
+
+import json
+import logging
+import multiprocessing
+import socketserver
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from pydantic import ValidationError
+
+from src.core.job_queue import TERMINAL_STATUSES, JobQueue
+from src.core.models import JobStatus, RenderJobOptions
+
+# イベント配信（stream=1）でキューを確認する間隔
+STREAM_POLL_SECONDS = 0.5
+MAX_BODY_BYTES = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+class JobAPIHandler(BaseHTTPRequestHandler):
+    """ジョブ API のリクエストハンドラ（server.queue を使う）"""
+
+    server_version = "VideoRenderAPI/1.0"
+
+    @property
+    def queue(self) -> JobQueue:
+        return self.server.queue
+
+    def address_string(self) -> str:
+        # Unix ソケットでは client_address がホスト・ポートの組ではない
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return str(self.client_address[0])
+        return "unix"
+
+    def log_message(self, format: str, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    # ----------------------------------------
+    # 応答
+    # ----------------------------------------
+
+    def _send_json(self, status: HTTPStatus, body: Any):
+        payload = json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_error(self, status: HTTPStatus, message: str):
+        self._send_json(status, {"error": message})
+
+    def _route(self) -> Tuple[list, Dict[str, list]]:
+        parsed = urlparse(self.path)
+        return [p for p in parsed.path.split("/") if p], parse_qs(parsed.query)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise ValueError("request body too large")
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(body, dict):
+            raise ValueError("request body must be a JSON object")
+        return body
+
+    # ----------------------------------------
+    # メソッド
+    # ----------------------------------------
+
+    def do_GET(self):
+        parts, query = self._route()
+
+        if parts == ["health"]:
+            return self._send_json(HTTPStatus.OK, {"status": "ok"})
+        if parts == ["stats"]:
+            return self._send_json(HTTPStatus.OK, self.queue.stats())
+        if parts == ["jobs"]:
+            status = query.get("status", [None])[0]
+            try:
+                status = JobStatus(status) if status else None
+                limit = int(query.get("limit", ["50"])[0])
+            except ValueError as e:
+                return self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            jobs = self.queue.list_jobs(status=status, limit=limit)
+            return self._send_json(HTTPStatus.OK, [job.model_dump(mode="json") for job in jobs])
+
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.queue.get(parts[1])
+            if job is None:
+                return self._send_error(HTTPStatus.NOT_FOUND, f"job not found: {parts[1]}")
+            if len(parts) == 2:
+                return self._send_json(HTTPStatus.OK, job.model_dump(mode="json"))
+            if parts[2] == "events":
+                try:
+                    after = int(query.get("after", ["0"])[0])
+                except ValueError as e:
+                    return self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+                if query.get("stream", ["0"])[0] in ("1", "true"):
+                    return self._stream_events(job.id, after)
+                return self._send_json(HTTPStatus.OK, self.queue.events(job.id, after=after))
+
+        self._send_error(HTTPStatus.NOT_FOUND, f"unknown path: {self.path}")
+
+    def do_POST(self):
+        parts, _ = self._route()
+        if parts != ["jobs"]:
+            return self._send_error(HTTPStatus.NOT_FOUND, f"unknown path: {self.path}")
+
+        try:
+            body = self._read_json()
+            subject = body.pop("subject", None)
+            if not subject or not isinstance(subject, str):
+                raise ValueError("subject is required")
+            priority = int(body.pop("priority", 0))
+            options = RenderJobOptions(**body)
+        except (ValueError, ValidationError) as e:
+            return self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+
+        job = self.queue.submit(subject, options, priority=priority)
+        self._send_json(HTTPStatus.CREATED, job.model_dump(mode="json"))
+
+    def do_DELETE(self):
+        parts, _ = self._route()
+        if len(parts) != 2 or parts[0] != "jobs":
+            return self._send_error(HTTPStatus.NOT_FOUND, f"unknown path: {self.path}")
+
+        job = self.queue.get(parts[1])
+        if job is None:
+            return self._send_error(HTTPStatus.NOT_FOUND, f"job not found: {parts[1]}")
+        if not self.queue.cancel(job.id):
+            return self._send_error(HTTPStatus.CONFLICT, f"job is {job.status.value}; only queued jobs can be cancelled")
+        self._send_json(HTTPStatus.OK, self.queue.get(job.id).model_dump(mode="json"))
+
+    def _stream_events(self, job_id: str, after: int):
+        """ジョブが終了するまで進捗イベントを1行1件の JSON で送る（接続を閉じて終わり）"""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        try:
+            while True:
+                # 終了判定を先に取り、その後のイベントまで送ってから終える（取りこぼし防止）
+                finished = self.queue.get(job_id).status in TERMINAL_STATUSES
+                for event in self.queue.events(job_id, after=after):
+                    self.wfile.write((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
+                    after = event["seq"]
+                self.wfile.flush()
+                if finished:
+                    return
+                time.sleep(STREAM_POLL_SECONDS)
+        except (BrokenPipeError, ConnectionResetError):
+            # クライアントが切断した
+            return
+
+
+class UnixJobAPIServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix ソケットで待ち受けるジョブ API サーバー"""
+    daemon_threads = True
+
+
+def create_server(
+    queue: JobQueue,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[Path] = None
+) -> socketserver.BaseServer:
+    """
+    ジョブ API サーバーを作成（serve_forever は呼び出し側）
+
+    Args:
+        queue: ジョブキュー
+        host: HTTP で待ち受けるアドレス
+        port: HTTP で待ち受けるポート（0 なら空きポート）
+        socket_path: 指定した場合は HTTP ではなくこの Unix ソケットで待ち受ける
+    """
+    if socket_path is not None:
+        socket_path = Path(socket_path)
+        if socket_path.exists():
+            socket_path.unlink()
+        server = UnixJobAPIServer(str(socket_path), JobAPIHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), JobAPIHandler)
+        server.daemon_threads = True
+    server.queue = queue
+    return server
+
+
+def serve(
+    queue: JobQueue,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[Path] = None,
+    workers: int = 1,
+    logger: Optional[logging.Logger] = None
+) -> int:
+    """
+    API を起動し、ワーカープロセスを workers 個起動する（Ctrl+C で終了）
+
+    ワーカーは実行中のジョブを終えてから終了する。
+    """
+    logger = logger or logging.getLogger(__name__)
+    from src.core.render_worker import run_worker_process
+
+    # ワーカーはモデルを読み込む独立したプロセス（fork だと API のスレッド・SQLite 接続を引き継ぐため spawn）
+    ctx = multiprocessing.get_context("spawn")
+    stop_event = ctx.Event()
+    processes = [
+        ctx.Process(target=run_worker_process, args=(stop_event, i), name=f"render-worker-{i}")
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    server = create_server(queue, host=host, port=port, socket_path=socket_path)
+    address = socket_path or f"http://{server.server_address[0]}:{server.server_address[1]}"
+    logger.info(f"Render API listening on {address} (queue: {queue.db_path}, workers: {workers})")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Stopping (waiting for running jobs to finish)...")
+    finally:
+        server.server_close()
+        stop_event.set()
+        for process in processes:
+            process.join()
+        if socket_path is not None:
+            Path(socket_path).unlink(missing_ok=True)
+
+    return 0
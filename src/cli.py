@@ -4,11 +4,13 @@ CLI entrypoint for video automation system
 
 Usage:
     python -m src.cli run-phase <subject> --phase <phase_number>
+    python -m src.cli profile <subject>
 
 Examples:
     python -m src.cli run-phase "織田信長" --phase 1
     python -m src.cli run-phase "織田信長" --phase 2
     python -m src.cli run-phase "織田信長" --phase 6
+    python -m src.cli profile "織田信長"
 """
 
 import sys
@@ -25,22 +27,12 @@ sys.path.insert(0, str(project_root))
 
 from src.core.config_manager import ConfigManager
 from src.utils.logger import setup_logger
+from src.utils import telemetry
 from src.core.models import PhaseStatus
-from src.core.orchestrator import PhaseOrchestrator
-
-# 全フェーズをインポート
-from src.phases.phase_01_script import Phase01Script
-from src.phases.phase_01_auto_script import Phase01AutoScript
-from src.phases.phase_02_audio import Phase02Audio
-from src.phases.phase_03_images import Phase03Images
-from src.phases.phase_04_image_processing import Phase04ImageProcessing
-from src.phases.phase_04_animation import Phase04Animation
-from src.phases.phase_05_bgm import Phase05BGM
-from src.phases.phase_06_subtitles import Phase06Subtitles
-from src.phases.phase_07_composition import Phase07Composition
-from src.phases.phase_08_thumbnail import Phase08Thumbnail
-from src.phases.phase_09_youtube import Phase09YouTube
-from src.phases.phase_10_shorts import Phase10Shorts
+from src.core.phase_registry import get_phase_class, phase_numbers
+
+# フェーズモジュール・オーケストレーターは重い依存（whisper / torch / moviepy など）を読み込むため、
+# 実行するフェーズが決まってから phase_registry 経由で import する
 
 
 def write_error_log(config: ConfigManager, subject: str, phase_number: int, error: Exception) -> Path:
@@ -141,42 +133,38 @@ def run_phase(
         level=log_level
     )
 
-    # フェーズクラスのマッピング
-    # Phase 6/7でv2を使用する場合は後で上書き
-    phase_classes = {
-        1: Phase01AutoScript if use_auto_script else Phase01Script,
-        2: Phase02Audio,
-        3: Phase03Images,
-        4: Phase04ImageProcessing,  # 新規実装: 画像加工処理
-        5: Phase05BGM,
-        6: Phase06Subtitles,
-        7: Phase07Composition,
-        8: Phase08Thumbnail,
-        9: Phase09YouTube,
-        10: Phase10Shorts,
-    }
-    
-    # v2オプションが指定されている場合、Phase 6/7をv2クラスに置き換え
-    if use_v2:
-        if phase_number == 6:
-            from src.phases.phase_06_subtitles_v2 import Phase06SubtitlesV2
-            phase_classes[6] = Phase06SubtitlesV2
-        elif phase_number == 7:
-            from src.phases.phase_07_composition_v2 import Phase07CompositionV2
-            phase_classes[7] = Phase07CompositionV2
+    # テレメトリ（スパン計測）を開始
+    telemetry.start_run(
+        subject=subject,
+        log_dir=config.get_path("logs_dir"),
+        command=f"run-phase --phase {phase_number}",
+        enabled=config.get("telemetry.enabled", True),
+        logger=logger
+    )
 
-    if phase_number not in phase_classes:
+    if phase_number not in phase_numbers():
         logger.error(f"Invalid phase number: {phase_number}. Must be 1-10.")
         return 1
 
+    # フェーズのバリエーション（--auto / --use-v2 / --legacy02）
+    variant = None
+    if phase_number == 1 and use_auto_script:
+        variant = "auto"
+    elif phase_number in (6, 7) and use_v2:
+        variant = "v2"
+    elif phase_number == 7 and use_legacy02:
+        variant = "legacy02"
+
     # フェーズを実行
     try:
         logger.info("="*60)
         logger.info(f"Running Phase {phase_number} for: {subject}")
         logger.info("="*60)
 
+        # フェーズクラスを取得（このフェーズのモジュールだけを import）
+        phase_class = get_phase_class(phase_number, variant)
+
         # フェーズインスタンスを作成
-        phase_class = phase_classes[phase_number]
 
         # 各フェーズに応じたパラメータを渡す
         if phase_number == 1:
@@ -227,8 +215,7 @@ def run_phase(
                 )
             elif use_legacy02:
                 # Legacy02版を使用（Phase03の画像）
-                from src.phases.phase_07_composition_legacy02 import Phase07CompositionLegacy02
-                phase = Phase07CompositionLegacy02(
+                phase = phase_class(
                     subject=subject,
                     config=config,
                     logger=logger
@@ -478,9 +465,19 @@ def generate_video(
         skip_phases.append(5)
         logger.info("⏭️  Phase 05 (BGM selection) will be skipped")
 
+    # テレメトリ（スパン計測）を開始
+    telemetry.start_run(
+        subject=subject,
+        log_dir=config.get_path("logs_dir"),
+        command=f"generate --from-phase {from_phase} --until-phase {until_phase}",
+        enabled=config.get("telemetry.enabled", True),
+        logger=logger
+    )
+
     # Orchestratorを作成
     # text_layoutが未指定の場合はtwo_line_red_whiteをデフォルトに
     default_text_layout = text_layout if text_layout else "two_line_red_white"
+    from src.core.orchestrator import PhaseOrchestrator
     orchestrator = PhaseOrchestrator(
         config=config,
         logger=logger,
@@ -514,6 +511,165 @@ def generate_video(
         return 1
 
 
+def profile_run(
+    subject: str,
+    run: Optional[str] = None,
+    top: int = 15,
+    json_path: Optional[Path] = None
+) -> int:
+    """
+    テレメトリを集計して表示
+
+    Args:
+        subject: 偉人名
+        run: 実行ID またはJSONLファイルのパス（省略時は最新の実行）
+        top: 表示する上位スパン数
+        json_path: 集計結果をJSONで保存するパス
+
+    Returns:
+        終了コード (0: 成功, 1: 失敗)
+    """
+    config = ConfigManager()
+    log_dir = config.get_path("logs_dir")
+
+    if run and Path(run).exists():
+        run_path = Path(run)
+    else:
+        runs = telemetry.find_runs(log_dir, subject)
+        if run:
+            runs = [p for p in runs if p.stem == run]
+        if not runs:
+            print(f"❌ No telemetry found for: {subject}")
+            print(f"   (searched {log_dir / 'telemetry' / subject})")
+            return 1
+        run_path = runs[-1]
+
+    spans = telemetry.load_spans(run_path)
+    if not spans:
+        print(f"❌ No spans recorded in: {run_path}")
+        return 1
+
+    summary = telemetry.aggregate_spans(spans)
+
+    print(f"Telemetry: {run_path}")
+    print(f"Spans: {len(spans)}")
+    print("")
+    print(telemetry.format_report(summary, top=top))
+
+    if json_path:
+        import json
+        json_path = Path(json_path)
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        print(f"\nSummary saved to: {json_path}")
+
+    return 0
+
+
+def serve_api(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    socket_path: Optional[Path] = None,
+    workers: Optional[int] = None
+) -> int:
+    """
+    ジョブ API と常駐ワーカーを起動
+
+    Args:
+        host: 待ち受けアドレス（省略時は settings.yaml の worker.host）
+        port: 待ち受けポート（省略時は worker.port）
+        socket_path: 指定した場合は Unix ソケットで待ち受ける
+        workers: ワーカープロセス数（省略時は worker.workers。0 なら API のみ）
+
+    Returns:
+        終了コード
+    """
+    from src.api import serve
+    from src.core.render_worker import open_job_queue
+
+    config = ConfigManager()
+    return serve(
+        open_job_queue(config),
+        host=host or config.get("worker.host", "127.0.0.1"),
+        port=port if port is not None else config.get("worker.port", 8765),
+        socket_path=socket_path,
+        workers=workers if workers is not None else config.get("worker.workers", 1),
+        logger=setup_logger(name="render_api", log_dir=config.get_path("logs_dir"), level="INFO")
+    )
+
+
+def run_worker(max_jobs: Optional[int] = None) -> int:
+    """
+    常駐ワーカーを1つ起動（serve とは別のプロセスからキューを共有する場合）
+
+    Args:
+        max_jobs: この件数を実行したら終了（省略時は Ctrl+C まで）
+
+    Returns:
+        終了コード
+    """
+    from src.core.render_worker import RenderWorker
+
+    try:
+        RenderWorker().run(max_jobs=max_jobs)
+    except KeyboardInterrupt:
+        # 実行中のジョブはリース切れ後に他のワーカーが再実行する
+        print("\nWorker stopped")
+    return 0
+
+
+def calibrate_encoder(
+    quick: bool = False,
+    duration: Optional[float] = None,
+    output: Optional[Path] = None
+) -> int:
+    """
+    このホストのエンコーダープロファイルを作成
+
+    Args:
+        quick: preset を絞り、crf は従来値だけで計測
+        duration: 合成タイムラインの長さ（秒、省略時は settings.yaml）
+        output: 保存先（省略時はキャッシュディレクトリの encoder_profiles/<ホスト名>.json）
+
+    Returns:
+        終了コード
+    """
+    import subprocess
+
+    from src.utils.encoder_calibration import create_calibrator
+    from src.utils.encoder_profile import clear_profile_cache, profile_path
+
+    config = ConfigManager()
+    logger = setup_logger(name="calibrate_encoder", log_dir=config.get_path("logs_dir"), level="INFO")
+
+    def show(m):
+        quality = f"SSIM {m.ssim:.4f} PSNR {m.psnr:.1f}" if m.ssim is not None else ""
+        print(
+            f"  {m.role:<14} {m.preset:<10} crf {m.crf:>2} threads {m.threads or 'auto':<4} "
+            f"x{m.workers}  {m.fps:7.1f} fps  {m.kbps:8.0f} kbps  {quality}"
+        )
+
+    try:
+        calibrator = create_calibrator(config, logger=logger, quick=quick, duration=duration, progress=show)
+        profile = calibrator.run()
+    except (ImportError, subprocess.CalledProcessError, RuntimeError) as e:
+        print(f"❌ Calibration failed: {e}")
+        return 1
+
+    output = Path(output) if output else profile_path(config)
+    profile.save(output)
+    clear_profile_cache()
+
+    print("")
+    for role, settings in profile.roles.items():
+        print(f"  {role:<14} preset={settings.preset} crf={settings.crf}")
+    if profile.parallel:
+        print(f"  {'parallel':<14} workers={profile.parallel_workers} threads={profile.threads_per_worker or 'auto'}")
+    print(f"\nEncoder profile saved to: {output}")
+    return 0
+
+
 def main():
     """メインエントリーポイント"""
     parser = argparse.ArgumentParser(
@@ -568,6 +724,16 @@ Examples:
 
   # Run from Phase 3 to Phase 7
   python -m src.cli generate "織田信長" --from-phase 3 --until-phase 7
+
+  # Show where time went in the latest run (telemetry spans)
+  python -m src.cli profile "織田信長"
+
+  # Measure encoder settings on this machine (writes a per-host encoder profile)
+  python -m src.cli calibrate-encoder
+
+  # Start the job API with 2 resident render workers
+  python -m src.cli serve --workers 2
+  curl -X POST localhost:8765/jobs -d '{"subject": "織田信長", "from_phase": 2}'
         """
     )
 
@@ -734,6 +900,100 @@ Examples:
         help="Use v2 implementation for Phase 6 (impact subtitles) or Phase 7 (background video + impact subtitles)"
     )
 
+    # profile コマンド（テレメトリの集計）
+    profile_parser = subparsers.add_parser(
+        "profile",
+        help="Aggregate telemetry spans of a run"
+    )
+    profile_parser.add_argument(
+        "subject",
+        type=str,
+        help="Subject name (e.g., '織田信長')"
+    )
+    profile_parser.add_argument(
+        "--run",
+        type=str,
+        default=None,
+        help="Run ID or path to a telemetry JSONL file (default: latest run)"
+    )
+    profile_parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="Number of spans to list"
+    )
+    profile_parser.add_argument(
+        "--json",
+        type=Path,
+        default=None,
+        help="Write the aggregated summary as JSON"
+    )
+
+    # serve コマンド（ジョブ API + 常駐ワーカー）
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Start the local job API and resident render workers"
+    )
+    serve_parser.add_argument(
+        "--host",
+        type=str,
+        default=None,
+        help="Address to listen on (default: worker.host in settings.yaml)"
+    )
+    serve_parser.add_argument(
+        "--port",
+        type=int,
+        default=None,
+        help="Port to listen on (default: worker.port in settings.yaml)"
+    )
+    serve_parser.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        help="Listen on a Unix socket instead of HTTP"
+    )
+    serve_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (0: API only)"
+    )
+
+    # worker コマンド（常駐ワーカーのみ）
+    worker_parser = subparsers.add_parser(
+        "worker",
+        help="Run a resident render worker on the shared job queue"
+    )
+    worker_parser.add_argument(
+        "--max-jobs",
+        type=int,
+        default=None,
+        help="Exit after this many jobs"
+    )
+
+    # calibrate-encoder コマンド（ホストごとのエンコーダープロファイル作成）
+    calibrate_parser = subparsers.add_parser(
+        "calibrate-encoder",
+        help="Benchmark x264 settings on this machine and write an encoder profile"
+    )
+    calibrate_parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Fewer presets and only the current crf values"
+    )
+    calibrate_parser.add_argument(
+        "--duration",
+        type=float,
+        default=None,
+        help="Length of the synthetic timeline in seconds"
+    )
+    calibrate_parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Where to write the profile (default: per-host file in the cache directory)"
+    )
+
     # 引数をパース
     args = parser.parse_args()
 
@@ -781,6 +1041,32 @@ Examples:
             all_variations=getattr(args, 'all_variations', False)
         )
 
+    # profile コマンド
+    if args.command == "profile":
+        return profile_run(
+            subject=args.subject,
+            run=args.run,
+            top=args.top,
+            json_path=args.json
+        )
+
+    # serve コマンド
+    if args.command == "serve":
+        return serve_api(
+            host=args.host,
+            port=args.port,
+            socket_path=args.socket,
+            workers=args.workers
+        )
+
+    # worker コマンド
+    if args.command == "worker":
+        return run_worker(max_jobs=args.max_jobs)
+
+    # calibrate-encoder コマンド
+    if args.command == "calibrate-encoder":
+        return calibrate_encoder(quick=args.quick, duration=args.duration, output=args.output)
+
     return 0
 
 
@@ -77,6 +77,24 @@ class ImageAPIError(APIError):
         super().__init__(service, message)
 
 
+class YouTubeUploadError(APIError):
+    """YouTube アップロード固有のエラー"""
+    def __init__(self, message: str, status_code: int = None):
+        self.status_code = status_code
+        super().__init__("YouTube", message)
+
+
+class YouTubeQuotaExceededError(YouTubeUploadError):
+    """YouTube Data API の Quota 不足（日次予算を超える）"""
+    def __init__(self, required_units: int, remaining_units: int):
+        self.required_units = required_units
+        self.remaining_units = remaining_units
+        super().__init__(
+            f"Quota budget exceeded. Required: {required_units} units, "
+            f"Remaining: {remaining_units} units"
+        )
+
+
 class APIRateLimitError(APIError):
     """APIレート制限エラー"""
     def __init__(self, service: str, retry_after: int = None):
@@ -0,0 +1,337 @@
+"""
+レンダリングジョブの永続キュー（SQLite）
+
+常駐ワーカー（src/core/render_worker.py）と API（src/api.py）が共有する。
+1つの SQLite ファイルを複数のワーカープロセスが開き、ジョブの取得は
+BEGIN IMMEDIATE のトランザクションで行うので、同じジョブを2つのワーカーが取ることはない。
+
+- submit(): ジョブを登録（queued）
+- claim(): 優先度・登録順で次のジョブを取得（running、リース付き。実行中の題材のジョブは後回し）
+- heartbeat(): 実行中のリースを延長（ワーカーが落ちるとリースが切れ、ジョブは queued に戻る）
+- finish(): 完了・失敗を記録
+- add_event() / events(): ジョブごとの進捗イベント（連番付き。API が差分を配信する）
+
+使用例:
+    queue = JobQueue(config.get_path("cache_dir") / "queue" / "jobs.sqlite3")
+    job = queue.submit("織田信長", RenderJobOptions(from_phase=2))
+    job = queue.claim(worker_id="host-1234")
+"""
+
+import json
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.core.models import JobStatus, RenderJob, RenderJobOptions
+
+# 形式を変更したら上げる
+SCHEMA_VERSION = 1
+
+DEFAULT_LEASE_SECONDS = 120.0
+DEFAULT_MAX_ATTEMPTS = 2
+
+TERMINAL_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    subject TEXT NOT NULL,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_expires REAL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority DESC, created_at);
+CREATE TABLE IF NOT EXISTS job_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    time REAL NOT NULL,
+    type TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_events_job ON job_events (job_id, seq);
+"""
+
+
+def _to_datetime(value: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value) if value is not None else None
+
+
+class JobQueue:
+    """SQLite のジョブキュー（プロセス間で共有）"""
+
+    def __init__(
+        self,
+        db_path: Path,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    ):
+        """
+        Args:
+            db_path: SQLite ファイル（無ければ作成）
+            lease_seconds: 実行中ジョブのリース。heartbeat が途絶えてこの時間が過ぎると再キューする
+            max_attempts: 再キューを含む最大実行回数（超えたら failed）
+        """
+        self.db_path = Path(db_path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # 接続はスレッド間で共有できないので呼び出しごとに開く（ローカルファイルなので軽い）
+        conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """書き込みロックを先に取るトランザクション（ジョブ取得の競合を防ぐ）"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> RenderJob:
+        return RenderJob(
+            id=row["id"],
+            subject=row["subject"],
+            options=RenderJobOptions(**json.loads(row["options"])),
+            status=JobStatus(row["status"]),
+            priority=row["priority"],
+            attempts=row["attempts"],
+            worker_id=row["worker_id"],
+            created_at=_to_datetime(row["created_at"]),
+            started_at=_to_datetime(row["started_at"]),
+            finished_at=_to_datetime(row["finished_at"]),
+            error=row["error"],
+            result=json.loads(row["result"]) if row["result"] else None,
+        )
+
+    # ----------------------------------------
+    # ジョブ
+    # ----------------------------------------
+
+    def submit(self, subject: str, options: Optional[RenderJobOptions] = None, priority: int = 0) -> RenderJob:
+        """ジョブを登録"""
+        options = options or RenderJobOptions()
+        job_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, subject, options, status, priority, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, subject, options.model_dump_json(), JobStatus.QUEUED.value, priority, now)
+            )
+            self._insert_event(conn, job_id, "queued", {"subject": subject})
+        return self.get(job_id)
+
+    def claim(self, worker_id: str) -> Optional[RenderJob]:
+        """
+        次のジョブを取得して running にする
+
+        リースが切れた running ジョブ（ワーカーが落ちた）は、先に queued へ戻す
+        （実行回数が max_attempts に達していれば failed）。
+        同じ題材のジョブが実行中なら取得しない（作業ディレクトリを2つのワーカーが同時に書かないため）。
+
+        Returns:
+            取得したジョブ。取得できる待機中のジョブが無ければ None
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            self._requeue_expired(conn, now)
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? "
+                "AND subject NOT IN (SELECT subject FROM jobs WHERE status = ?) "
+                "ORDER BY priority DESC, created_at LIMIT 1",
+                (JobStatus.QUEUED.value, JobStatus.RUNNING.value)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, lease_expires = ?, started_at = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                (JobStatus.RUNNING.value, worker_id, now + self.lease_seconds, now, row["id"])
+            )
+            self._insert_event(conn, row["id"], "started", {"worker_id": worker_id})
+        return self.get(row["id"])
+
+    def _requeue_expired(self, conn: sqlite3.Connection, now: float):
+        expired = conn.execute(
+            "SELECT id, attempts, worker_id FROM jobs WHERE status = ? AND lease_expires < ?",
+            (JobStatus.RUNNING.value, now)
+        ).fetchall()
+        for row in expired:
+            if row["attempts"] >= self.max_attempts:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, lease_expires = NULL, error = ? WHERE id = ?",
+                    (JobStatus.FAILED.value, now, f"worker {row['worker_id']} lost (lease expired)", row["id"])
+                )
+                self._insert_event(conn, row["id"], "failed", {"error": "lease expired"})
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, worker_id = NULL, lease_expires = NULL WHERE id = ?",
+                    (JobStatus.QUEUED.value, row["id"])
+                )
+                self._insert_event(conn, row["id"], "requeued", {"lost_worker": row["worker_id"]})
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """
+        実行中ジョブのリースを延長
+
+        Returns:
+            False ならこのワーカーはジョブを失っている（リース切れで再キューされた）
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker_id = ? AND status = ?",
+                (time.time() + self.lease_seconds, job_id, worker_id, JobStatus.RUNNING.value)
+            )
+            return cursor.rowcount == 1
+
+    def finish(
+        self,
+        job_id: str,
+        worker_id: str,
+        status: JobStatus,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> bool:
+        """
+        ジョブの終了を記録
+
+        Returns:
+            False ならこのワーカーはジョブを失っていた（記録しない）
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, lease_expires = NULL, result = ?, error = ? "
+                "WHERE id = ? AND worker_id = ? AND status = ?",
+                (status.value, time.time(), json.dumps(result, ensure_ascii=False) if result else None,
+                 error, job_id, worker_id, JobStatus.RUNNING.value)
+            )
+            if cursor.rowcount != 1:
+                return False
+            self._insert_event(conn, job_id, status.value, {"error": error} if error else {})
+        return True
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        待機中のジョブを取り消す
+
+        Returns:
+            取り消した場合 True（実行中・終了済みのジョブは取り消せない）
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?",
+                (JobStatus.CANCELLED.value, time.time(), job_id, JobStatus.QUEUED.value)
+            )
+            if cursor.rowcount != 1:
+                return False
+            self._insert_event(conn, job_id, "cancelled", {})
+        return True
+
+    def get(self, job_id: str) -> Optional[RenderJob]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list_jobs(self, status: Optional[JobStatus] = None, limit: int = 50) -> List[RenderJob]:
+        """新しい順にジョブを列挙"""
+        with self._connect() as conn:
+            if status is None:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                    (status.value, limit)
+                ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def stats(self, window_seconds: float = 3600.0) -> Dict[str, Any]:
+        """
+        キューの状態とスループット
+
+        Returns:
+            counts（状態ごとの件数）、直近 window_seconds の完了数・平均実行時間・1時間あたり完了数
+        """
+        since = time.time() - window_seconds
+        with self._connect() as conn:
+            counts = {status.value: 0 for status in JobStatus}
+            for row in conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+                counts[row["status"]] = row["n"]
+            recent = conn.execute(
+                "SELECT COUNT(*) AS n, AVG(finished_at - started_at) AS avg_seconds FROM jobs "
+                "WHERE status = ? AND finished_at >= ?",
+                (JobStatus.COMPLETED.value, since)
+            ).fetchone()
+            workers = [
+                row["worker_id"] for row in conn.execute(
+                    "SELECT DISTINCT worker_id FROM jobs WHERE status = ?", (JobStatus.RUNNING.value,)
+                )
+            ]
+        return {
+            "counts": counts,
+            "busy_workers": workers,
+            "window_seconds": window_seconds,
+            "completed_in_window": recent["n"],
+            "avg_job_seconds": round(recent["avg_seconds"], 1) if recent["avg_seconds"] is not None else None,
+            "jobs_per_hour": round(recent["n"] * 3600.0 / window_seconds, 2),
+        }
+
+    # ----------------------------------------
+    # 進捗イベント
+    # ----------------------------------------
+
+    @staticmethod
+    def _insert_event(conn: sqlite3.Connection, job_id: str, event_type: str, data: Dict[str, Any]):
+        conn.execute(
+            "INSERT INTO job_events (job_id, time, type, data) VALUES (?, ?, ?, ?)",
+            (job_id, time.time(), event_type, json.dumps(data, ensure_ascii=False, default=str))
+        )
+
+    def add_event(self, job_id: str, event_type: str, data: Optional[Dict[str, Any]] = None):
+        """進捗イベントを記録"""
+        with self._connect() as conn:
+            self._insert_event(conn, job_id, event_type, data or {})
+
+    def events(self, job_id: str, after: int = 0, limit: int = 500) -> List[Dict[str, Any]]:
+        """
+        ジョブの進捗イベント（seq が after より大きいもの）
+
+        Returns:
+            [{"seq", "time", "type", "data"}, ...]（seq 昇順）
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT seq, time, type, data FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+                (job_id, after, limit)
+            ).fetchall()
+        return [
+            {"seq": row["seq"], "time": row["time"], "type": row["type"], "data": json.loads(row["data"])}
+            for row in rows
+        ]
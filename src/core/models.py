@@ -25,6 +25,15 @@ class PhaseStatus(str, Enum):
     SKIPPED = "skipped"       # スキップ（既存出力あり）
 
 
+class JobStatus(str, Enum):
+    """レンダリングジョブ（常駐ワーカーのキュー）の状態"""
+    QUEUED = "queued"         # 待機中
+    RUNNING = "running"       # 実行中
+    COMPLETED = "completed"   # 完了
+    FAILED = "failed"         # 失敗
+    CANCELLED = "cancelled"   # 取り消し
+
+
 class AnimationType(str, Enum):
     """静止画アニメーションタイプ"""
     ZOOM_IN = "zoom_in"           # ゆっくりズームイン
@@ -372,4 +381,50 @@ class GenerationReport(BaseModel):
     output_video_path: str
     output_thumbnail_path: str
     phases_summary: List[PhaseExecution]
-    generated_at: datetime = Field(default_factory=datetime.now)
\ No newline at end of file
+    generated_at: datetime = Field(default_factory=datetime.now)
+
+
+# ========================================
+# 常駐ワーカー（ジョブキュー）
+# ========================================
+
+class RenderJobOptions(BaseModel):
+    """ジョブの実行オプション（generate コマンドの引数に対応）"""
+    from_phase: int = 1
+    until_phase: int = 10
+    force: bool = False
+    skip_phases: List[int] = Field(default_factory=list)
+    genre: Optional[str] = None
+    audio_var: Optional[str] = None
+    text_layout: Optional[str] = None
+    thumbnail_style: Optional[str] = None
+
+    @field_validator('from_phase', 'until_phase')
+    @classmethod
+    def validate_phase_range(cls, v):
+        if not 1 <= v <= 10:
+            raise ValueError('phase must be between 1 and 10')
+        return v
+
+    @field_validator('until_phase')
+    @classmethod
+    def validate_until_phase(cls, v, info):
+        if 'from_phase' in info.data and v < info.data['from_phase']:
+            raise ValueError('until_phase must be greater than or equal to from_phase')
+        return v
+
+
+class RenderJob(BaseModel):
+    """レンダリングジョブ"""
+    id: str
+    subject: str
+    options: RenderJobOptions
+    status: JobStatus
+    priority: int = 0
+    attempts: int = 0
+    worker_id: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
\ No newline at end of file
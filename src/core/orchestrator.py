@@ -5,27 +5,25 @@ Phase 1-9 を順番に実行し、エラーハンドリングや
 進捗管理を一元的に行う。
 """
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional
 import logging
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn
 from rich.console import Console
 
 from src.core.config_manager import ConfigManager
 from src.core.models import PhaseExecution, PhaseStatus, ProjectStatus
+from src.core.phase_registry import DEFAULT_PIPELINE, get_phase_class
+from src.core.section_events import AUDIO_COMPLETE, IMAGES_COMPLETE, SectionEventBus
 from src.utils.logger import setup_logger
+from src.utils.telemetry import map_in_context
 
-# 各Phaseをインポート
-from src.phases.phase_01_script import Phase01Script
-from src.phases.phase_02_audio import Phase02Audio
-from src.phases.phase_03_images import Phase03Images
-# from src.phases.phase_04_animation import Phase04Animation  # ❌ 無効化
-# from src.phases.phase_05_bgm import Phase05BGM              # ❌ 無効化
-from src.phases.phase_06_subtitles import Phase06Subtitles
-from src.phases.phase_07_composition import Phase07Composition
-from src.phases.phase_08_thumbnail import Phase08Thumbnail
-from src.phases.phase_09_youtube import Phase09YouTube
-from src.phases.phase_10_shorts import Phase10Shorts
+# 各Phaseは phase_registry 経由で、実行するものだけを import する
+
+# ストリーミング受け渡しでフェーズ完了時に通知するイベント
+PHASE_COMPLETE_EVENTS = {2: AUDIO_COMPLETE, 3: IMAGES_COMPLETE}
 
 
 class PhaseOrchestrator:
@@ -40,8 +38,14 @@ class PhaseOrchestrator:
         genre: Optional[str] = None,
         audio_var: Optional[str] = None,
         text_layout: Optional[str] = None,
-        thumbnail_style: Optional[str] = None
+        thumbnail_style: Optional[str] = None,
+        event_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
     ):
+        """
+        Args:
+            event_callback: 進捗イベント (種類, 内容) を受け取る関数
+                （"phase_started" / "phase_finished"。常駐ワーカーがジョブの進捗として記録する）
+        """
         self.config = config
         self.logger = logger or logging.getLogger(__name__)
         self.console = Console()
@@ -49,6 +53,16 @@ class PhaseOrchestrator:
         self.audio_var = audio_var
         self.text_layout = text_layout
         self.thumbnail_style = thumbnail_style
+        self.event_callback = event_callback
+
+    def _emit(self, event_type: str, **data):
+        """進捗イベントを通知（通知先の失敗でフェーズ実行は止めない）"""
+        if self.event_callback is None:
+            return
+        try:
+            self.event_callback(event_type, data)
+        except Exception as e:
+            self.logger.warning(f"Event callback failed ({event_type}): {e}")
 
     def run_all_phases(
         self,
@@ -56,7 +70,8 @@ class PhaseOrchestrator:
         skip_if_exists: bool = True,
         from_phase: int = 1,
         until_phase: int = 10,
-        skip_phases: Optional[List[int]] = None
+        skip_phases: Optional[List[int]] = None,
+        abort_event: Optional[threading.Event] = None
     ) -> ProjectStatus:
         """
         全フェーズを順次実行
@@ -67,6 +82,8 @@ class PhaseOrchestrator:
             from_phase: 開始フェーズ（1-10）
             until_phase: 終了フェーズ（1-10）
             skip_phases: スキップするフェーズ番号のリスト（例: [4, 5]）
+            abort_event: セットされたら次のフェーズに進まずに中断する
+                （常駐ワーカーがジョブのリースを失った場合。実行中のフェーズは最後まで実行される）
 
         Returns:
             ProjectStatus: プロジェクト全体の実行結果
@@ -86,72 +103,101 @@ class PhaseOrchestrator:
         )
 
         # 各Phaseのインスタンスを作成
-        phases = self._initialize_phases(subject)
-
-        # 指定範囲のフェーズのみ実行（スキップ対象を除外）
-        phases_to_run = [
-            p for p in phases
-            if from_phase <= p.get_phase_number() <= until_phase
-            and p.get_phase_number() not in skip_phases
+        # 指定範囲のフェーズのみ作成・実行（スキップ対象を除外）
+        phase_numbers = [
+            n for n in DEFAULT_PIPELINE
+            if from_phase <= n <= until_phase and n not in skip_phases
         ]
-
-        # 進捗バーを表示
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[bold blue]{task.description}"),
-            BarColumn(),
-            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-            TimeRemainingColumn(),
-            console=self.console
-        ) as progress:
-
-            # 全体タスク
-            total_task = progress.add_task(
-                f"[cyan]Generating video: {subject}",
-                total=len(phases_to_run)
-            )
-
-            # 各フェーズを実行
-            for phase in phases_to_run:
-                phase_num = phase.get_phase_number()
-                phase_name = phase.get_phase_name()
-
-                # フェーズタスク
-                phase_task = progress.add_task(
-                    f"[yellow]Phase {phase_num}: {phase_name}",
-                    total=100
+        phases_to_run = self._initialize_phases(subject, phase_numbers)
+
+        # ストリーミング受け渡し（Phase 2/3 → Phase 7）
+        section_events = self._start_streaming_handoff(phases_to_run, skip_if_exists)
+        streaming_config = self.config.get("execution.streaming_handoff", {}) or {}
+        parallel_audio_images = section_events is not None and streaming_config.get("parallel_audio_images", True)
+
+        try:
+            # 進捗バーを表示
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[bold blue]{task.description}"),
+                BarColumn(),
+                TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+                TimeRemainingColumn(),
+                console=self.console
+            ) as progress:
+
+                # 全体タスク
+                total_task = progress.add_task(
+                    f"[cyan]Generating video: {subject}",
+                    total=len(phases_to_run)
                 )
 
-                # フェーズ実行
-                execution = phase.run(skip_if_exists=skip_if_exists)
-                project_status.phases.append(execution)
-
-                # 進捗更新
-                progress.update(phase_task, completed=100)
-                progress.update(total_task, advance=1)
-
-                # エラーチェック
-                if execution.status == PhaseStatus.FAILED:
-                    project_status.overall_status = PhaseStatus.FAILED
-                    self.logger.error(f"Phase {phase_num} failed: {execution.error_message}")
-                    self._print_error_summary(project_status)
-                    return project_status
-
-                # 成功ログ
-                status_emoji = {
-                    PhaseStatus.COMPLETED: "✅",
-                    PhaseStatus.SKIPPED: "⏭️",
-                    PhaseStatus.FAILED: "❌"
-                }
-                emoji = status_emoji.get(execution.status, "")
-
-                # duration_secondsがNoneの場合は0.0にフォールバック
-                duration = execution.duration_seconds if execution.duration_seconds is not None else 0.0
-
-                self.console.print(
-                    f"{emoji} Phase {phase_num}: {phase_name} "
-                    f"({execution.status.value}, {duration:.1f}s)"
-                )
+                # 各フェーズを実行（並行実行するフェーズはまとめて）
+                for group in self._group_phases(phases_to_run, parallel_audio_images):
+                    if abort_event is not None and abort_event.is_set():
+                        project_status.overall_status = PhaseStatus.FAILED
+                        self.logger.warning(
+                            f"Aborted before phase {group[0].get_phase_number()} (abort requested)"
+                        )
+                        return project_status
+
+                    phase_tasks = []
+                    for phase in group:
+                        # フェーズタスク
+                        phase_tasks.append(progress.add_task(
+                            f"[yellow]Phase {phase.get_phase_number()}: {phase.get_phase_name()}",
+                            total=100
+                        ))
+                        self._emit("phase_started", phase=phase.get_phase_number(), name=phase.get_phase_name())
+
+                    # フェーズ実行
+                    executions = self._run_phase_group(group, skip_if_exists, section_events)
+
+                    for phase, phase_task, execution in zip(group, phase_tasks, executions):
+                        phase_num = phase.get_phase_number()
+                        phase_name = phase.get_phase_name()
+                        project_status.phases.append(execution)
+                        self._emit(
+                            "phase_finished",
+                            phase=phase_num,
+                            name=phase_name,
+                            status=execution.status.value,
+                            duration_seconds=execution.duration_seconds,
+                            error=execution.error_message
+                        )
+
+                        # 進捗更新
+                        progress.update(phase_task, completed=100)
+                        progress.update(total_task, advance=1)
+
+                        # エラーチェック
+                        if execution.status == PhaseStatus.FAILED:
+                            project_status.overall_status = PhaseStatus.FAILED
+                            self.logger.error(f"Phase {phase_num} failed: {execution.error_message}")
+                            self._print_error_summary(project_status)
+                            return project_status
+
+                        # 成功ログ
+                        status_emoji = {
+                            PhaseStatus.COMPLETED: "✅",
+                            PhaseStatus.SKIPPED: "⏭️",
+                            PhaseStatus.FAILED: "❌"
+                        }
+                        emoji = status_emoji.get(execution.status, "")
+
+                        # duration_secondsがNoneの場合は0.0にフォールバック
+                        duration = execution.duration_seconds if execution.duration_seconds is not None else 0.0
+
+                        self.console.print(
+                            f"{emoji} Phase {phase_num}: {phase_name} "
+                            f"({execution.status.value}, {duration:.1f}s)"
+                        )
+        finally:
+            # Phase 7 に届かずに終わった場合は先行エンコードを止める
+            for phase in phases_to_run:
+                prefetcher = getattr(phase, "segment_prefetcher", None)
+                if prefetcher is not None:
+                    prefetcher.close()
 
         # 全フェーズ完了
         project_status.overall_status = PhaseStatus.COMPLETED
@@ -159,33 +205,118 @@ class PhaseOrchestrator:
 
         return project_status
 
-    def _initialize_phases(self, subject: str) -> List:
+    def _start_streaming_handoff(self, phases: List, skip_if_exists: bool = True) -> Optional[SectionEventBus]:
+        """
+        ストリーミング受け渡しを準備（execution.streaming_handoff.enabled）
+
+        Phase 2/3/7 が全て実行対象のときだけ、SectionEventBus を Phase 2/3 に渡し、
+        Phase 7 のセグメント先行エンコードに購読させる。
+
+        Returns:
+            SectionEventBus（無効・対象外なら None）
+        """
+        streaming_config = self.config.get("execution.streaming_handoff", {}) or {}
+        if not streaming_config.get("enabled", False):
+            return None
+
+        by_number = {phase.get_phase_number(): phase for phase in phases}
+        if not all(n in by_number for n in (2, 3, 7)):
+            self.logger.info("Streaming handoff skipped: phases 2, 3 and 7 must run together")
+            return None
+
+        composition = by_number[7]
+        if not hasattr(composition, "start_segment_prefetch"):
+            self.logger.info(f"Streaming handoff skipped: {type(composition).__name__} does not support it")
+            return None
+        if skip_if_exists and composition.check_outputs_exist():
+            return None
+
+        section_events = SectionEventBus(self.logger)
+        try:
+            prefetcher = composition.start_segment_prefetch(
+                section_events,
+                max_workers=streaming_config.get("encode_workers", 1)
+            )
+        except Exception as e:
+            self.logger.warning(f"Streaming handoff disabled: {e}")
+            return None
+        if prefetcher is None:
+            return None
+
+        by_number[2].section_events = section_events
+        by_number[3].section_events = section_events
+        self.logger.info("Streaming handoff enabled (phase 2/3 → phase 7)")
+        return section_events
+
+    @staticmethod
+    def _group_phases(phases: List, parallel_audio_images: bool) -> List[List]:
+        """実行単位にまとめる（parallel_audio_images なら連続する Phase 2/3 を1つに）"""
+        groups = []
+        for phase in phases:
+            if (
+                parallel_audio_images
+                and groups
+                and phase.get_phase_number() == 3
+                and [p.get_phase_number() for p in groups[-1]] == [2]
+            ):
+                groups[-1].append(phase)
+            else:
+                groups.append([phase])
+        return groups
+
+    def _run_phase_group(
+        self,
+        group: List,
+        skip_if_exists: bool,
+        section_events: Optional[SectionEventBus]
+    ) -> List[PhaseExecution]:
+        """フェーズを実行（複数ならスレッドで並行）し、結果をフェーズ順に返す"""
+        def run(phase) -> PhaseExecution:
+            execution = phase.run(skip_if_exists=skip_if_exists)
+            # スキップした場合も含め、出力が揃ったことを Phase 7 に伝える
+            complete_event = PHASE_COMPLETE_EVENTS.get(phase.get_phase_number())
+            if section_events is not None and complete_event and execution.status != PhaseStatus.FAILED:
+                section_events.publish(complete_event)
+            return execution
+
+        if len(group) == 1:
+            return [run(group[0])]
+        with ThreadPoolExecutor(max_workers=len(group)) as executor:
+            return map_in_context(executor, run, group)
+
+    def _initialize_phases(self, subject: str, phase_numbers: Optional[List[int]] = None) -> List:
         """
-        全フェーズのインスタンスを作成
+        フェーズのインスタンスを作成（指定したフェーズのモジュールだけを import）
 
-        Phase04/05はデフォルトで無効化:
+        Phase04/05はデフォルトで無効化（DEFAULT_PIPELINE に含まない）:
         - Phase04 Animation: Phase03の静止画をそのまま使用（処理時間削減）
         - Phase05 BGM: Phase07で直接統合（ffmpeg直接処理）
 
         Args:
             subject: 偉人名
+            phase_numbers: 作成するフェーズ番号（省略時は DEFAULT_PIPELINE 全体）
 
         Returns:
             Phaseインスタンスのリスト
         """
-        working_dir = self.config.get_path("working_dir") / subject
+        if phase_numbers is None:
+            phase_numbers = DEFAULT_PIPELINE
+
+        common = dict(subject=subject, config=self.config, logger=self.logger)
+        # フェーズごとの追加引数
+        extra_kwargs = {
+            1: dict(genre=self.genre),
+            2: dict(audio_var=self.audio_var),
+            3: dict(genre=self.genre),
+            7: dict(genre=self.genre),
+            8: dict(genre=self.genre, text_layout=self.text_layout, style=self.thumbnail_style, is_batch_mode=True),
+            9: dict(genre=self.genre),
+            10: dict(genre=self.genre),
+        }
 
         return [
-            Phase01Script(subject=subject, config=self.config, logger=self.logger, genre=self.genre),
-            Phase02Audio(subject=subject, config=self.config, logger=self.logger, audio_var=self.audio_var),
-            Phase03Images(subject=subject, config=self.config, logger=self.logger, genre=self.genre),
-            # Phase04Animation(subject=subject, config=self.config, logger=self.logger),  # ❌ 無効化: 静止画をそのまま使用
-            # Phase05BGM(subject=subject, config=self.config, logger=self.logger),        # ❌ 無効化: Phase07で直接統合
-            Phase06Subtitles(subject=subject, config=self.config, logger=self.logger),
-            Phase07Composition(subject=subject, config=self.config, logger=self.logger, genre=self.genre),
-            Phase08Thumbnail(subject=subject, config=self.config, logger=self.logger, genre=self.genre, text_layout=self.text_layout, style=self.thumbnail_style, is_batch_mode=True),
-            Phase09YouTube(subject=subject, config=self.config, logger=self.logger, genre=self.genre),
-            Phase10Shorts(subject=subject, config=self.config, logger=self.logger, genre=self.genre),
+            get_phase_class(n)(**common, **extra_kwargs.get(n, {}))
+            for n in phase_numbers
         ]
 
     def _print_success_summary(self, status: ProjectStatus):
@@ -21,6 +21,7 @@ from ..utils.logger import (
     log_phase_complete,
     log_phase_error
 )
+from ..utils.telemetry import span
 
 
 class PhaseBase(ABC):
@@ -79,6 +80,9 @@ class PhaseBase(ABC):
         
         # フェーズ固有の設定を読み込み
         self.phase_config = config.get_phase_config(self.get_phase_number())
+
+        # セクション単位の完了通知（ストリーミング受け渡し時にオーケストレーターが設定）
+        self.section_events = None
     
     # ========================================
     # 抽象メソッド（サブクラスで実装必須）
@@ -221,6 +225,18 @@ class PhaseBase(ABC):
             data = json.load(f)
         
         return data
+
+    def publish_section_event(self, kind: str, section_id: Optional[int] = None, **data):
+        """
+        セクションの完了を後続フェーズに通知（ストリーミング受け渡しが無効なら何もしない）
+
+        Args:
+            kind: イベントの種類（src/core/section_events.py）
+            section_id: セクションID
+            **data: イベントごとのデータ
+        """
+        if self.section_events is not None:
+            self.section_events.publish(kind, section_id, **data)
     
     def run(self, skip_if_exists: bool = True) -> PhaseExecution:
         """
@@ -270,15 +286,22 @@ class PhaseBase(ABC):
             self.execution.started_at = datetime.now()
             self.logger.info(f"Phase {self.get_phase_number()} started")
             
-            # 実際の処理
-            output = self.execute_phase()
-            
-            # バリデーション
-            if not self.validate_output(output):
-                raise PhaseValidationError(
-                    self.get_phase_number(),
-                    "Output validation failed"
-                )
+            with span(
+                f"Phase {self.get_phase_number()}: {self.get_phase_name()}",
+                kind="phase",
+                phase=self.get_phase_number(),
+                phase_class=self.__class__.__name__,
+                subject=self.subject
+            ):
+                # 実際の処理
+                output = self.execute_phase()
+
+                # バリデーション
+                if not self.validate_output(output):
+                    raise PhaseValidationError(
+                        self.get_phase_number(),
+                        "Output validation failed"
+                    )
             
             # 成功
             self.execution.status = PhaseStatus.COMPLETED
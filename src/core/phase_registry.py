@@ -0,0 +1,89 @@
+"""
+フェーズクラスのレジストリ（遅延 import）
+
+フェーズモジュールは whisper / torch / moviepy / Google API クライアントなど重い依存を
+import 時に読み込むため、CLI やオーケストレーターで全フェーズを先に import すると
+profile や --help のような描画しないコマンドでも起動に数秒かかる。
+
+ここではフェーズ番号 → (モジュール, クラス名) だけを持ち、
+get_phase_class() が呼ばれたときに初めてそのフェーズのモジュールを import する。
+
+使用例:
+    phase_class = get_phase_class(7)                     # Phase07Composition
+    phase_class = get_phase_class(7, variant="v2")       # Phase07CompositionV2
+    phase_class = get_phase_class(1, variant="auto")     # Phase01AutoScript
+"""
+
+import importlib
+from typing import Dict, List, Optional, Tuple, Type
+
+# フェーズ番号 → (モジュール, クラス名)
+PHASES: Dict[int, Tuple[str, str]] = {
+    1: ("src.phases.phase_01_script", "Phase01Script"),
+    2: ("src.phases.phase_02_audio", "Phase02Audio"),
+    3: ("src.phases.phase_03_images", "Phase03Images"),
+    4: ("src.phases.phase_04_image_processing", "Phase04ImageProcessing"),
+    5: ("src.phases.phase_05_bgm", "Phase05BGM"),
+    6: ("src.phases.phase_06_subtitles", "Phase06Subtitles"),
+    7: ("src.phases.phase_07_composition", "Phase07Composition"),
+    8: ("src.phases.phase_08_thumbnail", "Phase08Thumbnail"),
+    9: ("src.phases.phase_09_youtube", "Phase09YouTube"),
+    10: ("src.phases.phase_10_shorts", "Phase10Shorts"),
+}
+
+# バリエーション名 → {フェーズ番号: (モジュール, クラス名)}
+VARIANTS: Dict[str, Dict[int, Tuple[str, str]]] = {
+    "auto": {
+        1: ("src.phases.phase_01_auto_script", "Phase01AutoScript"),
+    },
+    "v2": {
+        6: ("src.phases.phase_06_subtitles_v2", "Phase06SubtitlesV2"),
+        7: ("src.phases.phase_07_composition_v2", "Phase07CompositionV2"),
+    },
+    "legacy02": {
+        7: ("src.phases.phase_07_composition_legacy02", "Phase07CompositionLegacy02"),
+    },
+    "animation": {
+        4: ("src.phases.phase_04_animation", "Phase04Animation"),
+    },
+}
+
+# Orchestrator が既定で実行するフェーズ（Phase 4/5 は無効化: Phase 3 の静止画と Phase 7 の BGM 統合を使用）
+DEFAULT_PIPELINE: List[int] = [1, 2, 3, 6, 7, 8, 9, 10]
+
+
+def phase_numbers() -> List[int]:
+    """登録済みのフェーズ番号"""
+    return sorted(PHASES)
+
+
+def resolve_phase(phase_number: int, variant: Optional[str] = None) -> Tuple[str, str]:
+    """
+    フェーズ番号とバリエーションから (モジュール, クラス名) を決める（import しない）
+
+    バリエーションにそのフェーズが無い場合は通常版を返す。
+
+    Raises:
+        KeyError: 未登録のフェーズ番号・バリエーション
+    """
+    if phase_number not in PHASES:
+        raise KeyError(f"Invalid phase number: {phase_number}. Must be {min(PHASES)}-{max(PHASES)}.")
+    if variant:
+        if variant not in VARIANTS:
+            raise KeyError(f"Unknown phase variant: {variant}")
+        if phase_number in VARIANTS[variant]:
+            return VARIANTS[variant][phase_number]
+    return PHASES[phase_number]
+
+
+def get_phase_class(phase_number: int, variant: Optional[str] = None) -> Type:
+    """
+    フェーズクラスを取得（初回呼び出し時にモジュールを import）
+
+    Raises:
+        KeyError: 未登録のフェーズ番号・バリエーション
+        ImportError: フェーズの依存パッケージが無い場合
+    """
+    module_name, class_name = resolve_phase(phase_number, variant)
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)
@@ -0,0 +1,289 @@
+"""
+常駐レンダリングワーカー
+
+CLI の generate は実行ごとに新しいプロセスで設定・Whisper モデル・MeCab・フォントを読み込み直す。
+このワーカーはプロセスを起動したままジョブキュー（src/core/job_queue.py）からジョブを取り、
+同じプロセス内でフェーズを実行する。読み込み済みのものはジョブをまたいで再利用される:
+- 設定（ConfigManager）: ワーカーで1つ
+- Whisper / stable-ts モデル: whisper_timing.load_whisper_model のキャッシュ
+- MeCab: get_morphology_service のグローバルインスタンス
+- 深度推定モデル: depth_estimator のパイプラインキャッシュ
+- フォント: font_cache（初回ジョブで読み込み）
+
+起動時に warm_up で指定したものを先に読み込んでおく（settings.yaml の worker.warm_up）。
+複数のワーカー（プロセス）が同じキューを共有でき、ジョブはリース付きで1つのワーカーだけが実行する。
+
+使用例:
+    python -m src.cli worker
+    python -m src.cli serve --workers 2     # API + ワーカー2プロセス
+"""
+
+import logging
+import os
+import signal
+import socket
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.core.config_manager import ConfigManager
+from src.core.job_queue import JobQueue
+from src.core.models import JobStatus, PhaseStatus, RenderJob
+from src.utils import telemetry
+from src.utils.logger import setup_logger
+
+# 既定値（settings.yaml の worker セクションで上書き）
+DEFAULT_QUEUE_DB = "data/queue/jobs.sqlite3"
+DEFAULT_POLL_SECONDS = 2.0
+DEFAULT_WARM_UP = ("mecab", "whisper")
+DEFAULT_TEXT_LAYOUT = "two_line_red_white"
+
+
+def open_job_queue(config: ConfigManager) -> JobQueue:
+    """settings.yaml の worker セクションに従ってジョブキューを開く"""
+    db_path = Path(config.get("worker.queue_db", DEFAULT_QUEUE_DB))
+    if not db_path.is_absolute():
+        db_path = config.project_root / db_path
+    return JobQueue(
+        db_path,
+        lease_seconds=config.get("worker.lease_seconds", 120.0),
+        max_attempts=config.get("worker.max_attempts", 2),
+    )
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class RenderWorker:
+    """ジョブキューからジョブを取り、フェーズを実行する常駐ワーカー"""
+
+    def __init__(
+        self,
+        config: Optional[ConfigManager] = None,
+        queue: Optional[JobQueue] = None,
+        logger: Optional[logging.Logger] = None,
+        worker_id: Optional[str] = None
+    ):
+        self.config = config or ConfigManager()
+        self.queue = queue or open_job_queue(self.config)
+        self.worker_id = worker_id or default_worker_id()
+        self.logger = logger or setup_logger(
+            name="render_worker",
+            log_dir=self.config.get_path("logs_dir"),
+            level="INFO"
+        )
+        self.poll_seconds = self.config.get("worker.poll_seconds", DEFAULT_POLL_SECONDS)
+        self.warm_up_targets: List[str] = list(self.config.get("worker.warm_up", DEFAULT_WARM_UP) or [])
+
+    # ----------------------------------------
+    # ウォームアップ
+    # ----------------------------------------
+
+    def warm_up(self) -> Dict[str, str]:
+        """
+        モデル等を先に読み込む（失敗してもジョブ実行時に改めて読み込まれる）
+
+        Returns:
+            対象ごとの結果（"ok" / "skipped: ..." / "failed: ..."）
+        """
+        results = {}
+        for target in self.warm_up_targets:
+            loader = getattr(self, f"_warm_up_{target}", None)
+            if loader is None:
+                results[target] = "skipped: unknown target"
+                continue
+            try:
+                results[target] = loader() or "ok"
+            except Exception as e:
+                results[target] = f"failed: {e}"
+            self.logger.info(f"Warm-up {target}: {results[target]}")
+        return results
+
+    def _warm_up_mecab(self) -> Optional[str]:
+        from src.utils.morphology import get_morphology_service
+
+        service = get_morphology_service(
+            cache_dir=self.config.get_path("cache_dir") / "morphology",
+            logger=self.logger
+        )
+        return None if service.available else "skipped: MeCab not available"
+
+    def _warm_up_whisper(self) -> Optional[str]:
+        from src.utils.whisper_timing import STABLE_WHISPER_AVAILABLE, WHISPER_AVAILABLE, load_whisper_model
+
+        whisper_config = self.config.get_phase_config(2).get("whisper", {})
+        if not whisper_config.get("enabled", True):
+            return "skipped: whisper disabled"
+        if not WHISPER_AVAILABLE:
+            return "skipped: whisper not installed"
+        use_stable_ts = whisper_config.get("use_stable_ts", True) and STABLE_WHISPER_AVAILABLE
+        load_whisper_model(whisper_config.get("model", "base"), use_stable_ts=use_stable_ts)
+        return None
+
+    def _warm_up_depth(self) -> Optional[str]:
+        from src.processors.depth_estimator import TRANSFORMERS_AVAILABLE, DepthEstimator
+
+        if not TRANSFORMERS_AVAILABLE:
+            return "skipped: transformers not installed"
+        depth_config = self.config.phase_configs.get("04_image_processing", {}).get("depth_estimation", {})
+        DepthEstimator(
+            model_name=depth_config.get("default_model", "LiheYoung/depth-anything-small-hf"),
+            use_gpu=depth_config.get("use_gpu", True),
+            logger=self.logger
+        )
+        return None
+
+    # ----------------------------------------
+    # 実行ループ
+    # ----------------------------------------
+
+    def run(self, stop_event: Optional[threading.Event] = None, max_jobs: Optional[int] = None) -> int:
+        """
+        ジョブを取り続ける
+
+        Args:
+            stop_event: セットされたら（実行中のジョブが終わってから）終了
+            max_jobs: この件数を実行したら終了
+
+        Returns:
+            実行したジョブ数
+        """
+        stop_event = stop_event or threading.Event()
+        self.logger.info(f"Render worker {self.worker_id} started (queue: {self.queue.db_path})")
+        self.warm_up()
+
+        processed = 0
+        while not stop_event.is_set():
+            if max_jobs is not None and processed >= max_jobs:
+                break
+            job = self.queue.claim(self.worker_id)
+            if job is None:
+                stop_event.wait(self.poll_seconds)
+                continue
+            self.run_job(job)
+            processed += 1
+
+        self.logger.info(f"Render worker {self.worker_id} stopped ({processed} jobs)")
+        return processed
+
+    def run_job(self, job: RenderJob) -> JobStatus:
+        """取得済みのジョブを実行して結果をキューに記録"""
+        options = job.options
+        self.logger.info(
+            f"Job {job.id}: {job.subject} (phase {options.from_phase}-{options.until_phase}, "
+            f"attempt {job.attempts})"
+        )
+
+        # 実行中はリースを延長し続ける（止まればワーカーが落ちたとみなされ再キューされる）
+        # リースを失ったら lease_lost をセットし、次のフェーズに進まずに中断する
+        done = threading.Event()
+        lease_lost = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat_loop, args=(job.id, done, lease_lost), daemon=True
+        )
+        heartbeat.start()
+
+        def record_event(event_type: str, data: Dict[str, Any]):
+            # ジョブを失った後の進捗は新しい実行者のイベントと混ざるので記録しない
+            if not lease_lost.is_set():
+                self.queue.add_event(job.id, event_type, data)
+
+        status, result, error = JobStatus.FAILED, None, None
+        try:
+            telemetry.start_run(
+                subject=job.subject,
+                log_dir=self.config.get_path("logs_dir"),
+                command=f"worker job {job.id} --from-phase {options.from_phase} --until-phase {options.until_phase}",
+                enabled=self.config.get("telemetry.enabled", True),
+                logger=self.logger
+            )
+
+            from src.core.orchestrator import PhaseOrchestrator
+            orchestrator = PhaseOrchestrator(
+                config=self.config,
+                logger=self.logger,
+                genre=options.genre,
+                audio_var=options.audio_var,
+                text_layout=options.text_layout or DEFAULT_TEXT_LAYOUT,
+                thumbnail_style=options.thumbnail_style,
+                event_callback=record_event
+            )
+            project_status = orchestrator.run_all_phases(
+                subject=job.subject,
+                skip_if_exists=not options.force,
+                from_phase=options.from_phase,
+                until_phase=options.until_phase,
+                skip_phases=options.skip_phases,
+                abort_event=lease_lost
+            )
+
+            result = self._summarize(project_status)
+            if project_status.overall_status == PhaseStatus.COMPLETED:
+                status = JobStatus.COMPLETED
+            else:
+                failed = [p for p in project_status.phases if p.status == PhaseStatus.FAILED]
+                error = f"Phase {failed[0].phase_number} failed: {failed[0].error_message}" if failed else "failed"
+        except Exception as e:
+            self.logger.error(f"Job {job.id} failed: {e}", exc_info=True)
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            done.set()
+            heartbeat.join()
+
+        # リースを失ったワーカーは結果を書かない（ジョブは再キューされ、別のワーカーが実行する）
+        if lease_lost.is_set():
+            self.logger.warning(f"Job {job.id}: lease lost, aborted without recording the result")
+            return status
+
+        if not self.queue.finish(job.id, self.worker_id, status, result=result, error=error):
+            self.logger.warning(f"Job {job.id} was taken over by another worker; result discarded")
+        self.logger.info(f"Job {job.id}: {status.value}")
+        return status
+
+    def _heartbeat_loop(self, job_id: str, done: threading.Event, lease_lost: threading.Event):
+        """done までリースを延長する。延長できなければ lease_lost をセットして終了"""
+        interval = max(1.0, self.queue.lease_seconds / 3)
+        while not done.wait(interval):
+            try:
+                if not self.queue.heartbeat(job_id, self.worker_id):
+                    self.logger.warning(f"Lost lease on job {job_id}; aborting after the current phase")
+                    lease_lost.set()
+                    return
+            except Exception as e:
+                self.logger.warning(f"Heartbeat failed for job {job_id}: {e}")
+
+    @staticmethod
+    def _summarize(project_status) -> Dict[str, Any]:
+        return {
+            "overall_status": project_status.overall_status.value,
+            "phases": [
+                {
+                    "phase": p.phase_number,
+                    "name": p.phase_name,
+                    "status": p.status.value,
+                    "duration_seconds": p.duration_seconds,
+                }
+                for p in project_status.phases
+            ],
+        }
+
+
+def run_worker_process(stop_event=None, worker_index: int = 0) -> int:
+    """
+    ワーカープロセスのエントリーポイント（serve から spawn で起動）
+
+    設定・モデルはこのプロセスの中で読み込む。
+    """
+    if stop_event is not None:
+        # Ctrl+C は親（serve）が受け、stop_event で実行中のジョブを終えてから止める
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    config = ConfigManager()
+    logger = setup_logger(
+        name=f"render_worker.{worker_index}",
+        log_dir=config.get_path("logs_dir"),
+        level="INFO"
+    )
+    worker = RenderWorker(config=config, logger=logger)
+    return worker.run(stop_event=stop_event)
@@ -0,0 +1,63 @@
+"""
+セクション単位の完了通知（フェーズ間のストリーミング受け渡し）
+
+通常、Phase 7 は Phase 2（全ナレーション）と Phase 3（全画像）が終わるまで始められない。
+ストリーミング受け渡しを有効にすると、オーケストレーターが SectionEventBus を作って各フェーズに渡し、
+- Phase 2: セクションの音声ができるたびに "audio"（duration）
+- Phase 3: セクションの画像ができるたびに "images"（paths）
+- オーケストレーター: フェーズ終了時に "audio_complete" / "images_complete"
+を通知する。Phase 7 はこれを購読し、音声と画像が揃ったセクションからセグメントを先にエンコードする。
+
+購読側の関数は通知したスレッドで呼ばれるので、重い処理は自分のスレッドに渡すこと。
+
+使用例:
+    bus = SectionEventBus(logger)
+    bus.subscribe(lambda event: print(event.kind, event.section_id, event.data))
+    bus.publish("audio", 1, duration=42.5)
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# イベントの種類
+AUDIO_READY = "audio"
+IMAGES_READY = "images"
+AUDIO_COMPLETE = "audio_complete"
+IMAGES_COMPLETE = "images_complete"
+
+
+@dataclass
+class SectionEvent:
+    """セクション（またはフェーズ全体）の完了通知"""
+    kind: str
+    section_id: Optional[int] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+class SectionEventBus:
+    """フェーズ間でセクションの完了を通知する（スレッドセーフ）"""
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        self.logger = logger or logging.getLogger(__name__)
+        self._subscribers: List[Callable[[SectionEvent], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[SectionEvent], None]):
+        """通知を受け取る関数を登録"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def publish(self, kind: str, section_id: Optional[int] = None, **data):
+        """
+        通知（購読側の失敗で通知元のフェーズは止めない）
+        """
+        event = SectionEvent(kind=kind, section_id=section_id, data=data)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                self.logger.warning(f"Section event handler failed ({kind}, section {section_id}): {e}")
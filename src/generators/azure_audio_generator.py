@@ -60,7 +60,7 @@ class AzureAudioGenerator:
             speed: 速度（0.5-2.0）
             pitch: ピッチ（-50%～+50%）
             logger: ロガー
-            whisper_config: Whisper設定 {"enabled": bool, "model": str, "language": str}
+            whisper_config: Whisper設定 {"enabled": bool, "model": str, "language": str, "backend": str}
             punctuation_pause_config: 句点での間隔制御設定（未実装）
             use_elevenlabs_fa: ElevenLabs Forced Alignmentを使用するか
             elevenlabs_api_key: ElevenLabs API Key
@@ -96,6 +96,10 @@ class AzureAudioGenerator:
         # タイムスタンプ抽出用（Kokoroと同じ仕組み）
         self.whisper_config = whisper_config or {"enabled": True, "model": "base", "language": "ja"}
         self.punctuation_pause_config = punctuation_pause_config or {"enabled": False}
+
+        # Trueの場合はセクションごとのアライメントを行わない
+        # （Phase 2 が結合後の音声で一括アライメントする。whisper.alignment_scope: "full"）
+        self.defer_alignment = False
         self.use_elevenlabs_fa = use_elevenlabs_fa
         self.elevenlabs_api_key = elevenlabs_api_key or os.getenv("ELEVENLABS_API_KEY")
         self.elevenlabs_aligner = None
@@ -230,6 +234,13 @@ class AzureAudioGenerator:
         Returns:
             alignment形式のタイムスタンプ情報
         """
+        if self.defer_alignment:
+            return {
+                'characters': [],
+                'character_start_times_seconds': [],
+                'character_end_times_seconds': []
+            }
+
         # ElevenLabs Forced Alignmentを試す
         if self.use_elevenlabs_fa and self.elevenlabs_aligner:
             try:
@@ -300,7 +311,8 @@ class AzureAudioGenerator:
                 use_stable_ts=self.whisper_config.get("use_stable_ts", True),
                 suppress_silence=self.whisper_config.get("suppress_silence", True),
                 vad=self.whisper_config.get("vad", True),
-                vad_threshold=self.whisper_config.get("vad_threshold", 0.35)
+                vad_threshold=self.whisper_config.get("vad_threshold", 0.35),
+                backend=self.whisper_config.get("backend", "transcribe")
             )
         except Exception as e:
             self.logger.error(f"Failed to initialize Whisper: {e}")
@@ -4,7 +4,8 @@ Claude APIを使って画像キーワードを生成
 
 import json
 from typing import List
-import anthropic
+
+from ..utils.llm_gateway import get_llm_gateway
 
 
 class KeywordGenerator:
@@ -16,7 +17,7 @@ class KeywordGenerator:
             api_key: Anthropic API Key
             logger: ロガー
         """
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.llm = get_llm_gateway(api_key)
         self.logger = logger
 
     def generate_keywords(
@@ -50,7 +51,7 @@ class KeywordGenerator:
         )
 
         try:
-            response = self.client.messages.create(
+            response = self.llm.create(
                 model="claude-sonnet-4-20250514",
                 max_tokens=1000,
                 temperature=0.7,
@@ -59,7 +60,8 @@ class KeywordGenerator:
                         "role": "user",
                         "content": prompt
                     }
-                ]
+                ],
+                caller="KeywordGenerator"
             )
 
             # レスポンスからキーワードを抽出
@@ -17,6 +17,8 @@ import subprocess
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
+from src.processors.audio_processor import AudioProcessor
+from src.utils.synthesis_timing import SynthesisChunk, SynthesisTimingBuilder
 from src.utils.whisper_timing import WhisperTimingExtractor, WHISPER_AVAILABLE
 from src.utils.elevenlabs_forced_alignment import (
     create_elevenlabs_aligner,
@@ -42,7 +44,8 @@ class KokoroAudioGenerator:
         whisper_config: Optional[Dict[str, Any]] = None,
         punctuation_pause_config: Optional[Dict[str, Any]] = None,
         use_elevenlabs_fa: bool = True,
-        elevenlabs_api_key: Optional[str] = None
+        elevenlabs_api_key: Optional[str] = None,
+        synthesis_timing_config: Optional[Dict[str, Any]] = None
     ):
         """
         初期化
@@ -53,10 +56,11 @@ class KokoroAudioGenerator:
             speed: 速度（0.5-2.0）
             response_format: 出力形式（mp3, wav, opus, flac）
             logger: ロガー
-            whisper_config: Whisper設定 {"enabled": bool, "model": str, "language": str}
+            whisper_config: Whisper設定 {"enabled": bool, "model": str, "language": str, "backend": str}
             punctuation_pause_config: 句点での間隔制御設定
             use_elevenlabs_fa: ElevenLabs Forced Alignmentを使用するか（デフォルト: True）
             elevenlabs_api_key: ElevenLabs API Key（環境変数 ELEVENLABS_API_KEY を優先）
+            synthesis_timing_config: 合成情報からのタイミング生成設定（句点制御有効時のみ）
 
         Raises:
             ConnectionError: APIサーバーに接続できない場合
@@ -74,6 +78,13 @@ class KokoroAudioGenerator:
         # 句点での間隔制御設定
         self.punctuation_pause_config = punctuation_pause_config or {"enabled": False}
 
+        # Trueの場合はセクションごとのアライメントを行わない
+        # （Phase 2 が結合後の音声で一括アライメントする。whisper.alignment_scope: "full"）
+        self.defer_alignment = False
+
+        # 句点で分割して合成する場合、チャンク長と挿入無音からタイミングを組み立てる
+        self.synthesis_timing_config = synthesis_timing_config or {"enabled": False}
+
         # 🔥 新規追加: ElevenLabs Forced Alignment設定
         self.use_elevenlabs_fa = use_elevenlabs_fa
         # 環境変数からAPI Keyを取得（引数を優先）
@@ -324,6 +335,12 @@ class KokoroAudioGenerator:
 
         self.logger.info(f"Splitting text by punctuation: {len(segments)} segments")
 
+        # 合成情報からタイミングを組み立てる場合はチャンク長を記録
+        use_synthesis_timing = self.synthesis_timing_config.get("enabled", False)
+        audio_processor = AudioProcessor(logger=self.logger) if use_synthesis_timing else None
+        chunks: List[SynthesisChunk] = []
+        chunk_files: List[Path] = []
+
         # 一時ディレクトリを作成
         temp_dir = tempfile.mkdtemp(prefix='kokoro_punct_')
         temp_files = []
@@ -346,6 +363,13 @@ class KokoroAudioGenerator:
                     f.write(audio_bytes)
                 temp_files.append(segment_file)
 
+                if use_synthesis_timing:
+                    chunks.append(SynthesisChunk(
+                        text=segment,
+                        duration=audio_processor.get_duration(segment_file)
+                    ))
+                    chunk_files.append(segment_file)
+
                 # 無音を挿入（最後のセグメント以外、またはskip_section_end=falseの場合）
                 is_last = (i == len(segments) - 1)
                 should_add_pause = not (is_last and skip_section_end)
@@ -367,6 +391,10 @@ class KokoroAudioGenerator:
                         temp_files.append(silence_file)
                         self.logger.info(f"  + silence {silence_duration}s")
 
+                        if use_synthesis_timing:
+                            # エンコード後の実際の長さを使う
+                            chunks[-1].pause_after = audio_processor.get_duration(silence_file)
+
             # 全てのファイルを結合
             if not temp_files:
                 raise ValueError("No audio segments generated")
@@ -380,8 +408,12 @@ class KokoroAudioGenerator:
             with open(combined_file, 'rb') as f:
                 combined_audio_base64 = base64.b64encode(f.read()).decode('utf-8')
 
-            # Whisperでタイムスタンプ取得
-            alignment = self._extract_timestamps_with_whisper(combined_audio_base64, text)
+            if use_synthesis_timing:
+                # チャンク長と挿入無音からタイミングを組み立てる（ASRなし）
+                alignment = self._build_synthesis_alignment(chunks, chunk_files)
+            else:
+                # Whisperでタイムスタンプ取得
+                alignment = self._extract_timestamps_with_whisper(combined_audio_base64, text)
 
             return {
                 'audio_base64': combined_audio_base64,
@@ -397,6 +429,94 @@ class KokoroAudioGenerator:
             except Exception as e:
                 self.logger.warning(f"Failed to clean up temp directory {temp_dir}: {e}")
 
+    def _build_synthesis_alignment(
+        self,
+        chunks: List[SynthesisChunk],
+        chunk_files: List[Path]
+    ) -> Dict[str, List]:
+        """
+        チャンク長と挿入無音から文字タイミングを生成
+
+        文の境界はチャンク長の累積で確定し、文内は文字種の重みで按分する。
+        refine_with_asr が有効な場合のみ、文ごとに Whisper で文内のタイミングを補正する。
+
+        Args:
+            chunks: 合成したチャンク（音声長・後続の無音長つき）
+            chunk_files: 各チャンクの音声ファイル
+
+        Returns:
+            alignment形式のタイムスタンプ情報
+        """
+        config = self.synthesis_timing_config
+        builder = SynthesisTimingBuilder(
+            weights=config.get("weights"),
+            lead_in=config.get("lead_in", 0.0),
+            tail=config.get("tail", 0.0),
+            logger=self.logger
+        )
+
+        refined = {}
+        if config.get("refine_with_asr", False):
+            refined = self._refine_chunk_timings(chunks, chunk_files)
+
+        alignment = builder.build(chunks, refined)
+        end_times = alignment['character_end_times_seconds']
+        self.logger.info(
+            f"✓ Synthesis timing: {len(chunks)} sentences, "
+            f"{len(alignment['characters'])} characters "
+            f"({len(refined)} refined with ASR), "
+            f"duration: {end_times[-1] if end_times else 0:.2f}s"
+        )
+        return alignment
+
+    def _refine_chunk_timings(
+        self,
+        chunks: List[SynthesisChunk],
+        chunk_files: List[Path]
+    ) -> Dict[int, Dict[str, List]]:
+        """
+        文ごとに Whisper で文内の文字タイミングを取得（チャンク先頭からの相対時刻）
+
+        失敗した文は含めない（重み按分のまま）。
+        """
+        if not (self.whisper_config.get("enabled", True) and WHISPER_AVAILABLE):
+            self.logger.warning("Whisper not available, skipping per-sentence refinement")
+            return {}
+
+        try:
+            whisper_extractor = self._create_whisper_extractor()
+        except Exception as e:
+            self.logger.warning(f"Failed to initialize Whisper for refinement: {e}")
+            return {}
+
+        refined = {}
+        for i, (chunk, chunk_file) in enumerate(zip(chunks, chunk_files)):
+            try:
+                word_timings = whisper_extractor.extract_word_timings(
+                    audio_path=chunk_file,
+                    text=chunk.text
+                )
+            except Exception as e:
+                self.logger.warning(f"Refinement failed for sentence {i + 1}: {e}")
+                continue
+            expanded = self._expand_word_timings_to_chars(word_timings)
+            if expanded['characters']:
+                refined[i] = expanded
+        return refined
+
+    def _create_whisper_extractor(self) -> WhisperTimingExtractor:
+        """whisper_config から WhisperTimingExtractor を作成"""
+        return WhisperTimingExtractor(
+            model_name=self.whisper_config.get("model", "base"),
+            logger=self.logger,
+            language=self.whisper_config.get("language", "ja"),
+            use_stable_ts=self.whisper_config.get("use_stable_ts", True),
+            suppress_silence=self.whisper_config.get("suppress_silence", True),
+            vad=self.whisper_config.get("vad", True),
+            vad_threshold=self.whisper_config.get("vad_threshold", 0.35),
+            backend=self.whisper_config.get("backend", "transcribe")
+        )
+
     def generate_with_timestamps(
         self,
         text: str,
@@ -559,6 +679,13 @@ class KokoroAudioGenerator:
         Returns:
             alignment形式のタイムスタンプ情報
         """
+        if self.defer_alignment:
+            return {
+                'characters': [],
+                'character_start_times_seconds': [],
+                'character_end_times_seconds': []
+            }
+
         # 🔥 新規追加: ElevenLabs Forced Alignmentを試す
         if self.use_elevenlabs_fa and self.elevenlabs_aligner:
             try:
@@ -623,15 +750,7 @@ class KokoroAudioGenerator:
         # 🔥 追加：毎回Whisperを初期化（前のセグメントの影響を完全排除）
         try:
             self.logger.info("Initializing fresh Whisper model for this section...")
-            whisper_extractor = WhisperTimingExtractor(
-                model_name=self.whisper_config.get("model", "base"),
-                logger=self.logger,
-                language=self.whisper_config.get("language", "ja"),
-                use_stable_ts=self.whisper_config.get("use_stable_ts", True),
-                suppress_silence=self.whisper_config.get("suppress_silence", True),
-                vad=self.whisper_config.get("vad", True),
-                vad_threshold=self.whisper_config.get("vad_threshold", 0.35)
-            )
+            whisper_extractor = self._create_whisper_extractor()
         except Exception as e:
             self.logger.error(f"Failed to initialize Whisper: {e}")
             return {
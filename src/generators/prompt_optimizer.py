@@ -12,7 +12,8 @@ Stable Diffusion向けの詳細なプロンプトに最適化する。
 
 import logging
 from typing import Optional, Dict
-from anthropic import Anthropic
+
+from ..utils.llm_gateway import get_llm_gateway
 
 
 class PromptOptimizer:
@@ -43,7 +44,7 @@ class PromptOptimizer:
             model: 使用するClaudeモデル
             logger: ロガー
         """
-        self.client = Anthropic(api_key=api_key)
+        self.llm = get_llm_gateway(api_key)
         self.model = model
         self.logger = logger or logging.getLogger(__name__)
         
@@ -81,7 +82,7 @@ class PromptOptimizer:
         
         # Claude APIで最適化
         try:
-            response = self.client.messages.create(
+            response = self.llm.create(
                 model=self.model,
                 max_tokens=1000,
                 temperature=0.7,
@@ -91,7 +92,8 @@ class PromptOptimizer:
                     "content": self._build_user_prompt(
                         keyword, atmosphere, context, image_type, style
                     )
-                }]
+                }],
+                caller="PromptOptimizer"
             )
             
             optimized_prompt = response.content[0].text.strip()
@@ -9,12 +9,7 @@ import logging
 from typing import Dict, Any, Optional
 from datetime import datetime
 
-try:
-    from anthropic import Anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
-    print("Warning: anthropic package not installed. Run: pip install anthropic")
+from ..utils.llm_gateway import get_llm_gateway
 
 
 class ScriptGenerator:
@@ -42,10 +37,7 @@ class ScriptGenerator:
             temperature: 生成の多様性（0-1）
             logger: ロガー
         """
-        if not ANTHROPIC_AVAILABLE:
-            raise ImportError("anthropic package is required. Install with: pip install anthropic")
-        
-        self.client = Anthropic(api_key=api_key)
+        self.llm = get_llm_gateway(api_key)
         self.model = model
         self.max_tokens = max_tokens
         self.temperature = temperature
@@ -76,7 +68,8 @@ class ScriptGenerator:
         
         # API呼び出し
         try:
-            response = self.client.messages.create(
+            # 台本は毎回サンプリングし直すためキャッシュしない
+            response = self.llm.create(
                 model=self.model,
                 max_tokens=self.max_tokens,
                 temperature=self.temperature,
@@ -85,7 +78,9 @@ class ScriptGenerator:
                         "role": "user",
                         "content": prompt
                     }
-                ]
+                ],
+                caller="ScriptGenerator",
+                use_cache=False
             )
             
             # レスポンスからテキストを取得
@@ -4,12 +4,13 @@ YouTube Shorts メタデータ生成
 Claude APIを使用して、Shorts向けに最適化されたメタデータを生成する。
 """
 
-import anthropic
 import json
 import re
 from typing import Dict, Any, Optional
 import logging
 
+from ..utils.llm_gateway import get_llm_gateway
+
 
 class ShortsMetadataGenerator:
     """Shortsメタデータ生成クラス"""
@@ -20,7 +21,7 @@ class ShortsMetadataGenerator:
         model: str = "claude-haiku-4-5",
         logger: Optional[logging.Logger] = None
     ):
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.llm = get_llm_gateway(api_key)
         self.model = model
         self.logger = logger or logging.getLogger(__name__)
 
@@ -122,10 +123,11 @@ JSON形式で以下のキーを含めてください:
 }}
 """
 
-        response = self.client.messages.create(
+        response = self.llm.create(
             model=self.model,
             max_tokens=config.get("max_tokens", 1000),
-            messages=[{"role": "user", "content": prompt}]
+            messages=[{"role": "user", "content": prompt}],
+            caller="ShortsMetadataGenerator"
         )
 
         # レスポンスをパース
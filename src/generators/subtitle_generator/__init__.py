@@ -7,15 +7,19 @@
 from typing import Dict, Any, Optional
 import logging
 
+from src.utils.morphology import MorphologyService
+
 from .text_splitter import TextSplitter
 from .timing_processor import TimingProcessor
 from .formatter import SubtitleFormatter
 from .generator import SubtitleGenerator
+from .line_breaker import LineBreaker
 
 
 def create_subtitle_generator(
     config: Dict[str, Any],
-    logger: Optional[logging.Logger] = None
+    logger: Optional[logging.Logger] = None,
+    morphology: Optional[MorphologyService] = None
 ) -> SubtitleGenerator:
     """
     字幕生成器を作成（互換性維持用のファクトリー関数）
@@ -23,6 +27,7 @@ def create_subtitle_generator(
     Args:
         config: 字幕生成設定
         logger: ロガー
+        morphology: 形態素解析サービス（省略時はグローバルインスタンス）
 
     Returns:
         SubtitleGenerator インスタンス
@@ -32,7 +37,7 @@ def create_subtitle_generator(
         >>> generator = create_subtitle_generator(config, logger)
         >>> subtitles = generator.generate_subtitles_from_char_timings(audio_data)
     """
-    return SubtitleGenerator(config=config, logger=logger)
+    return SubtitleGenerator(config=config, logger=logger, morphology=morphology)
 
 
 # 公開API
@@ -41,5 +46,6 @@ __all__ = [
     "TimingProcessor",
     "SubtitleFormatter",
     "SubtitleGenerator",
+    "LineBreaker",
     "create_subtitle_generator",
 ]
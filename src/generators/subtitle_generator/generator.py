@@ -9,9 +9,11 @@ import logging
 
 from src.core.models import SubtitleEntry
 from src.utils.whisper_timing import create_whisper_extractor
+from src.utils.morphology import MorphologyService, get_morphology_service
 from .text_splitter import TextSplitter
 from .timing_processor import TimingProcessor
 from .formatter import SubtitleFormatter
+from .line_breaker import LineBreaker
 
 
 class SubtitleGenerator:
@@ -29,7 +31,8 @@ class SubtitleGenerator:
     def __init__(
         self,
         config: Dict[str, Any],
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        morphology: Optional[MorphologyService] = None
     ):
         """
         初期化
@@ -37,6 +40,7 @@ class SubtitleGenerator:
         Args:
             config: 字幕生成設定
             logger: ロガー
+            morphology: 形態素解析サービス（Noneの場合はグローバルインスタンス）
         """
         self.config = config
         self.logger = logger or logging.getLogger(__name__)
@@ -45,6 +49,7 @@ class SubtitleGenerator:
         self.splitter = TextSplitter(config, logger=logger)
         self.timing = TimingProcessor(config, logger=logger)
         self.formatter = SubtitleFormatter(config, logger=logger)
+        self.line_breaker = LineBreaker(config, logger=logger)
 
         # 設定値の取得（互換性のため保持）
         self.max_lines = max(1, config.get("max_lines", 2))
@@ -64,6 +69,8 @@ class SubtitleGenerator:
 
         # 分割戦略の設定（互換性のため保持）
         splitting = config.get("splitting", {})
+        # "dp": 文全体を動的計画法で分割 / "greedy": 従来の窓探索
+        self.splitting_engine = splitting.get("engine", "dp")
         self.window_size = splitting.get("window_size", 3)
         self.priority_scores = splitting.get("priority_scores", {
             "punctuation": 120,
@@ -90,7 +97,7 @@ class SubtitleGenerator:
         self.remove_punctuation = config.get("remove_punctuation_in_display", False)
 
         # MeCabの初期化（使用する場合）
-        self.mecab = None
+        self.morphology = morphology
         if self.use_mecab:
             self._init_mecab()
 
@@ -113,6 +120,38 @@ class SubtitleGenerator:
                 self.use_whisper = False
     
 
+    def _init_mecab(self):
+        """MeCabを初期化（形態素解析サービス経由）"""
+        if self.morphology is None:
+            self.morphology = get_morphology_service(logger=self.logger)
+
+        if not self.morphology.available:
+            self.logger.warning(
+                "MeCab not available. Install with: pip install mecab-python3 ipadic"
+            )
+            self.use_mecab = False
+
+    def _prime_morphology(self, audio_timing_data: List[Dict[str, Any]]):
+        """
+        全セクションのナレーションを一括で形態素解析
+
+        以降のチャンク単位の問い合わせは、この解析結果のスライスで応答される。
+        チャンクは改行・空白を含まないため、それらを除いたテキストを解析する。
+        """
+        if not self.use_mecab or self.morphology is None:
+            return
+
+        texts = []
+        for section in audio_timing_data:
+            characters = section.get("narration_timing", {}).get("characters", [])
+            text = "".join(c for c in characters if c not in ['\n', '\r', ' ', '\t'])
+            if text:
+                texts.append(text)
+
+        self.morphology.clear_contexts()
+        self.morphology.prime(texts)
+        self.logger.debug(f"Morphology primed with {len(texts)} sections")
+
     def _is_hiragana(self, char: str) -> bool:
         """ひらがなかどうか判定"""
         return '\u3040' <= char <= '\u309F'
@@ -177,7 +216,7 @@ class SubtitleGenerator:
                 'verb_adjective_positions': set([5, 6, 7, ...])  # 動詞・形容詞の内部位置
             }
         """
-        if not self.use_mecab or self.mecab is None:
+        if not self.use_mecab or self.morphology is None:
             # MeCabが利用できない場合は空の結果を返す
             return {
                 'boundaries': [],
@@ -186,56 +225,16 @@ class SubtitleGenerator:
             }
 
         try:
-            text = "".join(characters)
-
-            # MeCabで解析
-            node = self.mecab.parseToNode(text)
-
-            morphemes = []
-            boundaries = []
-            verb_adjective_positions = set()
-            current_pos = 0
-
-            while node:
-                surface = node.surface
-                features = node.feature.split(',')
-                pos = features[0] if features else "未知語"
-
-                if surface:  # 空文字列でない場合
-                    morpheme_len = len(surface)
-                    morpheme_end = current_pos + morpheme_len
-
-                    morphemes.append({
-                        'surface': surface,
-                        'pos': pos,
-                        'start': current_pos,
-                        'end': morpheme_end
-                    })
-
-                    # 形態素の終わり位置を境界として記録
-                    if morpheme_end < len(characters):
-                        boundaries.append(morpheme_end)
-
-                    # 動詞・形容詞の内部位置を記録（境界以外の位置）
-                    if pos in ['動詞', '形容詞']:
-                        for i in range(current_pos + 1, morpheme_end):
-                            verb_adjective_positions.add(i)
-
-                    current_pos = morpheme_end
-
-                node = node.next
+            # セクション単位の解析結果をスライスして取得（未解析なら単独で解析）
+            result = self.morphology.query("".join(characters))
 
             self.logger.debug(
-                f"MeCab detected {len(morphemes)} morphemes, "
-                f"{len(boundaries)} boundaries, "
-                f"{len(verb_adjective_positions)} verb/adj internal positions"
+                f"MeCab detected {len(result['morphemes'])} morphemes, "
+                f"{len(result['boundaries'])} boundaries, "
+                f"{len(result['verb_adjective_positions'])} verb/adj internal positions"
             )
 
-            return {
-                'boundaries': boundaries,
-                'morphemes': morphemes,
-                'verb_adjective_positions': verb_adjective_positions
-            }
+            return result
 
         except Exception as e:
             self.logger.warning(f"MeCab analysis failed: {e}")
@@ -293,12 +292,16 @@ class SubtitleGenerator:
         best_pos = ideal_pos
         best_reason = "forced"
 
-        # 形態素情報の取得
-        morpheme_boundaries = []
+        # 形態素情報の取得（ループ内の所属判定のため集合に変換）
+        morpheme_boundaries = set()
         verb_adjective_positions = set()
         if morpheme_info:
-            morpheme_boundaries = morpheme_info.get('boundaries', [])
-            verb_adjective_positions = morpheme_info.get('verb_adjective_positions', set())
+            morpheme_boundaries = set(morpheme_info.get('boundaries', []))
+            verb_adjective_positions = set(morpheme_info.get('verb_adjective_positions', set()))
+        particle_boundaries = set(boundaries.get("particles", []))
+        hiragana_to_kanji_boundaries = set(boundaries.get("hiragana_to_kanji", []))
+        kanji_to_hiragana_boundaries = set(boundaries.get("kanji_to_hiragana", []))
+        katakana_boundaries = set(boundaries.get("katakana_boundary", []))
 
         for pos in range(search_start, search_end):
             score = 0
@@ -345,25 +348,25 @@ class SubtitleGenerator:
                     reason = "morpheme_boundary"
 
             # 助詞の後
-            if pos in boundaries.get("particles", []):
+            if pos in particle_boundaries:
                 score += self.priority_scores.get("particle", 100)
                 if not reason:
                     reason = "particle"
 
             # ひらがな→漢字
-            elif pos in boundaries.get("hiragana_to_kanji", []):
+            elif pos in hiragana_to_kanji_boundaries:
                 score += self.priority_scores.get("hiragana_to_kanji", 80)
                 if not reason:
                     reason = "hiragana_to_kanji"
 
             # 漢字→ひらがな
-            elif pos in boundaries.get("kanji_to_hiragana", []):
+            elif pos in kanji_to_hiragana_boundaries:
                 score += self.priority_scores.get("kanji_to_hiragana", 60)
                 if not reason:
                     reason = "kanji_to_hiragana"
 
             # カタカナ境界
-            elif pos in boundaries.get("katakana_boundary", []):
+            elif pos in katakana_boundaries:
                 score += self.priority_scores.get("katakana_boundary", 40)
                 if not reason:
                     reason = "katakana_boundary"
@@ -429,6 +432,13 @@ class SubtitleGenerator:
         if len(characters) <= max_chars_per_line:
             return ["".join(characters)]
 
+        if self.splitting_engine == "dp":
+            try:
+                return self._split_into_lines_dp(characters, max_chars_per_line, max_lines)
+            except Exception as e:
+                # DP で分割できない場合は従来の窓探索で分割する
+                self.logger.warning(f"DP line breaking failed, using greedy splitter: {e}")
+
         # 36文字以内（max_chars_per_line * max_lines）の場合、段階的フォールバック
         if len(characters) <= max_chars_per_line * max_lines:
             MIN_LINE_LENGTH = 3  # 最低3文字
@@ -611,6 +621,49 @@ class SubtitleGenerator:
 
         return lines[:max_lines]
 
+    def _split_into_lines_dp(
+        self,
+        characters: List[str],
+        max_chars_per_line: int,
+        max_lines: int
+    ) -> List[str]:
+        """
+        LineBreaker（動的計画法）で複数行に分割
+
+        Args:
+            characters: 文字配列
+            max_chars_per_line: 1行あたりの最大文字数
+            max_lines: 最大行数
+
+        Returns:
+            行のリスト（句読点を除去済み）
+        """
+        breaks = self.line_breaker.find_breaks(
+            characters,
+            max_len=max_chars_per_line,
+            min_len=self.min_line_length,
+            max_segments=max_lines,
+            morpheme_info=self._detect_morpheme_boundaries(characters)
+        )
+        edges = [0] + breaks + [len(characters)]
+
+        lines = []
+        for a, b in zip(edges, edges[1:]):
+            line_text = "".join(characters[a:b])
+            if self.splitter.remove_punctuation_in_display:
+                # 句読点を除去（「、」と「」は残す）
+                line_text = "".join([c for c in line_text if c not in ["。", "！", "？", "…"]])
+            lines.append(line_text)
+
+        if len(characters) > max_chars_per_line * max_lines:
+            self.logger.warning(
+                f"Last line is too long ({len(characters) - edges[-2]} chars). "
+                f"Consider using longer max_chars or multiple subtitles."
+            )
+
+        # 空行を除外
+        return [line for line in lines if line.strip()][:max_lines]
+
     def generate_subtitles_from_char_timings(
         self,
         audio_timing_data: List[Dict[str, Any]]
@@ -631,6 +684,9 @@ class SubtitleGenerator:
         # 一時的に全字幕候補を保存（終了時刻調整前）
         temp_subtitles = []
 
+        # 形態素解析はセクション単位で1回だけ実行
+        self._prime_morphology(audio_timing_data)
+
         for section in audio_timing_data:
             offset = section.get("offset", 0.0)
 
@@ -1131,6 +1187,28 @@ class SubtitleGenerator:
         """
         MIN_CHUNK_LENGTH = 10  # 最小チャンク長
 
+        if self.splitting_engine == "dp":
+            try:
+                breaks = self.line_breaker.find_breaks(
+                    characters,
+                    max_len=max_chars,
+                    min_len=MIN_CHUNK_LENGTH,
+                    morpheme_info=self._detect_morpheme_boundaries(characters)
+                )
+            except Exception as e:
+                # DP で分割できない場合は従来のスコアリング方式で分割する
+                self.logger.warning(f"DP chunk splitting failed, using greedy splitter: {e}")
+            else:
+                edges = [0] + breaks + [len(characters)]
+                return [
+                    {
+                        "characters": characters[a:b],
+                        "start_times": start_times[a:b],
+                        "end_times": end_times[a:b]
+                    }
+                    for a, b in zip(edges, edges[1:])
+                ]
+
         chunks = []
         remaining_chars = characters.copy()
         remaining_starts = start_times.copy()
@@ -0,0 +1,344 @@
+"""
+動的計画法による改行位置の決定
+
+文（チャンク）全体を一度に見て、各行が max_chars 以内に収まる
+分割のうち総ペナルティが最小になるものを求める。
+
+従来の _find_split_position_with_score は理想位置の周辺窓から
+1か所ずつ貪欲に選び、残りを再帰的に処理していた。
+本モジュールは境界スコアを文ごとに1回だけ計算し、
+O(文字数 × max_chars) の DP で全体最適な分割を返す。
+"""
+
+from typing import Any, Dict, List, Optional, Set
+import logging
+
+
+# 行頭に置きたくない文字（禁則）
+LINE_START_FORBIDDEN = set(["、", "。", "！", "？", "…", "」", "』", "）", ")", "ー", "っ", "ゃ", "ゅ", "ょ"])
+
+# 直後で分割してよい句読点
+SENTENCE_END_PUNCTUATION = set(["。", "！", "？", "…"])
+
+
+class LineBreaker:
+    """
+    改行位置を全体最適で決定するクラス
+
+    スコア（大きいほど分割に適した位置）は splitting.priority_scores、
+    ペナルティは splitting.penalties をそのまま重みとして使う。
+
+    使用例:
+        breaker = LineBreaker(config)
+        breaks = breaker.find_breaks(characters, max_len=20, max_segments=2)
+        # breaks = [11]  → characters[:11] / characters[11:]
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        初期化
+
+        Args:
+            config: subtitle_generation.yamlの設定
+            logger: ロガー
+        """
+        self.logger = logger or logging.getLogger(__name__)
+
+        splitting = config.get("splitting", {})
+        self.priority_scores = splitting.get("priority_scores", {
+            "punctuation": 120,
+            "morpheme_boundary": 150,
+            "particle": 100,
+            "hiragana_to_kanji": 80,
+            "kanji_to_hiragana": 60,
+            "katakana_boundary": 40
+        })
+        penalties = splitting.get("penalties", {})
+        self.distance_penalty = penalties.get("distance_from_ideal", 5)
+        self.ends_with_n_tsu_penalty = penalties.get("ends_with_n_tsu", 20)
+        self.splits_number_penalty = penalties.get("splits_number", 50)
+        self.splits_alphabet_penalty = penalties.get("splits_alphabet", 50)
+        self.splits_verb_adjective_penalty = penalties.get("splits_verb_adjective", 500)
+        self.min_chunk_penalty = penalties.get("min_chunk_length", 200)
+        self.line_start_penalty = penalties.get("line_start_punctuation", 300)
+        self.new_line_penalty = penalties.get("new_line", 1000)
+        self.particles = splitting.get("particles", [
+            "は", "が", "を", "に", "で", "と", "も", "や", "から", "まで", "より"
+        ])
+
+    # ========================================
+    # 文字種判定
+    # ========================================
+
+    @staticmethod
+    def _is_hiragana(char: str) -> bool:
+        return '\u3040' <= char <= '\u309F'
+
+    @staticmethod
+    def _is_katakana(char: str) -> bool:
+        return '\u30A0' <= char <= '\u30FF'
+
+    @staticmethod
+    def _is_kanji(char: str) -> bool:
+        return '\u4E00' <= char <= '\u9FFF'
+
+    @staticmethod
+    def _is_number(char: str) -> bool:
+        return char.isdigit() or '\uFF10' <= char <= '\uFF19'
+
+    @staticmethod
+    def _is_alphabet(char: str) -> bool:
+        return char.isalpha() and ord(char) < 128
+
+    # ========================================
+    # 境界スコア
+    # ========================================
+
+    def compute_break_scores(
+        self,
+        characters: List[str],
+        morpheme_info: Optional[Dict[str, Any]] = None
+    ) -> List[float]:
+        """
+        各位置で分割したときのスコアを計算（文ごとに1回）
+
+        位置 p は characters[:p] / characters[p:] の分割を表す。
+
+        Args:
+            characters: 文字配列
+            morpheme_info: _detect_morpheme_boundaries() の結果
+
+        Returns:
+            長さ len(characters)+1 のスコア配列（両端は0）
+        """
+        n = len(characters)
+        scores = [0.0] * (n + 1)
+        if n < 2:
+            return scores
+
+        morpheme_boundaries: Set[int] = set()
+        verb_adjective_positions: Set[int] = set()
+        if morpheme_info:
+            morpheme_boundaries = set(morpheme_info.get('boundaries', []))
+            verb_adjective_positions = set(morpheme_info.get('verb_adjective_positions', set()))
+
+        # 助詞の直後（複数文字の助詞も対象）
+        text = "".join(characters)
+        single_char_particles = set(p for p in self.particles if len(p) == 1)
+        particle_ends: Set[int] = set()
+        for particle in self.particles:
+            start = text.find(particle)
+            while start != -1:
+                end = start + len(particle)
+                if end < n:
+                    particle_ends.add(end)
+                start = text.find(particle, start + 1)
+
+        punctuation_score = self.priority_scores.get("punctuation", 120)
+        morpheme_score = self.priority_scores.get("morpheme_boundary", 150)
+        particle_score = self.priority_scores.get("particle", 100)
+        hiragana_to_kanji_score = self.priority_scores.get("hiragana_to_kanji", 80)
+        kanji_to_hiragana_score = self.priority_scores.get("kanji_to_hiragana", 60)
+        katakana_score = self.priority_scores.get("katakana_boundary", 40)
+
+        for pos in range(1, n):
+            prev_char = characters[pos - 1]
+            next_char = characters[pos]
+            score = 0.0
+
+            # 句読点の直後
+            if prev_char == "、" or prev_char in SENTENCE_END_PUNCTUATION:
+                score += punctuation_score
+
+            # 形態素境界
+            if pos in morpheme_boundaries:
+                score += morpheme_score
+
+            # 助詞 / 文字種境界（いずれか1つ）
+            if pos in particle_ends:
+                score += particle_score
+            elif self._is_hiragana(prev_char) and self._is_kanji(next_char):
+                score += hiragana_to_kanji_score
+            elif (self._is_kanji(prev_char) and self._is_hiragana(next_char)
+                  and next_char not in single_char_particles):
+                # 助詞の直前（行頭が助詞になる分割）は除く
+                score += kanji_to_hiragana_score
+            elif self._is_katakana(prev_char) != self._is_katakana(next_char):
+                score += katakana_score
+
+            # 動詞・形容詞の途中
+            if pos in verb_adjective_positions:
+                score -= self.splits_verb_adjective_penalty
+
+            # 「ん」「っ」で終わる
+            if prev_char in ("ん", "っ"):
+                score -= self.ends_with_n_tsu_penalty
+
+            # 数字・英字の途中
+            if self._is_number(prev_char) and self._is_number(next_char):
+                score -= self.splits_number_penalty
+            if self._is_alphabet(prev_char) and self._is_alphabet(next_char):
+                score -= self.splits_alphabet_penalty
+
+            # 行頭禁則
+            if next_char in LINE_START_FORBIDDEN:
+                score -= self.line_start_penalty
+
+            scores[pos] = score
+
+        return scores
+
+    # ========================================
+    # 分割
+    # ========================================
+
+    def find_breaks(
+        self,
+        characters: List[str],
+        max_len: int,
+        min_len: int = 1,
+        max_segments: Optional[int] = None,
+        morpheme_info: Optional[Dict[str, Any]] = None
+    ) -> List[int]:
+        """
+        総ペナルティ最小の分割位置を求める
+
+        Args:
+            characters: 文字配列
+            max_len: 1行（1チャンク）の最大文字数
+            min_len: これより短い行にはペナルティを課す
+            max_segments: 行数の上限（Noneなら無制限）。
+                収まりきらない場合は最終行に残りをまとめる（従来挙動）
+            morpheme_info: _detect_morpheme_boundaries() の結果
+
+        Returns:
+            分割位置のリスト（昇順、0とlen(characters)は含まない）
+        """
+        n = len(characters)
+        if n <= max_len or max_len <= 0:
+            return []
+
+        scores = self.compute_break_scores(characters, morpheme_info)
+
+        min_segments = -(-n // max_len)
+        # 上限行数に収まらない場合は最終行に残りをまとめる（従来挙動）
+        overflow = max_segments is not None and min_segments > max_segments
+        target = max_len if overflow else n / min_segments
+
+        if max_segments is None:
+            breaks = self._solve_unbounded(n, max_len, min_len, target, scores)
+        else:
+            breaks = self._solve_bounded(
+                n, max_len, min_len, target, scores, max_segments, overflow
+            )
+
+        self.logger.debug(
+            f"LineBreaker: {n} chars -> {len(breaks) + 1} lines at {breaks}"
+        )
+        return breaks
+
+    def _segment_cost(self, length: int, target: float, min_len: int) -> float:
+        """1行あたりのコスト（長さの偏りと短すぎる行）"""
+        cost = abs(length - target) * self.distance_penalty
+        if length < min_len:
+            cost += self.min_chunk_penalty
+        return cost
+
+    def _solve_unbounded(
+        self,
+        n: int,
+        max_len: int,
+        min_len: int,
+        target: float,
+        scores: List[float]
+    ) -> List[int]:
+        """行数に上限のないDP（O(n × max_len)）"""
+        inf = float("inf")
+        cost = [inf] * (n + 1)
+        back = [0] * (n + 1)
+        cost[0] = 0.0
+
+        for j in range(1, n + 1):
+            best = inf
+            best_i = 0
+            for i in range(max(0, j - max_len), j):
+                if cost[i] == inf:
+                    continue
+                c = cost[i] + self._segment_cost(j - i, target, min_len)
+                if i > 0:
+                    c += self.new_line_penalty - scores[i]
+                if c < best:
+                    best = c
+                    best_i = i
+            cost[j] = best
+            back[j] = best_i
+
+        return self._backtrack(back, n)
+
+    def _solve_bounded(
+        self,
+        n: int,
+        max_len: int,
+        min_len: int,
+        target: float,
+        scores: List[float],
+        max_segments: int,
+        overflow: bool = False
+    ) -> List[int]:
+        """
+        行数上限つきのDP（O(max_segments × n × max_len)）
+
+        overflow=True の場合、最終行のみ max_len を超えてよい。
+        """
+        inf = float("inf")
+        # cost[k][j]: 先頭 j 文字を k 行に分割したときの最小コスト
+        cost = [[inf] * (n + 1) for _ in range(max_segments + 1)]
+        back = [[0] * (n + 1) for _ in range(max_segments + 1)]
+        cost[0][0] = 0.0
+
+        for k in range(1, max_segments + 1):
+            for j in range(1, n + 1):
+                best = inf
+                best_i = 0
+                overflow_line = overflow and k == max_segments and j == n
+                for i in range(0 if overflow_line else max(0, j - max_len), j):
+                    prev = cost[k - 1][i]
+                    if prev == inf:
+                        continue
+                    c = prev + self._segment_cost(j - i, target, min_len)
+                    if i > 0:
+                        c += self.new_line_penalty - scores[i]
+                    if c < best:
+                        best = c
+                        best_i = i
+                cost[k][j] = best
+                back[k][j] = best_i
+
+        best_k = min(
+            range(1, max_segments + 1),
+            key=lambda k: cost[k][n]
+        )
+        breaks = []
+        j = n
+        for k in range(best_k, 0, -1):
+            i = back[k][j]
+            if i > 0:
+                breaks.append(i)
+            j = i
+        return sorted(breaks)
+
+    @staticmethod
+    def _backtrack(back: List[int], n: int) -> List[int]:
+        """バックポインタから分割位置を復元"""
+        breaks = []
+        j = n
+        while j > 0:
+            i = back[j]
+            if i > 0:
+                breaks.append(i)
+            j = i
+        return sorted(breaks)
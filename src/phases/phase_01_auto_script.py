@@ -30,11 +30,7 @@ from src.core.models import VideoScript, ScriptSection, PhaseStatus
 from src.core.config_manager import ConfigManager
 from src.core.exceptions import PhaseExecutionError, PhaseValidationError
 from src.generators.script_prompt_builder import ScriptPromptBuilder
-
-try:
-    import anthropic
-except ImportError:
-    anthropic = None
+from src.utils.llm_gateway import get_llm_gateway
 
 
 class Phase01AutoScript(PhaseBase):
@@ -53,16 +49,13 @@ class Phase01AutoScript(PhaseBase):
         else:
             raise FileNotFoundError(f"Auto script config not found: {auto_script_config_path}")
 
-        # Claude APIクライアント
-        if anthropic is None:
-            raise ImportError("anthropic package is required. Install with: pip install anthropic")
-
+        # Claude API（LLM ゲートウェイ経由）
         try:
             api_key = config.get_api_key("CLAUDE_API_KEY")
         except Exception as e:
             raise ValueError(f"CLAUDE_API_KEY not found in environment: {e}")
 
-        self.claude_client = anthropic.Anthropic(api_key=api_key)
+        self.llm = get_llm_gateway(api_key)
 
         # プロンプトビルダー
         template_path = self.config.project_root / self.auto_config["prompt"]["template_path"]
@@ -173,7 +166,8 @@ class Phase01AutoScript(PhaseBase):
         delay = self.auto_config["retry"]["delay_seconds"]
 
         try:
-            response = self.claude_client.messages.create(
+            # 台本は毎回サンプリングし直すためキャッシュしない
+            response = self.llm.create(
                 model=self.auto_config["claude_api"]["model"],
                 max_tokens=self.auto_config["claude_api"]["max_tokens"],
                 temperature=self.auto_config["claude_api"].get("temperature", 1.0),
@@ -182,7 +176,9 @@ class Phase01AutoScript(PhaseBase):
                         "role": "user",
                         "content": prompt
                     }
-                ]
+                ],
+                caller="Phase01AutoScript",
+                use_cache=False
             )
 
             # レスポンスからテキスト抽出
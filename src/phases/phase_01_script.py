@@ -37,10 +37,7 @@ except ImportError:
         def normalize(data: dict) -> dict:
             return data
 
-try:
-    import anthropic
-except ImportError:
-    anthropic = None
+from src.utils.llm_gateway import get_llm_gateway
 
 
 class Phase01Script(PhaseBase):
@@ -513,19 +510,13 @@ class Phase01Script(PhaseBase):
         Raises:
             PhaseExecutionError: API呼び出し失敗時
         """
-        if anthropic is None:
-            raise PhaseExecutionError(
-                self.get_phase_number(),
-                "anthropic package is required. Install with: pip install anthropic"
-            )
-
         try:
             # APIキーを取得
             api_key = self.config.get_api_key("CLAUDE_API_KEY")
-            client = anthropic.Anthropic(api_key=api_key)
+            llm = get_llm_gateway(api_key)
 
-            # API呼び出し
-            response = client.messages.create(
+            # API呼び出し（台本は毎回サンプリングし直すためキャッシュしない）
+            response = llm.create(
                 model="claude-sonnet-4-20250514",
                 max_tokens=8000,
                 temperature=1.0,
@@ -534,7 +525,9 @@ class Phase01Script(PhaseBase):
                         "role": "user",
                         "content": prompt
                     }
-                ]
+                ],
+                caller="Phase01Script",
+                use_cache=False
             )
 
             # レスポンスからテキスト抽出
@@ -13,6 +13,7 @@ import os
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # プロジェクトルートをパスに追加
 if __name__ == "__main__":
@@ -20,6 +21,7 @@ if __name__ == "__main__":
     sys.path.insert(0, str(project_root))
 
 from src.core.phase_base import PhaseBase
+from src.core.section_events import AUDIO_READY
 from src.core.models import AudioGeneration, AudioSegment, VideoScript, ScriptSection
 from src.core.config_manager import ConfigManager
 from src.core.exceptions import (
@@ -31,6 +33,17 @@ from src.generators.audio_generator import create_audio_generator
 from src.generators.kokoro_audio_generator import KokoroAudioGenerator
 from src.processors.audio_processor import AudioProcessor
 from src.processors.text_optimizer import TextOptimizer
+from src.utils.kana_converter import KanaConverter
+from src.utils.morphology import get_morphology_service
+from src.utils.narration_aligner import AlignmentPiece, NarrationAligner
+from src.utils.synthesis_timing import SynthesisChunk, SynthesisTimingBuilder
+from src.utils.telemetry import submit_in_context
+from src.utils.timing_store import save_timing_data
+from src.utils.whisper_timing import (
+    STABLE_WHISPER_AVAILABLE,
+    WHISPER_AVAILABLE,
+    WhisperTimingExtractor
+)
 
 
 class Phase02Audio(PhaseBase):
@@ -98,6 +111,7 @@ class Phase02Audio(PhaseBase):
 
             # 2. 音声生成器を作成
             generator = self._create_audio_generator()
+            full_alignment = self._configure_full_alignment(generator)
 
             # 2.5. ElevenLabs使用時はひらがな変換
             service = self.phase_config.get("service", "elevenlabs").lower()
@@ -107,6 +121,7 @@ class Phase02Audio(PhaseBase):
 
             # 3. with_timestamps が有効かチェック
             use_timestamps = self.phase_config.get("with_timestamps", True)
+            timing_data = None
 
             if use_timestamps and hasattr(generator, 'generate_with_timestamps'):
                 # タイムスタンプ付きで生成
@@ -115,8 +130,9 @@ class Phase02Audio(PhaseBase):
                     script, generator
                 )
 
-                # タイミング情報を保存
-                self._save_audio_timing(timing_data)
+                # タイミング情報を保存（一括アライメント時は結合後に保存）
+                if not full_alignment:
+                    self._save_audio_timing(timing_data)
             else:
                 # 通常の生成（タイムスタンプなし）
                 self.logger.warning(
@@ -128,6 +144,11 @@ class Phase02Audio(PhaseBase):
             self.logger.info("Combining audio segments...")
             full_audio_path = self._combine_audio_segments(segments)
 
+            # 4.5 結合後の音声で台本全体を一括アライメント
+            if full_alignment and timing_data is not None:
+                self._align_full_narration(full_audio_path, segments, timing_data)
+                self._save_audio_timing(timing_data)
+
             # 5. 音声解析
             self.logger.info("Analyzing generated audio...")
             analysis = self._analyze_audio(full_audio_path)
@@ -378,6 +399,7 @@ class Phase02Audio(PhaseBase):
                 # 🔥 新規追加: ElevenLabs Forced Alignment設定
                 use_elevenlabs_fa = self.phase_config.get("use_elevenlabs_fa", True)
                 elevenlabs_api_key = self.phase_config.get("elevenlabs_api_key")  # nullの場合はNone
+                synthesis_timing_config = self.phase_config.get("synthesis_timing", {})
 
                 generator = KokoroAudioGenerator(
                     api_url=kokoro_config.get("api_url"),
@@ -388,12 +410,14 @@ class Phase02Audio(PhaseBase):
                     whisper_config=whisper_config,
                     punctuation_pause_config=punctuation_pause_config,
                     use_elevenlabs_fa=use_elevenlabs_fa,
-                    elevenlabs_api_key=elevenlabs_api_key
+                    elevenlabs_api_key=elevenlabs_api_key,
+                    synthesis_timing_config=synthesis_timing_config
                 )
                 self.logger.info(
                     f"Kokoro TTS initialized: voice={kokoro_config.get('voice', 'jf_alpha')}, "
                     f"whisper_enabled={whisper_config.get('enabled', True)}, "
                     f"punctuation_pause_enabled={punctuation_pause_config.get('enabled', False)}, "
+                    f"synthesis_timing_enabled={synthesis_timing_config.get('enabled', False)}, "
                     f"elevenlabs_fa_enabled={use_elevenlabs_fa}"
                 )
                 return generator
@@ -553,263 +577,418 @@ class Phase02Audio(PhaseBase):
         cumulative_offset = 0.0  # 累積時間オフセット
         silence_duration = self.phase_config.get("inter_section_silence", 0.5)
 
-        for i, section in enumerate(script.sections, start=1):
-            self.logger.info(
-                f"Processing section {i}/{total_sections}: {section.section_id}"
+        # テキスト最適化は全セクション分を先に並列で投入し、
+        # TTS は最適化が済んだセクションから順に進める（セクション1の合成と
+        # セクション2以降の最適化が重なる）。各セクションの最適化は台本だけで決まる。
+        optimization_executor = None
+        optimization_futures = []
+        if optimizer:
+            max_workers = max(1, text_opt_config.get("max_workers", 4))
+            optimization_executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="text_opt"
             )
-
-            # テキストの最適化
-            text_to_generate = section.narration
-            display_text = section.narration  # デフォルトは元のテキスト
-
-            if optimizer:
-                try:
-                    optimized = optimizer.optimize_for_tts(
-                        text=section.narration,
-                        context=overall_context
-                    )
-                    # 最適化結果が辞書の場合
-                    if isinstance(optimized, dict):
-                        text_to_generate = optimized.get("tts_text", section.narration)
-                        display_text = optimized.get("display_text", section.narration)
-                        self.logger.info(f"Original: {section.narration[:50]}...")
-                        self.logger.info(f"TTS text: {text_to_generate[:50]}...")
-                        self.logger.info(f"Display text: {display_text[:50]}...")
-                    else:
-                        # 後方互換性: 文字列が返された場合
-                        text_to_generate = optimized
-                        display_text = optimized
-                        self.logger.info(f"Original: {section.narration[:50]}...")
-                        self.logger.info(f"Optimized: {optimized[:50]}...")
-                except Exception as e:
-                    self.logger.warning(f"Text optimization failed: {e}")
-                    self.logger.warning("Using original text")
-
-            # 前後のテキストを取得（文脈用）
-            previous_text = ""  # 空文字列で初期化
-            next_text = ""      # 同様に空文字列で初期化
-
-            if use_previous:
-                if i > 1:
-                    # Section 2以降: 前のセクションのナレーションを使用
-                    previous_text = script.sections[i-2].narration
-                    self.logger.debug(f"Section {i}: Using previous_text from section {i-1}")
-                elif i == 1:
-                    # Section 1: ダミーの文脈を追加して音声の一貫性を保つ
-                    previous_text = f"これから{script.subject}についてお話しします。"
-                    self.logger.info(f"Section 1: Using dummy context: {previous_text}")
-
-            if use_next and i < total_sections:
-                next_text = script.sections[i].narration
-                self.logger.debug(f"Section {i}: Using next_text from section {i+1}")
-
-            # デバッグログ: セクションごとのパラメータを確認
+            optimization_futures = [
+                submit_in_context(
+                    optimization_executor,
+                    self._optimize_section_text, optimizer, section, overall_context
+                )
+                for section in script.sections
+            ]
             self.logger.info(
-                f"Section {i} generation params: "
-                f"has_previous={previous_text is not None}, "
-                f"has_next={next_text is not None}"
+                f"Text optimization started for {total_sections} sections "
+                f"({max_workers} parallel)"
             )
 
-            # 🆕 タイトル音声とナレーション音声を別々に生成
-            title_audio_data = None
-            title_duration = 0.0
-            title_alignment = {}
+        try:
+            for i, section in enumerate(script.sections, start=1):
+                self.logger.info(
+                    f"Processing section {i}/{total_sections}: {section.section_id}"
+                )
 
-            # 音声ファイルパス
-            audio_path = sections_dir / f"section_{section.section_id:02d}.mp3"
-            title_audio_path = sections_dir / f"section_{section.section_id:02d}_title.mp3"
-            narration_audio_path = sections_dir / f"section_{section.section_id:02d}_narration.mp3"
+                # テキストの最適化（先行投入した結果を待つ。未完了ならここで待つ）
+                if optimization_futures:
+                    text_to_generate, display_text = optimization_futures[i - 1].result()
+                else:
+                    text_to_generate = section.narration
+                    display_text = section.narration  # デフォルトは元のテキスト
+
+                # 前後のテキストを取得（文脈用）
+                previous_text = ""  # 空文字列で初期化
+                next_text = ""      # 同様に空文字列で初期化
+
+                if use_previous:
+                    if i > 1:
+                        # Section 2以降: 前のセクションのナレーションを使用
+                        previous_text = script.sections[i-2].narration
+                        self.logger.debug(f"Section {i}: Using previous_text from section {i-1}")
+                    elif i == 1:
+                        # Section 1: ダミーの文脈を追加して音声の一貫性を保つ
+                        previous_text = f"これから{script.subject}についてお話しします。"
+                        self.logger.info(f"Section 1: Using dummy context: {previous_text}")
+
+                if use_next and i < total_sections:
+                    next_text = script.sections[i].narration
+                    self.logger.debug(f"Section {i}: Using next_text from section {i+1}")
+
+                # デバッグログ: セクションごとのパラメータを確認
+                self.logger.info(
+                    f"Section {i} generation params: "
+                    f"has_previous={previous_text is not None}, "
+                    f"has_next={next_text is not None}"
+                )
 
-            # タイムスタンプ付きで音声生成（文脈対応）
-            try:
-                # 🆕 1. タイトル音声を生成（0.8倍速）
-                if section_title_enabled and section.title:
-                    self.logger.info(f"Generating title audio: {section.title}")
+                # 🆕 タイトル音声とナレーション音声を別々に生成
+                title_audio_data = None
+                title_duration = 0.0
+                title_alignment = {}
 
-                    # 元の速度を保存
-                    original_speed = generator.speed
+                # 音声ファイルパス
+                audio_path = sections_dir / f"section_{section.section_id:02d}.mp3"
+                title_audio_path = sections_dir / f"section_{section.section_id:02d}_title.mp3"
+                narration_audio_path = sections_dir / f"section_{section.section_id:02d}_narration.mp3"
 
-                    # 速度を変更
-                    generator.speed = title_speed
+                # タイムスタンプ付きで音声生成（文脈対応）
+                try:
+                    # 🆕 1. タイトル音声を生成（0.8倍速）
+                    if section_title_enabled and section.title:
+                        self.logger.info(f"Generating title audio: {section.title}")
+
+                        # 元の速度を保存
+                        original_speed = generator.speed
+
+                        # 速度を変更
+                        generator.speed = title_speed
+
+                        try:
+                            title_result = generator.generate_with_timestamps(
+                                text=section.title,
+                                previous_text=None,
+                                next_text=None
+                            )
+
+                            # タイトル音声データをデコード
+                            title_audio_data = base64.b64decode(title_result['audio_base64'])
+
+                            # タイトル音声を一時ファイルに保存
+                            title_audio_path.parent.mkdir(parents=True, exist_ok=True)
+                            with open(title_audio_path, 'wb') as f:
+                                f.write(title_audio_data)
+
+                            # タイトルのタイミング情報を取得
+                            title_alignment = title_result.get('alignment', {})
+                            title_char_end_times = title_alignment.get('character_end_times_seconds', [])
+
+                            if title_char_end_times:
+                                title_duration = title_char_end_times[-1]
+                            else:
+                                # フォールバック
+                                title_duration = AudioProcessor(logger=self.logger).get_duration(title_audio_path)
+
+                            self.logger.info(f"✓ Title audio generated ({title_duration:.2f}s)")
+
+                        finally:
+                            # 速度を元に戻す
+                            generator.speed = original_speed
+
+                    # 🆕 2. 本文音声を生成（通常速度）
+                    result = generator.generate_with_timestamps(
+                        text=text_to_generate,
+                        previous_text=previous_text,
+                        next_text=next_text
+                    )
 
-                    try:
-                        title_result = generator.generate_with_timestamps(
-                            text=section.title,
-                            previous_text=None,
-                            next_text=None
-                        )
+                    # Base64エンコードされた音声データをデコード
+                    narration_audio_data = base64.b64decode(result['audio_base64'])
 
-                        # タイトル音声データをデコード
-                        title_audio_data = base64.b64decode(title_result['audio_base64'])
+                    # ナレーション音声を一時ファイルに保存
+                    narration_audio_path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(narration_audio_path, 'wb') as f:
+                        f.write(narration_audio_data)
 
-                        # タイトル音声を一時ファイルに保存
-                        title_audio_path.parent.mkdir(parents=True, exist_ok=True)
-                        with open(title_audio_path, 'wb') as f:
-                            f.write(title_audio_data)
+                    # タイミング情報を取得
+                    narration_alignment = result.get('alignment', {})
 
-                        # タイトルのタイミング情報を取得
-                        title_alignment = title_result.get('alignment', {})
-                        title_char_end_times = title_alignment.get('character_end_times_seconds', [])
+                    # 音声の長さを取得（タイムスタンプから計算）
+                    char_end_times = narration_alignment.get('character_end_times_seconds', [])
+                    if char_end_times:
+                        # 最後の文字の終了時間が音声の長さ
+                        narration_duration = char_end_times[-1]
+                        self.logger.debug(f"Narration duration from timestamps: {narration_duration:.2f}s")
+                    else:
+                        # フォールバック: ffprobeを使用
+                        try:
+                            narration_duration = AudioProcessor(logger=self.logger).get_duration(narration_audio_path)
+                            self.logger.debug(f"Narration duration from ffprobe: {narration_duration:.2f}s")
+                        except Exception as e:
+                            # ffprobeも失敗した場合は推定値を使用
+                            self.logger.warning(f"Could not get duration from ffprobe: {e}")
+                            # 文字数から推定（1文字あたり約0.2秒と仮定）
+                            narration_duration = len(section.narration) * 0.2
+                            self.logger.warning(f"Using estimated narration duration: {narration_duration:.2f}s")
+
+                    # 🆕 3. 音声を結合（タイトル + 無音 + ナレーション）
+                    if section_title_enabled and title_audio_data:
+                        # AudioProcessorを使用して結合（Python 3.13対応）
+                        audio_processor = AudioProcessor(logger=self.logger)
+                    
+                        # タイトルとナレーションを結合（間に無音を挿入）
+                        audio_files = [Path(title_audio_path), Path(narration_audio_path)]
+                        total_duration = audio_processor.combine_audio_files(
+                            audio_paths=audio_files,
+                            output_path=Path(audio_path),
+                            silence_duration=title_silence_after
+                        )
 
-                        if title_char_end_times:
-                            title_duration = title_char_end_times[-1]
-                        else:
-                            # フォールバック
-                            title_duration = generator._get_audio_duration(title_audio_path)
+                        self.logger.info(
+                            f"✓ Combined audio: title({title_duration:.1f}s) + "
+                            f"silence({title_silence_after:.1f}s) + "
+                            f"narration({narration_duration:.1f}s) = {total_duration:.1f}s"
+                        )
+                    else:
+                        # タイトルなしの場合は、ナレーションのみ
+                        import shutil
+                        shutil.copy(narration_audio_path, audio_path)
+                        total_duration = narration_duration
+
+                    # 🆕 4. タイミング情報を構築
+                    timing_info = {
+                        'section_id': section.section_id,
+                        'section_title': section.title,  # 🆕 タイトル追加
+                        'text': section.narration,  # 元のテキスト（後方互換性のため）
+                        'tts_text': text_to_generate,  # 音声用テキスト
+                        'display_text': display_text,  # 字幕用テキスト
+                        'audio_path': str(audio_path),
+                        'offset': cumulative_offset,
+                        'total_duration': total_duration
+                    }
 
-                        self.logger.info(f"✓ Title audio generated ({title_duration:.2f}s)")
+                    # 🆕 タイトルのタイミング情報を追加
+                    if section_title_enabled and title_audio_data:
+                        timing_info['title_timing'] = {
+                            'text': section.title,
+                            'start_time': 0.0,  # セクション内の相対時間
+                            'end_time': title_duration,
+                            'speed': title_speed,
+                            'special_type': 'section_title',
+                            'characters': title_alignment.get('characters', []),
+                            'char_start_times': title_alignment.get('character_start_times_seconds', []),
+                            'char_end_times': title_alignment.get('character_end_times_seconds', [])
+                        }
+
+                        # 🆕 無音のタイミング情報を追加
+                        timing_info['silence_after_title'] = {
+                            'start_time': title_duration,
+                            'end_time': title_duration + title_silence_after,
+                            'duration': title_silence_after
+                        }
+
+                        # 🆕 ナレーションのタイミング情報（オフセット調整済み）
+                        narration_start = title_duration + title_silence_after
+                        timing_info['narration_timing'] = {
+                            'text': section.narration,
+                            'start_time': narration_start,
+                            'end_time': narration_start + narration_duration,
+                            'characters': narration_alignment.get('characters', []),
+                            'char_start_times': narration_alignment.get('character_start_times_seconds', []),
+                            'char_end_times': narration_alignment.get('character_end_times_seconds', [])
+                        }
+                    else:
+                        # タイトルなしの場合は、従来通り
+                        timing_info['characters'] = narration_alignment.get('characters', [])
+                        timing_info['char_start_times'] = narration_alignment.get('character_start_times_seconds', [])
+                        timing_info['char_end_times'] = narration_alignment.get('character_end_times_seconds', [])
+                        timing_info['duration'] = narration_duration
+
+                    timing_data.append(timing_info)
+
+                    # セグメント情報を記録
+                    segment = AudioSegment(
+                        section_id=section.section_id,
+                        audio_path=str(audio_path),
+                        duration=total_duration
+                    )
+                    segments.append(segment)
 
-                    finally:
-                        # 速度を元に戻す
-                        generator.speed = original_speed
+                    self.logger.info(
+                        f"✓ Section {i}/{total_sections} generated with timestamps "
+                        f"(total: {total_duration:.1f}s)"
+                    )
 
-                # 🆕 2. 本文音声を生成（通常速度）
-                result = generator.generate_with_timestamps(
-                    text=text_to_generate,
-                    previous_text=previous_text,
-                    next_text=next_text
-                )
+                    # ストリーミング受け渡し: Phase 7 はこのセクションの尺が決まった時点でエンコードを始められる
+                    self.publish_section_event(AUDIO_READY, section.section_id, duration=total_duration)
 
-                # Base64エンコードされた音声データをデコード
-                narration_audio_data = base64.b64decode(result['audio_base64'])
+                    # 累積オフセットを更新
+                    cumulative_offset += total_duration + silence_duration
 
-                # ナレーション音声を一時ファイルに保存
-                narration_audio_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(narration_audio_path, 'wb') as f:
-                    f.write(narration_audio_data)
+                except Exception as e:
+                    self.logger.error(
+                        f"Failed to generate audio with timestamps for "
+                        f"section {section.section_id}: {e}"
+                    )
+                    raise
+        finally:
+            # 途中で失敗した場合（最適化結果の待機を含む）も残りの最適化を取り消してスレッドを解放する
+            # （正常終了時は全セクションの結果を受け取り済み）
+            if optimization_executor:
+                optimization_executor.shutdown(wait=False, cancel_futures=True)
 
-                # タイミング情報を取得
-                narration_alignment = result.get('alignment', {})
+        return segments, timing_data
 
-                # 音声の長さを取得（タイムスタンプから計算）
-                char_end_times = narration_alignment.get('character_end_times_seconds', [])
-                if char_end_times:
-                    # 最後の文字の終了時間が音声の長さ
-                    narration_duration = char_end_times[-1]
-                    self.logger.debug(f"Narration duration from timestamps: {narration_duration:.2f}s")
-                else:
-                    # フォールバック: ffprobeを使用
-                    try:
-                        narration_duration = generator._get_audio_duration(narration_audio_path)
-                        self.logger.debug(f"Narration duration from ffprobe: {narration_duration:.2f}s")
-                    except Exception as e:
-                        # ffprobeも失敗した場合は推定値を使用
-                        self.logger.warning(f"Could not get duration from ffprobe: {e}")
-                        # 文字数から推定（1文字あたり約0.2秒と仮定）
-                        narration_duration = len(section.narration) * 0.2
-                        self.logger.warning(f"Using estimated narration duration: {narration_duration:.2f}s")
-
-                # 🆕 3. 音声を結合（タイトル + 無音 + ナレーション）
-                if section_title_enabled and title_audio_data:
-                    # AudioProcessorを使用して結合（Python 3.13対応）
-                    audio_processor = AudioProcessor(logger=self.logger)
-                    
-                    # タイトルとナレーションを結合（間に無音を挿入）
-                    audio_files = [Path(title_audio_path), Path(narration_audio_path)]
-                    total_duration = audio_processor.combine_audio_files(
-                        audio_paths=audio_files,
-                        output_path=Path(audio_path),
-                        silence_duration=title_silence_after
-                    )
+    def _configure_full_alignment(self, generator) -> bool:
+        """
+        一括アライメント（whisper.alignment_scope: "full"）を使うか判定
 
-                    self.logger.info(
-                        f"✓ Combined audio: title({title_duration:.1f}s) + "
-                        f"silence({title_silence_after:.1f}s) + "
-                        f"narration({narration_duration:.1f}s) = {total_duration:.1f}s"
-                    )
-                else:
-                    # タイトルなしの場合は、ナレーションのみ
-                    import shutil
-                    shutil.copy(narration_audio_path, audio_path)
-                    total_duration = narration_duration
-
-                # 🆕 4. タイミング情報を構築
-                timing_info = {
-                    'section_id': section.section_id,
-                    'section_title': section.title,  # 🆕 タイトル追加
-                    'text': section.narration,  # 元のテキスト（後方互換性のため）
-                    'tts_text': text_to_generate,  # 音声用テキスト
-                    'display_text': display_text,  # 字幕用テキスト
-                    'audio_path': str(audio_path),
-                    'offset': cumulative_offset,
-                    'total_duration': total_duration
-                }
+        使う場合は生成器のセクションごとのアライメントを止める。
+        stable-ts が無い場合や生成器が対応していない場合は従来通りセクションごと。
+        """
+        whisper_config = self.phase_config.get("whisper", {})
+        if whisper_config.get("alignment_scope", "section") != "full":
+            return False
+        if not hasattr(generator, "defer_alignment"):
+            return False
+        if not (whisper_config.get("enabled", True) and WHISPER_AVAILABLE and STABLE_WHISPER_AVAILABLE):
+            self.logger.warning(
+                "Full-narration alignment requires Whisper and stable-ts. "
+                "Falling back to per-section alignment."
+            )
+            return False
 
-                # 🆕 タイトルのタイミング情報を追加
-                if section_title_enabled and title_audio_data:
-                    timing_info['title_timing'] = {
-                        'text': section.title,
-                        'start_time': 0.0,  # セクション内の相対時間
-                        'end_time': title_duration,
-                        'speed': title_speed,
-                        'special_type': 'section_title',
-                        'characters': title_alignment.get('characters', []),
-                        'char_start_times': title_alignment.get('character_start_times_seconds', []),
-                        'char_end_times': title_alignment.get('character_end_times_seconds', [])
-                    }
+        generator.defer_alignment = True
+        self.logger.info("Per-section alignment deferred to full-narration alignment")
+        return True
 
-                    # 🆕 無音のタイミング情報を追加
-                    timing_info['silence_after_title'] = {
-                        'start_time': title_duration,
-                        'end_time': title_duration + title_silence_after,
-                        'duration': title_silence_after
-                    }
+    def _align_full_narration(
+        self,
+        full_audio_path: Path,
+        segments: List[AudioSegment],
+        timing_data: List[Dict[str, Any]]
+    ):
+        """
+        narration_full.mp3 に台本全体を一括アライメントし、各セクションの
+        タイミング情報（タイトル・ナレーション）に切り分けて書き込む
 
-                    # 🆕 ナレーションのタイミング情報（オフセット調整済み）
-                    narration_start = title_duration + title_silence_after
-                    timing_info['narration_timing'] = {
-                        'text': section.narration,
-                        'start_time': narration_start,
-                        'end_time': narration_start + narration_duration,
-                        'characters': narration_alignment.get('characters', []),
-                        'char_start_times': narration_alignment.get('character_start_times_seconds', []),
-                        'char_end_times': narration_alignment.get('character_end_times_seconds', [])
-                    }
-                else:
-                    # タイトルなしの場合は、従来通り
-                    timing_info['characters'] = narration_alignment.get('characters', [])
-                    timing_info['char_start_times'] = narration_alignment.get('character_start_times_seconds', [])
-                    timing_info['char_end_times'] = narration_alignment.get('character_end_times_seconds', [])
-                    timing_info['duration'] = narration_duration
+        セクションの位置は _combine_audio_segments で確定した segment.start_time を使う。
+        生成時点でタイミングが得られている部分（合成情報からのタイミングなど）はそのまま。
 
-                timing_data.append(timing_info)
+        Args:
+            full_audio_path: 結合済み音声
+            segments: AudioSegmentのリスト（start_time 設定済み）
+            timing_data: タイミング情報のリスト（更新される）
+        """
+        targets = []
+        for segment, timing_info in zip(segments, timing_data):
+            if 'narration_timing' in timing_info:
+                title_timing = timing_info['title_timing']
+                narration_timing = timing_info['narration_timing']
+                parts = [
+                    (title_timing, title_timing['text'], title_timing['start_time'], title_timing['end_time']),
+                    (narration_timing, timing_info['tts_text'], narration_timing['start_time'], narration_timing['end_time'])
+                ]
+            else:
+                parts = [(timing_info, timing_info['tts_text'], 0.0, timing_info['duration'])]
 
-                # セグメント情報を記録
-                segment = AudioSegment(
-                    section_id=section.section_id,
-                    audio_path=str(audio_path),
-                    duration=total_duration
-                )
-                segments.append(segment)
+            for target, text, start, end in parts:
+                if target.get('characters') or not text:
+                    continue
+                piece = AlignmentPiece(text, segment.start_time + start, segment.start_time + end)
+                targets.append((target, piece))
 
-                self.logger.info(
-                    f"✓ Section {i}/{total_sections} generated with timestamps "
-                    f"(total: {total_duration:.1f}s)"
-                )
+        if not targets:
+            self.logger.info("All sections already have timings, skipping full-narration alignment")
+            return
 
-                # 累積オフセットを更新
-                cumulative_offset += total_duration + silence_duration
+        whisper_config = self.phase_config.get("whisper", {})
+        full_config = whisper_config.get("full_alignment", {})
+        try:
+            extractor = WhisperTimingExtractor(
+                model_name=whisper_config.get("model", "base"),
+                logger=self.logger,
+                language=whisper_config.get("language", "ja"),
+                use_stable_ts=True,
+                suppress_silence=whisper_config.get("suppress_silence", True),
+                vad=whisper_config.get("vad", True),
+                vad_threshold=whisper_config.get("vad_threshold", 0.35),
+                backend="align"
+            )
+            aligner = NarrationAligner(
+                extractor,
+                chunk_seconds=full_config.get("chunk_seconds", 120.0),
+                overlap=full_config.get("overlap", 1.0),
+                logger=self.logger
+            )
+            alignments = aligner.align(full_audio_path, [piece for _, piece in targets])
+        except Exception as e:
+            self.logger.error(f"Full-narration alignment failed: {e}")
+            alignments = [{} for _ in targets]
+            aligner = None
+
+        # 失敗した部分は文字種の重みで長さを按分
+        estimator = SynthesisTimingBuilder(logger=self.logger)
+        estimated = 0
+        for (target, piece), alignment in zip(targets, alignments):
+            if not alignment.get('characters'):
+                alignment = estimator.build([SynthesisChunk(piece.text, piece.end - piece.start)])
+                estimated += 1
+            target['characters'] = alignment['characters']
+            target['char_start_times'] = alignment['character_start_times_seconds']
+            target['char_end_times'] = alignment['character_end_times_seconds']
+
+        if aligner:
+            self.logger.info(
+                f"✓ Full-narration alignment: {len(targets)} parts in "
+                f"{aligner.stats['chunks']} chunks ({aligner.stats['seconds']:.1f}s), "
+                f"{estimated} estimated"
+            )
+        else:
+            self.logger.warning(f"Estimated timings for {estimated} parts")
 
-            except Exception as e:
-                self.logger.error(
-                    f"Failed to generate audio with timestamps for "
-                    f"section {section.section_id}: {e}"
-                )
-                raise
+    def _optimize_section_text(
+        self,
+        optimizer: TextOptimizer,
+        section: ScriptSection,
+        overall_context: Optional[str]
+    ) -> tuple[str, str]:
+        """
+        1セクションのテキストを音声合成用に最適化（ワーカースレッドで実行）
 
-        return segments, timing_data
+        Returns:
+            (音声用テキスト, 字幕用テキスト)。失敗時は元のナレーション
+        """
+        try:
+            optimized = optimizer.optimize_for_tts(
+                text=section.narration,
+                context=overall_context
+            )
+        except Exception as e:
+            self.logger.warning(f"Text optimization failed for section {section.section_id}: {e}")
+            self.logger.warning("Using original text")
+            return section.narration, section.narration
+
+        # 最適化結果が辞書の場合
+        if isinstance(optimized, dict):
+            text_to_generate = optimized.get("tts_text", section.narration)
+            display_text = optimized.get("display_text", section.narration)
+            self.logger.info(f"Section {section.section_id} original: {section.narration[:50]}...")
+            self.logger.info(f"Section {section.section_id} TTS text: {text_to_generate[:50]}...")
+            self.logger.info(f"Section {section.section_id} display text: {display_text[:50]}...")
+            return text_to_generate, display_text
+
+        # 後方互換性: 文字列が返された場合
+        self.logger.info(f"Section {section.section_id} original: {section.narration[:50]}...")
+        self.logger.info(f"Section {section.section_id} optimized: {optimized[:50]}...")
+        return optimized, optimized
 
     def _save_audio_timing(self, timing_data: List[Dict[str, Any]]):
         """
         音声タイミング情報をJSONファイルに保存
 
+        JSON（互換用）と並べて列指向ストア（audio_timing.timing/）も書く。
+
         Args:
             timing_data: タイミング情報のリスト
         """
         timing_path = self.phase_dir / "audio_timing.json"
-
-        with open(timing_path, 'w', encoding='utf-8') as f:
-            json.dump(timing_data, f, indent=2, ensure_ascii=False)
+        save_timing_data(timing_path, timing_data)
 
         self.logger.info(
             f"Audio timing data saved: {timing_path} "
@@ -938,49 +1117,47 @@ class Phase02Audio(PhaseBase):
         """
         台本全体をひらがなに変換（ElevenLabs用）
 
+        MeCab の読みとユーザー辞書でセクションごとにオフライン変換し、
+        読めない語だけを Claude に問い合わせる（KanaConverter）。
+
         Args:
             script: 元の台本
 
         Returns:
-            ひらがな変換後の台本
-
-        Raises:
-            PhaseExecutionError: 変換失敗時
+            ひらがな変換後の台本（失敗時は元の台本）
         """
         self.logger.info("Converting script to hiragana for ElevenLabs...")
 
         try:
-            # Claude APIキーを取得
-            claude_api_key = self.config.get_api_key("CLAUDE_API_KEY")
-
-            # 台本全体のナレーションを結合
-            all_narrations = []
-            for section in script.sections:
-                all_narrations.append(f"[Section {section.section_id}]\n{section.narration}")
-
-            full_text = "\n\n".join(all_narrations)
-
-            # Claude APIでひらがな変換
-            hiragana_text = self._convert_to_hiragana_via_claude(
-                full_text,
-                claude_api_key
+            kana_config = self.phase_config.get("kana_conversion", {})
+            cache_dir = self.config.get_path("cache_dir")
+            user_dictionary = kana_config.get(
+                "user_dictionary", "config/dictionaries/kana_user_dict.yaml"
+            )
+            converter = KanaConverter(
+                morphology=get_morphology_service(
+                    cache_dir=cache_dir / "morphology",
+                    logger=self.logger
+                ),
+                user_dictionary=self.config.project_root / user_dictionary,
+                cache_dir=cache_dir / "kana" if kana_config.get("cache", True) else None,
+                llm_fallback=kana_config.get("llm_fallback", True),
+                model=kana_config.get("model", "claude-sonnet-4-20250514"),
+                logger=self.logger
             )
 
-            # セクションごとに分割して台本に戻す
-            hiragana_sections = hiragana_text.split("[Section")
-
-            for i, section in enumerate(script.sections):
-                if i + 1 < len(hiragana_sections):
-                    # セクション番号を除去してナレーションを取得
-                    section_text = hiragana_sections[i + 1]
-                    # "]" の後のテキストを取得（section_id部分をスキップ）
-                    if "]" in section_text:
-                        section_text = section_text.split("]", 1)[1].strip()
-                        section.narration = section_text
-                    else:
-                        self.logger.warning(f"Failed to parse hiragana text for section {section.section_id}")
+            hiragana_texts = converter.convert_many(
+                [section.narration for section in script.sections]
+            )
+            for section, hiragana_text in zip(script.sections, hiragana_texts):
+                section.narration = hiragana_text
 
-            self.logger.info("✓ Hiragana conversion completed")
+            self.logger.info(
+                f"✓ Hiragana conversion completed "
+                f"(cached: {converter.stats['cache_hits']}, "
+                f"OOV tokens: {converter.stats['oov_tokens']}, "
+                f"LLM calls: {converter.stats['llm_calls']})"
+            )
             return script
 
         except Exception as e:
@@ -989,78 +1166,6 @@ class Phase02Audio(PhaseBase):
             # エラー時は元のscriptを返す
             return script
 
-    def _convert_to_hiragana_via_claude(
-        self,
-        text: str,
-        api_key: str
-    ) -> str:
-        """
-        Claude APIでひらがな変換
-
-        Args:
-            text: 元のテキスト
-            api_key: Claude APIキー
-
-        Returns:
-            ひらがな変換後のテキスト
-
-        Raises:
-            Exception: API呼び出し失敗時
-        """
-        import anthropic
-
-        client = anthropic.Anthropic(api_key=api_key)
-
-        prompt = f"""以下の日本語テキストを、すべてひらがなに変換してください。
-
-【変換ルール】
-1. 漢字、カタカナをすべてひらがなに変換
-2. 句読点（。、！？）はそのまま保持
-3. 改行もそのまま保持
-4. [Section N] のようなマーカーもそのまま保持
-5. 数字は「いち」「に」「さん」などひらがなに変換
-6. 英数字が含まれる場合は、読み方をひらがなに変換
-
-【入力テキスト】
-\"\"\"
-{text}
-\"\"\"
-
-【出力】
-変換後のひらがなテキストのみを出力してください。
-説明や前置きは一切不要です。
-マーカー [Section N] は必ず保持してください。
-"""
-
-        try:
-            message = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=8000,
-                temperature=0,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-
-            hiragana_text = message.content[0].text.strip()
-
-            # 不要な装飾を除去
-            hiragana_text = hiragana_text.replace('```', '').replace('"""', '').strip()
-
-            self.logger.info("✓ Hiragana conversion completed")
-            self.logger.debug(f"Original length: {len(text)} chars")
-            self.logger.debug(f"Converted length: {len(hiragana_text)} chars")
-
-            return hiragana_text
-
-        except Exception as e:
-            self.logger.error(f"Hiragana conversion API call failed: {e}")
-            raise
-
-
-# ========================================
-# スタンドアロン実行用
-# ========================================
 
 def main():
     """テスト実行"""
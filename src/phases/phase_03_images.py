@@ -23,8 +23,10 @@ from src.core.models import (
     VideoScript
 )
 from src.core.config_manager import ConfigManager
+from src.core.section_events import IMAGES_READY
 from src.generators.image_generator import ImageGenerator
-from src.utils.image_resizer import resize_images_to_1920x1080
+from src.utils.image_resizer import ImageResizer, resize_images_to_1920x1080
+from src.utils.llm_gateway import get_llm_gateway
 
 
 class Phase03Images(PhaseBase):
@@ -58,6 +60,9 @@ class Phase03Images(PhaseBase):
 
         # KeywordGenerator（遅延初期化）
         self.keyword_generator = None
+
+        # 先読みしたキーワード {section_id: [keyword, ...]}
+        self._prefetched_keywords: Dict[int, List[str]] = {}
     
     def get_phase_number(self) -> int:
         return 3
@@ -154,29 +159,20 @@ class Phase03Images(PhaseBase):
         # 画像枚数の動的調整設定
         dynamic_count_config = self.phase_config.get("dynamic_image_count", {})
         dynamic_count_enabled = dynamic_count_config.get("enabled", False)
+
+        # キーワード不足のセクションは、Claude への問い合わせを先に並列で済ませる
+        self._prefetch_section_keywords(script.sections, images_per_section, dynamic_count_config)
         
         for section_idx, section in enumerate(script.sections):
             # section.section_idを使う（1-based indexing from JSON）
             self.logger.info(f"Generating images for Section {section.section_id}: {section.title}")
             
             # セクションの長さに応じて画像枚数を調整
-            target_count = images_per_section
+            target_count = self._get_target_count(section, images_per_section, dynamic_count_config)
             if dynamic_count_enabled:
-                thresholds = dynamic_count_config.get("thresholds", {})
-                long_threshold = thresholds.get("long", 500)
-                medium_threshold = thresholds.get("medium", 300)
-                
-                narration_length = len(section.narration)
-                if narration_length > long_threshold:
-                    target_count = 5
-                elif narration_length > medium_threshold:
-                    target_count = 4
-                else:
-                    target_count = 3
-                
                 self.logger.info(
                     f"Dynamic image count: {target_count} images "
-                    f"(narration length: {narration_length} chars)"
+                    f"(narration length: {len(section.narration)} chars)"
                 )
             
             # セクションの画像を生成
@@ -192,6 +188,14 @@ class Phase03Images(PhaseBase):
             
             all_images.extend(section_images)
             total_cost = generator.get_total_cost()
+
+            # ストリーミング受け渡し: 最終形（1920x1080 PNG）にしてから Phase 7 に渡す
+            if self.section_events is not None:
+                self.publish_section_event(
+                    IMAGES_READY,
+                    section.section_id,
+                    paths=self._finalize_section_images(section_images)
+                )
             
             self.logger.info(
                 f"Section {section_idx + 1} complete: "
@@ -406,6 +410,32 @@ class Phase03Images(PhaseBase):
 
         return generator
     
+    def _finalize_section_images(self, section_images: List[CollectedImage]) -> List[str]:
+        """
+        セクションの画像を先に 1920x1080 PNG にする（ストリーミング受け渡し時）
+
+        最後の一括リサイズと同じ結果になる: 変換済みの PNG は一括リサイズでスキップされ、
+        元の JPEG はここで削除する。file_path（.jpg）の更新は一括リサイズ後の処理に任せる。
+
+        Returns:
+            最終的な画像パス
+        """
+        resizer = ImageResizer(logger=self.logger, output_format="PNG")
+        final_paths = []
+        for img in section_images:
+            source = Path(img.file_path)
+            if not source.exists():
+                continue
+            try:
+                output = resizer.resize_image(source)
+            except Exception as e:
+                self.logger.warning(f"Early resize failed for {source.name}: {e}")
+                continue
+            if output != source and source.suffix.lower() == '.jpg':
+                source.unlink()
+            final_paths.append(str(output))
+        return final_paths
+
     def _generate_section_images(
         self,
         generator: ImageGenerator,
@@ -444,11 +474,13 @@ class Phase03Images(PhaseBase):
             # 不足分を計算
             needed_count = target_count - len(keywords)
 
-            # Claude APIでキーワード生成
-            generated_keywords = self._generate_keywords_for_section(
-                section=section,
-                count=needed_count
-            )
+            # Claude APIでキーワード生成（先読み済みならそれを使う）
+            generated_keywords = self._prefetched_keywords.pop(section_id, None)
+            if generated_keywords is None:
+                generated_keywords = self._generate_keywords_for_section(
+                    section=section,
+                    count=needed_count
+                )
 
             # 既存のキーワードに追加
             keywords.extend(generated_keywords)
@@ -624,6 +656,65 @@ class Phase03Images(PhaseBase):
             counts[classification] = counts.get(classification, 0) + 1
         return counts
 
+    def _get_target_count(self, section, images_per_section: int, dynamic_count_config: dict) -> int:
+        """セクションの画像枚数（dynamic_image_count が有効ならナレーション長で調整）"""
+        if not dynamic_count_config.get("enabled", False):
+            return images_per_section
+
+        thresholds = dynamic_count_config.get("thresholds", {})
+        narration_length = len(section.narration)
+        if narration_length > thresholds.get("long", 500):
+            return 5
+        if narration_length > thresholds.get("medium", 300):
+            return 4
+        return 3
+
+    def _prefetch_section_keywords(
+        self,
+        sections,
+        images_per_section: int,
+        dynamic_count_config: dict
+    ):
+        """
+        キーワードが不足している全セクションのキーワードを並列に生成
+
+        結果は self._prefetched_keywords に入れ、_generate_section_images() が使う。
+        同時実行数は LLM ゲートウェイのモデル別セマフォで制限される。
+        """
+        pending = []
+        for section in sections:
+            image_keywords = getattr(section, 'image_keywords', None) or []
+            target_count = self._get_target_count(section, images_per_section, dynamic_count_config)
+            if len(image_keywords) < target_count:
+                pending.append((section, target_count - len(image_keywords)))
+
+        if len(pending) < 2 or self._get_keyword_generator() is None:
+            return
+
+        self.logger.info(f"Prefetching keywords for {len(pending)} sections...")
+        results = get_llm_gateway().map(
+            lambda item: self._generate_keywords_for_section(item[0], item[1]),
+            pending
+        )
+        for (section, _), keywords in zip(pending, results):
+            self._prefetched_keywords[section.section_id] = keywords
+
+    def _get_keyword_generator(self):
+        """KeywordGenerator（未初期化なら初期化。APIキーがなければNone）"""
+        if self.keyword_generator is None:
+            try:
+                api_key = self.config.get_api_key("CLAUDE_API_KEY")
+            except Exception as e:
+                self.logger.error(f"CLAUDE_API_KEY not found: {e}. Cannot generate keywords.")
+                return None
+
+            from src.generators.keyword_generator import KeywordGenerator
+            self.keyword_generator = KeywordGenerator(
+                api_key=api_key,
+                logger=self.logger
+            )
+        return self.keyword_generator
+
     def _generate_keywords_for_section(
         self,
         section,
@@ -639,23 +730,13 @@ class Phase03Images(PhaseBase):
         Returns:
             生成されたキーワードのリスト
         """
-        # KeywordGeneratorが未初期化なら初期化
-        if not hasattr(self, 'keyword_generator') or self.keyword_generator is None:
-            try:
-                api_key = self.config.get_api_key("CLAUDE_API_KEY")
-            except Exception as e:
-                self.logger.error(f"CLAUDE_API_KEY not found: {e}. Cannot generate keywords.")
-                # フォールバック
-                return [self.subject] * count
-
-            from src.generators.keyword_generator import KeywordGenerator
-            self.keyword_generator = KeywordGenerator(
-                api_key=api_key,
-                logger=self.logger
-            )
+        keyword_generator = self._get_keyword_generator()
+        if keyword_generator is None:
+            # フォールバック
+            return [self.subject] * count
 
         # キーワード生成
-        keywords = self.keyword_generator.generate_keywords(
+        keywords = keyword_generator.generate_keywords(
             section_title=section.title,
             narration=section.narration,
             atmosphere=section.atmosphere,
@@ -4,7 +4,6 @@ Phase 6: 字幕生成（Subtitle Generation）
 台本と音声解析データから字幕を生成し、SRT形式で出力する。
 """
 
-import json
 import sys
 from pathlib import Path
 from typing import List, Optional, Any, Dict
@@ -27,6 +26,8 @@ from src.core.exceptions import (
     PhaseInputMissingError
 )
 from src.generators.subtitle_generator import create_subtitle_generator
+from src.utils.morphology import get_morphology_service
+from src.utils.timing_store import load_timing_data, save_timing_data
 
 
 class Phase06Subtitles(PhaseBase):
@@ -109,16 +110,25 @@ class Phase06Subtitles(PhaseBase):
                     [str(audio_timing_path)]
                 )
 
-            with open(audio_timing_path, 'r', encoding='utf-8') as f:
-                audio_timing_data = json.load(f)
+            audio_timing_data = load_timing_data(audio_timing_path)
 
             # 🆕 audio_timing_data を保存（後で使用）
             self.audio_timing_data = audio_timing_data
 
             # 2. 字幕生成（generator に委譲）
+            # 形態素解析の結果はフェーズ・実行をまたいでキャッシュ
+            morph_config = self.phase_config.get("morphological_analysis", {})
+            morphology_cache_dir = (
+                self.config.get_path("cache_dir") / "morphology"
+                if morph_config.get("cache", True) else None
+            )
             generator = create_subtitle_generator(
                 config=self.phase_config,
-                logger=self.logger
+                logger=self.logger,
+                morphology=get_morphology_service(
+                    cache_dir=morphology_cache_dir,
+                    logger=self.logger
+                )
             )
 
             subtitles = generator.generate_subtitles_from_char_timings(
@@ -352,8 +362,7 @@ class Phase06Subtitles(PhaseBase):
             "subtitles": all_subtitles
         }
 
-        with open(timing_path, 'w', encoding='utf-8') as f:
-            json.dump(timing_data, f, indent=2, ensure_ascii=False)
+        save_timing_data(timing_path, timing_data)
 
         self.logger.info(f"Timing JSON saved: {timing_path} ({len(all_subtitles)} subtitles)")
         return timing_path
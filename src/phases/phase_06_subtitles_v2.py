@@ -27,6 +27,7 @@ from src.core.exceptions import (
     PhaseInputMissingError
 )
 from src.generators.subtitle_generator import create_subtitle_generator
+from src.utils.morphology import get_morphology_service
 
 
 class Phase06SubtitlesV2(PhaseBase):
@@ -113,9 +114,19 @@ class Phase06SubtitlesV2(PhaseBase):
                 audio_timing_data = json.load(f)
 
             # 2. 字幕生成（generator に委譲）
+            # 形態素解析の結果はフェーズ・実行をまたいでキャッシュ
+            morph_config = self.phase_config.get("morphological_analysis", {})
+            morphology_cache_dir = (
+                self.config.get_path("cache_dir") / "morphology"
+                if morph_config.get("cache", True) else None
+            )
             generator = create_subtitle_generator(
                 config=self.phase_config,
-                logger=self.logger
+                logger=self.logger,
+                morphology=get_morphology_service(
+                    cache_dir=morphology_cache_dir,
+                    logger=self.logger
+                )
             )
 
             subtitles = generator.generate_subtitles_from_char_timings(
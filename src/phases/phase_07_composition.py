@@ -8,7 +8,7 @@ import platform
 import re
 import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
 from datetime import datetime
 
 try:
@@ -39,6 +39,21 @@ from ..core.config_manager import ConfigManager
 from ..core.models import VideoComposition, VideoTimeline, TimelineClip, SubtitleEntry
 from ..utils.image_timing_matcher_fixed import ImageTimingMatcherFixed
 from ..utils.image_timing_matcher_llm import ImageTimingMatcherLLM
+from ..utils.encoder_profile import EncodeSettings, resolve_encode_settings
+from ..utils.shorts_renderer import RENDER_SOURCES_FILE, save_render_sources
+from ..utils.telemetry import span
+from ..utils.timing_store import load_timing_data
+
+try:
+    from ..utils.video_composition.frame_server import (
+        CV2_AVAILABLE as FRAME_SERVER_AVAILABLE,
+        FramePlan,
+        FrameServerRenderer,
+        build_frame_clips,
+        rasterize_subtitles,
+    )
+except ImportError:
+    FRAME_SERVER_AVAILABLE = False
 
 
 class Phase07Composition(PhaseBase):
@@ -145,6 +160,23 @@ class Phase07Composition(PhaseBase):
         self.encode_preset = perf_config.get("preset", "faster")
         self.parallel_processing = perf_config.get("parallel_processing", True)
         self.threads = perf_config.get("threads", 0)
+        self.bake_overlays = perf_config.get("bake_overlays", False)
+
+        # ホストのエンコーダープロファイル（python -m src.cli calibrate-encoder）があれば preset / crf / threads を上書き
+        final_encode = resolve_encode_settings(
+            config, "final", EncodeSettings(self.encode_preset, 23, self.threads), self.logger
+        )
+        self.encode_preset = final_encode.preset
+        self.encode_crf = final_encode.crf
+        self.threads = final_encode.threads
+        self.segment_encode = resolve_encode_settings(config, "still_segment", logger=self.logger)
+
+        # フレームサーバー方式（NumPy/OpenCV でフレーム生成 → ffmpeg にパイプ）
+        self.use_frame_server = perf_config.get("use_frame_server", False)
+        self.frame_server_config = perf_config.get("frame_server", {}) or {}
+
+        # ストリーミング受け渡し時のセグメント先行エンコード（start_segment_prefetch で開始）
+        self.segment_prefetcher = None
     
     def get_phase_number(self) -> int:
         return 7
@@ -226,6 +258,17 @@ class Phase07Composition(PhaseBase):
             self.logger.info("🎬 Executing legacy moviepy composition")
             return self._execute_legacy()
 
+        # フレームサーバー方式の分岐
+        if self.use_frame_server:
+            if FRAME_SERVER_AVAILABLE:
+                self.logger.info("🎞️ Using frame server composition (NumPy frames piped to ffmpeg)")
+                return self._execute_frame_server()
+            self.logger.warning(
+                "Frame server requires opencv-python (pip install opencv-python), "
+                "falling back to ffmpeg direct integration"
+            )
+            return self._execute_ffmpeg_direct()
+
         # ffmpeg直接統合モードの分岐
         if self.use_ffmpeg_direct:
             self.logger.info("🔥 Using ffmpeg direct integration (high-speed mode)")
@@ -490,8 +533,7 @@ class Phase07Composition(PhaseBase):
             self.logger.warning("Subtitle data not found, using empty list")
             return []
 
-        with open(subtitle_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_timing_data(subtitle_path)
 
         subtitles = []
         for item in data.get("subtitles", []):
@@ -522,8 +564,7 @@ class Phase07Composition(PhaseBase):
             return None
 
         try:
-            with open(subtitle_timing_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_timing_data(subtitle_timing_path)
             self.logger.info(f"Loaded subtitle_timing.json with {len(data.get('subtitles', []))} entries")
             return data
         except Exception as e:
@@ -539,8 +580,7 @@ class Phase07Composition(PhaseBase):
             return None
         
         try:
-            with open(audio_timing_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_timing_data(audio_timing_path)
             
             # Phase 2がリスト形式で保存している場合、辞書形式に変換
             if isinstance(data, list):
@@ -1441,6 +1481,7 @@ class Phase07Composition(PhaseBase):
     def _load_japanese_font(self, size: int):
         """日本語フォントを読み込む（cinecaption226.ttf優先）"""
         from PIL import ImageFont
+        from src.utils.font_cache import load_first_font
 
         # プロジェクトルートからフォントパスを取得
         project_root = self.config.project_root
@@ -1467,13 +1508,11 @@ class Phase07Composition(PhaseBase):
             "/System/Library/Fonts/ヒラギノ角ゴシック W3.ttc",  # macOS
         ]
 
-        for font_path in font_paths:
-            try:
-                font = ImageFont.truetype(font_path, size)
-                self.logger.info(f"Using font: {font_path}")
-                return font
-            except:
-                continue
+        # 候補の探索と読み込みはプロセス内でキャッシュ（常駐ワーカーではジョブをまたいで再利用）
+        font, font_path = load_first_font(font_paths, size)
+        if font is not None:
+            self.logger.info(f"Using font: {font_path}")
+            return font
 
         # フォントが見つからない場合はデフォルト
         self.logger.warning("Japanese font not found, using default font")
@@ -1497,10 +1536,11 @@ class Phase07Composition(PhaseBase):
         try:
             # 1. データ読み込み
             self.logger.info("Loading data...")
-            audio_path = self._get_audio_path()
-            audio_timing = self._load_audio_timing()
-            subtitles = self._load_subtitles()
-            script = self._load_script()
+            with span("load_data"):
+                audio_path = self._get_audio_path()
+                audio_timing = self._load_audio_timing()
+                subtitles = self._load_subtitles()
+                script = self._load_script()
 
             # 2. BGM読み込み（YAML設定から音量を取得）
             bgm_config = self.phase_config.get("bgm", {})
@@ -1510,15 +1550,18 @@ class Phase07Composition(PhaseBase):
                 f"Loading BGM data (base volume: {base_volume:.0%}, "
                 f"amplification: {amplification:.1f}x)..."
             )
-            bgm_data = self._load_bgm()
+            with span("load_bgm"):
+                bgm_data = self._load_bgm()
 
             # 3. セグメントベースの動画生成（字幕同期の問題を解決）
             self.logger.info("Creating video using segment-based approach...")
-            final_output = self._create_segment_videos_then_concat(audio_path, bgm_data)
+            with span("segment_composition"):
+                final_output = self._create_segment_videos_then_concat(audio_path, bgm_data)
 
             # 4. サムネイル生成
             self.logger.info("Generating thumbnail...")
-            thumbnail_path = self._generate_thumbnail_with_ffmpeg(final_output)
+            with span("thumbnail"):
+                thumbnail_path = self._generate_thumbnail_with_ffmpeg(final_output)
 
             # 5. メタデータ生成
             render_time = time.time() - render_start
@@ -1562,356 +1605,738 @@ class Phase07Composition(PhaseBase):
             self.logger.error(f"Video composition failed: {e}", exc_info=True)
             raise
 
-    def _create_segment_videos_then_concat(self, audio_path: Path, bgm_data: Optional[dict]) -> Path:
+    def _execute_frame_server(self) -> VideoComposition:
         """
-        セグメントごとに動画を作成してから連結（方法2: タイミング同期の問題を解決）
+        フレームサーバー方式で統合
 
-        利点：
-        - 各セグメントのタイミングが正確
-        - concat demuxerで高速結合
-        - 字幕の同期問題なし
+        - 画像の表示区間は ffmpeg direct と同じ（_calculate_image_timings）
+        - 各フレームはワーカープロセスが cv2.warpAffine（Ken Burns）+ 字幕のアルファ合成で生成
+        - フレームは共有メモリのリングバッファ経由で1つの ffmpeg に順番どおりパイプ
+        - 音声・BGM のミックスは ffmpeg direct と同じフィルタ（_build_audio_filter）
 
-        手順：
-        1. 各画像を個別の動画に変換（字幕なし）
-        2. concat demuxerで連結
-        3. ASS字幕を適用
+        メモリ使用量はリングのサイズで決まり、動画の長さに依存しない。
+        """
+        import tempfile
+
+        render_start = time.time()
+
+        try:
+            # 1. データ読み込み
+            self.logger.info("Loading data...")
+            with span("load_data"):
+                audio_path = self._get_audio_path()
+                subtitles = self._load_subtitles()
+            with span("load_bgm"):
+                bgm_data = self._load_bgm()
+
+            # 2. 画像ごとの表示区間
+            image_timings, audio_duration = self._calculate_image_timings(audio_path)
+            if not image_timings:
+                raise ValueError("No image timings calculated")
+
+            output_dir = Path(self.config.get("paths", {}).get("output_dir", "data/output")) / "videos"
+            output_dir.mkdir(parents=True, exist_ok=True)
+            final_output = output_dir / f"{self.subject}.mp4"
+
+            fs_config = self.frame_server_config
+            effects_config = self.phase_config.get("visual_effects", {})
+
+            with tempfile.TemporaryDirectory(prefix="frame_server_") as temp_dir:
+                # 3. 字幕を RGBA 画像にラスタライズ
+                with span("rasterize_subtitles", subtitles=len(subtitles)):
+                    overlays = self._rasterize_subtitle_overlays(subtitles, Path(temp_dir))
+
+                plan = FramePlan(
+                    width=self.resolution[0],
+                    height=self.resolution[1],
+                    fps=self.fps,
+                    total_frames=int(round(audio_duration * self.fps)),
+                    clips=build_frame_clips(image_timings, ken_burns=fs_config.get("ken_burns", True)),
+                    overlays=overlays,
+                    bar_height=fs_config.get("bar_height", 216),
+                    gradient_ratio=fs_config.get("gradient_ratio", 0.0),
+                    zoom_speed=effects_config.get("zoom_speed", 0.0003),
+                    max_zoom=effects_config.get("max_zoom", 1.15),
+                )
+
+                # 4. フレーム生成 + エンコード
+                extra_inputs, output_args = self._frame_server_encoder_args(audio_path, bgm_data, audio_duration)
+                renderer = FrameServerRenderer(
+                    workers=fs_config.get("workers", 0),
+                    ring_size=fs_config.get("ring_size", 16),
+                    logger=self.logger
+                )
+                with span("frame_server", frames=plan.total_frames):
+                    renderer.render(plan, final_output, extra_inputs, output_args)
+
+            # 5. サムネイル生成
+            self.logger.info("Generating thumbnail...")
+            with span("thumbnail"):
+                thumbnail_path = self._generate_thumbnail_with_ffmpeg(final_output)
+
+            # 6. メタデータ生成
+            render_time = time.time() - render_start
+            file_size_mb = final_output.stat().st_size / (1024 * 1024)
+
+            composition = VideoComposition(
+                subject=self.subject,
+                output_video_path=str(final_output),
+                thumbnail_path=str(thumbnail_path),
+                metadata_path=str(self.phase_dir / "metadata.json"),
+                timeline=VideoTimeline(
+                    subject=self.subject,
+                    clips=[],
+                    audio_path=str(audio_path),
+                    bgm_segments=[],
+                    subtitles=subtitles,
+                    total_duration=audio_duration,
+                    resolution=self.resolution,
+                    fps=self.fps
+                ),
+                render_time_seconds=render_time,
+                file_size_mb=file_size_mb,
+                completed_at=datetime.now()
+            )
+
+            self._save_metadata(composition)
+
+            self.logger.info(f"✅ Composition completed in {render_time:.1f}s (frame server)")
+            self.logger.info(f"Final video: {final_output}")
+            self.logger.info(f"File size: {file_size_mb:.1f} MB")
+            return composition
+
+        except Exception as e:
+            self.logger.error(f"Video composition failed: {e}", exc_info=True)
+            raise
+
+    def _rasterize_subtitle_overlays(self, subtitles: List[SubtitleEntry], out_dir: Path) -> list:
+        """
+        字幕を RGBA 画像にラスタライズ（ASS の Default / SectionTitle スタイルに合わせる）
+
+        Returns:
+            FrameOverlay のリスト
+        """
+        impact_level_map = {}
+        subtitle_timing_data = self._load_subtitle_timing()
+        if subtitle_timing_data:
+            for sub_data in subtitle_timing_data.get('subtitles', []):
+                if sub_data.get('index'):
+                    impact_level_map[sub_data['index']] = sub_data.get('impact_level', 'none')
+
+        entries = []
+        for subtitle in subtitles:
+            lines = [
+                line.strip()
+                for line in (subtitle.text_line1, subtitle.text_line2, subtitle.text_line3)
+                if line and line.strip()
+            ]
+            entries.append({
+                'start_time': subtitle.start_time,
+                'end_time': subtitle.end_time,
+                'lines': lines,
+                'section_title': impact_level_map.get(subtitle.index) == 'section_title',
+            })
+
+        fs_config = self.frame_server_config
+        return rasterize_subtitles(
+            entries,
+            out_dir,
+            font=self._load_japanese_font(fs_config.get("font_size", 48)),
+            width=self.resolution[0],
+            height=self.resolution[1],
+            margin_bottom=fs_config.get("margin_bottom", 70),
+            title_font=self._load_japanese_font(fs_config.get("title_font_size", 100)),
+            stroke_width=self.phase_config.get('subtitle', {}).get('stroke_width', 3)
+        )
+
+    def _frame_server_encoder_args(
+        self,
+        audio_path: Path,
+        bgm_data: Optional[dict],
+        duration: float
+    ) -> Tuple[List[str], List[str]]:
+        """
+        フレームサーバーの ffmpeg に渡す音声入力と出力オプション
+
+        入力0（生フレーム）の後にナレーション（入力1）と BGM（入力2以降）を並べる。
+        """
+        extra_inputs = ['-i', str(audio_path)]
+        bgm_segments = [
+            segment for segment in (bgm_data or {}).get("segments", [])
+            if segment.get("file_path") and Path(segment["file_path"]).exists()
+        ]
+        for segment in bgm_segments:
+            extra_inputs.extend(['-i', str(segment["file_path"])])
+
+        if bgm_segments:
+            output_args = ['-filter_complex', self._build_audio_filter(bgm_segments), '-map', '0:v', '-map', '[audio]']
+        else:
+            output_args = ['-map', '0:v', '-map', '1:a']
+
+        output_args.extend([
+            '-c:v', 'libx264',
+            '-preset', self.encode_preset,
+            '-crf', str(self.encode_crf),
+            '-pix_fmt', 'yuv420p',
+            '-c:a', 'aac',
+            '-b:a', '192k',
+            '-t', f'{duration:.3f}',
+        ])
+        return extra_inputs, output_args
+
+    def _bake_subtitle_bar(self, image_paths: List[Path]) -> Dict[Path, Path]:
+        """
+        字幕用の黒バー（下部216px）を各画像に焼き込む
+
+        セグメントと同じ scale=decrease,pad 配置で合成するため、
+        最終合成で drawbox を適用した場合と同じフレームになる。
+
+        Returns:
+            {元画像のパス: 焼き込み済み画像のパス}（失敗時は空）
+        """
+        try:
+            from ..utils.video_composition.overlay_baker import StaticOverlayBaker
+
+            baker = StaticOverlayBaker(
+                logger=self.logger,
+                cache_dir=self.working_dir / "04_processed" / ".overlay_cache",
+                width=1920,
+                height=1080,
+                gradient_ratio=0.0,
+                bar_height=216,
+                fit="pad"
+            )
+            return baker.bake_many(image_paths)
+        except Exception as e:
+            self.logger.warning(f"Overlay baking failed, using drawbox filter: {e}")
+            return {}
+
+    @staticmethod
+    def _section_durations(audio_timing) -> Dict[int, float]:
+        """
+        audio_timing からセクションID → 尺
+
+        優先順位: total_duration → narration_timing.end_time → char_end_times の最後
+        """
+        if isinstance(audio_timing, list):
+            timing_sections = audio_timing
+        elif isinstance(audio_timing, dict):
+            timing_sections = audio_timing.get('sections', [audio_timing])
+        else:
+            timing_sections = []
+
+        section_durations = {}
+        for timing_section in timing_sections:
+            section_id = timing_section.get('section_id')
+            if not section_id:
+                continue
+
+            # 🆕 優先1: total_duration
+            total_duration = timing_section.get('total_duration')
+            if total_duration is not None:
+                section_durations[section_id] = total_duration
+                continue
+
+            # 🆕 優先2: narration_timing内のend_time
+            narration_timing = timing_section.get('narration_timing', {})
+            if narration_timing:
+                narration_end = narration_timing.get('end_time')
+                if narration_end is not None:
+                    section_durations[section_id] = narration_end
+                    continue
+
+            # フォールバック: トップレベルのchar_end_times
+            char_end_times = timing_section.get('char_end_times', [])
+            if char_end_times:
+                section_durations[section_id] = char_end_times[-1]
+        return section_durations
+
+    @staticmethod
+    def _group_section_images(image_paths: List[Path], section_ids) -> Dict[int, List[Path]]:
+        """存在する画像をファイル名のセクション番号（section_XX）でグループ化し、セクション内はファイル名順"""
+        section_images = {sid: [] for sid in section_ids}
+        for file_path in image_paths:
+            if not file_path.exists():
+                continue
+
+            # ファイル名からセクション番号を抽出
+            match = re.search(r'section_(\d+)', file_path.name)
+            if match:
+                section_num = int(match.group(1))
+                if section_num in section_images:
+                    section_images[section_num].append(file_path)
+
+        # 各セクション内でソート
+        for section_num in section_images.keys():
+            section_images[section_num].sort(key=lambda p: p.name)
+        return section_images
+
+    @staticmethod
+    def _equal_split_section_duration(
+        section_id: int,
+        sorted_section_ids: List[int],
+        section_durations: Dict[int, float],
+        actual_audio_duration: Optional[float]
+    ) -> float:
+        """
+        均等分割でのセクションの表示時間
+
+        3セクション以上では、最後のセクションを音声の実際の長さ - それ以外の合計 にする
+        （actual_audio_duration はこの場合だけ使う）。
+        """
+        if section_id == sorted_section_ids[-1] and len(sorted_section_ids) >= 3:
+            preceding_duration = 0
+            for sid in sorted_section_ids[:-1]:  # 最後以外
+                preceding_duration += section_durations.get(sid, 0)
+            return actual_audio_duration - preceding_duration
+        return section_durations.get(section_id, 0)
+
+    # ----------------------------------------
+    # セグメントの先行エンコード（ストリーミング受け渡し）
+    # ----------------------------------------
+
+    def _segment_command(self, input_path: Path, duration: float, output_path: Path) -> List[str]:
+        """静止画1枚 → セグメント動画の ffmpeg コマンド"""
+        return [
+            'ffmpeg', '-y',
+            '-loop', '1',
+            '-i', str(input_path),
+            '-t', f"{duration:.6f}",
+            '-vf', 'scale=1920:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2',
+            '-c:v', 'libx264',
+            '-preset', self.segment_encode.preset,  # 速度重視
+            '-crf', str(self.segment_encode.crf),  # ロスレス（still_segment は crf 0 に固定）
+            '-pix_fmt', 'yuv420p',
+            '-r', '30',  # FPS統一
+            str(output_path)
+        ]
+
+    def _segment_signature(self) -> str:
+        """セグメントキャッシュのキーに含めるエンコード引数（入出力パス・表示時間を除く）"""
+        cmd = self._segment_command(Path("<input>"), 0.0, Path("<output>"))
+        return " ".join(arg for arg in cmd if arg not in ("<input>", "<output>", f"{0.0:.6f}"))
+
+    def _segment_cache(self):
+        from ..utils.video_composition.segment_prefetch import SegmentCache
+
+        return SegmentCache(self.phase_dir / "segment_cache")
+
+    def _encode_segment(self, input_path: Path, duration: float, output_path: Path):
+        """
+        セグメントを1つ作る
+
+        Raises:
+            subprocess.CalledProcessError: ffmpeg が失敗した場合
+        """
+        import subprocess
+
+        subprocess.run(
+            self._segment_command(input_path, duration, output_path),
+            check=True,
+            capture_output=True
+        )
+
+    def _prefetch_inputs(self, image_paths: List[Path]) -> Dict[Path, Path]:
+        """先行エンコードの入力（本体と同じく、有効なら黒バーを焼き込んだ画像）"""
+        return self._bake_subtitle_bar(image_paths) if self.bake_overlays else {}
+
+    def _plan_prefetch_section(self, section_id: int, state) -> Optional[List[Tuple[Path, float]]]:
+        """
+        均等分割でのセクションの (画像, 表示時間)。_calculate_image_timings と同じ計算
+
+        Returns:
+            まだ決められなければ None（音声・画像の待ち）、エンコードするものが無ければ []
+        """
+        images = state.section_images.get(section_id)
+        if images is None:
+            return [] if state.images_complete else None
+        if section_id not in state.audio_durations:
+            return [] if state.audio_complete else None
+
+        # 最後のセクションは結合後の音声の長さで決まるので Phase 2 の完了を待つ
+        sorted_section_ids = state.section_ids
+        actual_audio_duration = None
+        if section_id == sorted_section_ids[-1] and len(sorted_section_ids) >= 3:
+            if not state.audio_complete:
+                return None
+            actual_audio_duration = self._get_audio_duration(self._get_audio_path())
+
+        images = [p for p in images if p.exists()]
+        section_duration = self._equal_split_section_duration(
+            section_id, sorted_section_ids, state.audio_durations, actual_audio_duration
+        )
+        if not images or section_duration == 0:
+            return []
+        duration_per_image = section_duration / len(images)
+        return [(image_path, duration_per_image) for image_path in images]
+
+    def _load_prefetch_section_images(self) -> Dict[int, List[Path]]:
+        """Phase 3 の出力（classified.json）からセクションごとの画像"""
+        classified_path = self.working_dir / "03_images" / "classified.json"
+        if not classified_path.exists():
+            return {}
+        with open(classified_path, 'r', encoding='utf-8') as f:
+            classified_data = json.load(f)
+        section_ids = [section['section_id'] for section in self._load_script().get('sections', [])]
+        return self._group_section_images(
+            [Path(img.get('file_path', '')) for img in classified_data.get('images', [])],
+            section_ids
+        )
+
+    def start_segment_prefetch(self, section_events, max_workers: int = 1):
+        """
+        Phase 2/3 のセクション完了通知を購読し、セグメントを先にエンコードする
+
+        ffmpeg 直接統合・均等分割（image_timing.mode: equal_split）のときだけ有効。
+        それ以外のモードは字幕タイミングや全画像を見て配置を決めるため、先行できない。
+
+        Args:
+            section_events: SectionEventBus
+            max_workers: 同時にエンコードするセクション数
+
+        Returns:
+            SegmentPrefetcher（対象外のモードでは None）
+        """
+        from ..utils.video_composition.segment_prefetch import SegmentPrefetcher
+
+        timing_mode = self.phase_config.get("image_timing", {}).get("mode", "equal_split")
+        if self.use_legacy or self.use_frame_server or not self.use_ffmpeg_direct or timing_mode != "equal_split":
+            self.logger.info(
+                "Segment prefetch skipped: requires ffmpeg direct integration with equal_split image timing"
+            )
+            return None
+
+        section_ids = [section['section_id'] for section in self._load_script().get('sections', [])]
+        self.segment_prefetcher = SegmentPrefetcher(
+            section_ids=section_ids,
+            cache=self._segment_cache(),
+            signature=self._segment_signature(),
+            plan_section=self._plan_prefetch_section,
+            prepare_inputs=self._prefetch_inputs,
+            encode=self._encode_segment,
+            load_audio_durations=lambda: self._section_durations(self._load_audio_timing()),
+            load_section_images=self._load_prefetch_section_images,
+            logger=self.logger,
+            max_workers=max_workers
+        )
+        section_events.subscribe(self.segment_prefetcher.handle)
+        self.logger.info(f"Segment prefetch started for {len(section_ids)} sections")
+        return self.segment_prefetcher
+
+    def _calculate_image_timings(self, audio_path: Path) -> Tuple[List[Dict[str, Any]], float]:
+        """
+        画像ごとの表示時間を計算（image_timing.mode に従う）
 
         Args:
             audio_path: 音声ファイルのパス
-            bgm_data: BGMデータ
 
         Returns:
-            最終動画のパス
+            (画像タイミングのリスト, 音声の実際の長さ)
+            画像タイミングは {'path', 'duration'}（llm / keyword_match では 'start_time', 'end_time' も含む）
         """
-        import subprocess
-        import tempfile
+        self.logger.info("Loading image files and timing information...")
+        script = self._load_script()
+        audio_timing = self._load_audio_timing()
 
-        self.logger.info("🎬 Using segment-based approach for better subtitle sync...")
+        # classified.jsonから全画像を取得
+        classified_path = self.working_dir / "03_images" / "classified.json"
+        if not classified_path.exists():
+            raise FileNotFoundError(f"classified.json not found: {classified_path}")
 
-        # 一時ディレクトリ作成
-        temp_dir = Path(tempfile.mkdtemp(prefix="video_segments_"))
-        segment_files = []
-        concat_list = None
+        with open(classified_path, 'r', encoding='utf-8') as f:
+            classified_data = json.load(f)
 
-        try:
-            # 1. 画像とタイミング情報を取得
-            self.logger.info("Loading image files and timing information...")
-            script = self._load_script()
-            audio_timing = self._load_audio_timing()
+        all_images = classified_data.get('images', [])
 
-            # classified.jsonから全画像を取得
-            classified_path = self.working_dir / "03_images" / "classified.json"
-            if not classified_path.exists():
-                raise FileNotFoundError(f"classified.json not found: {classified_path}")
+        # セクションIDと時間のマッピングを作成
+        section_durations = self._section_durations(audio_timing)
 
-            with open(classified_path, 'r', encoding='utf-8') as f:
-                classified_data = json.load(f)
+        # セクションごとに画像をグループ化（各セクション内はファイル名順）
+        section_images = self._group_section_images(
+            [Path(img.get('file_path', '')) for img in all_images],
+            section_durations.keys()
+        )
 
-            all_images = classified_data.get('images', [])
+        # 2. 画像ごとの表示時間を計算
+        image_timings = []
+        sorted_section_ids = sorted(section_images.keys())
 
-            # セクションIDと時間のマッピングを作成
-            section_durations = {}
-            if isinstance(audio_timing, list):
-                for timing_section in audio_timing:
-                    section_id = timing_section.get('section_id')
-                    if not section_id:
-                        continue
+        # 音声の実際の長さを取得
+        actual_audio_duration = self._get_audio_duration(audio_path)
+        self.logger.info(f"Actual audio duration: {actual_audio_duration:.3f}s")
+
+        # 画像タイミングモードを確認
+        image_timing_config = self.phase_config.get("image_timing", {})
+        timing_mode = image_timing_config.get("mode", "equal_split")
+        
+        if timing_mode == "llm":
+            # LLM駆動型画像配置モード
+            self.logger.info("🤖 Using LLM-driven image timing mode")
+            try:
+                # 字幕タイミングを読み込み
+                subtitle_timing_path = self.working_dir / "06_subtitles" / "subtitle_timing.json"
+                if subtitle_timing_path.exists():
+                    subtitle_timing_data = load_timing_data(subtitle_timing_path)
+                    subtitle_timing = subtitle_timing_data.get('subtitles', [])
                     
-                    # 🆕 優先1: total_duration
-                    total_duration = timing_section.get('total_duration')
-                    if total_duration is not None:
-                        section_durations[section_id] = total_duration
-                        continue
+                    # APIキーを取得
+                    try:
+                        api_key = self.config.get_api_key("CLAUDE_API_KEY")
+                    except Exception:
+                        # 環境変数から直接取得を試みる
+                        import os
+                        api_key = os.getenv("CLAUDE_API_KEY")
+                        if not api_key:
+                            raise ValueError("CLAUDE_API_KEY not found in config or environment")
                     
-                    # 🆕 優先2: narration_timing内のend_time
-                    narration_timing = timing_section.get('narration_timing', {})
-                    if narration_timing:
-                        narration_end = narration_timing.get('end_time')
-                        if narration_end is not None:
-                            section_durations[section_id] = narration_end
-                            continue
+                    # ImageTimingMatcherLLMを初期化
+                    llm_config = image_timing_config.get("llm", {})
+                    matcher = ImageTimingMatcherLLM(
+                        working_dir=self.working_dir,
+                        api_key=api_key,
+                        model=llm_config.get("model", "claude-3-haiku-20240307"),
+                        cache_dir=llm_config.get("cache_dir"),
+                        min_duration=llm_config.get("min_display_duration", 3.0),
+                        max_duration=llm_config.get("max_display_duration", 15.0),
+                        gap_threshold=llm_config.get("gap_threshold", 2.0),
+                        logger=self.logger
+                    )
                     
-                    # フォールバック: トップレベルのchar_end_times
-                    char_end_times = timing_section.get('char_end_times', [])
-                    if char_end_times:
-                        section_durations[section_id] = char_end_times[-1]
-            elif isinstance(audio_timing, dict):
-                sections = audio_timing.get('sections', [audio_timing])
-                for timing_section in sections:
-                    section_id = timing_section.get('section_id')
-                    if not section_id:
-                        continue
+                    # セクションごとに画像クリップを生成（LLM への問い合わせは並列）
+                    all_image_clips = matcher.match_sections(
+                        script_data=script,
+                        classified_images=classified_data,
+                        subtitle_timing=subtitle_timing,
+                        section_ids=sorted_section_ids
+                    )
                     
-                    # 🆕 優先1: total_duration
-                    total_duration = timing_section.get('total_duration')
-                    if total_duration is not None:
-                        section_durations[section_id] = total_duration
-                        continue
+                    # 時間順にソート
+                    all_image_clips.sort(key=lambda clip: clip['start_time'])
+                    
+                    # image_timingsに変換
+                    for clip in all_image_clips:
+                        image_path = Path(clip['image_path'])
+                        start_time = clip['start_time']
+                        end_time = clip['end_time']
+                        duration = end_time - start_time
+                        
+                        if image_path.exists():
+                            image_timings.append({
+                                'path': image_path,
+                                'duration': duration,
+                                'start_time': start_time,
+                                'end_time': end_time
+                            })
                     
-                    # 🆕 優先2: narration_timing内のend_time
-                    narration_timing = timing_section.get('narration_timing', {})
-                    if narration_timing:
-                        narration_end = narration_timing.get('end_time')
-                        if narration_end is not None:
-                            section_durations[section_id] = narration_end
-                            continue
+                    self.logger.info(f"✅ Generated {len(image_timings)} image clips with LLM matching")
+                else:
+                    self.logger.warning(f"subtitle_timing.json not found. Falling back to equal split mode.")
+                    raise FileNotFoundError(f"subtitle_timing.json not found: {subtitle_timing_path}")
+            except Exception as e:
+                self.logger.warning(f"LLM matching failed: {e}. Falling back to keyword match mode.")
+                timing_mode = "keyword_match"  # フォールバック
+        
+        if timing_mode == "keyword_match":
+            # キーワードマッチングモード
+            self.logger.info("🎯 Using keyword-based image timing mode")
+            try:
+                # 字幕タイミングを読み込み
+                subtitle_timing_path = self.working_dir / "06_subtitles" / "subtitle_timing.json"
+                if subtitle_timing_path.exists():
+                    subtitle_timing_data = load_timing_data(subtitle_timing_path)
+                    subtitle_timing = subtitle_timing_data.get('subtitles', [])
                     
-                    # フォールバック: トップレベルのchar_end_times
-                    char_end_times = timing_section.get('char_end_times', [])
-                    if char_end_times:
-                        section_durations[section_id] = char_end_times[-1]
+                    # ImageTimingMatcherFixedを初期化
+                    keyword_match_config = image_timing_config.get("keyword_match", {})
+                    matcher = ImageTimingMatcherFixed(
+                        working_dir=self.working_dir,  # audio_timing.jsonを読むため
+                        min_duration=keyword_match_config.get("min_display_duration", 3.0),
+                        max_duration=keyword_match_config.get("max_display_duration", 15.0),
+                        section_boundary_switch=keyword_match_config.get("section_boundary_switch", True),
+                        exact_match_weight=keyword_match_config.get("priority", {}).get("exact_match_weight", 10.0),
+                        partial_match_weight=keyword_match_config.get("priority", {}).get("partial_match_weight", 5.0),
+                        same_section_weight=keyword_match_config.get("priority", {}).get("same_section_weight", 3.0),
+                        keyword_length_weight=keyword_match_config.get("priority", {}).get("keyword_length_weight", 1.0),
+                        use_keyword_index=keyword_match_config.get("use_index", True),
+                        logger=self.logger
+                    )
+                    
+                    # セクションごとに画像クリップを生成（LLM への問い合わせは並列）
+                    all_image_clips = matcher.match_sections(
+                        script_data=script,
+                        classified_images=classified_data,
+                        subtitle_timing=subtitle_timing,
+                        section_ids=sorted_section_ids
+                    )
+                    
+                    # 時間順にソート
+                    all_image_clips.sort(key=lambda clip: clip['start_time'])
+                    
+                    # image_timingsに変換
+                    for clip in all_image_clips:
+                        image_path = Path(clip['image_path'])
+                        start_time = clip['start_time']
+                        end_time = clip['end_time']
+                        duration = end_time - start_time
+                        
+                        if image_path.exists():
+                            image_timings.append({
+                                'path': image_path,
+                                'duration': duration,
+                                'start_time': start_time,
+                                'end_time': end_time
+                            })
+                    
+                    self.logger.info(f"✅ Generated {len(image_timings)} image clips with keyword matching")
+                else:
+                    self.logger.warning(f"subtitle_timing.json not found. Falling back to equal split mode.")
+                    raise FileNotFoundError(f"subtitle_timing.json not found: {subtitle_timing_path}")
+            except Exception as e:
+                self.logger.warning(f"Keyword matching failed: {e}. Falling back to equal split mode.")
+                timing_mode = "equal_split"  # フォールバック
+        
+        if timing_mode == "equal_split":
+            # 均等分割モード（従来の方法）
+            self.logger.info("📊 Using equal split image timing mode")
+            
+            # Section 1とSection 2の合計時間を計算
+            if len(sorted_section_ids) >= 3:
+                remaining_duration = self._equal_split_section_duration(
+                    sorted_section_ids[-1], sorted_section_ids, section_durations, actual_audio_duration
+                )
+                self.logger.info(
+                    f"Section 1+2 duration: {actual_audio_duration - remaining_duration:.3f}s, "
+                    f"Section 3 needs: {remaining_duration:.3f}s"
+                )
+
+            for section_id in sorted_section_ids:
+                images = section_images[section_id]
+                images_count = len(images)
 
-            # セクションごとに画像をグループ化
-            section_images = {sid: [] for sid in section_durations.keys()}
-            for img in all_images:
-                file_path = Path(img.get('file_path', ''))
-                if not file_path.exists():
+                if images_count == 0:
                     continue
 
-                # ファイル名からセクション番号を抽出
-                match = re.search(r'section_(\d+)', file_path.name)
-                if match:
-                    section_num = int(match.group(1))
-                    if section_num in section_images:
-                        section_images[section_num].append(file_path)
+                # 最後のセクション（Section 3）は音声の実際の長さに合わせる
+                section_duration = self._equal_split_section_duration(
+                    section_id, sorted_section_ids, section_durations, actual_audio_duration
+                )
 
-            # 各セクション内でソート
-            for section_num in section_images.keys():
-                section_images[section_num].sort(key=lambda p: p.name)
+                if section_duration == 0:
+                    continue
 
-            # 2. 画像ごとの表示時間を計算
-            image_timings = []
-            sorted_section_ids = sorted(section_images.keys())
+                # このセクションの各画像の表示時間（均等分割）
+                duration_per_image = section_duration / images_count
 
-            # 音声の実際の長さを取得
-            actual_audio_duration = self._get_audio_duration(audio_path)
-            self.logger.info(f"Actual audio duration: {actual_audio_duration:.3f}s")
+                self.logger.info(
+                    f"Section {section_id}: {images_count} images × {duration_per_image:.3f}s = {section_duration:.3f}s"
+                )
 
-            # 画像タイミングモードを確認
-            image_timing_config = self.phase_config.get("image_timing", {})
-            timing_mode = image_timing_config.get("mode", "equal_split")
-            
-            if timing_mode == "llm":
-                # LLM駆動型画像配置モード
-                self.logger.info("🤖 Using LLM-driven image timing mode")
-                try:
-                    # 字幕タイミングを読み込み
-                    subtitle_timing_path = self.working_dir / "06_subtitles" / "subtitle_timing.json"
-                    if subtitle_timing_path.exists():
-                        with open(subtitle_timing_path, 'r', encoding='utf-8') as f:
-                            subtitle_timing_data = json.load(f)
-                        subtitle_timing = subtitle_timing_data.get('subtitles', [])
-                        
-                        # APIキーを取得
-                        try:
-                            api_key = self.config.get_api_key("CLAUDE_API_KEY")
-                        except Exception:
-                            # 環境変数から直接取得を試みる
-                            import os
-                            api_key = os.getenv("CLAUDE_API_KEY")
-                            if not api_key:
-                                raise ValueError("CLAUDE_API_KEY not found in config or environment")
-                        
-                        # ImageTimingMatcherLLMを初期化
-                        llm_config = image_timing_config.get("llm", {})
-                        matcher = ImageTimingMatcherLLM(
-                            working_dir=self.working_dir,
-                            api_key=api_key,
-                            model=llm_config.get("model", "claude-3-haiku-20240307"),
-                            cache_dir=llm_config.get("cache_dir"),
-                            min_duration=llm_config.get("min_display_duration", 3.0),
-                            max_duration=llm_config.get("max_display_duration", 15.0),
-                            gap_threshold=llm_config.get("gap_threshold", 2.0),
-                            logger=self.logger
-                        )
-                        
-                        # セクションごとに画像クリップを生成
-                        all_image_clips = []
-                        for section_id in sorted_section_ids:
-                            image_clips = matcher.match_images_to_subtitles(
-                                script_data=script,
-                                classified_images=classified_data,
-                                subtitle_timing=subtitle_timing,
-                                section_id=section_id
-                            )
-                            all_image_clips.extend(image_clips)
-                        
-                        # 時間順にソート
-                        all_image_clips.sort(key=lambda clip: clip['start_time'])
-                        
-                        # image_timingsに変換
-                        for clip in all_image_clips:
-                            image_path = Path(clip['image_path'])
-                            start_time = clip['start_time']
-                            end_time = clip['end_time']
-                            duration = end_time - start_time
-                            
-                            if image_path.exists():
-                                image_timings.append({
-                                    'path': image_path,
-                                    'duration': duration,
-                                    'start_time': start_time,
-                                    'end_time': end_time
-                                })
-                        
-                        self.logger.info(f"✅ Generated {len(image_timings)} image clips with LLM matching")
-                    else:
-                        self.logger.warning(f"subtitle_timing.json not found. Falling back to equal split mode.")
-                        raise FileNotFoundError(f"subtitle_timing.json not found: {subtitle_timing_path}")
-                except Exception as e:
-                    self.logger.warning(f"LLM matching failed: {e}. Falling back to keyword match mode.")
-                    timing_mode = "keyword_match"  # フォールバック
-            
-            if timing_mode == "keyword_match":
-                # キーワードマッチングモード
-                self.logger.info("🎯 Using keyword-based image timing mode")
-                try:
-                    # 字幕タイミングを読み込み
-                    subtitle_timing_path = self.working_dir / "06_subtitles" / "subtitle_timing.json"
-                    if subtitle_timing_path.exists():
-                        with open(subtitle_timing_path, 'r', encoding='utf-8') as f:
-                            subtitle_timing_data = json.load(f)
-                        subtitle_timing = subtitle_timing_data.get('subtitles', [])
-                        
-                        # ImageTimingMatcherFixedを初期化
-                        keyword_match_config = image_timing_config.get("keyword_match", {})
-                        matcher = ImageTimingMatcherFixed(
-                            working_dir=self.working_dir,  # audio_timing.jsonを読むため
-                            min_duration=keyword_match_config.get("min_display_duration", 3.0),
-                            max_duration=keyword_match_config.get("max_display_duration", 15.0),
-                            section_boundary_switch=keyword_match_config.get("section_boundary_switch", True),
-                            exact_match_weight=keyword_match_config.get("priority", {}).get("exact_match_weight", 10.0),
-                            partial_match_weight=keyword_match_config.get("priority", {}).get("partial_match_weight", 5.0),
-                            same_section_weight=keyword_match_config.get("priority", {}).get("same_section_weight", 3.0),
-                            keyword_length_weight=keyword_match_config.get("priority", {}).get("keyword_length_weight", 1.0),
-                            logger=self.logger
-                        )
-                        
-                        # セクションごとに画像クリップを生成
-                        all_image_clips = []
-                        for section_id in sorted_section_ids:
-                            image_clips = matcher.match_images_to_subtitles(
-                                script_data=script,
-                                classified_images=classified_data,
-                                subtitle_timing=subtitle_timing,
-                                section_id=section_id
-                            )
-                            all_image_clips.extend(image_clips)
-                        
-                        # 時間順にソート
-                        all_image_clips.sort(key=lambda clip: clip['start_time'])
-                        
-                        # image_timingsに変換
-                        for clip in all_image_clips:
-                            image_path = Path(clip['image_path'])
-                            start_time = clip['start_time']
-                            end_time = clip['end_time']
-                            duration = end_time - start_time
-                            
-                            if image_path.exists():
-                                image_timings.append({
-                                    'path': image_path,
-                                    'duration': duration,
-                                    'start_time': start_time,
-                                    'end_time': end_time
-                                })
-                        
-                        self.logger.info(f"✅ Generated {len(image_timings)} image clips with keyword matching")
-                    else:
-                        self.logger.warning(f"subtitle_timing.json not found. Falling back to equal split mode.")
-                        raise FileNotFoundError(f"subtitle_timing.json not found: {subtitle_timing_path}")
-                except Exception as e:
-                    self.logger.warning(f"Keyword matching failed: {e}. Falling back to equal split mode.")
-                    timing_mode = "equal_split"  # フォールバック
-            
-            if timing_mode == "equal_split":
-                # 均等分割モード（従来の方法）
-                self.logger.info("📊 Using equal split image timing mode")
-                
-                # Section 1とSection 2の合計時間を計算
-                section_1_2_duration = 0
-                for section_id in sorted_section_ids[:-1]:  # 最後以外
-                    section_1_2_duration += section_durations.get(section_id, 0)
-
-                # Section 3に必要な時間（音声の実際の長さ - Section 1,2の合計）
-                if len(sorted_section_ids) >= 3:
-                    remaining_duration = actual_audio_duration - section_1_2_duration
-                    self.logger.info(
-                        f"Section 1+2 duration: {section_1_2_duration:.3f}s, "
-                        f"Section 3 needs: {remaining_duration:.3f}s"
-                    )
+                for image_path in images:
+                    image_timings.append({
+                        'path': image_path,
+                        'duration': duration_per_image
+                    })
 
-                for section_id in sorted_section_ids:
-                    images = section_images[section_id]
-                    images_count = len(images)
+        self.logger.info(f"Total images to process: {len(image_timings)}")
+        return image_timings, actual_audio_duration
 
-                    if images_count == 0:
-                        continue
+    def _create_segment_videos_then_concat(self, audio_path: Path, bgm_data: Optional[dict]) -> Path:
+        """
+        セグメントごとに動画を作成してから連結（方法2: タイミング同期の問題を解決）
 
-                    # 最後のセクション（Section 3）は音声の実際の長さに合わせる
-                    if section_id == sorted_section_ids[-1] and len(sorted_section_ids) >= 3:
-                        section_duration = remaining_duration
-                    else:
-                        section_duration = section_durations.get(section_id, 0)
+        利点：
+        - 各セグメントのタイミングが正確
+        - concat demuxerで高速結合
+        - 字幕の同期問題なし
 
-                    if section_duration == 0:
-                        continue
+        手順：
+        1. 各画像を個別の動画に変換（字幕なし）
+        2. concat demuxerで連結
+        3. ASS字幕を適用
 
-                    # このセクションの各画像の表示時間（均等分割）
-                    duration_per_image = section_duration / images_count
+        Args:
+            audio_path: 音声ファイルのパス
+            bgm_data: BGMデータ
 
-                    self.logger.info(
-                        f"Section {section_id}: {images_count} images × {duration_per_image:.3f}s = {section_duration:.3f}s"
-                    )
+        Returns:
+            最終動画のパス
+        """
+        import subprocess
+        import tempfile
 
-                    for image_path in images:
-                        image_timings.append({
-                            'path': image_path,
-                            'duration': duration_per_image
-                        })
+        self.logger.info("🎬 Using segment-based approach for better subtitle sync...")
+
+        # 前回の描画ソースは今回の完成動画と一致しないため先に削除（保存は最終合成の成功後）
+        stale_sources = self.phase_dir / RENDER_SOURCES_FILE
+        if stale_sources.exists():
+            stale_sources.unlink()
 
-            self.logger.info(f"Total images to process: {len(image_timings)}")
+        # 一時ディレクトリ作成
+        temp_dir = Path(tempfile.mkdtemp(prefix="video_segments_"))
+        segment_files = []
+        concat_list = None
+
+        try:
+            # ストリーミング受け渡し中なら、先行エンコード中のセグメントを待つ
+            if self.segment_prefetcher is not None:
+                with span("wait_segment_prefetch"):
+                    encoded, failed = self.segment_prefetcher.wait()
+                self.segment_prefetcher.close()
+                self.segment_prefetcher = None
+                self.logger.info(f"Segment prefetch finished: {encoded} encoded, {failed} failed")
+            segment_cache = self._segment_cache()
+            segment_signature = self._segment_signature()
+
+            # 1. 画像ごとの表示時間を計算
+            image_timings, actual_audio_duration = self._calculate_image_timings(audio_path)
+
+            # 字幕用の黒バーを静止画に焼き込む（最終合成の drawbox を省略）
+            baked_images = {}
+            if self.bake_overlays:
+                with span("bake_overlays", images=len(image_timings)):
+                    baked_images = self._bake_subtitle_bar([t['path'] for t in image_timings])
 
             # 3. 各画像を動画セグメントに変換
             self.logger.info("Creating video segments from images...")
-            for i, timing in enumerate(image_timings):
-                img_path = timing['path']
-                duration = timing['duration']
-                output_segment = temp_dir / f"segment_{i:03d}.mp4"
-
-                cmd = [
-                    'ffmpeg', '-y',
-                    '-loop', '1',
-                    '-i', str(img_path),
-                    '-t', f"{duration:.6f}",
-                    '-vf', 'scale=1920:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2',
-                    '-c:v', 'libx264',
-                    '-preset', 'ultrafast',  # 速度重視
-                    '-crf', '0',  # ロスレス
-                    '-pix_fmt', 'yuv420p',
-                    '-r', '30',  # FPS統一
-                    str(output_segment)
-                ]
+            reused_segments = 0
+            with span("encode_segments", segments=len(image_timings)) as encode_span:
+                for i, timing in enumerate(image_timings):
+                    img_path = timing['path']
+                    duration = timing['duration']
+                    input_path = baked_images.get(img_path, img_path)
+
+                    # 先行エンコード済み（画像の内容・表示時間・引数が一致）ならそのまま使う
+                    cached_segment = segment_cache.lookup(input_path, duration, segment_signature)
+                    if cached_segment is not None:
+                        segment_files.append(cached_segment)
+                        reused_segments += 1
+                        continue
+
+                    output_segment = temp_dir / f"segment_{i:03d}.mp4"
+                    cmd = self._segment_command(input_path, duration, output_segment)
 
-                try:
-                    result = subprocess.run(
-                        cmd,
-                        check=True,
-                        capture_output=True,
-                        text=False,  # バイナリモードで取得
-                        encoding=None  # エンコーディングを指定しない
-                    )
-                    segment_files.append(output_segment)
-                    if (i + 1) % 3 == 0 or i == len(image_timings) - 1:
-                        self.logger.info(f"  Created {i + 1}/{len(image_timings)} segments")
-                except subprocess.CalledProcessError as e:
-                    # エラーメッセージをUTF-8でデコード（失敗時は無視）
                     try:
-                        stderr_msg = e.stderr.decode('utf-8', errors='ignore') if e.stderr else ''
-                    except:
-                        stderr_msg = '<decode failed>'
-                    self.logger.error(f"Failed to create segment {i}: {stderr_msg}")
-                    raise
+                        result = subprocess.run(
+                            cmd,
+                            check=True,
+                            capture_output=True,
+                            text=False,  # バイナリモードで取得
+                            encoding=None  # エンコーディングを指定しない
+                        )
+                        segment_files.append(output_segment)
+                        if (i + 1) % 3 == 0 or i == len(image_timings) - 1:
+                            self.logger.info(f"  Created {i + 1}/{len(image_timings)} segments")
+                    except subprocess.CalledProcessError as e:
+                        # エラーメッセージをUTF-8でデコード（失敗時は無視）
+                        try:
+                            stderr_msg = e.stderr.decode('utf-8', errors='ignore') if e.stderr else ''
+                        except:
+                            stderr_msg = '<decode failed>'
+                        self.logger.error(f"Failed to create segment {i}: {stderr_msg}")
+                        raise
+                encode_span.set(reused=reused_segments)
+            if reused_segments:
+                self.logger.info(f"  Reused {reused_segments}/{len(image_timings)} prefetched segments")
 
             # 4. concat用のファイルリスト作成
             concat_list = temp_dir / "concat.txt"
@@ -1956,7 +2381,10 @@ class Phase07Composition(PhaseBase):
 
             # フィルタ構築
             ass_path_str = str(ass_path).replace('\\', '/').replace(':', '\\:')
-            video_filter = f"drawbox=y=ih-216:color=black@1.0:width=iw:height=216:t=fill,ass='{ass_path_str}'"
+            if baked_images:
+                video_filter = f"ass='{ass_path_str}'"
+            else:
+                video_filter = f"drawbox=y=ih-216:color=black@1.0:width=iw:height=216:t=fill,ass='{ass_path_str}'"
             cmd.extend(['-vf', video_filter])
 
             # オーディオ処理
@@ -1991,7 +2419,7 @@ class Phase07Composition(PhaseBase):
             cmd.extend([
                 '-c:v', 'libx264',
                 '-preset', self.encode_preset,
-                '-crf', '23',
+                '-crf', str(self.encode_crf),
                 '-c:a', 'aac',
                 '-b:a', '192k',
                 '-t', f'{actual_audio_duration:.3f}',  # 音声の正確な長さを指定
@@ -2016,14 +2444,19 @@ class Phase07Composition(PhaseBase):
             self.logger.info("=" * 60)
 
             try:
-                result = subprocess.run(
-                    cmd,
-                    check=True,
-                    capture_output=True,
-                    text=False,  # バイナリモードで取得
-                    encoding=None  # エンコーディングを指定しない
-                )
+                with span("final_mux"):
+                    result = subprocess.run(
+                        cmd,
+                        check=True,
+                        capture_output=True,
+                        text=False,  # バイナリモードで取得
+                        encoding=None  # エンコーディングを指定しない
+                    )
                 self.logger.info(f"✅ Video generation completed: {final_output}")
+                segment_cache.clear()
+
+                # Shorts（Phase 10 の from_sources）向けに描画ソースを記録
+                self._save_render_sources(image_timings, baked_images, ass_path, audio_path, final_output)
 
                 # 必要に応じてログ出力（UTF-8でデコード）
                 if result.stdout:
@@ -2049,8 +2482,12 @@ class Phase07Composition(PhaseBase):
         finally:
             # 7. 一時ファイルをクリーンアップ
             self.logger.info("Cleaning up temporary files...")
+            if self.segment_prefetcher is not None:
+                self.segment_prefetcher.close()
+                self.segment_prefetcher = None
             for segment in segment_files:
-                if segment.exists():
+                # 先行エンコードのキャッシュは最終動画ができるまで残す（再実行で再利用）
+                if segment.exists() and segment.parent == temp_dir:
                     segment.unlink()
             if concat_list and concat_list.exists():
                 concat_list.unlink()
@@ -2063,14 +2500,56 @@ class Phase07Composition(PhaseBase):
                     self.logger.warning(f"Failed to delete temp directory: {e}")
             self.logger.info("✅ Cleanup completed")
 
+    def _save_render_sources(
+        self,
+        image_timings: List[Dict[str, Any]],
+        baked_images: Dict[Path, Path],
+        ass_path: Optional[Path],
+        audio_path: Path,
+        final_output: Path
+    ) -> Optional[Path]:
+        """
+        最終合成の描画ソースを phase_dir/render_sources.json に保存
+
+        静止画セグメント（scale=decrease,pad + 下部216pxの黒バー）と同じフレームを
+        Phase 10 が画像から直接描画できるようにする。BGM はインラインでミックスしているため
+        音声ステムは無く、Shorts の音声は完成動画から切り出す。
+        """
+        images = []
+        start = 0.0
+        for timing in image_timings:
+            image_path = timing['path']
+            images.append({
+                'path': str(Path(baked_images.get(image_path, image_path)).resolve()),
+                'start': start,
+                'duration': timing['duration'],
+                'section_id': timing.get('section_id'),
+            })
+            start += timing['duration']
+
+        sources = {
+            'fps': 30,  # セグメントは -r 30 で作る
+            'width': 1920,
+            'height': 1080,
+            'total_duration': start,
+            'audio_path': str(Path(audio_path).resolve()),
+            'audio_stem_path': None,
+            'ass_path': str(Path(ass_path).resolve()) if ass_path and Path(ass_path).exists() else None,
+            'gradient_path': None,
+            'overlays_baked': bool(baked_images),
+            'fit': 'pad',
+            'bar_height': 0 if baked_images else 216,
+            'images': images,
+        }
+        return save_render_sources(self.phase_dir / RENDER_SOURCES_FILE, sources, final_output, self.logger)
+
     def _load_audio_timing(self) -> dict:
         """audio_timing.jsonを読み込み"""
         timing_path = self.working_dir / "02_audio" / "audio_timing.json"
         if not timing_path.exists():
             raise FileNotFoundError(f"audio_timing.json not found: {timing_path}")
 
-        with open(timing_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_timing_data(timing_path)
 
     def _create_ffmpeg_concat_file(self, script: dict) -> Path:
         """
@@ -2097,8 +2576,7 @@ class Phase07Composition(PhaseBase):
         if not audio_timing_path.exists():
             raise FileNotFoundError(f"audio_timing.json not found: {audio_timing_path}")
 
-        with open(audio_timing_path, 'r', encoding='utf-8') as f:
-            audio_timing = json.load(f)
+        audio_timing = load_timing_data(audio_timing_path)
 
         # セクションIDと時間のマッピングを作成
         section_durations = {}
@@ -2381,8 +2859,7 @@ class Phase07Composition(PhaseBase):
             # この場合は通常の処理を続行するため、Noneを返して呼び出し元で処理
             raise FileNotFoundError(f"subtitle_timing.json not found: {subtitle_timing_path}")
         
-        with open(subtitle_timing_path, 'r', encoding='utf-8') as f:
-            subtitle_timing_data = json.load(f)
+        subtitle_timing_data = load_timing_data(subtitle_timing_path)
         
         subtitle_timing = subtitle_timing_data.get('subtitles', [])
         
@@ -2480,8 +2957,7 @@ class Phase07Composition(PhaseBase):
         
         if audio_timing_path.exists():
             try:
-                with open(audio_timing_path, 'r', encoding='utf-8') as f:
-                    audio_timing = json.load(f)
+                audio_timing = load_timing_data(audio_timing_path)
                 
                 # リスト形式のaudio_timingから該当セクションを探す
                 if isinstance(audio_timing, list):
@@ -2963,7 +3439,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         cmd.extend([
             '-c:v', 'libx264',
             '-preset', self.encode_preset,
-            '-crf', '23',
+            '-crf', str(self.encode_crf),
             '-c:a', 'aac',
             '-b:a', '192k',
             '-ar', '48000',
@@ -3200,7 +3676,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         cmd.extend([
             '-c:v', 'libx264',
             '-preset', self.encode_preset,
-            '-crf', '23',
+            '-crf', str(self.encode_crf),
             '-c:a', 'aac',
             '-b:a', '192k',
             '-ar', '48000',
@@ -3424,7 +3900,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         cmd.extend([
             '-c:v', 'libx264',
             '-preset', self.encode_preset,
-            '-crf', '23',
+            '-crf', str(self.encode_crf),
             '-pix_fmt', 'yuv420p',
             '-c:a', 'aac',
             '-b:a', '192k',
@@ -3524,7 +4000,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         cmd.extend([
             '-c:v', 'libx264',
             '-preset', self.encode_preset,
-            '-crf', '23',
+            '-crf', str(self.encode_crf),
             '-pix_fmt', 'yuv420p',
             '-c:a', 'aac',
             '-b:a', '192k',
@@ -3695,7 +4171,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             '-vf', f"subtitles={srt_filename}:force_style='{force_style}'",
             '-c:v', 'libx264',
             '-preset', self.encode_preset,
-            '-crf', '23',
+            '-crf', str(self.encode_crf),
             '-c:a', 'copy',  # 音声は再エンコードしない
             '-y',
             output_normalized
@@ -45,6 +45,7 @@ from ..utils.subtitle_utils.subtitle_processor import SubtitleProcessor
 from ..utils.video_composition.background_processor import BackgroundVideoProcessor
 from ..utils.video_composition.bgm_processor import BGMProcessor
 from ..utils.video_composition.ffmpeg_builder import FFmpegBuilder
+from ..utils.encoder_profile import EncodeSettings, resolve_encode_settings
 from ..utils.subtitle_utils.ass_generator import ASSGenerator
 
 
@@ -114,6 +115,12 @@ class Phase07CompositionV2(PhaseBase):
         self.use_background_video = perf_config.get("use_background_video", False)
         self.encode_preset = perf_config.get("preset", "faster")
 
+        # ホストのエンコーダープロファイル（python -m src.cli calibrate-encoder）があれば上書き
+        self.final_encode = resolve_encode_settings(
+            config, "final", EncodeSettings(self.encode_preset, 23), self.logger
+        )
+        self.encode_preset = self.final_encode.preset
+
         self.split_config = self.phase_config.get("split_layout", {})
         self.split_enabled = self.split_config.get("enabled", False)
 
@@ -189,7 +196,8 @@ class Phase07CompositionV2(PhaseBase):
         # 既存のプロセッサ（互換性のため保持）
         self.bg_processor = BackgroundVideoProcessor(
             self.config.project_root,
-            self.logger
+            self.logger,
+            encode_settings=resolve_encode_settings(self.config, "background", logger=self.logger)
         )
         self.bgm_processor = BGMProcessor(
             self.config.project_root,
@@ -201,8 +209,9 @@ class Phase07CompositionV2(PhaseBase):
             self.config.project_root,
             self.logger,
             encode_preset=self.encode_preset,
-            threads=0,
-            bgm_processor=self.bgm_processor
+            threads=self.final_encode.threads,
+            bgm_processor=self.bgm_processor,
+            crf=self.final_encode.crf
         )
         subtitle_config_path = self.config.project_root / "config" / "phases" / "subtitle_generation.yaml"
         self.ass_generator = ASSGenerator(
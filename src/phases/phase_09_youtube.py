@@ -26,13 +26,13 @@ from src.core.exceptions import (
     PhaseInputMissingError
 )
 from src.utils.youtube_metadata_generator import YouTubeMetadataGenerator
+from src.utils.youtube_uploader import QUOTA_COSTS, create_uploader_from_config
 
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
-from googleapiclient.errors import HttpError
 
 
 class Phase09YouTube(PhaseBase):
@@ -389,11 +389,24 @@ class Phase09YouTube(PhaseBase):
             with open(token_file, 'w') as f:
                 f.write(creds.to_json())
 
+        # アップロードエンジンが同じ認証情報を使う
+        self._youtube_credentials = creds
+
         # YouTube APIクライアントを作成
         youtube = build('youtube', 'v3', credentials=creds)
 
         return youtube
 
+    def _create_uploader(self):
+        """再開可能アップロードエンジンを作成（認証後に呼ぶ）"""
+        return create_uploader_from_config(
+            credentials=self._youtube_credentials,
+            upload_config=self.phase_config.get("upload_engine", {}),
+            quota_config=self.phase_config.get("quota", {}),
+            cache_dir=self.config.get_path("cache_dir"),
+            logger=self.logger
+        )
+
     def _upload_video(
         self,
         youtube,
@@ -427,47 +440,24 @@ class Phase09YouTube(PhaseBase):
             }
         }
 
-        # メディアファイルを作成
-        media = MediaFileUpload(
-            str(video_path),
-            mimetype='video/mp4',
-            resumable=True,
-            chunksize=1024*1024  # 1MB
-        )
+        # 再開可能アップロード（セッションは保存され、再実行時は続きから）
+        self._uploader = self._create_uploader()
+        last_logged = {"percent": -10}
+
+        def log_progress(sent: int, total: int):
+            percent = int(sent * 100 / total) if total else 100
+            if percent - last_logged["percent"] >= 10:
+                last_logged["percent"] = percent
+                self.logger.info(f"Upload progress: {percent}%")
 
-        # アップロードリクエストを実行
-        request = youtube.videos().insert(
+        response = self._uploader.upload(
+            video_path,
+            body,
             part="snippet,status",
-            body=body,
-            media_body=media
+            label=video_path.name,
+            progress=log_progress
         )
 
-        response = None
-        retry_count = 0
-        max_retries = self.phase_config.get("retry", {}).get("max_attempts", 3)
-
-        while response is None and retry_count < max_retries:
-            try:
-                self.logger.info(f"Upload attempt {retry_count + 1}/{max_retries}")
-                status, response = request.next_chunk()
-
-                if status:
-                    progress = int(status.progress() * 100)
-                    self.logger.info(f"Upload progress: {progress}%")
-
-            except HttpError as e:
-                if e.resp.status in [500, 502, 503, 504]:
-                    retry_count += 1
-                    self.logger.warning(f"HTTP error {e.resp.status}, retrying...")
-                else:
-                    raise
-
-        if response is None:
-            raise PhaseExecutionError(
-                self.get_phase_number(),
-                "Upload failed after retries"
-            )
-
         video_id = response['id']
         self.logger.info(f"Upload complete! Video ID: {video_id}")
 
@@ -513,6 +503,10 @@ class Phase09YouTube(PhaseBase):
         self.logger.info(f"Uploading thumbnail: {thumbnail_path}")
 
         try:
+            uploader = getattr(self, "_uploader", None)
+            if uploader is not None and uploader.quota is not None:
+                uploader.quota.reserve(QUOTA_COSTS["thumbnails.set"], "thumbnail")
+
             youtube.thumbnails().set(
                 videoId=video_id,
                 media_body=MediaFileUpload(str(thumbnail_path))
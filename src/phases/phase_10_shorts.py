@@ -1,8 +1,9 @@
 """
 Phase 10: YouTube Shorts 自動投稿
 
-Phase 7で生成された動画を60秒ごとに分割し、
-縦型に変換してYouTube Shortsとして投稿する。
+Phase 7の描画ソース（画像タイミング・音声ステム・ASS字幕）から
+字幕境界で区切った縦型クリップを直接描画し、YouTube Shortsとして投稿する。
+描画ソースがない場合は完成動画を60秒ごとに分割して縦型に変換する。
 """
 
 import json
@@ -11,7 +12,7 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import logging
-import time
+from concurrent.futures import ThreadPoolExecutor
 
 # プロジェクトルートをパスに追加
 if __name__ == "__main__":
@@ -27,15 +28,17 @@ from src.core.exceptions import (
 )
 from src.utils.video_splitter import VideoSplitter
 from src.utils.aspect_ratio_converter import AspectRatioConverter
+from src.utils.shorts_renderer import RENDER_SOURCES_FILE, ShortsRenderer, plan_shorts_cuts
+from src.utils.telemetry import submit_in_context
+from src.utils.timing_store import load_timing_data
 from src.generators.shorts_metadata_generator import ShortsMetadataGenerator
+from src.utils.youtube_uploader import UploadJob, create_uploader_from_config
 
 # YouTube API関連（Phase 9から流用）
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-from googleapiclient.errors import HttpError
 
 
 class Phase10Shorts(PhaseBase):
@@ -99,12 +102,13 @@ class Phase10Shorts(PhaseBase):
         """
         Shorts投稿の実行フロー:
 
-        1. Phase 7の動画を取得
-        2. VideoSplitterで60秒ごとに分割（最初の5個）
-        3. AspectRatioConverterで各クリップを縦型に変換
+        1. Phase 7の描画ソースから縦型クリップを直接描画（字幕境界で区切り、並列）
+           描画ソースがない場合:
+           2. VideoSplitterで60秒ごとに分割（最初の5個）
+           3. AspectRatioConverterで各クリップを縦型に変換
         4. Phase 9のログから本編URLを取得
         5. ShortsMetadataGeneratorでメタデータ生成
-        6. YouTube APIで各クリップを連続投稿
+        6. メタデータを並列に先読みしつつ、各クリップを並列に再開可能アップロード
         7. 結果をログに保存
         """
         self.logger.info(f"Starting YouTube Shorts upload for: {self.subject}")
@@ -114,11 +118,15 @@ class Phase10Shorts(PhaseBase):
             output_dir = self.config.get_path("output_dir")
             video_path = output_dir / "videos" / f"{self.subject}.mp4"
 
-            # 2. 動画を分割
-            clips = self._split_video(video_path)
+            # 2-3. 縦型クリップを用意（ソースから直接描画 → 分割+変換の順）
+            vertical_clips = None
+            split_mode = self.phase_config.get("video_split", {}).get("mode", "split")
+            if split_mode == "from_sources":
+                vertical_clips = self._render_from_sources(video_path)
 
-            # 3. 各クリップを縦型に変換
-            vertical_clips = self._convert_to_vertical(clips)
+            if not vertical_clips:
+                clips = self._split_video(video_path)
+                vertical_clips = self._convert_to_vertical(clips)
 
             # 4. Phase 9のログから本編URLと本編メタデータを取得
             main_video_url, original_metadata = self._get_main_video_info()
@@ -236,6 +244,70 @@ class Phase10Shorts(PhaseBase):
     # 内部メソッド
     # ========================================
 
+    def _render_from_sources(self, video_path: Path) -> Optional[List[Path]]:
+        """
+        Phase 7の描画ソースから縦型クリップを直接描画
+
+        完成動画を再エンコードせず、画像・音声ステム・ASS字幕から
+        1080x1920 のクリップを並列に描画する。切り出し位置は
+        subtitle_timing.json の字幕（文）の終わりに合わせる。
+
+        Args:
+            video_path: 完成動画のパス（描画ソースの照合と、音声ステムがない場合の音声ソース）
+
+        Returns:
+            縦型クリップのパスリスト（描画ソースがない・完成動画と一致しない・失敗した場合は None）
+        """
+        split_config = self.phase_config.get("video_split", {})
+        aspect_config = self.phase_config.get("aspect_ratio", {})
+        output_config = self.phase_config.get("output", {})
+
+        sources_path = self.config.get_phase_dir(self.subject, 7) / RENDER_SOURCES_FILE
+        renderer = ShortsRenderer(
+            project_root=self.config.project_root,
+            logger=self.logger,
+            target_width=aspect_config.get("target_width", 1080),
+            target_height=aspect_config.get("target_height", 1920),
+            encode_preset=split_config.get("encode_preset", "veryfast"),
+            crf=split_config.get("crf", 20),
+            max_workers=split_config.get("max_workers", 0),
+            fallback_audio_path=video_path,
+            still_backgrounds=split_config.get("still_backgrounds", False),
+            blur_downscale=aspect_config.get("blur_downscale", 10)
+        )
+
+        try:
+            sources = renderer.load_sources(sources_path, video_path=video_path)
+            if sources is None:
+                self.logger.info("Render sources unavailable, falling back to split + convert")
+                return None
+
+            subtitles = []
+            subtitle_path = self.config.get_phase_dir(self.subject, 6) / "subtitle_timing.json"
+            if subtitle_path.exists():
+                subtitles = load_timing_data(subtitle_path).get("subtitles", [])
+            else:
+                self.logger.warning(f"Subtitle timing not found, cutting at fixed intervals: {subtitle_path}")
+
+            cuts = plan_shorts_cuts(
+                subtitles,
+                total_duration=sources.get("total_duration", 0.0),
+                segment_duration=split_config.get("segment_duration", 60),
+                max_clips=split_config.get("max_clips", 5),
+                min_duration=split_config.get("min_clip_duration", 20),
+                fps=sources.get("fps", 30)
+            )
+            if not cuts:
+                self.logger.warning("No shorts cuts planned, falling back to split + convert")
+                return None
+
+            vertical_dir = self.phase_dir / output_config.get("vertical_dir", "vertical")
+            return renderer.render_clips(sources, cuts, vertical_dir, prefix="vertical")
+
+        except Exception as e:
+            self.logger.warning(f"⚠️ Rendering shorts from sources failed, falling back to split + convert: {e}")
+            return None
+
     def _split_video(self, video_path: Path) -> List[Path]:
         """
         動画を60秒ごとに分割
@@ -293,24 +365,27 @@ class Phase10Shorts(PhaseBase):
         output_config = self.phase_config.get("output", {})
         vertical_dir = self.phase_dir / output_config.get("vertical_dir", "vertical")
 
-        # AspectRatioConverterで変換
-        converter = AspectRatioConverter(logger=self.logger)
-        vertical_clips = []
-
-        for i, clip in enumerate(clips, 1):
-            output_path = vertical_dir / f"vertical_{i:03d}.mp4"
-
-            self.logger.info(f"Converting clip {i}/{len(clips)} to vertical (mode={mode})...")
-
-            converted = converter.convert_to_vertical(
-                input_path=clip,
-                output_path=output_path,
-                target_width=target_width,
-                target_height=target_height,
-                mode=mode
-            )
+        # AspectRatioConverterで並列に変換
+        converter = AspectRatioConverter(
+            logger=self.logger,
+            blur_downscale=aspect_config.get("blur_downscale", 10)
+        )
+        jobs = [
+            {
+                'input_path': clip,
+                'output_path': vertical_dir / f"vertical_{i:03d}.mp4"
+            }
+            for i, clip in enumerate(clips, 1)
+        ]
 
-            vertical_clips.append(converted)
+        self.logger.info(f"Converting {len(clips)} clips to vertical (mode={mode})...")
+        vertical_clips = converter.convert_many(
+            jobs,
+            target_width=target_width,
+            target_height=target_height,
+            mode=mode,
+            max_workers=aspect_config.get("max_workers", 0)
+        )
 
         return vertical_clips
 
@@ -388,6 +463,9 @@ class Phase10Shorts(PhaseBase):
             with open(token_file, 'w') as f:
                 f.write(creds.to_json())
 
+        # アップロードエンジンが同じ認証情報を使う
+        self._youtube_credentials = creds
+
         # YouTube APIクライアントを作成
         youtube = build('youtube', 'v3', credentials=creds)
 
@@ -403,6 +481,10 @@ class Phase10Shorts(PhaseBase):
         """
         全クリップをアップロード
 
+        メタデータ生成は全クリップ分を並列に先読みし、各クリップは
+        自分のメタデータが揃った時点で並列アップロードを開始する。
+        Quota 予算を超えるクリップはアップロードせずに失敗として記録する。
+
         Args:
             youtube: YouTube APIクライアント
             clips: 縦型クリップのパスリスト
@@ -414,6 +496,7 @@ class Phase10Shorts(PhaseBase):
         """
         metadata_config = self.phase_config.get("metadata_generation", {})
         upload_config = self.phase_config.get("upload", {})
+        engine_config = self.phase_config.get("upload_engine", {})
 
         # Claude APIキーを取得
         try:
@@ -432,54 +515,74 @@ class Phase10Shorts(PhaseBase):
             logger=self.logger
         )
 
-        upload_results = []
+        uploader = create_uploader_from_config(
+            credentials=self._youtube_credentials,
+            upload_config=engine_config,
+            quota_config=self.phase_config.get("quota", {}),
+            cache_dir=self.config.get_path("cache_dir"),
+            logger=self.logger
+        )
+
         total_clips = len(clips)
+        privacy_status = upload_config.get("privacy_status", "public")
+        category_id = upload_config.get("category_id", "22")
+
+        def generate(clip_number: int) -> Dict[str, Any]:
+            # configにmax_tokensとtemperatureを含める
+            return generator.generate_metadata(
+                subject=self.subject,
+                original_title=original_metadata.get("title", f"{self.subject}の物語"),
+                original_description=original_metadata.get("description", ""),
+                clip_number=clip_number,
+                total_clips=total_clips,
+                main_video_url=main_video_url,
+                config={
+                    **metadata_config,
+                    "max_tokens": metadata_config.get("max_tokens", 2000),
+                    "temperature": metadata_config.get("temperature", 0.7)
+                }
+            )
 
-        for i, clip_path in enumerate(clips, 1):
-            try:
-                self.logger.info(f"Uploading clip {i}/{total_clips}...")
-
-                # メタデータを生成（configにmax_tokensとtemperatureを含める）
-                metadata = generator.generate_metadata(
-                    subject=self.subject,
-                    original_title=original_metadata.get("title", f"{self.subject}の物語"),
-                    original_description=original_metadata.get("description", ""),
-                    clip_number=i,
-                    total_clips=total_clips,
-                    main_video_url=main_video_url,
-                    config={
-                        **metadata_config,
-                        "max_tokens": metadata_config.get("max_tokens", 2000),
-                        "temperature": metadata_config.get("temperature", 0.7)
-                    }
-                )
+        # メタデータを並列に先読み（アップロードと並行）
+        metadata_workers = max(1, min(engine_config.get("metadata_workers", 5), total_clips))
+        with ThreadPoolExecutor(max_workers=metadata_workers) as metadata_executor:
+            metadata_futures = {
+                i: submit_in_context(metadata_executor, generate, i)
+                for i in range(1, total_clips + 1)
+            }
 
-                # アップロード
-                video_id = self._upload_single_clip(
-                    youtube=youtube,
-                    clip_path=clip_path,
-                    metadata=metadata,
-                    privacy_status=upload_config.get("privacy_status", "public"),
-                    category_id=upload_config.get("category_id", "22")
+            def body_for(clip_number: int):
+                def build_body() -> Dict[str, Any]:
+                    metadata = metadata_futures[clip_number].result()
+                    return self._build_clip_body(metadata, privacy_status, category_id)
+                return build_body
+
+            jobs = [
+                UploadJob(
+                    file_path=clip_path,
+                    body=body_for(i),
+                    label=f"clip {i}/{total_clips}",
+                    extra={"clip_number": i}
                 )
+                for i, clip_path in enumerate(clips, 1)
+            ]
+            results = uploader.upload_many(jobs, max_workers=engine_config.get("max_workers", 3))
 
-                # 結果を記録
+        upload_results = []
+        for result in results:
+            i = result["extra"]["clip_number"]
+            if result["video_id"]:
+                video_id = result["video_id"]
                 upload_results.append({
                     "clip_number": i,
                     "video_id": video_id,
                     "url": f"https://www.youtube.com/shorts/{video_id}",
-                    "title": metadata["title"],
+                    "title": metadata_futures[i].result()["title"],
                     "status": "success"
                 })
-
                 self.logger.info(f"Clip {i} uploaded successfully: {video_id}")
-
-                # API制限を考慮して少し待機
-                if i < total_clips:
-                    time.sleep(2)
-
-            except Exception as e:
-                self.logger.error(f"Failed to upload clip {i}: {e}")
+            else:
+                self.logger.error(f"Failed to upload clip {i}: {result['error']}")
                 # エラーでも可能な限り続行
                 upload_results.append({
                     "clip_number": i,
@@ -487,34 +590,29 @@ class Phase10Shorts(PhaseBase):
                     "url": None,
                     "title": f"Clip {i}",
                     "status": "failed",
-                    "error": str(e)
+                    "error": result["error"]
                 })
 
         return upload_results
 
-    def _upload_single_clip(
+    def _build_clip_body(
         self,
-        youtube,
-        clip_path: Path,
         metadata: Dict[str, Any],
         privacy_status: str,
         category_id: str
-    ) -> str:
+    ) -> Dict[str, Any]:
         """
-        1つのクリップをアップロード
+        クリップの videos.insert リクエストボディを作成
 
         Args:
-            youtube: YouTube APIクライアント
-            clip_path: クリップのパス
             metadata: メタデータ
             privacy_status: 公開設定
             category_id: カテゴリID
 
         Returns:
-            video_id
+            リクエストボディ
         """
-        # リクエストボディを作成
-        body = {
+        return {
             "snippet": {
                 "title": metadata["title"],
                 "description": metadata["description"],
@@ -527,50 +625,6 @@ class Phase10Shorts(PhaseBase):
             }
         }
 
-        # メディアファイルを作成
-        media = MediaFileUpload(
-            str(clip_path),
-            mimetype='video/mp4',
-            resumable=True,
-            chunksize=1024*1024  # 1MB
-        )
-
-        # アップロードリクエストを実行
-        request = youtube.videos().insert(
-            part="snippet,status",
-            body=body,
-            media_body=media
-        )
-
-        response = None
-        retry_count = 0
-        max_retries = self.phase_config.get("retry", {}).get("max_attempts", 3)
-
-        while response is None and retry_count < max_retries:
-            try:
-                status, response = request.next_chunk()
-
-                if status:
-                    progress = int(status.progress() * 100)
-                    self.logger.debug(f"Upload progress: {progress}%")
-
-            except HttpError as e:
-                if e.resp.status in [500, 502, 503, 504]:
-                    retry_count += 1
-                    self.logger.warning(f"HTTP error {e.resp.status}, retrying...")
-                    time.sleep(5)
-                else:
-                    raise
-
-        if response is None:
-            raise PhaseExecutionError(
-                self.get_phase_number(),
-                "Upload failed after retries"
-            )
-
-        video_id = response['id']
-        return video_id
-
     def _save_upload_log(self, result: Dict[str, Any]) -> None:
         """アップロードログを保存"""
         upload_log_path = self.phase_dir / self.phase_config.get("output", {}).get(
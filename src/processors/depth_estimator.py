@@ -3,17 +3,22 @@
 Hugging Face Transformersを使用した深度推定処理
 """
 
-import torch
+import importlib.util
+import threading
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from PIL import Image
 import logging
 
-try:
-    from transformers import pipeline
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
+# torch / transformers は import だけで数秒かかるため、DepthEstimator の作成時に読み込む
+TRANSFORMERS_AVAILABLE = (
+    importlib.util.find_spec("transformers") is not None
+    and importlib.util.find_spec("torch") is not None
+)
+
+# 読み込み済みパイプライン（プロセス内で共有。常駐ワーカーではジョブをまたいで再利用する）
+_pipeline_cache: Dict[Tuple[str, str], Any] = {}
+_pipeline_cache_lock = threading.Lock()
 
 
 class DepthEstimator:
@@ -44,6 +49,9 @@ class DepthEstimator:
                 "Install with: pip install transformers torch"
             )
         
+        import torch
+        from transformers import pipeline
+
         self.logger = logger or logging.getLogger(__name__)
         
         # デバイス選択
@@ -56,11 +64,15 @@ class DepthEstimator:
         
         # パイプライン初期化
         try:
-            self.pipe = pipeline(
-                task="depth-estimation",
-                model=model_name,
-                device=self.device
-            )
+            with _pipeline_cache_lock:
+                key = (model_name, self.device)
+                if key not in _pipeline_cache:
+                    _pipeline_cache[key] = pipeline(
+                        task="depth-estimation",
+                        model=model_name,
+                        device=self.device
+                    )
+                self.pipe = _pipeline_cache[key]
             self.model_name = model_name
             self.logger.info(f"Depth estimation model loaded: {model_name}")
         except Exception as e:
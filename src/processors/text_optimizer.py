@@ -7,7 +7,8 @@ Claude APIを使用して、音声合成用にテキストを最適化する。
 
 import logging
 from typing import Optional
-from anthropic import Anthropic
+
+from ..utils.llm_gateway import get_llm_gateway
 
 
 class TextOptimizer:
@@ -27,7 +28,7 @@ class TextOptimizer:
             model: 使用するClaudeモデル
             logger: ロガー
         """
-        self.client = Anthropic(api_key=api_key)
+        self.llm = get_llm_gateway(api_key)
         self.model = model
         self.logger = logger or logging.getLogger(__name__)
 
@@ -54,13 +55,14 @@ class TextOptimizer:
         self.logger.debug(f"Optimizing text: {text[:50]}...")
 
         try:
-            response = self.client.messages.create(
+            response = self.llm.create(
                 model=self.model,
                 max_tokens=4096,
                 messages=[{
                     "role": "user",
                     "content": prompt
-                }]
+                }],
+                caller="TextOptimizer"
             )
 
             optimized_response = response.content[0].text.strip()
@@ -3,20 +3,152 @@
 
 横型動画を縦型(9:16)に変換。
 元動画のアスペクト比(16:9)は保持したまま、ぼかし背景の上に配置。
+
+fast_blur_bg モードは背景を 1/blur_downscale の解像度でぼかしてから拡大する
+（_create_zoompan_segment の scale=192:108 と同じ考え方）。
+静止画ソースの場合は画像ごとに事前にぼかした背景静止画を再利用できる。
 """
 
+import hashlib
+import os
 import subprocess
 import platform
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Literal
+from typing import Dict, List, Optional, Literal, Sequence
 import logging
 
+from .telemetry import map_in_context
+
+# fast_blur_bg: 背景を縮小する倍率（1080x1920 → 108x192）
+DEFAULT_BLUR_DOWNSCALE = 10
+
 
 class AspectRatioConverter:
     """アスペクト比変換クラス"""
 
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        blur_downscale: int = DEFAULT_BLUR_DOWNSCALE,
+        cache_dir: Optional[Path] = None
+    ):
+        """
+        Args:
+            logger: ロガー
+            blur_downscale: fast_blur_bg で背景をぼかす解像度の縮小倍率
+            cache_dir: ぼかし背景静止画の保存先（Noneの場合は出力先の隣）
+        """
         self.logger = logger or logging.getLogger(__name__)
+        self.blur_downscale = max(1, blur_downscale)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
+    def _fast_blur_chain(self, target_width: int, target_height: int) -> str:
+        """
+        縮小 → 小さな boxblur → 拡大 の背景フィルタチェーン
+
+        boxblur をフル解像度（半径 min(h,w)/20）ではなく
+        1/blur_downscale の解像度で掛けるため、計算量は約 1/blur_downscale^2。
+        """
+        small_w = max(2, target_width // self.blur_downscale // 2 * 2)
+        small_h = max(2, target_height // self.blur_downscale // 2 * 2)
+        # フル解像度の半径 min(h,w)/20 を縮小後の解像度に換算
+        radius = max(1, min(small_w, small_h) // 20)
+        return (
+            f"scale={small_w}:{small_h}:force_original_aspect_ratio=increase,"
+            f"crop={small_w}:{small_h},"
+            f"boxblur=luma_radius={radius}:luma_power=2:chroma_radius={radius}:chroma_power=2,"
+            f"scale={target_width}:{target_height}:flags=bicubic"
+        )
+
+    def create_blurred_still(
+        self,
+        image_path: Path,
+        target_width: int = 1080,
+        target_height: int = 1920
+    ) -> Path:
+        """
+        静止画から縦型のぼかし背景静止画を作成（キャッシュ付き）
+
+        Ken Burns の元画像のように背景の元が静止画の場合、
+        フレームごとにぼかす代わりにこの静止画を背景として使える。
+
+        Returns:
+            ぼかし背景静止画のパス
+        """
+        image_path = Path(image_path)
+        stat = image_path.stat()
+        key = "|".join([
+            str(image_path.resolve()), str(stat.st_size), str(stat.st_mtime_ns),
+            f"{target_width}x{target_height}", str(self.blur_downscale),
+        ])
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        cache_dir = self.cache_dir or image_path.parent / ".blur_cache"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        output_path = cache_dir / f"{image_path.stem}_blur_{digest}.png"
+        if output_path.exists():
+            return output_path
+
+        tmp_path = output_path.with_name(output_path.stem + ".tmp.png")
+        cmd = [
+            'ffmpeg', '-y',
+            '-i', self._normalize(image_path),
+            '-vf', self._fast_blur_chain(target_width, target_height),
+            '-frames:v', '1',
+            self._normalize(tmp_path)
+        ]
+        self._run(cmd, "blurred still")
+        tmp_path.replace(output_path)
+        return output_path
+
+    def create_blurred_stills(
+        self,
+        image_paths: Sequence[Path],
+        target_width: int = 1080,
+        target_height: int = 1920,
+        max_workers: int = 0
+    ) -> Dict[Path, Path]:
+        """
+        複数画像のぼかし背景静止画を並列に作成
+
+        Returns:
+            {元画像のパス: ぼかし背景静止画のパス}
+        """
+        unique: List[Path] = list(dict.fromkeys(Path(p) for p in image_paths))
+        if not unique:
+            return {}
+        workers = min(max_workers or os.cpu_count() or 1, len(unique))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            stills = map_in_context(
+                executor, lambda p: self.create_blurred_still(p, target_width, target_height), unique
+            )
+        return dict(zip(unique, stills))
+
+    def _normalize(self, p: Path) -> str:
+        """WindowsパスをUnix形式に変換（ffmpeg互換）"""
+        path_str = str(p)
+        if platform.system() == 'Windows':
+            path_str = path_str.replace('\\', '/')
+        return path_str
+
+    def _run(self, cmd: List[str], label: str):
+        self.logger.debug(f"Command: {' '.join(cmd)}")
+        try:
+            subprocess.run(
+                cmd,
+                check=True,
+                capture_output=True,
+                text=False,
+                encoding=None
+            )
+        except subprocess.CalledProcessError as e:
+            try:
+                stderr_msg = e.stderr.decode('utf-8', errors='ignore') if e.stderr else ''
+            except:
+                stderr_msg = '<decode failed>'
+
+            self.logger.error(f"ffmpeg {label} failed: {stderr_msg}")
+            raise
 
     def convert_to_vertical(
         self,
@@ -25,7 +157,9 @@ class AspectRatioConverter:
         target_width: int = 1080,
         target_height: int = 1920,
         crop_mode: Optional[str] = None,  # 後方互換性のため残す
-        mode: Literal["blur_bg", "black_bars", "crop"] = "blur_bg"
+        mode: Literal["blur_bg", "fast_blur_bg", "black_bars", "crop"] = "blur_bg",
+        background_image: Optional[Path] = None,
+        threads: int = 0
     ) -> Path:
         """
         横型を縦型に変換
@@ -37,9 +171,13 @@ class AspectRatioConverter:
             target_height: 出力高さ（デフォルト1920）
             crop_mode: クロップモード（後方互換性のため、非推奨）
             mode: 変換モード
-                - "blur_bg": ぼかし背景 + 元動画16:9維持（推奨）
+                - "blur_bg": ぼかし背景 + 元動画16:9維持（フル解像度 boxblur）
+                - "fast_blur_bg": blur_bg と同じ見た目を縮小解像度のぼかしで作る（推奨）
                 - "black_bars": 黒帯追加 + 元動画16:9維持
                 - "crop": 中央クロップ（非推奨）
+            background_image: fast_blur_bg で使うぼかし済み背景静止画
+                （create_blurred_still() の出力。指定時は背景をフレームごとに計算しない）
+            threads: ffmpeg のスレッド数（0 = 自動。並列変換時に分配する）
             
         Returns:
             変換後の動画パス
@@ -82,6 +220,36 @@ class AspectRatioConverter:
                 output_str
             ]
             
+        elif mode == "fast_blur_bg":
+            # 縮小解像度でぼかした背景 + 元動画16:9維持
+            fg = f"scale={target_width}:-2"
+            if background_image is not None:
+                # 事前にぼかした背景静止画を再利用（フレームごとのぼかしなし）
+                filter_complex = (
+                    f"[1:v]scale={target_width}:{target_height}[bg];"
+                    f"[0:v]{fg}[fg];"
+                    f"[bg][fg]overlay=(W-w)/2:(H-h)/2:shortest=1,format=yuv420p[out]"
+                )
+                inputs = ['-i', input_str, '-loop', '1', '-i', self._normalize(Path(background_image))]
+            else:
+                filter_complex = (
+                    f"[0:v]split=2[bgsrc][fgsrc];"
+                    f"[bgsrc]{self._fast_blur_chain(target_width, target_height)}[bg];"
+                    f"[fgsrc]{fg}[fg];"
+                    f"[bg][fg]overlay=(W-w)/2:(H-h)/2,format=yuv420p[out]"
+                )
+                inputs = ['-i', input_str]
+
+            cmd = [
+                'ffmpeg', '-y',
+                *inputs,
+                '-filter_complex', filter_complex,
+                '-map', '[out]',
+                '-map', '0:a?',
+                '-c:a', 'copy',
+                output_str
+            ]
+
         elif mode == "black_bars":
             # 黒帯 + 元動画16:9維持
             # 前景: アスペクト比保持で幅に合わせてスケール
@@ -108,26 +276,59 @@ class AspectRatioConverter:
                 output_str
             ]
 
+        if threads > 0:
+            cmd[-1:-1] = ['-threads', str(threads)]
+
         self.logger.info(f"Converting to vertical ({target_width}x{target_height}, mode={mode})...")
-        self.logger.debug(f"Command: {' '.join(cmd)}")
+        self._run(cmd, "conversion")
 
-        try:
-            result = subprocess.run(
-                cmd,
-                check=True,
-                capture_output=True,
-                text=False,
-                encoding=None
-            )
+        self.logger.info(f"✓ Converted: {output_path.name}")
+        return output_path
 
-            self.logger.info(f"✓ Converted: {output_path.name}")
-            return output_path
+    def convert_many(
+        self,
+        jobs: Sequence[Dict],
+        target_width: int = 1080,
+        target_height: int = 1920,
+        mode: Literal["blur_bg", "fast_blur_bg", "black_bars", "crop"] = "blur_bg",
+        max_workers: int = 0
+    ) -> List[Path]:
+        """
+        複数クリップを並列に縦型変換
 
-        except subprocess.CalledProcessError as e:
-            try:
-                stderr_msg = e.stderr.decode('utf-8', errors='ignore') if e.stderr else ''
-            except:
-                stderr_msg = '<decode failed>'
+        Args:
+            jobs: [{'input_path': Path, 'output_path': Path, 'background_image': Optional[Path]}, ...]
+            target_width: 出力幅
+            target_height: 出力高さ
+            mode: 変換モード（convert_to_vertical と同じ）
+            max_workers: 並列数（0 の場合は CPU 数とクリップ数から自動決定）
 
-            self.logger.error(f"ffmpeg conversion failed: {stderr_msg}")
-            raise
+        Returns:
+            変換後の動画パスのリスト（jobs と同じ順）
+        """
+        if not jobs:
+            return []
+
+        cpu_count = os.cpu_count() or 1
+        if max_workers and max_workers > 0:
+            workers = min(max_workers, len(jobs))
+        else:
+            # x264 は1プロセスでも数スレッドは使うため、1クリップあたり2コアを目安にする
+            workers = max(1, min(cpu_count // 2, len(jobs)))
+        threads = max(1, cpu_count // workers)
+
+        self.logger.info(f"Converting {len(jobs)} clips in parallel ({workers} workers × {threads} threads)...")
+
+        def convert(job: Dict) -> Path:
+            return self.convert_to_vertical(
+                input_path=job['input_path'],
+                output_path=job['output_path'],
+                target_width=target_width,
+                target_height=target_height,
+                mode=mode,
+                background_image=job.get('background_image'),
+                threads=threads
+            )
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return map_in_context(executor, convert, jobs)
@@ -1 +1,208 @@
-﻿# cost
+"""
+コスト計算
+
+API 呼び出しのトークン数・料金を実行中に集計する。
+LLM ゲートウェイ（src/utils/llm_gateway.py）が呼び出しごとに記録し、
+フェーズ終了時などに summary() で内訳を取り出す。
+
+料金は USD / 100万トークン。円換算は settings.yaml の
+cost_tracking.exchange_rate_usd_to_jpy を使う。
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from .logger import log_cost
+
+# モデル名の接頭辞 → (入力, 出力) USD / 100万トークン
+# 長い接頭辞から順に照合する
+LLM_PRICING_USD_PER_MTOK = {
+    "claude-opus-4": (15.0, 75.0),
+    "claude-sonnet-4": (3.0, 15.0),
+    "claude-3-7-sonnet": (3.0, 15.0),
+    "claude-3-5-sonnet": (3.0, 15.0),
+    "claude-3-5-haiku": (0.8, 4.0),
+    "claude-3-haiku": (0.25, 1.25),
+    "claude-3-opus": (15.0, 75.0),
+}
+
+# 不明なモデルは Sonnet 相当で見積もる
+DEFAULT_LLM_PRICING = (3.0, 15.0)
+
+DEFAULT_EXCHANGE_RATE = 150.0
+
+
+def llm_pricing(model: str) -> tuple:
+    """モデルの (入力, 出力) 単価 USD / 100万トークン"""
+    for prefix in sorted(LLM_PRICING_USD_PER_MTOK, key=len, reverse=True):
+        if model.startswith(prefix):
+            return LLM_PRICING_USD_PER_MTOK[prefix]
+    return DEFAULT_LLM_PRICING
+
+
+def llm_cost_usd(model: str, input_tokens: int, output_tokens: int) -> float:
+    """トークン数から料金（USD）を計算"""
+    input_price, output_price = llm_pricing(model)
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+class CostCalculator:
+    """
+    実行中の API コスト集計（スレッドセーフ）
+
+    呼び出し元（caller）ごとに回数・トークン数・料金を積み上げる。
+    キャッシュから返した応答は回数だけ数え、料金は加算しない。
+    """
+
+    def __init__(
+        self,
+        exchange_rate: float = DEFAULT_EXCHANGE_RATE,
+        alert_threshold_jpy: Optional[float] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        初期化
+
+        Args:
+            exchange_rate: USD → JPY の換算レート
+            alert_threshold_jpy: 累計がこの額を超えたら警告（Noneなら警告しない）
+            logger: ロガー
+        """
+        self.exchange_rate = exchange_rate
+        self.alert_threshold_jpy = alert_threshold_jpy
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._alerted = False
+
+    def record_llm(
+        self,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        caller: str = "",
+        cached: bool = False
+    ) -> float:
+        """
+        LLM 呼び出し1回分を記録
+
+        Args:
+            model: モデル名
+            input_tokens: 入力トークン数
+            output_tokens: 出力トークン数
+            caller: 呼び出し元（集計キー）
+            cached: キャッシュから返した応答か
+
+        Returns:
+            この呼び出しの料金（USD）
+        """
+        cost = 0.0 if cached else llm_cost_usd(model, input_tokens, output_tokens)
+        key = caller or model
+
+        with self._lock:
+            entry = self._entries.setdefault(key, {
+                "service": "claude",
+                "model": model,
+                "calls": 0,
+                "cached_calls": 0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "cost_usd": 0.0,
+            })
+            entry["calls"] += 1
+            if cached:
+                entry["cached_calls"] += 1
+            else:
+                entry["input_tokens"] += input_tokens
+                entry["output_tokens"] += output_tokens
+                entry["cost_usd"] += cost
+            total_jpy = self._total_usd() * self.exchange_rate
+            should_alert = (
+                self.alert_threshold_jpy is not None
+                and not self._alerted
+                and total_jpy > self.alert_threshold_jpy
+            )
+            if should_alert:
+                self._alerted = True
+
+        if cost:
+            log_cost(self.logger, f"claude/{key}", cost * self.exchange_rate, total_jpy)
+        if should_alert:
+            self.logger.warning(
+                f"API cost ¥{total_jpy:.0f} exceeded alert threshold ¥{self.alert_threshold_jpy:.0f}"
+            )
+        return cost
+
+    def _total_usd(self) -> float:
+        return sum(entry["cost_usd"] for entry in self._entries.values())
+
+    @property
+    def total_usd(self) -> float:
+        with self._lock:
+            return self._total_usd()
+
+    @property
+    def total_jpy(self) -> float:
+        return self.total_usd * self.exchange_rate
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        集計結果
+
+        Returns:
+            {"total_usd", "total_jpy", "breakdown": {caller: {...}}}
+        """
+        with self._lock:
+            breakdown = {key: dict(entry) for key, entry in self._entries.items()}
+            total = self._total_usd()
+        return {
+            "total_usd": round(total, 6),
+            "total_jpy": round(total * self.exchange_rate, 2),
+            "breakdown": breakdown,
+        }
+
+    def reset(self):
+        """集計をクリア"""
+        with self._lock:
+            self._entries.clear()
+            self._alerted = False
+
+
+# ========================================
+# グローバルインスタンス
+# ========================================
+
+_cost_calculator: Optional[CostCalculator] = None
+_cost_calculator_lock = threading.Lock()
+
+
+def get_cost_calculator() -> CostCalculator:
+    """
+    グローバルなコスト集計を取得
+
+    初回呼び出し時に settings.yaml の cost_tracking から初期化する。
+    """
+    global _cost_calculator
+
+    with _cost_calculator_lock:
+        if _cost_calculator is None:
+            exchange_rate = DEFAULT_EXCHANGE_RATE
+            alert_threshold = None
+            try:
+                from ..core.config_manager import get_config
+                tracking = get_config().get("cost_tracking", {}) or {}
+                exchange_rate = tracking.get("exchange_rate_usd_to_jpy", DEFAULT_EXCHANGE_RATE)
+                if tracking.get("enabled", True):
+                    alert_threshold = tracking.get("alert_threshold_jpy")
+            except Exception:
+                pass
+            _cost_calculator = CostCalculator(exchange_rate, alert_threshold)
+        return _cost_calculator
+
+
+def reset_cost_calculator() -> None:
+    """グローバルなコスト集計をリセット（テスト用）"""
+    global _cost_calculator
+    with _cost_calculator_lock:
+        _cost_calculator = None
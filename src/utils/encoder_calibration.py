@@ -0,0 +1,369 @@
+"""
+エンコーダーのキャリブレーション（ホストごとのプロファイル作成）
+
+短い合成タイムライン（静止画のズーム・パン + 字幕バー。本番の Phase 7 と同じ構成）を
+ロスレスで作り、ロール（src/utils/encoder_profile.py）ごとに preset × crf の組み合わせで
+エンコードして次を計測する:
+- 速度（エンコードの fps）
+- 出力サイズ（kbps）
+- 画質（元のタイムラインに対する SSIM / PSNR。ffmpeg の ssim / psnr フィルタ）
+
+画質の下限は「従来の固定値でエンコードしたときの SSIM - 許容差」。
+その下限を満たす組み合わせから、ロールの方針（speed: 最速 / balanced: 時間 × サイズが最小）で選ぶ。
+最終動画の設定では、さらに threads と同時に走らせる ffmpeg の数（チャンク並列エンコード用）を計測する。
+
+使用例:
+    python -m src.cli calibrate-encoder
+    python -m src.cli calibrate-encoder --quick
+"""
+
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import numpy as np
+    from PIL import Image
+    IMAGING_AVAILABLE = True
+except ImportError:
+    IMAGING_AVAILABLE = False
+
+from .encoder_profile import ROLE_DEFAULTS, EncodeSettings, EncoderProfile, host_fingerprint
+
+# 既定値（settings.yaml の encoder_profile.calibration で上書き）
+DEFAULT_DURATION = 4.0
+DEFAULT_PRESETS = ["ultrafast", "superfast", "veryfast", "faster", "fast", "medium"]
+QUICK_PRESETS = ["ultrafast", "veryfast", "faster", "medium"]
+DEFAULT_SSIM_TOLERANCE = 0.002
+
+# ロールごとの crf の候補と選び方
+ROLE_GRID: Dict[str, Dict[str, Any]] = {
+    "final": {"crfs": [20, 23, 26], "objective": "balanced"},
+    "still_segment": {"crfs": [0], "objective": "speed"},
+    "intermediate": {"crfs": [16, 18, 20], "objective": "speed"},
+    "background": {"crfs": [26, 28, 30], "objective": "speed"},
+}
+
+WIDTH, HEIGHT, FPS = 1920, 1080, 30
+
+
+@dataclass
+class Measurement:
+    """1つの組み合わせの計測結果"""
+    role: str
+    preset: str
+    crf: int
+    threads: int
+    workers: int
+    seconds: float
+    fps: float
+    kbps: float
+    ssim: Optional[float] = None
+    psnr: Optional[float] = None
+    passed: bool = True
+
+    @property
+    def settings(self) -> EncodeSettings:
+        return EncodeSettings(self.preset, self.crf, self.threads)
+
+
+def make_calibration_image(seed: int, width: int = WIDTH, height: int = HEIGHT) -> "Image.Image":
+    """
+    写真に近い合成画像（なだらかなグラデーション + 中周波の模様 + 細かいノイズ）
+
+    単色や規則的なパターンだとエンコーダーの差が出ないため、実画像に近い周波数成分を持たせる。
+    """
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    base = np.stack([
+        120 + 80 * np.sin(x / width * np.pi * (1 + seed % 3) + c) * np.cos(y / height * np.pi * 1.5)
+        for c in (0.0, 1.2, 2.4)
+    ], axis=-1)
+
+    # 中周波: 低解像度の乱数を拡大
+    coarse = rng.random((height // 40, width // 40, 3)).astype(np.float32)
+    coarse = np.asarray(
+        Image.fromarray((coarse * 255).astype(np.uint8)).resize((width, height), Image.Resampling.BICUBIC),
+        dtype=np.float32
+    )
+    fine = rng.normal(0, 6, (height, width, 1)).astype(np.float32)
+
+    image = base * 0.6 + coarse * 0.4 + fine
+    return Image.fromarray(np.clip(image, 0, 255).astype(np.uint8))
+
+
+class EncoderCalibrator:
+    """合成タイムラインでエンコード設定を計測し、ホストのプロファイルを作る"""
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        duration: float = DEFAULT_DURATION,
+        presets: Optional[List[str]] = None,
+        role_grid: Optional[Dict[str, Dict[str, Any]]] = None,
+        ssim_tolerance: float = DEFAULT_SSIM_TOLERANCE,
+        images: int = 3,
+        measure_parallel: bool = True,
+        progress: Optional[Callable[[Measurement], None]] = None
+    ):
+        """
+        Args:
+            duration: 合成タイムラインの長さ（秒）
+            presets: 試す x264 preset
+            role_grid: ロール → {"crfs": [...], "objective": "speed" | "balanced"}
+            ssim_tolerance: 従来の固定値の SSIM からどこまで下がってよいか
+            images: タイムラインの画像数
+            measure_parallel: threads / 同時エンコード数も計測するか
+            progress: 計測ごとに呼ばれる関数（表示用）
+        """
+        if not IMAGING_AVAILABLE:
+            raise ImportError("numpy and Pillow are required for encoder calibration")
+        self.logger = logger or logging.getLogger(__name__)
+        self.duration = duration
+        self.presets = presets or DEFAULT_PRESETS
+        self.role_grid = role_grid or ROLE_GRID
+        self.ssim_tolerance = ssim_tolerance
+        self.images = images
+        self.measure_parallel = measure_parallel
+        self.progress = progress
+        self.frames = int(round(duration * FPS))
+
+    # ----------------------------------------
+    # 合成タイムライン
+    # ----------------------------------------
+
+    def build_timeline(self, work_dir: Path) -> Path:
+        """
+        ロスレスの参照タイムライン（静止画ごとにゆっくりズーム・パン、下部に字幕バー）
+        """
+        inputs, filters = [], []
+        per_image = self.duration / self.images
+        for i in range(self.images):
+            image_path = work_dir / f"calibration_{i}.png"
+            make_calibration_image(seed=i).save(image_path, compress_level=1)
+            inputs.extend(['-loop', '1', '-framerate', str(FPS), '-t', f"{per_image:.3f}", '-i', str(image_path)])
+            # 110% に拡大して 1920x1080 を時間とともにずらしながら切り出す（Ken Burns 相当）
+            filters.append(
+                f"[{i}:v]scale={int(WIDTH * 1.1)}:{int(HEIGHT * 1.1)},"
+                f"crop={WIDTH}:{HEIGHT}:x='(iw-ow)*t/{per_image:.3f}':y='(ih-oh)*t/{per_image:.3f}',"
+                f"drawbox=y=ih-216:color=black@1.0:width=iw:height=216:t=fill,"
+                f"format=yuv420p,setsar=1[v{i}]"
+            )
+        concat = "".join(f"[v{i}]" for i in range(self.images))
+        filters.append(f"{concat}concat=n={self.images}:v=1:a=0[out]")
+
+        reference = work_dir / "reference.mkv"
+        cmd = [
+            'ffmpeg', '-y', '-v', 'error', *inputs,
+            '-filter_complex', ';'.join(filters),
+            '-map', '[out]', '-r', str(FPS), '-frames:v', str(self.frames),
+            '-c:v', 'libx264', '-preset', 'ultrafast', '-qp', '0', '-pix_fmt', 'yuv420p',
+            str(reference)
+        ]
+        subprocess.run(cmd, check=True, capture_output=True)
+        return reference
+
+    # ----------------------------------------
+    # 計測
+    # ----------------------------------------
+
+    def _encode_command(self, reference: Path, settings: EncodeSettings, output: Path) -> List[str]:
+        return [
+            'ffmpeg', '-y', '-v', 'error', '-i', str(reference),
+            '-c:v', 'libx264', *settings.video_args(include_threads=True),
+            '-pix_fmt', 'yuv420p', '-an', str(output)
+        ]
+
+    def measure(
+        self,
+        role: str,
+        reference: Path,
+        settings: EncodeSettings,
+        work_dir: Path,
+        workers: int = 1,
+        quality: bool = True
+    ) -> Measurement:
+        """
+        エンコードして速度・サイズ・画質を計測
+
+        workers > 1 の場合は同じエンコードを同時に走らせ、全体の fps（合計フレーム / 経過時間）を計測する。
+        """
+        outputs = [work_dir / f"{role}_{settings.preset}_{settings.crf}_{settings.threads}_{i}.mp4" for i in range(workers)]
+        start = time.perf_counter()
+        processes = [
+            subprocess.Popen(self._encode_command(reference, settings, output),
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            for output in outputs
+        ]
+        for process in processes:
+            _, stderr = process.communicate()
+            if process.returncode != 0:
+                raise RuntimeError(f"encode failed ({settings}): {stderr.decode('utf-8', errors='ignore')[-500:]}")
+        seconds = time.perf_counter() - start
+
+        measurement = Measurement(
+            role=role,
+            preset=settings.preset,
+            crf=settings.crf,
+            threads=settings.threads,
+            workers=workers,
+            seconds=seconds,
+            fps=self.frames * workers / seconds,
+            kbps=outputs[0].stat().st_size * 8 / 1000 / self.duration,
+        )
+        if quality:
+            measurement.ssim, measurement.psnr = self.compare(outputs[0], reference)
+        for output in outputs:
+            output.unlink()
+
+        if self.progress:
+            self.progress(measurement)
+        return measurement
+
+    @staticmethod
+    def compare(distorted: Path, reference: Path) -> tuple:
+        """
+        参照に対する SSIM（All）と PSNR（average）
+
+        Returns:
+            (ssim, psnr)。ロスレスの PSNR は inf
+        """
+        cmd = [
+            'ffmpeg', '-v', 'info', '-i', str(distorted), '-i', str(reference),
+            '-filter_complex',
+            # コンテナによってタイムスタンプの丸めが違う（mkv はミリ秒）ので、フレーム番号で揃えて比較する
+            f"[0:v]settb=1/{FPS},setpts=N,split[d0][d1];[1:v]settb=1/{FPS},setpts=N,split[r0][r1];"
+            "[d0][r0]ssim;[d1][r1]psnr",
+            '-f', 'null', '-'
+        ]
+        result = subprocess.run(cmd, capture_output=True)
+        stderr = result.stderr.decode('utf-8', errors='ignore')
+        ssim_match = re.search(r"SSIM .*All:([\d.]+)", stderr)
+        psnr_match = re.search(r"PSNR .*average:(inf|[\d.]+)", stderr)
+        if not ssim_match or not psnr_match:
+            raise RuntimeError(f"quality comparison failed: {stderr[-500:]}")
+        return float(ssim_match.group(1)), float(psnr_match.group(1))
+
+    # ----------------------------------------
+    # 選択
+    # ----------------------------------------
+
+    @staticmethod
+    def select(measurements: List[Measurement], objective: str) -> Measurement:
+        """
+        下限を満たす組み合わせから選ぶ
+
+        - speed: 最速。fps の差が 5% 以内ならサイズの小さい方
+        - balanced: (時間 / 最短時間) × (サイズ / 最小サイズ) が最小
+        """
+        passing = [m for m in measurements if m.passed]
+        if not passing:
+            return max(measurements, key=lambda m: m.ssim or 0.0)
+        if objective == "balanced":
+            min_seconds = min(m.seconds for m in passing)
+            min_kbps = min(m.kbps for m in passing)
+            return min(passing, key=lambda m: (m.seconds / min_seconds) * (m.kbps / min_kbps))
+        best_fps = max(m.fps for m in passing)
+        near_best = [m for m in passing if m.fps >= best_fps * 0.95]
+        return min(near_best, key=lambda m: m.kbps)
+
+    def calibrate_role(self, role: str, reference: Path, work_dir: Path) -> List[Measurement]:
+        """ロールの preset × crf を計測し、従来値の SSIM を基準に合否を付ける"""
+        grid = self.role_grid[role]
+        baseline = ROLE_DEFAULTS[role]
+        candidates = [EncodeSettings(preset, crf) for preset in self.presets for crf in grid["crfs"]]
+        if not any(c.preset == baseline.preset and c.crf == baseline.crf for c in candidates):
+            candidates.insert(0, EncodeSettings(baseline.preset, baseline.crf))
+
+        measurements = [self.measure(role, reference, settings, work_dir) for settings in candidates]
+        baseline_ssim = next(
+            m.ssim for m in measurements if m.preset == baseline.preset and m.crf == baseline.crf
+        )
+        for m in measurements:
+            m.passed = m.ssim >= baseline_ssim - self.ssim_tolerance
+        return measurements
+
+    def calibrate_parallel(self, reference: Path, settings: EncodeSettings, work_dir: Path) -> List[Measurement]:
+        """最終動画の設定で threads × 同時エンコード数を計測（チャンク並列エンコード用）"""
+        cpu_count = os.cpu_count() or 1
+        combos = []
+        workers = 1
+        while workers <= cpu_count:
+            combos.append((workers, max(1, cpu_count // workers) if workers > 1 else 0))
+            workers *= 2
+        return [
+            self.measure("parallel", reference, EncodeSettings(settings.preset, settings.crf, threads), work_dir,
+                         workers=workers, quality=False)
+            for workers, threads in combos
+        ]
+
+    def run(self) -> EncoderProfile:
+        """キャリブレーションを実行してプロファイルを返す（保存は呼び出し側）"""
+        work_dir = Path(tempfile.mkdtemp(prefix="encoder_calibration_"))
+        try:
+            self.logger.info(f"Building {self.duration:.1f}s synthetic timeline...")
+            reference = self.build_timeline(work_dir)
+
+            roles: Dict[str, EncodeSettings] = {}
+            measurements: List[Measurement] = []
+            for role, grid in self.role_grid.items():
+                role_measurements = self.calibrate_role(role, reference, work_dir)
+                measurements.extend(role_measurements)
+                roles[role] = self.select(role_measurements, grid["objective"]).settings
+                self.logger.info(f"{role}: preset={roles[role].preset} crf={roles[role].crf}")
+
+            parallel: Dict[str, int] = {}
+            if self.measure_parallel and "final" in roles:
+                parallel_measurements = self.calibrate_parallel(reference, roles["final"], work_dir)
+                measurements.extend(parallel_measurements)
+                best = max(parallel_measurements, key=lambda m: m.fps)
+                # 単独エンコードの threads は workers=1 の結果（0 = ffmpeg に任せる）
+                parallel = {"workers": best.workers, "threads_per_worker": best.threads}
+                self.logger.info(f"parallel: {best.workers} encodes × {best.threads or 'auto'} threads")
+
+            return EncoderProfile(
+                host=host_fingerprint(),
+                roles=roles,
+                parallel=parallel,
+                created_at=datetime.now().isoformat(timespec="seconds"),
+                timeline={
+                    "duration": self.duration,
+                    "frames": self.frames,
+                    "resolution": f"{WIDTH}x{HEIGHT}",
+                    "images": self.images,
+                },
+                measurements=[asdict(m) for m in measurements],
+            )
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def create_calibrator(config, logger: Optional[logging.Logger] = None, quick: bool = False, **kwargs) -> EncoderCalibrator:
+    """settings.yaml の encoder_profile.calibration に従ってキャリブレーターを作る"""
+    calibration_config = config.get("encoder_profile.calibration", {}) or {}
+    role_grid = {role: dict(grid) for role, grid in ROLE_GRID.items()}
+    for role, crfs in (calibration_config.get("crfs", {}) or {}).items():
+        if role in role_grid:
+            role_grid[role]["crfs"] = list(crfs)
+    if quick:
+        # 従来値の crf だけ（preset と並列数の比較）
+        for role, grid in role_grid.items():
+            grid["crfs"] = [ROLE_DEFAULTS[role].crf]
+
+    options = dict(
+        logger=logger,
+        duration=calibration_config.get("duration", DEFAULT_DURATION),
+        presets=QUICK_PRESETS if quick else calibration_config.get("presets", DEFAULT_PRESETS),
+        role_grid=role_grid,
+        ssim_tolerance=calibration_config.get("ssim_tolerance", DEFAULT_SSIM_TOLERANCE),
+    )
+    options.update({k: v for k, v in kwargs.items() if v is not None})
+    return EncoderCalibrator(**options)
@@ -0,0 +1,236 @@
+"""
+ホストごとのエンコーダープロファイル
+
+x264 の preset / crf / threads と並列エンコード数の最適値は CPU（コア数・世代）や
+ffmpeg のビルドで変わるため、固定値ではなくホストごとに計測した値を使う。
+プロファイルは python -m src.cli calibrate-encoder（src/utils/encoder_calibration.py）で作成し、
+キャッシュディレクトリの encoder_profiles/<ホスト名>.json に保存する。
+
+用途（ロール）ごとの設定:
+- final: 最終動画（従来 preset: faster / crf 23）
+- still_segment: 静止画セグメント（ロスレス中間ファイル。従来 ultrafast / crf 0。
+  プロファイルで変えられるのは preset / threads だけで、crf は常に 0）
+- intermediate: ズーム・パンのセグメントなどの中間ファイル（従来 ultrafast / crf 18）
+- background: 背景動画の加工（従来 ultrafast / crf 28）
+
+プロファイルが無い・別のホスト（CPU 数や ffmpeg のバージョンが違う）の場合は、
+各コンポーネントの従来の固定値をそのまま使う。
+
+使用例:
+    final = resolve_encode_settings(config, "final", EncodeSettings("faster", 23))
+    cmd += ['-c:v', 'libx264', *final.video_args()]
+"""
+
+import json
+import logging
+import os
+import platform
+import socket
+import subprocess
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# プロファイルの形式を変更したら上げる
+ENCODER_PROFILE_VERSION = 1
+
+
+@dataclass
+class EncodeSettings:
+    """x264 のエンコード設定"""
+    preset: str
+    crf: int
+    threads: int = 0  # 0 = ffmpeg に任せる
+
+    def video_args(self, include_threads: bool = False) -> List[str]:
+        """-preset / -crf（/ -threads）の引数"""
+        args = ['-preset', self.preset, '-crf', str(self.crf)]
+        if include_threads and self.threads > 0:
+            args.extend(['-threads', str(self.threads)])
+        return args
+
+
+# 各ロールの従来の固定値
+ROLE_DEFAULTS: Dict[str, EncodeSettings] = {
+    "final": EncodeSettings("faster", 23),
+    "still_segment": EncodeSettings("ultrafast", 0),
+    "intermediate": EncodeSettings("ultrafast", 18),
+    "background": EncodeSettings("ultrafast", 28),
+}
+
+# ロスレスで作るロール（プロファイルの crf を使わず 0 に固定）
+LOSSLESS_ROLES = ("still_segment",)
+
+
+def _ffmpeg_version() -> str:
+    try:
+        result = subprocess.run(['ffmpeg', '-version'], capture_output=True, text=True, timeout=10)
+        first_line = result.stdout.splitlines()[0] if result.stdout else ""
+        return first_line.split(" Copyright")[0].strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+_fingerprint: Optional[Dict[str, Any]] = None
+
+
+def host_fingerprint() -> Dict[str, Any]:
+    """プロファイルが有効なホストの条件（CPU・ffmpeg が変わったら計測し直す）"""
+    global _fingerprint
+    if _fingerprint is None:
+        _fingerprint = {
+            "hostname": socket.gethostname(),
+            "machine": platform.machine(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count() or 1,
+            "ffmpeg": _ffmpeg_version(),
+        }
+    return dict(_fingerprint)
+
+
+@dataclass
+class EncoderProfile:
+    """計測結果から決めたホストのエンコード設定"""
+    host: Dict[str, Any]
+    roles: Dict[str, EncodeSettings]
+    parallel: Dict[str, int] = field(default_factory=dict)
+    created_at: str = ""
+    timeline: Dict[str, Any] = field(default_factory=dict)
+    measurements: List[Dict[str, Any]] = field(default_factory=list)
+
+    def settings(self, role: str) -> Optional[EncodeSettings]:
+        return self.roles.get(role)
+
+    @property
+    def parallel_workers(self) -> int:
+        """同時に走らせる ffmpeg の数（チャンク並列エンコードなど）"""
+        return self.parallel.get("workers", 0)
+
+    @property
+    def threads_per_worker(self) -> int:
+        return self.parallel.get("threads_per_worker", 0)
+
+    def matches_host(self, fingerprint: Optional[Dict[str, Any]] = None) -> bool:
+        fingerprint = fingerprint or host_fingerprint()
+        return all(self.host.get(key) == fingerprint[key] for key in ("machine", "cpu_count", "ffmpeg"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": ENCODER_PROFILE_VERSION,
+            "host": self.host,
+            "created_at": self.created_at,
+            "timeline": self.timeline,
+            "roles": {role: asdict(settings) for role, settings in self.roles.items()},
+            "parallel": self.parallel,
+            "measurements": self.measurements,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EncoderProfile":
+        if data.get("version") != ENCODER_PROFILE_VERSION:
+            raise ValueError(f"unsupported encoder profile version: {data.get('version')}")
+        return cls(
+            host=data.get("host", {}),
+            roles={role: EncodeSettings(**settings) for role, settings in data.get("roles", {}).items()},
+            parallel=data.get("parallel", {}),
+            created_at=data.get("created_at", ""),
+            timeline=data.get("timeline", {}),
+            measurements=data.get("measurements", []),
+        )
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: Path) -> "EncoderProfile":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def profile_path(config) -> Path:
+    """このホストのプロファイルの保存先"""
+    profile_dir = config.get("encoder_profile.dir")
+    if not profile_dir:
+        profile_dir = config.get_path("cache_dir") / "encoder_profiles"
+    profile_dir = Path(profile_dir)
+    if not profile_dir.is_absolute():
+        profile_dir = config.project_root / profile_dir
+    return profile_dir / f"{socket.gethostname()}.json"
+
+
+_profiles: Dict[str, Optional[EncoderProfile]] = {}
+_profiles_lock = threading.Lock()
+
+
+def load_encoder_profile(config, logger: Optional[logging.Logger] = None) -> Optional[EncoderProfile]:
+    """
+    このホストのプロファイルを読み込む（プロセス内で1回）
+
+    Returns:
+        プロファイル。無効化・未作成・別ホスト用の場合は None
+    """
+    if not config.get("encoder_profile.enabled", True):
+        return None
+    logger = logger or logging.getLogger(__name__)
+    path = profile_path(config)
+    key = str(path)
+
+    with _profiles_lock:
+        if key in _profiles:
+            return _profiles[key]
+
+    profile = None
+    if path.exists():
+        try:
+            profile = EncoderProfile.load(path)
+        except Exception as e:
+            logger.warning(f"Encoder profile ignored ({path}): {e}")
+        else:
+            if not profile.matches_host():
+                logger.warning(
+                    f"Encoder profile {path.name} was measured on different hardware or ffmpeg; "
+                    "using fixed encoder settings (re-run: python -m src.cli calibrate-encoder)"
+                )
+                profile = None
+            else:
+                logger.info(f"Using encoder profile: {path}")
+
+    with _profiles_lock:
+        _profiles[key] = profile
+    return profile
+
+
+def resolve_encode_settings(
+    config,
+    role: str,
+    fallback: Optional[EncodeSettings] = None,
+    logger: Optional[logging.Logger] = None
+) -> EncodeSettings:
+    """
+    ロールのエンコード設定（プロファイルがあればその値、無ければ fallback）
+
+    Args:
+        config: ConfigManager
+        role: final / still_segment / intermediate / background
+        fallback: プロファイルが無い場合の設定（省略時は ROLE_DEFAULTS）
+
+    LOSSLESS_ROLES は crf 0 に固定する（preset / threads のみプロファイルの値）。
+    """
+    fallback = fallback or ROLE_DEFAULTS[role]
+    profile = load_encoder_profile(config, logger) if config is not None else None
+    settings = (profile.settings(role) if profile else None) or fallback
+    if role in LOSSLESS_ROLES and settings.crf != 0:
+        if logger:
+            logger.warning(f"Encoder profile crf {settings.crf} ignored for lossless role {role}")
+        settings = EncodeSettings(settings.preset, 0, settings.threads)
+    return settings
+
+
+def clear_profile_cache():
+    """読み込み済みのプロファイルを破棄（calibrate-encoder で作り直した後）"""
+    with _profiles_lock:
+        _profiles.clear()
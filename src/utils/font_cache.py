@@ -0,0 +1,76 @@
+"""
+日本語フォントの読み込みキャッシュ
+
+字幕・タイトルの描画はフォント候補のリスト（プロジェクト内 → OS 標準）を先頭から試し、
+最初に読み込めたものを使う。候補の探索（存在しないパスの例外）とフォントファイルの
+読み込みは毎回同じ結果になるので、プロセス内で1回だけ行う。
+
+- 候補リスト → 見つかったパス はプロセス全体で共有
+- FreeTypeFont はスレッド間で共有しない（スレッドごとに1つ作る）
+
+使用例:
+    font, font_path = load_first_font(font_paths, 60)
+    if font is None:
+        font = ImageFont.load_default()
+"""
+
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+from PIL import ImageFont
+
+_resolved_paths: Dict[Tuple[Tuple[str, ...], int], Optional[str]] = {}
+_resolved_lock = threading.Lock()
+_thread_fonts = threading.local()
+
+
+def load_font(font_path: str, size: int) -> ImageFont.FreeTypeFont:
+    """
+    フォントを読み込む（同じスレッド・パス・サイズは1回だけ）
+
+    Raises:
+        OSError: フォントを読み込めない場合
+    """
+    fonts = getattr(_thread_fonts, "fonts", None)
+    if fonts is None:
+        fonts = _thread_fonts.fonts = {}
+    key = (font_path, size)
+    if key not in fonts:
+        fonts[key] = ImageFont.truetype(font_path, size)
+    return fonts[key]
+
+
+def load_first_font(font_paths: Sequence[str], size: int) -> Tuple[Optional[ImageFont.FreeTypeFont], Optional[str]]:
+    """
+    候補のうち最初に読み込めたフォント
+
+    Returns:
+        (フォント, パス)。どれも読み込めない場合は (None, None)
+    """
+    key = (tuple(str(p) for p in font_paths), size)
+    with _resolved_lock:
+        resolved = key in _resolved_paths
+        font_path = _resolved_paths.get(key)
+
+    if resolved:
+        return (load_font(font_path, size), font_path) if font_path else (None, None)
+
+    found = None
+    for candidate in key[0]:
+        try:
+            font = load_font(candidate, size)
+        except Exception:
+            continue
+        found = (font, candidate)
+        break
+
+    with _resolved_lock:
+        _resolved_paths[key] = found[1] if found else None
+    return found or (None, None)
+
+
+def clear_font_cache():
+    """キャッシュをクリア（フォントを追加・差し替えた場合）"""
+    with _resolved_lock:
+        _resolved_paths.clear()
+    _thread_fonts.fonts = {}
@@ -8,14 +8,17 @@
 - audio_timing.jsonを使用してセクション境界を正確に計算
 - 日本語対応の正規化改善
 - シンプルな画像配置アルゴリズム
+- キーワード転置インデックスによる高速マッチング（KeywordIndex）
 """
 
-import json
 import re
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 import logging
 
+from .keyword_index import KeywordIndex
+from .timing_store import load_timing_data, load_timing_store
+
 
 class ImageTimingMatcherFixed:
     """
@@ -39,6 +42,7 @@ class ImageTimingMatcherFixed:
         partial_match_weight: float = 5.0,
         same_section_weight: float = 3.0,
         keyword_length_weight: float = 1.0,
+        use_keyword_index: bool = True,
         logger: Optional[logging.Logger] = None
     ):
         """
@@ -53,6 +57,8 @@ class ImageTimingMatcherFixed:
             partial_match_weight: 部分一致の重み
             same_section_weight: 同一セクションの重み
             keyword_length_weight: キーワード長の重み
+            use_keyword_index: キーワード転置インデックスを使用するか
+                （Falseの場合は従来の全件走査）
             logger: ロガー
         """
         self.working_dir = Path(working_dir)
@@ -63,8 +69,15 @@ class ImageTimingMatcherFixed:
         self.partial_match_weight = partial_match_weight
         self.same_section_weight = same_section_weight
         self.keyword_length_weight = keyword_length_weight
+        self.use_keyword_index = use_keyword_index
         self.logger = logger or logging.getLogger(__name__)
         
+        # セクション別画像・キーワードインデックス（classified_imagesごとに1回だけ構築）
+        self._images_source: Optional[tuple] = None
+        self._images_data: Optional[dict] = None
+        self._images_by_section: Dict[int, List[dict]] = {}
+        self._keyword_index: Optional[KeywordIndex] = None
+        
         # audio_timing.jsonを読み込んでセクション境界を計算
         self.section_boundaries = self._load_section_boundaries()
     
@@ -83,8 +96,9 @@ class ImageTimingMatcherFixed:
             return boundaries
         
         try:
-            with open(audio_timing_path, 'r', encoding='utf-8') as f:
-                audio_timing = json.load(f)
+            # 列指向ストアがあれば文字タイミングは配列ビューのまま使う（JSON全体を読まない）
+            store = load_timing_store(audio_timing_path)
+            audio_timing = store.records if store else load_timing_data(audio_timing_path)
             
             cumulative_time = 0.0
             
@@ -99,10 +113,14 @@ class ImageTimingMatcherFixed:
             
             for section in sections:
                 section_id = section.get('section_id')
-                char_end_times = section.get('char_end_times', [])
+                if store:
+                    char_timings = store.char_timings(section)
+                    char_end_times = char_timings[2] if char_timings else []
+                else:
+                    char_end_times = section.get('char_end_times', [])
                 
-                if section_id and char_end_times:
-                    section_duration = char_end_times[-1]
+                if section_id and len(char_end_times):
+                    section_duration = float(char_end_times[-1])
                     boundaries[section_id] = (cumulative_time, cumulative_time + section_duration)
                     self.logger.debug(
                         f"Section {section_id}: {cumulative_time:.2f}s - "
@@ -215,6 +233,12 @@ class ImageTimingMatcherFixed:
                 keywords = img.get('keywords', [])
                 self.logger.debug(f"  {Path(img.get('file_path', '')).name}: {keywords}")
         
+        # キーワードインデックスを取得（初回のみ構築）
+        keyword_index = (
+            self._get_keyword_index(classified_images)
+            if self.use_keyword_index else None
+        )
+        
         # 画像クリップを生成（シンプルなアルゴリズム）
         image_clips = []
         current_time = section_start
@@ -229,11 +253,17 @@ class ImageTimingMatcherFixed:
             end_time = subtitle['end_time']
             
             # キーワードマッチング
-            matches = self._find_keyword_matches(
-                subtitle_text,
-                section_images,
-                section_id
-            )
+            if keyword_index is not None:
+                matches = keyword_index.lookup(
+                    self._normalize_text(subtitle_text),
+                    section_id
+                )
+            else:
+                matches = self._find_keyword_matches(
+                    subtitle_text,
+                    section_images,
+                    section_id
+                )
             
             # デバッグ: マッチしない場合の詳細ログ（5分以降のみ）
             if start_time >= 300.0:  # 5分以降
@@ -379,6 +409,29 @@ class ImageTimingMatcherFixed:
         
         return image_clips
     
+    def _get_keyword_index(self, classified_images: dict) -> KeywordIndex:
+        """
+        キーワード転置インデックスを取得（同じ画像データなら再利用）
+        
+        Args:
+            classified_images: 分類済み画像データ
+            
+        Returns:
+            KeywordIndex
+        """
+        self._prepare_images(classified_images)
+        if self._keyword_index is None:
+            self._keyword_index = KeywordIndex(
+                images=classified_images.get('images', []),
+                normalize=self._normalize_text,
+                get_image_section=self._get_image_section,
+                priority_fn=self._calculate_priority
+            )
+            self.logger.debug(
+                f"Keyword index built: {len(self._keyword_index)} keyword entries"
+            )
+        return self._keyword_index
+    
     def _find_keyword_matches(
         self,
         subtitle_text: str,
@@ -386,7 +439,10 @@ class ImageTimingMatcherFixed:
         section_id: int
     ) -> List[Dict[str, Any]]:
         """
-        キーワードマッチング
+        キーワードマッチング（全件走査版）
+        
+        use_keyword_index=False の場合に使用する。
+        KeywordIndex.lookup() と同じ結果を返す。
         
         Args:
             subtitle_text: 字幕テキスト
@@ -408,20 +464,7 @@ class ImageTimingMatcherFixed:
                 normalized_keyword = self._normalize_text(keyword)
                 
                 # 完全一致
-                is_match = normalized_keyword in normalized_text
-                # デバッグ: Section 4で「最後の晩餐」のマッチングを詳細に確認
-                if section_id == 4 and '最後の晩餐' in keyword:
-                    self.logger.warning(
-                        f"[MATCH DEBUG] Section {section_id}: "
-                        f"keyword='{keyword}' (normalized='{normalized_keyword}') "
-                        f"in text='{normalized_text[:80]}' -> {is_match}"
-                    )
-                    self.logger.warning(
-                        f"[MATCH DEBUG] normalized_keyword length: {len(normalized_keyword)}, "
-                        f"normalized_text length: {len(normalized_text)}"
-                    )
-                
-                if is_match:
+                if normalized_keyword in normalized_text:
                     match_type = 'exact'
                     confidence = 1.0
                     priority = self._calculate_priority(
@@ -604,17 +647,35 @@ class ImageTimingMatcherFixed:
         Returns:
             画像リスト
         """
-        all_images = classified_images.get('images', [])
-        section_images = []
+        self._prepare_images(classified_images)
+        return list(self._images_by_section.get(section_id, []))
+    
+    def _prepare_images(self, classified_images: dict):
+        """
+        画像をセクション別に分類（同じ画像データなら再利用）
+        
+        Args:
+            classified_images: 分類済み画像データ
+        """
+        # id() は解放後に別のデータで再利用されるため、インデックスに使う内容（パスとキーワード）をキーにする
+        source = tuple(
+            (image.get('file_path', ''), tuple(image.get('keywords', [])))
+            for image in classified_images.get('images', [])
+        )
+        if self._images_source == source and self._images_data is classified_images:
+            return
         
-        for image in all_images:
+        images_by_section: Dict[int, List[dict]] = {}
+        for image in classified_images.get('images', []):
             file_path = Path(image.get('file_path', ''))
             image_section = self._get_image_section(file_path)
-            
-            if image_section == section_id:
-                section_images.append(image)
+            images_by_section.setdefault(image_section, []).append(image)
         
-        return section_images
+        if self._images_source != source:
+            self._keyword_index = None
+        self._images_source = source
+        self._images_data = classified_images
+        self._images_by_section = images_by_section
     
     def _get_image_section(self, image_path: Path) -> int:
         """
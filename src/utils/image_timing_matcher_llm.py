@@ -8,15 +8,13 @@ LLMが指定しなかった隙間時間には「未使用画像」を自動的
 import json
 import hashlib
 import logging
+import threading
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
-try:
-    from anthropic import Anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+from .llm_gateway import get_llm_gateway
+from .timing_store import load_timing_data, load_timing_store
 
 
 class ImageTimingMatcherLLM:
@@ -25,7 +23,7 @@ class ImageTimingMatcherLLM:
     
     機能:
     - Claude 3 Haikuを使用した文脈理解に基づく画像配置
-    - セクション単位でのAPI問い合わせ（出力トークン制限回避）
+    - セクション単位でのAPI問い合わせ（出力トークン制限回避、セクション間は並列）
     - キャッシュ機能によるコスト削減
     - ハイブリッド配置（LLM指定 + 隙間埋め）
     """
@@ -54,11 +52,6 @@ class ImageTimingMatcherLLM:
             gap_threshold: 隙間埋めの閾値（秒）
             logger: ロガー
         """
-        if not ANTHROPIC_AVAILABLE:
-            raise ImportError(
-                "anthropic package is required. Install with: pip install anthropic"
-            )
-        
         self.working_dir = Path(working_dir)
         self.model = model
         self.min_duration = min_duration
@@ -76,7 +69,8 @@ class ImageTimingMatcherLLM:
                     "Set it or pass api_key parameter."
                 )
         
-        self.api_client = Anthropic(api_key=api_key)
+        self.llm = get_llm_gateway(api_key)
+        self._cache_lock = threading.Lock()
         
         # キャッシュディレクトリの設定（Phase 07の出力ディレクトリに保存）
         if cache_dir is None:
@@ -105,10 +99,38 @@ class ImageTimingMatcherLLM:
     def _save_cache(self):
         """キャッシュファイルに保存"""
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, ensure_ascii=False, indent=2)
+            with self._cache_lock:
+                with open(self.cache_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.cache, f, ensure_ascii=False, indent=2)
         except Exception as e:
             self.logger.warning(f"Failed to save cache: {e}")
+
+    def match_sections(
+        self,
+        script_data: dict,
+        classified_images: dict,
+        subtitle_timing: List[dict],
+        section_ids: List[int]
+    ) -> List[Dict[str, Any]]:
+        """
+        複数セクションをまとめてマッチング
+
+        セクションごとの問い合わせは LLM ゲートウェイ経由で並列に実行する
+        （同時実行数はゲートウェイのモデル別セマフォで制限）。
+
+        Returns:
+            全セクションの画像クリップ（セクション順に連結）
+        """
+        results = self.llm.map(
+            lambda section_id: self.match_images_to_subtitles(
+                script_data=script_data,
+                classified_images=classified_images,
+                subtitle_timing=subtitle_timing,
+                section_id=section_id
+            ),
+            section_ids
+        )
+        return [clip for clips in results for clip in clips]
     
     def _get_cache_key(
         self,
@@ -269,7 +291,7 @@ class ImageTimingMatcherLLM:
         # LLMに問い合わせ
         self.logger.info(f"🤖 Querying LLM for Section {section_id}...")
         try:
-            response = self.api_client.messages.create(
+            response = self.llm.create(
                 model=self.model,
                 max_tokens=4096,
                 system="You are a video director. Output valid JSON only. Do not include any explanatory text.",
@@ -278,7 +300,8 @@ class ImageTimingMatcherLLM:
                         "role": "user",
                         "content": prompt
                     }
-                ]
+                ],
+                caller="ImageTimingMatcherLLM"
             )
             
             # レスポンスからテキストを取得
@@ -294,7 +317,8 @@ class ImageTimingMatcherLLM:
             allocations = json.loads(response_text)
             
             # キャッシュに保存
-            self.cache[cache_key] = allocations
+            with self._cache_lock:
+                self.cache[cache_key] = allocations
             self._save_cache()
             
             self.logger.info(f"✓ LLM allocation received: {len(allocations)} assignments")
@@ -658,8 +682,9 @@ Rules:
             return boundaries
         
         try:
-            with open(audio_timing_path, 'r', encoding='utf-8') as f:
-                audio_timing = json.load(f)
+            # 列指向ストアがあれば文字タイミングは配列ビューのまま使う（JSON全体を読まない）
+            store = load_timing_store(audio_timing_path)
+            audio_timing = store.records if store else load_timing_data(audio_timing_path)
             
             cumulative_time = 0.0
             
@@ -673,10 +698,14 @@ Rules:
             
             for section in sections:
                 section_id = section.get('section_id')
-                char_end_times = section.get('char_end_times', [])
+                if store:
+                    char_timings = store.char_timings(section)
+                    char_end_times = char_timings[2] if char_timings else []
+                else:
+                    char_end_times = section.get('char_end_times', [])
                 
-                if section_id and char_end_times:
-                    section_duration = char_end_times[-1]
+                if section_id and len(char_end_times):
+                    section_duration = float(char_end_times[-1])
                     boundaries[section_id] = (cumulative_time, cumulative_time + section_duration)
                     cumulative_time += section_duration
             
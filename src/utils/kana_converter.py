@@ -0,0 +1,439 @@
+"""
+読み仮名変換エンジン（オフライン）
+
+ナレーションをひらがなに変換する（ElevenLabs 用）。
+字幕生成と同じ MorphologyService（MeCab）の解析結果を使い、
+形態素の読み（Morpheme.reading）をひらがなにして連結する。
+
+- ユーザー辞書（偉人名・地名など）を最長一致で優先
+- 数字は位取りと音便（さんびゃく・はっせん など）を考慮して読む
+- 辞書にも MeCab にも読みがない語（未知語）だけをまとめて1回 LLM に問い合わせ、
+  結果は学習済み読みとしてキャッシュ
+- セクションの解析は MorphologyService.analyze_many() で並列
+- 変換結果はテキストのハッシュ（＋辞書の版）をキーにディスクへキャッシュ
+
+MeCab が使えない環境では、セクションごとの LLM 変換（並列）にフォールバックする。
+
+使用例:
+    converter = KanaConverter(
+        morphology=get_morphology_service(cache_dir=cache_dir / "morphology"),
+        user_dictionary=Path("config/dictionaries/kana_user_dict.yaml"),
+        cache_dir=cache_dir / "kana"
+    )
+    hiragana_texts = converter.convert_many([section.narration for section in script.sections])
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import yaml
+
+from .llm_gateway import get_llm_gateway
+from .morphology import MorphAnalysis, MorphologyService, text_hash
+
+# キャッシュ形式を変更したら上げる
+KANA_CACHE_VERSION = 1
+
+# 読みが必要な文字（漢字・々・英字）
+NEEDS_READING = re.compile(r"[㐀-鿿豈-﫿々〆ヵヶA-Za-zＡ-Ｚａ-ｚ]")
+
+DIGITS = re.compile(r"[0-9０-９]+")
+
+_DIGIT_KANA = ["", "いち", "に", "さん", "よん", "ご", "ろく", "なな", "はち", "きゅう"]
+
+# 位ごとの読み（音便を含む）
+_HUNDREDS = {1: "ひゃく", 3: "さんびゃく", 6: "ろっぴゃく", 8: "はっぴゃく"}
+_THOUSANDS = {1: "せん", 3: "さんぜん", 8: "はっせん"}
+
+_LARGE_UNITS = [(10 ** 12, "ちょう"), (10 ** 8, "おく"), (10 ** 4, "まん")]
+
+
+def katakana_to_hiragana(text: str) -> str:
+    """カタカナをひらがなに変換（長音記号などはそのまま）"""
+    return "".join(
+        chr(ord(c) - 0x60) if "ァ" <= c <= "ヶ" else c
+        for c in text
+    )
+
+
+def _under_10000(n: int) -> str:
+    parts = []
+    thousands, rest = divmod(n, 1000)
+    hundreds, rest = divmod(rest, 100)
+    tens, ones = divmod(rest, 10)
+    if thousands:
+        parts.append(_THOUSANDS.get(thousands, _DIGIT_KANA[thousands] + "せん"))
+    if hundreds:
+        parts.append(_HUNDREDS.get(hundreds, _DIGIT_KANA[hundreds] + "ひゃく"))
+    if tens:
+        parts.append(("" if tens == 1 else _DIGIT_KANA[tens]) + "じゅう")
+    if ones:
+        parts.append(_DIGIT_KANA[ones])
+    return "".join(parts)
+
+
+def number_to_kana(n: int) -> str:
+    """
+    整数をひらがなで読む
+
+    例: 1560 → せんごひゃくろくじゅう、8000 → はっせん、0 → ぜろ
+    """
+    if n == 0:
+        return "ぜろ"
+    parts = []
+    for unit, name in _LARGE_UNITS:
+        count, n = divmod(n, unit)
+        if count:
+            # 一万・一億 は「いち」を付けて読む
+            parts.append((_under_10000(count) if count > 1 else "いち") + name)
+    if n:
+        parts.append(_under_10000(n))
+    return "".join(parts)
+
+
+def _digits_to_kana(digits: str) -> str:
+    # 全角数字も半角として読む
+    return number_to_kana(int(digits.translate(str.maketrans("０１２３４５６７８９", "0123456789"))))
+
+
+class KanaConverter:
+    """
+    MeCab + ユーザー辞書による読み仮名変換
+
+    変換は2段階:
+    1. 各テキストを「読みが決まった部分」と「未知語」のトークン列にする
+    2. 全テキストの未知語をまとめて LLM で解決し、トークン列を連結する
+    """
+
+    def __init__(
+        self,
+        morphology: MorphologyService,
+        user_dictionary: Optional[Path] = None,
+        cache_dir: Optional[Path] = None,
+        llm_fallback: bool = True,
+        model: str = "claude-sonnet-4-20250514",
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        初期化
+
+        Args:
+            morphology: 形態素解析サービス
+            user_dictionary: ユーザー辞書 YAML（{表記: 読み}）
+            cache_dir: 変換結果・学習済み読みの保存先（Noneならキャッシュしない）
+            llm_fallback: 未知語を LLM に問い合わせるか
+            model: 未知語の問い合わせに使うモデル
+            logger: ロガー
+        """
+        self.morphology = morphology
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.llm_fallback = llm_fallback
+        self.model = model
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        self.user_dict = self._load_user_dictionary(user_dictionary)
+        self.learned = self._load_learned()
+        self._max_entry_len = max((len(k) for k in self.user_dict), default=0)
+        self.stats = {"cache_hits": 0, "converted": 0, "oov_tokens": 0, "llm_calls": 0}
+
+        # ユーザー辞書が変わったら変換結果キャッシュを無効にする
+        self._dict_version = hashlib.sha1(
+            json.dumps(self.user_dict, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:12]
+
+    # ----------------------------------------
+    # 辞書・キャッシュ
+    # ----------------------------------------
+
+    def _load_user_dictionary(self, path: Optional[Path]) -> Dict[str, str]:
+        if path is None:
+            return {}
+        path = Path(path)
+        if not path.exists():
+            self.logger.warning(f"Kana user dictionary not found: {path}")
+            return {}
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            data = yaml.safe_load(f) or {}
+        entries = data.get("entries", data) if isinstance(data, dict) else {}
+        return {
+            str(surface): katakana_to_hiragana(str(reading))
+            for surface, reading in entries.items()
+            if surface and reading
+        }
+
+    @property
+    def _learned_path(self) -> Optional[Path]:
+        return self.cache_dir / "learned_readings.json" if self.cache_dir else None
+
+    def _load_learned(self) -> Dict[str, str]:
+        path = self._learned_path
+        if path is None or not path.exists():
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.debug(f"Learned readings read failed: {e}")
+            return {}
+
+    def _save_learned(self):
+        path = self._learned_path
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.learned, f, ensure_ascii=False, indent=2, sort_keys=True)
+        tmp_path.replace(path)
+
+    def _cache_path(self, text: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        key = text_hash(f"{KANA_CACHE_VERSION}:{self._dict_version}:{text}")
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _load_cached(self, text: str) -> Optional[str]:
+        path = self._cache_path(text)
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data["kana"] if data.get("text") == text else None
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _store(self, text: str, kana: str):
+        path = self._cache_path(text)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"text": text, "kana": kana}, f, ensure_ascii=False)
+            tmp_path.replace(path)
+        except OSError as e:
+            self.logger.debug(f"Kana cache write failed ({path}): {e}")
+
+    # ----------------------------------------
+    # 変換
+    # ----------------------------------------
+
+    def _match_user_dict(self, text: str, pos: int) -> Optional[Tuple[str, str]]:
+        """pos から始まるユーザー辞書の最長一致"""
+        for length in range(min(self._max_entry_len, len(text) - pos), 0, -1):
+            surface = text[pos:pos + length]
+            if surface in self.user_dict:
+                return surface, self.user_dict[surface]
+        return None
+
+    def _plain_reading(self, surface: str) -> Optional[str]:
+        """辞書を使わずに読める表記（かな・記号・数字）なら読みを返す"""
+        if NEEDS_READING.search(surface):
+            return None
+        return DIGITS.sub(lambda m: _digits_to_kana(m.group()), katakana_to_hiragana(surface))
+
+    def _tokenize(self, analysis: MorphAnalysis) -> List[Tuple[str, bool]]:
+        """
+        テキストを (文字列, 未知語か) のトークン列にする
+
+        ユーザー辞書の一致と数字の並びは形態素境界より優先する。一致が形態素の
+        途中で終わった場合、その形態素の残りは表記から読む（読めなければ未知語）。
+        """
+        text = analysis.text
+        tokens: List[Tuple[str, bool]] = []
+        morphemes = iter(analysis.morphemes)
+        morpheme = next(morphemes, None)
+        pos = 0
+
+        while pos < len(text):
+            while morpheme is not None and morpheme.end <= pos:
+                morpheme = next(morphemes, None)
+
+            match = self._match_user_dict(text, pos) if self.user_dict else None
+            if match:
+                tokens.append((match[1], False))
+                pos += len(match[0])
+                continue
+
+            # 数字の並びは形態素の分かれ方によらず1つの数として読む
+            digits = DIGITS.match(text, pos)
+            if digits:
+                tokens.append((_digits_to_kana(digits.group()), False))
+                pos = digits.end()
+                continue
+
+            if morpheme is None or morpheme.start > pos:
+                # 形態素に含まれない文字（空白など）
+                end = morpheme.start if morpheme is not None else len(text)
+                surface = text[pos:end]
+            elif morpheme.start == pos:
+                surface = morpheme.surface
+                end = morpheme.end
+                if morpheme.reading and NEEDS_READING.search(surface):
+                    tokens.append((katakana_to_hiragana(morpheme.reading), False))
+                    pos = end
+                    continue
+            else:
+                # ユーザー辞書の一致で途中から始まる形態素
+                end = morpheme.end
+                surface = text[pos:end]
+
+            reading = self._plain_reading(surface)
+            if reading is not None:
+                tokens.append((reading, False))
+            elif surface in self.learned:
+                tokens.append((self.learned[surface], False))
+            else:
+                tokens.append((surface, True))
+            pos = end
+
+        return tokens
+
+    def _resolve_oov(self, surfaces: Sequence[str], contexts: Dict[str, str]) -> Dict[str, str]:
+        """未知語の読みを LLM にまとめて問い合わせる"""
+        if not surfaces or not self.llm_fallback:
+            return {}
+
+        items = "\n".join(f"- {surface}（文脈: {contexts.get(surface, '')}）" for surface in surfaces)
+        prompt = f"""以下の語の読みを、文脈に合わせてひらがなで答えてください。
+
+{items}
+
+JSON オブジェクト（キーが語、値がひらがなの読み）のみを出力してください。説明は不要です。"""
+
+        try:
+            with self._lock:
+                self.stats["llm_calls"] += 1
+            response = get_llm_gateway().create(
+                model=self.model,
+                max_tokens=2000,
+                temperature=0,
+                messages=[{"role": "user", "content": prompt}],
+                caller="KanaConverter.oov"
+            )
+            text = response.text.strip().strip("`")
+            if text.startswith("json"):
+                text = text[4:]
+            readings = json.loads(text)
+        except Exception as e:
+            self.logger.warning(f"OOV reading lookup failed: {e}")
+            return {}
+
+        resolved = {
+            surface: katakana_to_hiragana(str(readings[surface]))
+            for surface in surfaces
+            if isinstance(readings, dict) and readings.get(surface)
+        }
+        if resolved:
+            self.learned.update(resolved)
+            try:
+                self._save_learned()
+            except OSError as e:
+                self.logger.debug(f"Learned readings write failed: {e}")
+        return resolved
+
+    def _convert_via_llm(self, texts: List[str]) -> List[str]:
+        """MeCab が使えない場合: セクションごとに LLM で変換（並列）"""
+        gateway = get_llm_gateway()
+
+        def convert(text: str) -> str:
+            prompt = f"""以下の日本語テキストを、すべてひらがなに変換してください。
+
+【変換ルール】
+1. 漢字、カタカナをすべてひらがなに変換
+2. 句読点（。、！？）はそのまま保持
+3. 改行もそのまま保持
+4. 数字は「いち」「に」「さん」などひらがなに変換
+5. 英数字が含まれる場合は、読み方をひらがなに変換
+
+【入力テキスト】
+\"\"\"
+{text}
+\"\"\"
+
+【出力】
+変換後のひらがなテキストのみを出力してください。
+説明や前置きは一切不要です。
+"""
+            try:
+                response = gateway.create(
+                    model=self.model,
+                    max_tokens=8000,
+                    temperature=0,
+                    messages=[{"role": "user", "content": prompt}],
+                    caller="KanaConverter.section"
+                )
+            except Exception as e:
+                self.logger.warning(f"Hiragana conversion via LLM failed: {e}")
+                return text
+            return response.text.replace('```', '').replace('"""', '').strip()
+
+        return gateway.map(convert, texts)
+
+    def convert_many(self, texts: Sequence[str]) -> List[str]:
+        """
+        複数テキストをひらがなに変換
+
+        Args:
+            texts: テキストのリスト（通常はセクションごとのナレーション）
+
+        Returns:
+            texts と同じ順序の変換結果
+        """
+        texts = list(texts)
+        results: Dict[int, str] = {}
+        pending = []
+        for index, text in enumerate(texts):
+            cached = self._load_cached(text)
+            if cached is not None:
+                results[index] = cached
+                self.stats["cache_hits"] += 1
+            else:
+                pending.append(index)
+
+        if pending and not self.morphology.available:
+            self.logger.warning("MeCab not available - converting sections via LLM")
+            for index, kana in zip(pending, self._convert_via_llm([texts[i] for i in pending])):
+                results[index] = kana
+                self._store(texts[index], kana)
+            pending = []
+
+        if pending:
+            analyses = self.morphology.analyze_many([texts[i] for i in pending])
+            token_lists = {index: self._tokenize(analysis) for index, analysis in zip(pending, analyses)}
+
+            # 未知語を全セクション分まとめて1回で解決
+            oov: List[str] = []
+            contexts: Dict[str, str] = {}
+            for index, tokens in token_lists.items():
+                for surface, unknown in tokens:
+                    if unknown and surface not in contexts:
+                        oov.append(surface)
+                        position = texts[index].find(surface)
+                        contexts[surface] = texts[index][max(0, position - 10):position + len(surface) + 10]
+            self.stats["oov_tokens"] += len(oov)
+            resolved = self._resolve_oov(oov, contexts)
+            if oov:
+                self.logger.info(f"Kana conversion: {len(oov)} OOV tokens, {len(resolved)} resolved via LLM")
+
+            for index, tokens in token_lists.items():
+                kana = "".join(resolved.get(surface, surface) if unknown else surface for surface, unknown in tokens)
+                results[index] = kana
+                # 未解決の未知語を含む結果は保存しない（次回 LLM が使えれば解決できる）
+                if all(not unknown or surface in resolved for surface, unknown in tokens):
+                    self._store(texts[index], kana)
+                self.stats["converted"] += 1
+
+        return [results[index] for index in range(len(texts))]
+
+    def convert(self, text: str) -> str:
+        """1テキストをひらがなに変換"""
+        return self.convert_many([text])[0]
@@ -0,0 +1,215 @@
+"""
+キーワード転置インデックス（Keyword Index）
+
+画像キーワードを正規化済みのn-gramで索引化し、
+字幕テキストから候補画像を高速に引けるようにする。
+
+ImageTimingMatcherFixed は従来、字幕1件ごとに
+全画像 × 全キーワードの部分文字列検索を行っていた。
+本インデックスは被写体（subject）ごとに1回だけ構築し、
+字幕側は「n-gram列挙 → 候補の検証 → スコア付け」のみで済む。
+
+マッチ判定は従来実装と完全に同一:
+- 完全一致: 正規化キーワードが正規化字幕に含まれる
+- 部分一致: キーワードを空白分割した2文字以上の語のうち、
+  最初に字幕へ含まれる語（1キーワードにつき1回）
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+
+@dataclass(frozen=True)
+class _Pattern:
+    """インデックスに登録する検索パターン"""
+    entry_id: int       # (画像, キーワード) の通し番号
+    text: str           # 正規化済みパターン文字列
+    word_order: int     # -1: キーワード全体（完全一致）, 0以上: 部分一致の語順
+
+
+@dataclass
+class _Entry:
+    """(画像, キーワード) の組"""
+    image_index: int
+    image_path: Path
+    image_section: int
+    keyword: str
+    exact_priority: Dict[bool, float]
+    partial: List[Tuple[float, Dict[bool, float]]]  # 語順ごとの (confidence, priority)
+
+
+class KeywordIndex:
+    """
+    画像キーワードの転置インデックス
+
+    キーは正規化パターンの先頭 ``ngram`` 文字（短いパターンは全体）。
+    パターンが字幕に含まれるなら、その出現位置から始まる n-gram が
+    必ず字幕側の列挙に現れるため、検証前の候補漏れは起きない。
+
+    使用例:
+        index = KeywordIndex(images, normalize, get_section, priority_fn)
+        matches = index.lookup(normalized_text, section_id)
+    """
+
+    def __init__(
+        self,
+        images: List[dict],
+        normalize: Callable[[str], str],
+        get_image_section: Callable[[Path], int],
+        priority_fn: Callable[..., float],
+        ngram: int = 2
+    ):
+        """
+        初期化（インデックス構築）
+
+        Args:
+            images: 画像リスト（classified.json の images）
+            normalize: テキスト正規化関数
+            get_image_section: 画像パス → セクションID
+            priority_fn: 優先度計算関数（_calculate_priority と同じ引数）
+            ngram: インデックスキーの文字数
+        """
+        self.ngram = ngram
+        self._entries: List[_Entry] = []
+        # セクションID -> n-gramキー -> パターン
+        self._postings: Dict[int, Dict[str, List[_Pattern]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        self._key_lengths: Set[int] = set()
+        # 空文字に正規化されたキーワードは常に完全一致する（従来挙動）
+        self._always: Dict[int, List[_Pattern]] = defaultdict(list)
+
+        for image_index, image in enumerate(images):
+            image_path = Path(image.get('file_path', ''))
+            image_section = get_image_section(image_path)
+
+            for keyword in image.get('keywords', []):
+                normalized_keyword = normalize(keyword)
+                entry_id = len(self._entries)
+
+                exact_priority = {
+                    same: priority_fn(
+                        match_type='exact',
+                        is_same_section=same,
+                        keyword_length=len(keyword),
+                        confidence=1.0
+                    )
+                    for same in (True, False)
+                }
+
+                partial = []
+                for order, word in enumerate(normalized_keyword.split()):
+                    if len(word) < 2:
+                        partial.append((0.0, {}))
+                        continue
+                    confidence = 0.5 + (len(word) / len(normalized_keyword)) * 0.3
+                    partial.append((confidence, {
+                        same: priority_fn(
+                            match_type='partial',
+                            is_same_section=same,
+                            keyword_length=len(keyword),
+                            confidence=confidence
+                        )
+                        for same in (True, False)
+                    }))
+                    self._add(image_section, _Pattern(entry_id, word, order))
+
+                self._entries.append(_Entry(
+                    image_index=image_index,
+                    image_path=image_path,
+                    image_section=image_section,
+                    keyword=keyword,
+                    exact_priority=exact_priority,
+                    partial=partial
+                ))
+                self._add(image_section, _Pattern(entry_id, normalized_keyword, -1))
+
+    def _add(self, section_id: int, pattern: _Pattern):
+        """パターンを登録"""
+        if not pattern.text:
+            self._always[section_id].append(pattern)
+            return
+        key = pattern.text[:self.ngram]
+        self._key_lengths.add(len(key))
+        self._postings[section_id][key].append(pattern)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(
+        self,
+        normalized_text: str,
+        section_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        正規化済み字幕テキストにマッチする画像を取得
+
+        Args:
+            normalized_text: 正規化済み字幕テキスト
+            section_id: 対象セクション（Noneなら全画像が対象）
+
+        Returns:
+            マッチ結果のリスト（従来の _find_keyword_matches と同じ形式・順序）
+        """
+        exact_hits: Set[int] = set()
+        partial_hits: Dict[int, int] = {}
+
+        if section_id is None:
+            sections = list(self._postings.keys() | self._always.keys())
+        else:
+            sections = [section_id]
+
+        # 字幕側のn-gramを1回だけ列挙
+        text_keys: Set[str] = set()
+        text_length = len(normalized_text)
+        for length in self._key_lengths:
+            for i in range(text_length - length + 1):
+                text_keys.add(normalized_text[i:i + length])
+
+        candidates: List[_Pattern] = []
+        for section in sections:
+            candidates.extend(self._always.get(section, ()))
+            postings = self._postings.get(section)
+            if not postings:
+                continue
+            for key in text_keys:
+                patterns = postings.get(key)
+                if patterns:
+                    candidates.extend(patterns)
+
+        for pattern in candidates:
+            if pattern.text not in normalized_text:
+                continue
+            if pattern.word_order < 0:
+                exact_hits.add(pattern.entry_id)
+            else:
+                previous = partial_hits.get(pattern.entry_id)
+                if previous is None or pattern.word_order < previous:
+                    partial_hits[pattern.entry_id] = pattern.word_order
+
+        matches = []
+        for entry_id in sorted(exact_hits | partial_hits.keys()):
+            entry = self._entries[entry_id]
+            is_same_section = (entry.image_section == section_id)
+
+            if entry_id in exact_hits:
+                matches.append({
+                    'image_path': entry.image_path,
+                    'keyword': entry.keyword,
+                    'match_type': 'exact',
+                    'confidence': 1.0,
+                    'priority': entry.exact_priority[is_same_section]
+                })
+            else:
+                confidence, priority = entry.partial[partial_hits[entry_id]]
+                matches.append({
+                    'image_path': entry.image_path,
+                    'keyword': entry.keyword,
+                    'match_type': 'partial',
+                    'confidence': confidence,
+                    'priority': priority[is_same_section]
+                })
+
+        return matches
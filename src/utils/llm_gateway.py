@@ -0,0 +1,556 @@
+"""
+LLM ゲートウェイ
+
+Claude API の呼び出しを1か所に集約する。
+
+- プロンプト（リクエスト全体）のハッシュをキーにした永続レスポンスキャッシュ
+- モデルごとの同時実行数制限（セマフォ）
+- セクション単位などの一括呼び出し用ヘルパー（create_many / map）
+- トークン数・料金を cost_calculator に記録
+- 決定的なローカルスタブ（backend: stub）。API キーもネットワークもなしで
+  パイプライン全体を動かせるため、ベンチマークで使う
+
+応答は Anthropic SDK の Message と同じく response.content[0].text で読める。
+
+バックエンドは settings.yaml の llm.backend、または環境変数 LLM_BACKEND で切り替える。
+
+使用例:
+    llm = get_llm_gateway(api_key)
+    response = llm.create(
+        model="claude-sonnet-4-20250514",
+        max_tokens=1000,
+        messages=[{"role": "user", "content": prompt}],
+        caller="PromptOptimizer"
+    )
+    text = response.text
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+try:
+    import anthropic
+    ANTHROPIC_AVAILABLE = True
+except ImportError:
+    ANTHROPIC_AVAILABLE = False
+
+from ..core.exceptions import ClaudeAPIError
+from . import telemetry
+from .cost_calculator import CostCalculator, get_cost_calculator
+
+LLM_BACKEND_ENV = "LLM_BACKEND"
+
+# キャッシュ形式のバージョン（形式を変えたら上げる）
+CACHE_VERSION = 1
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_RETRIES = 3
+
+
+# ========================================
+# 応答
+# ========================================
+
+@dataclass
+class LLMTextBlock:
+    """テキストブロック（anthropic の TextBlock 互換）"""
+    text: str
+    type: str = "text"
+
+
+@dataclass
+class LLMUsage:
+    """トークン使用量"""
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+@dataclass
+class LLMResponse:
+    """
+    LLM の応答
+
+    Attributes:
+        content: テキストブロックのリスト（content[0].text で本文）
+        model: 応答したモデル
+        usage: トークン使用量
+        stop_reason: 終了理由
+        cached: キャッシュから返したか
+    """
+    content: List[LLMTextBlock]
+    model: str
+    usage: LLMUsage = field(default_factory=LLMUsage)
+    stop_reason: Optional[str] = None
+    cached: bool = False
+
+    @property
+    def text(self) -> str:
+        """全テキストブロックを連結した本文"""
+        return "".join(block.text for block in self.content)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "content": [{"type": block.type, "text": block.text} for block in self.content],
+            "model": self.model,
+            "usage": {"input_tokens": self.usage.input_tokens, "output_tokens": self.usage.output_tokens},
+            "stop_reason": self.stop_reason,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], cached: bool = False) -> "LLMResponse":
+        usage = data.get("usage") or {}
+        return cls(
+            content=[LLMTextBlock(text=block.get("text", "")) for block in data.get("content", [])],
+            model=data.get("model", ""),
+            usage=LLMUsage(usage.get("input_tokens", 0), usage.get("output_tokens", 0)),
+            stop_reason=data.get("stop_reason"),
+            cached=cached,
+        )
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """リクエストの正規化 JSON の SHA-256"""
+    canonical = json.dumps(
+        {"v": CACHE_VERSION, **request},
+        ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+# ========================================
+# バックエンド
+# ========================================
+
+class AnthropicBackend:
+    """Anthropic Messages API"""
+
+    name = "anthropic"
+
+    def __init__(self, api_key: Optional[str] = None, max_retries: int = DEFAULT_MAX_RETRIES):
+        """
+        初期化
+
+        Args:
+            api_key: Anthropic APIキー（Noneなら最初の呼び出しで CLAUDE_API_KEY を使う）
+            max_retries: SDK の再試行回数（429 / 5xx / 通信エラー）
+        """
+        self.api_key = api_key
+        self.max_retries = max_retries
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        with self._lock:
+            if self._client is None:
+                if not ANTHROPIC_AVAILABLE:
+                    raise ClaudeAPIError(
+                        "anthropic package is required. Install with: pip install anthropic"
+                    )
+                api_key = self.api_key or os.getenv("CLAUDE_API_KEY")
+                if not api_key:
+                    raise ClaudeAPIError("CLAUDE_API_KEY is not set")
+                self._client = anthropic.Anthropic(api_key=api_key, max_retries=self.max_retries)
+            return self._client
+
+    def create(self, request: Dict[str, Any], caller: str = "") -> LLMResponse:
+        message = self._get_client().messages.create(**request)
+        usage = getattr(message, "usage", None)
+        return LLMResponse(
+            content=[
+                LLMTextBlock(text=block.text)
+                for block in message.content
+                if getattr(block, "type", "text") == "text"
+            ],
+            model=getattr(message, "model", request.get("model", "")),
+            usage=LLMUsage(
+                getattr(usage, "input_tokens", 0) or 0,
+                getattr(usage, "output_tokens", 0) or 0
+            ),
+            stop_reason=getattr(message, "stop_reason", None),
+        )
+
+
+def echo_responder(request: Dict[str, Any]) -> str:
+    """
+    スタブの既定応答
+
+    最後のユーザーメッセージをそのまま返す（テキスト変換系のプロンプトは
+    入力をほぼそのまま出力する想定のため、下流の処理が壊れにくい）。
+    """
+    for message in reversed(request.get("messages", [])):
+        if message.get("role") != "user":
+            continue
+        content = message.get("content")
+        if isinstance(content, str):
+            return content
+        if isinstance(content, list):
+            return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+
+class StubBackend:
+    """
+    決定的なローカルスタブ
+
+    呼び出し元（caller）ごとに応答関数を登録でき、未登録なら echo_responder。
+    トークン数は文字数から概算する（日本語でおおよそ2文字1トークン）。
+    """
+
+    name = "stub"
+
+    def __init__(
+        self,
+        responders: Optional[Dict[str, Callable[[Dict[str, Any]], str]]] = None,
+        default_responder: Optional[Callable[[Dict[str, Any]], str]] = None,
+        latency: float = 0.0
+    ):
+        """
+        初期化
+
+        Args:
+            responders: caller → 応答関数（リクエスト → テキスト）
+            default_responder: 未登録の caller に使う応答関数
+            latency: 1呼び出しごとの遅延（秒）。実APIの往復時間を模す
+        """
+        self.responders = dict(responders or {})
+        self.default_responder = default_responder or echo_responder
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def register(self, caller: str, responder: Callable[[Dict[str, Any]], str]):
+        """caller 用の応答関数を登録"""
+        self.responders[caller] = responder
+
+    def create(self, request: Dict[str, Any], caller: str = "") -> LLMResponse:
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        text = self.responders.get(caller, self.default_responder)(request)
+        prompt_chars = len(json.dumps(
+            [request.get("system", ""), request.get("messages", [])], ensure_ascii=False
+        ))
+        return LLMResponse(
+            content=[LLMTextBlock(text=text)],
+            model=request.get("model", "stub"),
+            usage=LLMUsage(prompt_chars // 2, len(text) // 2),
+            stop_reason="end_turn",
+        )
+
+
+# ========================================
+# キャッシュ
+# ========================================
+
+class ResponseCache:
+    """
+    リクエストハッシュ → 応答 の永続キャッシュ
+
+    1応答1ファイル（<dir>/<key[:2]>/<key>.json）。書き込みは一時ファイル経由で
+    置き換えるため、並列実行中に壊れたファイルを読むことはない。
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[LLMResponse]:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return LLMResponse.from_dict(json.load(f)["response"], cached=True)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key: str, request: Dict[str, Any], response: LLMResponse):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {"model": request.get("model"), "created_at": time.time(), "response": response.to_dict()},
+                f, ensure_ascii=False
+            )
+        os.replace(tmp_path, path)
+
+    def clear(self) -> int:
+        """キャッシュを全削除（削除した件数を返す）"""
+        count = 0
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob("*/*.json"):
+                path.unlink()
+                count += 1
+        return count
+
+
+# ========================================
+# ゲートウェイ
+# ========================================
+
+class LLMGateway:
+    """
+    LLM 呼び出しの共通窓口
+
+    キャッシュ確認 → モデル別セマフォ → バックエンド呼び出し → コスト記録 → キャッシュ保存
+    の順に処理する。
+    """
+
+    def __init__(
+        self,
+        backend,
+        cache_dir: Optional[Path] = None,
+        concurrency: Optional[Dict[str, int]] = None,
+        default_concurrency: int = DEFAULT_CONCURRENCY,
+        cost_calculator: Optional[CostCalculator] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        初期化
+
+        Args:
+            backend: AnthropicBackend / StubBackend
+            cache_dir: レスポンスキャッシュの保存先（Noneならキャッシュしない）
+            concurrency: モデル名 → 同時実行数
+            default_concurrency: 未指定モデルの同時実行数
+            cost_calculator: コスト記録先（Noneならグローバル）
+            logger: ロガー
+        """
+        self.backend = backend
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.concurrency = dict(concurrency or {})
+        self.default_concurrency = max(1, default_concurrency)
+        self.cost_calculator = cost_calculator or get_cost_calculator()
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = {"calls": 0, "cache_hits": 0, "errors": 0}
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def backend_name(self) -> str:
+        return self.backend.name
+
+    def _semaphore(self, model: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if model not in self._semaphores:
+                limit = self.concurrency.get(model, self.default_concurrency)
+                self._semaphores[model] = threading.BoundedSemaphore(max(1, limit))
+            return self._semaphores[model]
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def create(
+        self,
+        *,
+        model: str,
+        messages: List[Dict[str, Any]],
+        max_tokens: int,
+        caller: str = "",
+        use_cache: bool = True,
+        **kwargs
+    ) -> LLMResponse:
+        """
+        メッセージを送信
+
+        Args:
+            model: モデル名
+            messages: メッセージ列
+            max_tokens: 最大出力トークン数
+            caller: 呼び出し元（コスト集計・スタブ応答の切り替えに使う）
+            use_cache: キャッシュを使うか（サンプリングを毎回やり直したい生成は False）
+            **kwargs: system / temperature など messages.create の引数
+
+        Returns:
+            LLMResponse
+        """
+        request = {"model": model, "max_tokens": max_tokens, "messages": messages, **kwargs}
+        key = request_key(request) if self.cache and use_cache else None
+        self._count("calls")
+
+        if key:
+            response = self.cache.get(key)
+            if response is not None:
+                self._count("cache_hits")
+                self.cost_calculator.record_llm(model, 0, 0, caller=caller, cached=True)
+                with telemetry.span("messages.create", kind="llm", provider="cache", model=model, caller=caller):
+                    pass
+                self.logger.debug(f"LLM cache hit ({caller or model}): {key[:12]}")
+                return response
+
+        try:
+            with self._semaphore(model):
+                if self.backend.name == "anthropic":
+                    # 実APIはテレメトリのフックで計測される
+                    response = self.backend.create(request, caller=caller)
+                else:
+                    with telemetry.span("messages.create", kind="llm", provider=self.backend.name, model=model) as s:
+                        response = self.backend.create(request, caller=caller)
+                        s.set(input_tokens=response.usage.input_tokens, output_tokens=response.usage.output_tokens)
+        except Exception:
+            self._count("errors")
+            raise
+
+        self.cost_calculator.record_llm(
+            model, response.usage.input_tokens, response.usage.output_tokens, caller=caller
+        )
+        if key:
+            try:
+                self.cache.put(key, request, response)
+            except OSError as e:
+                self.logger.debug(f"LLM cache write failed: {e}")
+        return response
+
+    def create_many(
+        self,
+        requests: Sequence[Dict[str, Any]],
+        max_workers: Optional[int] = None,
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        複数のリクエストを並列に送信（結果は入力順）
+
+        同時実行数はモデル別セマフォで抑えられるため、max_workers は
+        スレッド数の上限でしかない。
+
+        Args:
+            requests: create() のキーワード引数の辞書のリスト
+            max_workers: スレッド数（省略時はリクエスト数と同時実行数の小さい方）
+            return_exceptions: True なら失敗したリクエストの位置に例外を入れて返す
+
+        Returns:
+            LLMResponse（または例外）のリスト
+        """
+        if not requests:
+            return []
+
+        def run(request: Dict[str, Any]):
+            try:
+                return self.create(**request)
+            except Exception as e:
+                if return_exceptions:
+                    return e
+                raise
+
+        limit = max(
+            self.concurrency.get(request["model"], self.default_concurrency) for request in requests
+        )
+        workers = max_workers or min(len(requests), limit)
+        if workers <= 1:
+            return [run(request) for request in requests]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm") as executor:
+            return telemetry.map_in_context(executor, run, requests)
+
+    def map(
+        self,
+        func: Callable[[Any], Any],
+        items: Sequence[Any],
+        max_workers: Optional[int] = None
+    ) -> List[Any]:
+        """
+        items の各要素に func を並列適用（結果は入力順）
+
+        func の中で create() を呼ぶ「セクションごとに1回問い合わせる」処理用。
+        例外はそのまま送出される。
+        """
+        items = list(items)
+        workers = max_workers or min(len(items), self.default_concurrency)
+        if workers <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm") as executor:
+            return telemetry.map_in_context(executor, func, items)
+
+
+# ========================================
+# グローバルインスタンス
+# ========================================
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def create_gateway_from_config(
+    llm_config: Dict[str, Any],
+    project_root: Path,
+    api_key: Optional[str] = None,
+    logger: Optional[logging.Logger] = None
+) -> LLMGateway:
+    """
+    settings.yaml の llm セクションからゲートウェイを作成
+
+    Args:
+        llm_config: llm セクション
+        project_root: キャッシュディレクトリの基準
+        api_key: Anthropic APIキー
+        logger: ロガー
+    """
+    backend_name = os.getenv(LLM_BACKEND_ENV) or llm_config.get("backend", "anthropic")
+    if backend_name == "stub":
+        backend = StubBackend(latency=llm_config.get("stub_latency", 0.0))
+    elif backend_name == "anthropic":
+        backend = AnthropicBackend(api_key, max_retries=llm_config.get("max_retries", DEFAULT_MAX_RETRIES))
+    else:
+        raise ValueError(f"Unknown LLM backend: {backend_name}")
+
+    cache_config = llm_config.get("cache", {}) or {}
+    cache_dir = None
+    if cache_config.get("enabled", True):
+        cache_dir = Path(cache_config.get("dir", "data/cache/llm"))
+        if not cache_dir.is_absolute():
+            cache_dir = Path(project_root) / cache_dir
+        # スタブの応答で実APIのキャッシュを汚さない
+        if backend_name == "stub":
+            cache_dir = cache_dir / "stub"
+
+    concurrency = dict(llm_config.get("concurrency", {}) or {})
+    default_concurrency = concurrency.pop("default", DEFAULT_CONCURRENCY)
+
+    return LLMGateway(
+        backend,
+        cache_dir=cache_dir,
+        concurrency=concurrency,
+        default_concurrency=default_concurrency,
+        logger=logger
+    )
+
+
+def get_llm_gateway(api_key: Optional[str] = None) -> LLMGateway:
+    """
+    グローバルなゲートウェイを取得
+
+    初回呼び出し時に settings.yaml の llm セクションから初期化する。
+    api_key は Anthropic バックエンドがまだキーを持っていなければ設定される。
+    """
+    global _gateway
+
+    with _gateway_lock:
+        if _gateway is None:
+            from ..core.config_manager import get_config
+            config = get_config()
+            _gateway = create_gateway_from_config(
+                config.get("llm", {}) or {}, config.project_root, api_key
+            )
+        elif api_key and isinstance(_gateway.backend, AnthropicBackend) and not _gateway.backend.api_key:
+            _gateway.backend.api_key = api_key
+        return _gateway
+
+
+def set_llm_gateway(gateway: Optional[LLMGateway]) -> None:
+    """グローバルなゲートウェイを差し替え（ベンチマーク・テスト用。None でリセット）"""
+    global _gateway
+    with _gateway_lock:
+        _gateway = gateway
@@ -0,0 +1,462 @@
+"""
+形態素解析サービス（MeCab）
+
+ナレーションをセクション単位で1回だけ解析し、
+形態素を文字オフセット付きで保持する。
+
+- 字幕分割などの部分文字列への問い合わせは、解析結果のスライスで応答
+- 解析結果はテキストのハッシュをキーにメモリ・ディスクへキャッシュ
+  （フェーズ・実行をまたいで再利用）
+- MeCabが利用可能な場合、複数セクションをワーカープロセスで並列解析
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+try:
+    import MeCab
+    MECAB_AVAILABLE = True
+except ImportError:
+    MECAB_AVAILABLE = False
+    MeCab = None
+
+
+# キャッシュ形式を変更したら上げる
+MORPHOLOGY_CACHE_VERSION = 1
+
+# メモリ上に保持する解析結果の上限（常駐ワーカーでジョブをまたいで増え続けないように）
+MEMO_MAX_ENTRIES = 2048
+
+# 内部位置を分割禁止とする品詞
+VERB_ADJECTIVE_POS = ("動詞", "形容詞")
+
+
+@dataclass
+class Morpheme:
+    """形態素（文字オフセット付き）"""
+    surface: str
+    pos: str
+    start: int
+    end: int
+    reading: Optional[str] = None   # カタカナ読み（辞書にない場合はNone）
+    base_form: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "surface": self.surface,
+            "pos": self.pos,
+            "start": self.start,
+            "end": self.end,
+            "reading": self.reading,
+            "base_form": self.base_form,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Morpheme":
+        return cls(
+            surface=data["surface"],
+            pos=data["pos"],
+            start=data["start"],
+            end=data["end"],
+            reading=data.get("reading"),
+            base_form=data.get("base_form"),
+        )
+
+
+@dataclass
+class MorphAnalysis:
+    """1テキストの解析結果"""
+    text: str
+    morphemes: List[Morpheme] = field(default_factory=list)
+
+    def slice(self, start: int, end: int) -> Dict[str, Any]:
+        """
+        部分文字列 text[start:end] の形態素情報を取得
+
+        境界をまたぐ形態素は範囲内に切り詰める。
+
+        Returns:
+            SubtitleGenerator._detect_morpheme_boundaries() と同じ形式
+            （位置はスライス先頭からの相対値）
+        """
+        length = end - start
+        morphemes = []
+        boundaries = []
+        verb_adjective_positions: Set[int] = set()
+
+        for m in self.morphemes:
+            if m.end <= start:
+                continue
+            if m.start >= end:
+                break
+
+            rel_start = max(m.start, start) - start
+            rel_end = min(m.end, end) - start
+            morphemes.append({
+                'surface': self.text[start + rel_start:start + rel_end],
+                'pos': m.pos,
+                'start': rel_start,
+                'end': rel_end
+            })
+
+            if rel_end < length:
+                boundaries.append(rel_end)
+
+            if m.pos in VERB_ADJECTIVE_POS:
+                for i in range(rel_start + 1, rel_end):
+                    verb_adjective_positions.add(i)
+
+        return {
+            'boundaries': boundaries,
+            'morphemes': morphemes,
+            'verb_adjective_positions': verb_adjective_positions
+        }
+
+    def boundaries(self) -> Dict[str, Any]:
+        """テキスト全体の形態素情報"""
+        return self.slice(0, len(self.text))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": MORPHOLOGY_CACHE_VERSION,
+            "text": self.text,
+            "morphemes": [m.to_dict() for m in self.morphemes],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MorphAnalysis":
+        return cls(
+            text=data["text"],
+            morphemes=[Morpheme.from_dict(m) for m in data.get("morphemes", [])],
+        )
+
+
+def text_hash(text: str) -> str:
+    """キャッシュキー（テキストのSHA-1）"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _parse_with_tagger(tagger, text: str) -> MorphAnalysis:
+    """MeCab Taggerで解析して文字オフセットを付与"""
+    morphemes = []
+    current_pos = 0
+    node = tagger.parseToNode(text)
+
+    while node:
+        surface = node.surface
+        if surface:
+            features = node.feature.split(',')
+            pos = features[0] if features else "未知語"
+            reading = features[7] if len(features) > 7 and features[7] != "*" else None
+            base_form = features[6] if len(features) > 6 and features[6] != "*" else None
+
+            # MeCabは空白を読み飛ばすため、原文上の位置を探し直す
+            found = text.find(surface, current_pos)
+            start = found if found != -1 else current_pos
+            end = start + len(surface)
+
+            morphemes.append(Morpheme(
+                surface=surface,
+                pos=pos,
+                start=start,
+                end=end,
+                reading=reading,
+                base_form=base_form
+            ))
+            current_pos = end
+        node = node.next
+
+    return MorphAnalysis(text=text, morphemes=morphemes)
+
+
+# ワーカープロセスごとのTagger
+_worker_tagger = None
+
+
+def _worker_analyze(text: str) -> Dict[str, Any]:
+    """ワーカープロセスで解析（ProcessPoolExecutor用）"""
+    global _worker_tagger
+    if _worker_tagger is None:
+        _worker_tagger = MeCab.Tagger()
+    return _parse_with_tagger(_worker_tagger, text).to_dict()
+
+
+class MorphologyService:
+    """
+    形態素解析サービス
+
+    使用例:
+        service = MorphologyService(cache_dir=Path("data/cache/morphology"))
+        service.prime(section_texts)           # セクションを一括解析
+        info = service.query("天下統一を目指した")  # 解析済みテキストのスライスで応答
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_workers: Optional[int] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        初期化
+
+        Args:
+            cache_dir: ディスクキャッシュの保存先（Noneならメモリのみ）
+            max_workers: 並列解析のワーカー数（Noneなら CPU数）
+            logger: ロガー
+
+        解析結果はメモリにも MEMO_MAX_ENTRIES 件まで保持する（古いものから破棄）。
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._tagger = None
+        self._memo: "OrderedDict[str, MorphAnalysis]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+        # prime() で登録した文脈（部分文字列問い合わせの検索対象）
+        self._contexts: List[MorphAnalysis] = []
+        self._last_context: Optional[MorphAnalysis] = None
+        # 直前にヒットした範囲（同じ文字列が繰り返し現れても先頭の出現位置に戻らない）
+        self._last_start = 0
+        self._last_end = 0
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def available(self) -> bool:
+        """MeCabが利用可能か"""
+        if not MECAB_AVAILABLE:
+            return False
+        try:
+            self._get_tagger()
+            return True
+        except Exception as e:
+            self.logger.warning(f"Failed to initialize MeCab: {e}")
+            return False
+
+    def _get_tagger(self):
+        if self._tagger is None:
+            self._tagger = MeCab.Tagger()
+            self.logger.info("MeCab initialized")
+        return self._tagger
+
+    # ----------------------------------------
+    # キャッシュ
+    # ----------------------------------------
+
+    def _cache_path(self, key: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _recall(self, key: str) -> Optional[MorphAnalysis]:
+        with self._memo_lock:
+            analysis = self._memo.get(key)
+            if analysis is not None:
+                self._memo.move_to_end(key)
+            return analysis
+
+    def _remember(self, key: str, analysis: MorphAnalysis):
+        with self._memo_lock:
+            self._memo[key] = analysis
+            self._memo.move_to_end(key)
+            while len(self._memo) > MEMO_MAX_ENTRIES:
+                self._memo.popitem(last=False)
+
+    def _load_cached(self, text: str) -> Optional[MorphAnalysis]:
+        key = text_hash(text)
+        analysis = self._recall(key)
+        if analysis is not None:
+            return analysis
+
+        path = self._cache_path(key)
+        if path is None or not path.exists():
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != MORPHOLOGY_CACHE_VERSION or data.get("text") != text:
+                return None
+            analysis = MorphAnalysis.from_dict(data)
+        except Exception as e:
+            self.logger.debug(f"Morphology cache read failed ({path}): {e}")
+            return None
+
+        self._remember(key, analysis)
+        return analysis
+
+    def _store(self, analysis: MorphAnalysis):
+        key = text_hash(analysis.text)
+        self._remember(key, analysis)
+
+        path = self._cache_path(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(analysis.to_dict(), f, ensure_ascii=False)
+            tmp_path.replace(path)
+        except Exception as e:
+            self.logger.debug(f"Morphology cache write failed ({path}): {e}")
+
+    # ----------------------------------------
+    # 解析
+    # ----------------------------------------
+
+    def analyze(self, text: str) -> MorphAnalysis:
+        """
+        テキストを解析（キャッシュ優先）
+
+        MeCabが利用できない場合は形態素なしの結果を返す。
+        """
+        cached = self._load_cached(text)
+        if cached is not None:
+            return cached
+
+        if not self.available:
+            return MorphAnalysis(text=text)
+
+        analysis = _parse_with_tagger(self._get_tagger(), text)
+        self._store(analysis)
+        return analysis
+
+    def analyze_many(self, texts: Sequence[str]) -> List[MorphAnalysis]:
+        """
+        複数テキストを解析（未キャッシュ分はワーカープロセスで並列実行）
+
+        Args:
+            texts: テキストのリスト（通常はセクションごとのナレーション）
+
+        Returns:
+            texts と同じ順序の解析結果
+        """
+        results: Dict[str, MorphAnalysis] = {}
+        pending = []
+        for text in texts:
+            cached = self._load_cached(text)
+            if cached is not None:
+                results[text] = cached
+            elif text not in pending:
+                pending.append(text)
+
+        if pending and self.available:
+            workers = min(self.max_workers, len(pending))
+            if workers > 1:
+                self.logger.debug(
+                    f"Analyzing {len(pending)} texts with {workers} MeCab workers"
+                )
+                try:
+                    with ProcessPoolExecutor(max_workers=workers) as executor:
+                        for text, data in zip(pending, executor.map(_worker_analyze, pending)):
+                            analysis = MorphAnalysis.from_dict(data)
+                            self._store(analysis)
+                            results[text] = analysis
+                    pending = []
+                except Exception as e:
+                    self.logger.warning(
+                        f"Parallel MeCab analysis failed, falling back to serial: {e}"
+                    )
+
+        for text in pending:
+            results[text] = self.analyze(text)
+
+        return [results[text] for text in texts]
+
+    def prime(self, texts: Sequence[str]) -> List[MorphAnalysis]:
+        """
+        テキストを一括解析し、部分文字列問い合わせの文脈として登録
+
+        Args:
+            texts: セクションのナレーションなど
+
+        Returns:
+            解析結果のリスト
+        """
+        analyses = self.analyze_many([t for t in texts if t])
+        self._contexts.extend(analyses)
+        return analyses
+
+    def clear_contexts(self):
+        """prime() で登録した文脈を破棄"""
+        self._contexts = []
+        self._last_context = None
+        self._last_start = 0
+        self._last_end = 0
+
+    def query(self, text: str) -> Dict[str, Any]:
+        """
+        テキストの形態素情報を取得
+
+        prime() 済みの文脈に含まれる場合はそのスライスを返し、
+        含まれない場合のみ単独で解析する。
+
+        Returns:
+            {'boundaries', 'morphemes', 'verb_adjective_positions'}
+        """
+        if not text:
+            return {'boundaries': [], 'morphemes': [], 'verb_adjective_positions': set()}
+
+        # 字幕チャンクは先頭から順に（チャンク → その中の行の順で）問い合わせられるので、
+        # 直前にヒットした範囲の先頭から探す。同じ文字列が文脈内に複数回現れても先頭の出現位置に戻らない。
+        # 直前と同じ文字列が続けて問い合わせられた場合は、直前の範囲の次の出現位置とみなす。
+        candidates = []
+        if self._last_context is not None:
+            cursor = self._last_start
+            if self._last_context.text[self._last_start:self._last_end] == text:
+                cursor = self._last_end
+            candidates.append((self._last_context, cursor))
+        candidates.extend((context, 0) for context in self._contexts)
+
+        for context, cursor in candidates:
+            start = context.text.find(text, cursor)
+            if start != -1:
+                self._last_context = context
+                self._last_start = start
+                self._last_end = start + len(text)
+                return context.slice(start, self._last_end)
+
+        return self.analyze(text).boundaries()
+
+
+# ========================================
+# グローバルインスタンス
+# ========================================
+
+_global_services: Dict[Optional[str], MorphologyService] = {}
+_global_services_lock = threading.Lock()
+
+
+def get_morphology_service(
+    cache_dir: Optional[Path] = None,
+    logger: Optional[logging.Logger] = None
+) -> MorphologyService:
+    """
+    グローバルな形態素解析サービスを取得
+
+    キャッシュディレクトリ（None = ディスクキャッシュなし）ごとに1つのインスタンスを返す。
+    logger を指定した場合は、以降そのインスタンスのログはそのロガーに出す。
+    """
+    key = str(Path(cache_dir).resolve()) if cache_dir else None
+
+    with _global_services_lock:
+        service = _global_services.get(key)
+        if service is None:
+            service = MorphologyService(cache_dir=cache_dir, logger=logger)
+            _global_services[key] = service
+        elif logger is not None:
+            service.logger = logger
+
+    return service
@@ -0,0 +1,170 @@
+"""
+全体ナレーションの一括アライメント
+
+セクションごとに一時ファイルを書いて Whisper に通す代わりに、
+結合済みの narration_full.mp3 を1回だけデコードし、台本全体を
+強制アライメント（WhisperTimingExtractor.align_audio）する。
+
+- 音声は whisper.load_audio() で1回だけ 16kHz 波形に読み込み、以降は配列のスライスで扱う
+- セクション（タイトル・ナレーション）の位置は Phase 2 の結合時に分かっているので、
+  連続するピースを chunk_seconds 程度ずつまとめ、前後に overlap 秒の余白を付けて
+  1回ずつアライメントする（区間の端が VAD で削られない）
+- 結果は文字数でピースごとに切り分け、ピース先頭からの相対時刻に戻す
+
+使用例:
+    aligner = NarrationAligner(extractor, chunk_seconds=120.0, overlap=1.0)
+    alignments = aligner.align(full_audio_path, [
+        AlignmentPiece("織田信長の生涯", start=0.0, end=1.8),
+        AlignmentPiece("織田信長は尾張に生まれた。", start=3.8, end=7.2),
+    ])
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .whisper_timing import WHISPER_AVAILABLE, WhisperTimingExtractor
+
+# whisper.audio.SAMPLE_RATE
+SAMPLE_RATE = 16000
+
+
+@dataclass
+class AlignmentPiece:
+    """全体音声上の位置が分かっているテキスト1片"""
+    text: str
+    start: float  # 全体音声での開始（秒）
+    end: float    # 全体音声での終了（秒）
+
+
+def _empty_alignment() -> Dict[str, List]:
+    return {
+        'characters': [],
+        'character_start_times_seconds': [],
+        'character_end_times_seconds': []
+    }
+
+
+class NarrationAligner:
+    """結合済み音声に台本全体を強制アライメントし、ピースごとに切り分ける"""
+
+    def __init__(
+        self,
+        extractor: WhisperTimingExtractor,
+        chunk_seconds: float = 120.0,
+        overlap: float = 1.0,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        初期化
+
+        Args:
+            extractor: backend="align" で作成した WhisperTimingExtractor
+            chunk_seconds: 1回のアライメントにまとめる音声の長さの目安（秒）
+            overlap: チャンクの前後に付ける余白（秒）
+            logger: ロガー
+        """
+        if not WHISPER_AVAILABLE:
+            raise ImportError(
+                "whisper package is required. "
+                "Install with: pip install openai-whisper"
+            )
+        if extractor.backend != "align":
+            raise ValueError("NarrationAligner requires an extractor with backend='align'")
+
+        self.extractor = extractor
+        self.chunk_seconds = chunk_seconds
+        self.overlap = overlap
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = {"chunks": 0, "failed_chunks": 0, "seconds": 0.0}
+
+    def _group_pieces(self, pieces: List[AlignmentPiece]) -> List[List[int]]:
+        """連続するピースを chunk_seconds 程度ずつまとめる"""
+        groups: List[List[int]] = []
+        for i, piece in enumerate(pieces):
+            if groups and piece.end - pieces[groups[-1][0]].start <= self.chunk_seconds:
+                groups[-1].append(i)
+            else:
+                groups.append([i])
+        return groups
+
+    def align(
+        self,
+        audio_path: Path,
+        pieces: List[AlignmentPiece]
+    ) -> List[Dict[str, List]]:
+        """
+        全体音声にピースのテキストをアライメント
+
+        Args:
+            audio_path: 結合済み音声（narration_full.mp3）
+            pieces: 開始順のピース
+
+        Returns:
+            ピースごとの alignment（ピース先頭からの相対時刻）。
+            アライメントに失敗したチャンクのピースは空の alignment
+        """
+        import whisper  # import に時間がかかるため実行時に読み込む
+
+        started = time.perf_counter()
+        audio = whisper.load_audio(str(audio_path))
+        total = len(audio) / SAMPLE_RATE
+
+        results = [_empty_alignment() for _ in pieces]
+        groups = self._group_pieces(pieces)
+
+        self.logger.info(
+            f"Aligning {len(pieces)} pieces in {len(groups)} chunks "
+            f"over {total:.1f}s audio"
+        )
+
+        for n, group in enumerate(groups, start=1):
+            group_pieces = [pieces[i] for i in group]
+            window_start = max(0.0, group_pieces[0].start - self.overlap)
+            window_end = min(total, group_pieces[-1].end + self.overlap)
+            window = audio[int(window_start * SAMPLE_RATE):int(window_end * SAMPLE_RATE)]
+            text = "".join(p.text for p in group_pieces)
+
+            self.logger.info(
+                f"Chunk {n}/{len(groups)}: {window_start:.1f}-{window_end:.1f}s, "
+                f"{len(group_pieces)} pieces, {len(text)} chars"
+            )
+
+            char_timings = self.extractor.align_audio(window, text)
+            self.stats["chunks"] += 1
+            if not char_timings or len(char_timings) != len(text):
+                self.stats["failed_chunks"] += 1
+                self.logger.warning(f"Alignment failed for chunk {n}")
+                continue
+
+            # 文字数でピースごとに切り分ける
+            pos = 0
+            for i, piece in zip(group, group_pieces):
+                piece_timings = char_timings[pos:pos + len(piece.text)]
+                pos += len(piece.text)
+                results[i] = self._to_piece_alignment(piece, piece_timings, window_start)
+
+        self.stats["seconds"] += time.perf_counter() - started
+        return results
+
+    def _to_piece_alignment(
+        self,
+        piece: AlignmentPiece,
+        char_timings: List[Dict],
+        window_start: float
+    ) -> Dict[str, List]:
+        """チャンク内の文字タイミングをピース先頭からの相対時刻に直す（ピース内に収める）"""
+        duration = piece.end - piece.start
+        alignment = _empty_alignment()
+        for timing in char_timings:
+            char = timing["word"]
+            if not char.strip():
+                continue
+            start = window_start + float(timing["start"]) - piece.start
+            end = window_start + float(timing["end"]) - piece.start
+            alignment['characters'].append(char)
+            alignment['character_start_times_seconds'].append(min(max(start, 0.0), duration))
+            alignment['character_end_times_seconds'].append(min(max(end, 0.0), duration))
+        return alignment
@@ -0,0 +1,548 @@
+"""
+Shorts 直接描画ユーティリティ
+
+Phase 7 の描画ソース（render_sources.json: 画像タイミング・音声ステム・ASS字幕）から
+縦型(1080x1920)クリップを直接描画する。
+描画ソースは Phase 7 の静止画セグメント方式（Phase07Composition の ffmpeg 直接統合）と
+V2（VideoSegmentGenerator）が最終合成の後に書く。完成動画のフィンガープリントを記録しておき、
+完成動画が別の方法で作り直されていた場合（古い描画ソース）は使わない。
+V2 のズーム・パンは再現しない（静止画のまま）ため、既定は完成動画の分割（video_split.mode: split）。
+
+従来の「完成動画を -c copy で分割 → 各クリップを boxblur 付きで再エンコード」と比べて:
+- 完成動画の再エンコード（1世代分の劣化）がない
+- 切り出し位置を字幕・文の境界に合わせられる（GOP境界に依存しない）
+- 背景ぼかしは縮小→拡大の擬似ブラーで、フル解像度の boxblur を使わない
+  （still_backgrounds では画像ごとに一度だけぼかした静止画を再利用する）
+- 全クリップを並列に描画する
+"""
+
+import hashlib
+import json
+import math
+import os
+import platform
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import logging
+
+from .telemetry import map_in_context
+
+# 文末とみなす文字（字幕の終わりがこれなら文の境界）
+SENTENCE_END_CHARS = ("。", "！", "？", "!", "?", "」", "』")
+
+# 音声コーデック設定（Phase 7 の音声ステムと同一）
+SHORTS_AUDIO_ARGS = ['-c:a', 'aac', '-b:a', '192k', '-ar', '48000']
+
+# フィンガープリントに使う先頭・末尾のバイト数
+FINGERPRINT_CHUNK_BYTES = 1 << 20
+
+# 描画ソース（Phase 7 が phase_dir に書き、Phase 10 が読む）
+RENDER_SOURCES_FILE = "render_sources.json"
+RENDER_SOURCES_VERSION = 2
+
+
+def video_fingerprint(path: Path) -> Dict[str, Any]:
+    """
+    動画ファイルのフィンガープリント（サイズ + 先頭・末尾 1MiB の SHA-1）
+
+    コピーしても一致し（更新日時は使わない）、再エンコードすれば変わる。
+    """
+    path = Path(path)
+    size = path.stat().st_size
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        h.update(f.read(FINGERPRINT_CHUNK_BYTES))
+        if size > FINGERPRINT_CHUNK_BYTES:
+            f.seek(max(FINGERPRINT_CHUNK_BYTES, size - FINGERPRINT_CHUNK_BYTES))
+            h.update(f.read(FINGERPRINT_CHUNK_BYTES))
+    return {"size": size, "sha1": h.hexdigest()}
+
+
+def save_render_sources(
+    sources_path: Path,
+    sources: Dict[str, Any],
+    video_path: Path,
+    logger: Optional[logging.Logger] = None
+) -> Optional[Path]:
+    """
+    描画ソースを完成動画のフィンガープリント付きで保存（最終合成の成功後に呼ぶ）
+
+    sources の主なキー:
+        images: [{'path', 'start', 'duration', 'section_id'}]
+        fps / width / height / total_duration
+        audio_path / audio_stem_path / ass_path / gradient_path（無ければ None）
+        overlays_baked: グラデーション・黒バーが画像に焼き込み済みか
+        fit: 画像の配置（"cover" = 切り抜き（既定）/ "pad" = 縮小して黒で余白埋め）
+        bar_height: 下部の字幕用黒バーの高さ（焼き込み済み・無しなら 0）
+
+    Returns:
+        保存したファイルのパス（失敗時は None）
+    """
+    logger = logger or logging.getLogger(__name__)
+    try:
+        sources = dict(sources, version=RENDER_SOURCES_VERSION, final_video=video_fingerprint(video_path))
+        with open(sources_path, 'w', encoding='utf-8') as f:
+            json.dump(sources, f, indent=2, ensure_ascii=False)
+        logger.debug(f"Render sources saved: {sources_path}")
+        return sources_path
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to save render sources: {e}")
+        return None
+
+
+def _subtitle_text(subtitle: Dict[str, Any]) -> str:
+    lines = [subtitle.get(key) or "" for key in ("text_line1", "text_line2", "text_line3")]
+    return "".join(lines).strip()
+
+
+def plan_shorts_cuts(
+    subtitles: List[Dict[str, Any]],
+    total_duration: float,
+    segment_duration: float = 60.0,
+    max_clips: int = 5,
+    min_duration: float = 20.0,
+    fps: int = 30
+) -> List[Dict[str, Any]]:
+    """
+    字幕境界に合わせてクリップの切り出し位置を決める
+
+    各クリップは segment_duration 以内に収め、その範囲で最も遅い
+    文末（。！？ など）の字幕終了時刻で切る。文末がなければ最も遅い字幕終了時刻、
+    それもなければ segment_duration ちょうどで切る。
+    時刻はフレーム単位に丸める。
+
+    Args:
+        subtitles: subtitle_timing.json の "subtitles"
+        total_duration: 動画全体の長さ（秒）
+        segment_duration: 1クリップの最大長（秒）
+        max_clips: 最大クリップ数
+        min_duration: 1クリップの最小長（秒、これより短い境界は採用しない）
+        fps: フレームレート
+
+    Returns:
+        [{'index': 0, 'start': 0.0, 'end': 58.4, 'duration': 58.4}, ...]
+    """
+    def snap(t: float) -> float:
+        return round(t * fps) / fps
+
+    boundaries = []
+    for subtitle in subtitles:
+        end_time = subtitle.get("end_time")
+        if end_time is None:
+            continue
+        boundaries.append((float(end_time), _subtitle_text(subtitle).endswith(SENTENCE_END_CHARS)))
+    boundaries.sort()
+
+    total_duration = snap(total_duration)
+    min_duration = min(min_duration, segment_duration)
+    cuts: List[Dict[str, Any]] = []
+    start = 0.0
+
+    while len(cuts) < max_clips and total_duration - start >= 1.0 / fps:
+        limit = start + segment_duration
+        if total_duration <= limit:
+            end = total_duration
+        else:
+            window = [(t, is_sentence) for t, is_sentence in boundaries if start + min_duration <= t <= limit]
+            sentence_ends = [t for t, is_sentence in window if is_sentence]
+            if sentence_ends:
+                end = sentence_ends[-1]
+            elif window:
+                end = window[-1][0]
+            else:
+                end = limit
+            # フレーム丸めで segment_duration を超えないようにする
+            end = min(snap(end), math.floor(limit * fps + 1e-6) / fps)
+
+        end = snap(end)
+        if end <= start:
+            break
+
+        cuts.append({
+            "index": len(cuts),
+            "start": start,
+            "end": end,
+            "duration": end - start,
+        })
+        start = end
+
+    return cuts
+
+
+class ShortsRenderer:
+    """
+    描画ソースから縦型 Shorts クリップを直接描画
+
+    使用例:
+        renderer = ShortsRenderer(project_root, logger)
+        sources = renderer.load_sources(phase7_dir / RENDER_SOURCES_FILE)
+        cuts = plan_shorts_cuts(subtitles, sources["total_duration"])
+        clips = renderer.render_clips(sources, cuts, output_dir)
+    """
+
+    def __init__(
+        self,
+        project_root: Path,
+        logger: Optional[logging.Logger] = None,
+        target_width: int = 1080,
+        target_height: int = 1920,
+        encode_preset: str = "veryfast",
+        crf: int = 20,
+        max_workers: int = 0,
+        fallback_audio_path: Optional[Path] = None,
+        still_backgrounds: bool = False,
+        blur_downscale: int = 10
+    ):
+        """
+        Args:
+            project_root: プロジェクトのルートパス（字幕フォントの解決に使用）
+            logger: ロガー
+            target_width: 出力幅
+            target_height: 出力高さ
+            encode_preset: x264 プリセット
+            crf: x264 CRF
+            max_workers: 並列数（0 の場合は CPU 数とクリップ数から自動決定）
+            fallback_audio_path: 音声ステムがない場合に使う音声（完成動画など）
+            still_backgrounds: 背景に画像ごとの事前ぼかし静止画を使う
+                （フレームごとの縮小ぼかしを省略。背景に字幕は映らない）
+            blur_downscale: 背景をぼかす解像度の縮小倍率
+        """
+        self.project_root = project_root
+        self.logger = logger or logging.getLogger(__name__)
+        self.target_width = target_width
+        self.target_height = target_height
+        self.encode_preset = encode_preset
+        self.crf = crf
+        self.max_workers = max_workers
+        self.fallback_audio_path = fallback_audio_path
+        self.still_backgrounds = still_backgrounds
+        self.blur_downscale = blur_downscale
+
+    def _normalize_path(self, p: Path) -> str:
+        """WindowsパスをUnix形式に変換（ffmpeg互換）"""
+        path_str = str(Path(p).resolve())
+        if platform.system() == 'Windows':
+            path_str = path_str.replace('\\', '/')
+        return path_str
+
+    def _build_ass_filter(self, ass_path: Path) -> str:
+        """ass フィルタ文字列を構築（FFmpegBuilder と同じ fontsdir）"""
+        ass_path_str = str(Path(ass_path).resolve())
+        fonts_dir_str = str((self.project_root / "assets" / "fonts" / "cinema").resolve()).replace('\\', '/')
+        if platform.system() == 'Windows':
+            ass_path_str = ass_path_str.replace('\\', '/').replace(':', '\\:')
+            fonts_dir_str = fonts_dir_str.replace(':', '\\:')
+        return f"ass='{ass_path_str}':fontsdir='{fonts_dir_str}'"
+
+    # ----------------------------------------
+    # ソース
+    # ----------------------------------------
+
+    def load_sources(self, sources_path: Path, video_path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+        """
+        render_sources.json を読み込む
+
+        Args:
+            sources_path: render_sources.json のパス
+            video_path: 完成動画（指定した場合、描画ソースがこの動画のものか確認する）
+
+        Returns:
+            描画ソース（存在しない・画像が欠けている・完成動画と一致しない場合は None）
+        """
+        if not sources_path.exists():
+            self.logger.info(f"Render sources not found: {sources_path}")
+            return None
+
+        with open(sources_path, 'r', encoding='utf-8') as f:
+            sources = json.load(f)
+
+        if video_path is not None:
+            recorded = sources.get("final_video")
+            if not recorded:
+                self.logger.warning("Render sources do not record the final video; not using them")
+                return None
+            if not Path(video_path).exists() or video_fingerprint(video_path) != recorded:
+                self.logger.warning(
+                    f"Render sources are stale (final video changed since they were written): {video_path}"
+                )
+                return None
+
+        images = sources.get("images", [])
+        if not images:
+            self.logger.warning("Render sources contain no images")
+            return None
+
+        missing = [image["path"] for image in images if not Path(image["path"]).exists()]
+        if missing:
+            self.logger.warning(f"Render sources reference {len(missing)} missing images (e.g. {missing[0]})")
+            return None
+
+        return sources
+
+    def resolve_audio(self, sources: Dict[str, Any]) -> Optional[Path]:
+        """クリップ音声の入力（音声ステム → 代替音声の順）"""
+        stem = sources.get("audio_stem_path")
+        if stem and Path(stem).exists():
+            return Path(stem)
+        if self.fallback_audio_path and Path(self.fallback_audio_path).exists():
+            return Path(self.fallback_audio_path)
+        return None
+
+    # ----------------------------------------
+    # コマンド構築
+    # ----------------------------------------
+
+    def write_concat_file(
+        self,
+        images: List[Dict[str, Any]],
+        cut: Dict[str, Any],
+        output_path: Path,
+        replacements: Optional[Dict[Path, Path]] = None
+    ) -> Path:
+        """
+        クリップ区間に重なる画像だけを並べた concat ファイルを作る
+
+        先頭・末尾の画像は区間からはみ出す分だけ表示時間を短くする。
+        replacements を指定すると画像を差し替える（ぼかし背景静止画など）。
+        """
+        start, end = cut["start"], cut["end"]
+        lines = []
+        last_path = None
+        for image in images:
+            image_start = image["start"]
+            image_end = image_start + image["duration"]
+            if image_end <= start or image_start >= end:
+                continue
+            shown = min(image_end, end) - max(image_start, start)
+            if shown <= 0:
+                continue
+            image_path = Path(image["path"])
+            image_path = (replacements or {}).get(image_path, image_path)
+            path_str = self._normalize_path(image_path).replace("'", "'\\''")
+            lines.append(f"file '{path_str}'")
+            lines.append(f"duration {shown:.6f}")
+            last_path = path_str
+
+        # 最後のファイルを再度追加（ffmpeg concat仕様）
+        if last_path:
+            lines.append(f"file '{last_path}'")
+
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines))
+        return output_path
+
+    def build_clip_command(
+        self,
+        sources: Dict[str, Any],
+        cut: Dict[str, Any],
+        concat_file: Path,
+        output_path: Path,
+        audio_path: Optional[Path] = None,
+        threads: int = 0,
+        background_concat: Optional[Path] = None
+    ) -> List[str]:
+        """
+        1クリップを描画するffmpegコマンド
+
+        本編と同じ 16:9 フレーム（画像 + グラデーション / 黒バー + ASS字幕）を作り、
+        縦型キャンバスの中央に配置する。背景は同じフレームを
+        縮小→拡大した擬似ブラー（フル解像度の boxblur は使わない）。
+        background_concat を指定した場合は、事前にぼかした静止画を背景に使う。
+        """
+        fps = sources.get("fps", 30)
+        width = sources.get("width", 1920)
+        height = sources.get("height", 1080)
+        tw, th = self.target_width, self.target_height
+        frames = max(1, round(cut["duration"] * fps))
+
+        cmd = ['ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-i', self._normalize_path(concat_file)]
+        next_input = 1
+
+        background_input = None
+        if background_concat is not None:
+            cmd.extend(['-f', 'concat', '-safe', '0', '-i', self._normalize_path(background_concat)])
+            background_input = next_input
+            next_input += 1
+
+        gradient_path = sources.get("gradient_path")
+        gradient_input = None
+        if gradient_path and Path(gradient_path).exists() and not sources.get("overlays_baked"):
+            cmd.extend(['-loop', '1', '-i', self._normalize_path(Path(gradient_path))])
+            gradient_input = next_input
+            next_input += 1
+
+        audio_input = None
+        if audio_path is not None:
+            cmd.extend([
+                '-ss', f"{cut['start']:.6f}", '-t', f"{cut['duration']:.6f}",
+                '-i', self._normalize_path(audio_path)
+            ])
+            audio_input = next_input
+
+        # 本編と同じ 16:9 フレーム
+        if sources.get("fit", "cover") == "pad":
+            frame = (
+                f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2"
+            )
+        else:
+            frame = f"scale={width}:{height}:force_original_aspect_ratio=increase,crop={width}:{height}"
+        bar_height = sources.get("bar_height", 0)
+        if bar_height:
+            frame += f",drawbox=y=ih-{bar_height}:color=black@1.0:width=iw:height={bar_height}:t=fill"
+        parts = [f"[0:v]{frame},setsar=1,fps={fps},setpts=PTS-STARTPTS[v_src]"]
+        current = "[v_src]"
+        if gradient_input is not None:
+            parts.append(f"{current}[{gradient_input}:v]overlay=0:0:format=auto:shortest=1[v_grad]")
+            current = "[v_grad]"
+
+        ass_path = sources.get("ass_path")
+        if ass_path and Path(ass_path).exists():
+            # 字幕は本編タイムライン基準なので、描画中だけクリップ開始時刻へずらす
+            parts.append(
+                f"{current}setpts=PTS+{cut['start']:.6f}/TB,"
+                f"{self._build_ass_filter(Path(ass_path))},"
+                f"setpts=PTS-STARTPTS[v_main]"
+            )
+        else:
+            parts.append(f"{current}copy[v_main]")
+
+        # 縦型レイアウト: 擬似ブラー背景 + 幅合わせの前景
+        if background_input is not None:
+            parts.append(
+                f"[{background_input}:v]scale={tw}:{th},setsar=1,fps={fps},"
+                f"setpts=PTS-STARTPTS,eq=brightness=-0.3[v_bg]"
+            )
+            parts.append(f"[v_main]scale={tw}:-2[v_fg]")
+        else:
+            bg_w = max(2, tw // self.blur_downscale // 2 * 2)
+            bg_h = max(2, th // self.blur_downscale // 2 * 2)
+            parts.append("[v_main]split=2[v_bgsrc][v_fgsrc]")
+            parts.append(
+                f"[v_bgsrc]scale=-2:{bg_h},crop={bg_w}:{bg_h},"
+                f"scale={tw}:{th}:flags=bicubic,eq=brightness=-0.3[v_bg]"
+            )
+            parts.append(f"[v_fgsrc]scale={tw}:-2[v_fg]")
+        parts.append("[v_bg][v_fg]overlay=(W-w)/2:(H-h)/2,format=yuv420p[v_out]")
+
+        cmd.extend(['-filter_complex', ";".join(parts), '-map', '[v_out]'])
+        if audio_input is not None:
+            cmd.extend(['-map', f'{audio_input}:a:0', *SHORTS_AUDIO_ARGS])
+        else:
+            cmd.append('-an')
+
+        cmd.extend([
+            '-frames:v', str(frames),
+            '-c:v', 'libx264', '-preset', self.encode_preset, '-crf', str(self.crf),
+            '-pix_fmt', 'yuv420p', '-r', str(fps),
+            '-threads', str(threads),
+            '-movflags', '+faststart',
+            self._normalize_path(output_path)
+        ])
+        return cmd
+
+    # ----------------------------------------
+    # 描画
+    # ----------------------------------------
+
+    def _resolve_workers(self, num_clips: int) -> int:
+        if self.max_workers and self.max_workers > 0:
+            return min(self.max_workers, num_clips)
+        # x264 は1プロセスでも数スレッドは使うため、1クリップあたり2コアを目安にする
+        return max(1, min((os.cpu_count() or 2) // 2, num_clips))
+
+    def render_clips(
+        self,
+        sources: Dict[str, Any],
+        cuts: List[Dict[str, Any]],
+        output_dir: Path,
+        prefix: str = "vertical"
+    ) -> List[Path]:
+        """
+        全クリップを並列に描画
+
+        Args:
+            sources: load_sources() の戻り値
+            cuts: plan_shorts_cuts() の戻り値
+            output_dir: 出力ディレクトリ
+            prefix: 出力ファイル名のプレフィックス
+
+        Returns:
+            縦型クリップのパスリスト（cuts と同じ順）
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        if not cuts:
+            return []
+
+        audio_path = self.resolve_audio(sources)
+        if audio_path is None:
+            self.logger.warning("⚠️ No audio source for shorts, clips will be silent")
+
+        backgrounds: Dict[Path, Path] = {}
+        if self.still_backgrounds:
+            try:
+                from .aspect_ratio_converter import AspectRatioConverter
+
+                converter = AspectRatioConverter(
+                    logger=self.logger,
+                    blur_downscale=self.blur_downscale,
+                    cache_dir=output_dir / ".blur_cache"
+                )
+                backgrounds = converter.create_blurred_stills(
+                    [Path(image["path"]) for image in sources["images"]],
+                    target_width=self.target_width,
+                    target_height=self.target_height,
+                    max_workers=self.max_workers
+                )
+            except Exception as e:
+                self.logger.warning(f"⚠️ Blurred stills unavailable, blurring per frame: {e}")
+                backgrounds = {}
+
+        workers = self._resolve_workers(len(cuts))
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        self.logger.info(
+            f"🎬 Rendering {len(cuts)} shorts from sources "
+            f"({self.target_width}x{self.target_height}, {workers} parallel × {threads} threads)"
+        )
+
+        def render(cut: Dict[str, Any]) -> Path:
+            number = cut["index"] + 1
+            output_path = output_dir / f"{prefix}_{number:03d}.mp4"
+            concat_file = output_dir / f".{prefix}_{number:03d}_concat.txt"
+            self.write_concat_file(sources["images"], cut, concat_file)
+            background_concat = None
+            if backgrounds:
+                background_concat = output_dir / f".{prefix}_{number:03d}_bg_concat.txt"
+                self.write_concat_file(sources["images"], cut, background_concat, replacements=backgrounds)
+            cmd = self.build_clip_command(
+                sources, cut, concat_file, output_path,
+                audio_path=audio_path, threads=threads, background_concat=background_concat
+            )
+            self.logger.debug(f"Command: {' '.join(cmd)}")
+            try:
+                subprocess.run(
+                    cmd,
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    stdin=subprocess.DEVNULL
+                )
+            except subprocess.CalledProcessError as e:
+                stderr_msg = e.stderr.decode('utf-8', errors='ignore') if e.stderr else ''
+                self.logger.error(f"ffmpeg shorts render failed (clip {number}): {stderr_msg[-500:]}")
+                raise
+            finally:
+                concat_file.unlink(missing_ok=True)
+                if background_concat is not None:
+                    background_concat.unlink(missing_ok=True)
+
+            self.logger.info(
+                f"✓ Short {number}/{len(cuts)}: {output_path.name} "
+                f"({cut['start']:.1f}s-{cut['end']:.1f}s)"
+            )
+            return output_path
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return map_in_context(executor, render, cuts)
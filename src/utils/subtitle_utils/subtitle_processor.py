@@ -14,6 +14,7 @@ from PIL import Image, ImageDraw, ImageFont
 
 from ...core.models import SubtitleEntry
 from ...core.config_manager import ConfigManager
+from ..font_cache import load_first_font
 
 
 class SubtitleProcessor:
@@ -704,13 +705,11 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             "/System/Library/Fonts/ヒラギノ角ゴシック W3.ttc",
         ]
 
-        for font_path in font_paths:
-            try:
-                font = ImageFont.truetype(font_path, size)
-                self.logger.info(f"Using font: {font_path}")
-                return font
-            except:
-                continue
+        # 候補の探索と読み込みはプロセス内でキャッシュ（常駐ワーカーではジョブをまたいで再利用）
+        font, font_path = load_first_font(font_paths, size)
+        if font is not None:
+            self.logger.info(f"Using font: {font_path}")
+            return font
 
         # フォントが見つからない場合はデフォルト
         self.logger.warning("Japanese font not found, using default font")
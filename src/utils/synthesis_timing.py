@@ -0,0 +1,180 @@
+"""
+合成情報からの文字タイミング生成（ASR なし）
+
+句点ごとに分割して音声合成する場合（punctuation_pause 有効時）、
+各文の音声長と文の後に挿入した無音の長さは生成側で正確に分かっている。
+そこで結合音声を Whisper / ElevenLabs FA で解析し直す代わりに、
+- 文の境界: チャンクの音声長と挿入した無音長の累積
+- 文内の文字: モーラ数 / 文字種による重みで文の発話区間を按分
+として char_start_times / char_end_times を直接組み立てる。
+同じ入力からは常に同じ結果になり、処理はほぼ一瞬で終わる。
+
+文内の精度が必要な場合は、文ごとの ASR 結果（チャンク先頭からの相対時刻）を
+refined として渡すと、その文だけ重み按分の代わりに使う。
+
+使用例:
+    builder = SynthesisTimingBuilder(lead_in=0.05, tail=0.1)
+    alignment = builder.build([
+        SynthesisChunk("織田信長は尾張に生まれた。", duration=2.4, pause_after=0.8),
+        SynthesisChunk("幼名は吉法師。", duration=1.3),
+    ])
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 文字種ごとの重み（1.0 ≒ 1モーラ）
+DEFAULT_WEIGHTS = {
+    "kana": 1.0,         # ひらがな・カタカナ・長音・促音
+    "small_kana": 0.0,   # ゃゅょぁぃぅぇぉ など（直前の文字と1モーラ）
+    "kanji": 2.0,        # 漢字1文字の読みは平均2モーラ前後
+    "digit": 1.5,
+    "alpha": 1.0,
+    "comma": 1.0,        # 読点は短い間として扱う
+    "other": 0.0,        # 句点・括弧・空白など（発音しない）
+}
+
+_SMALL_KANA = set("ぁぃぅぇぉゃゅょゎァィゥェォャュョヮ")
+_COMMAS = set("、，,")
+
+
+def char_class(char: str) -> str:
+    """文字種を判定（DEFAULT_WEIGHTS のキー）"""
+    if char in _SMALL_KANA:
+        return "small_kana"
+    if "ぁ" <= char <= "ゖ" or "ァ" <= char <= "ヺ" or char == "ー":
+        return "kana"
+    if "一" <= char <= "鿿" or "㐀" <= char <= "䶿" or char in "々〆ヵヶ":
+        return "kanji"
+    if char.isdigit():
+        return "digit"
+    if char.isalpha():
+        return "alpha"
+    if char in _COMMAS:
+        return "comma"
+    return "other"
+
+
+@dataclass
+class SynthesisChunk:
+    """合成した1チャンク（1文）"""
+    text: str
+    duration: float           # チャンク音声の長さ（秒）
+    pause_after: float = 0.0  # チャンクの後に挿入した無音（秒）
+
+
+class SynthesisTimingBuilder:
+    """チャンク長と挿入無音から文字タイミングを組み立てる"""
+
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        lead_in: float = 0.0,
+        tail: float = 0.0,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        初期化
+
+        Args:
+            weights: 文字種ごとの重み（DEFAULT_WEIGHTS を部分的に上書き）
+            lead_in: チャンク先頭の無音として発話区間から除く長さ（秒）
+            tail: チャンク末尾の無音として発話区間から除く長さ（秒）
+            logger: ロガー
+        """
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.lead_in = lead_in
+        self.tail = tail
+        self.logger = logger or logging.getLogger(__name__)
+
+    def sentence_timings(
+        self,
+        text: str,
+        start: float,
+        end: float
+    ) -> Tuple[List[float], List[float]]:
+        """
+        文の発話区間 [start, end] を文字の重みで按分
+
+        重み0の文字は直前の文字の終了時刻で瞬間表示にする。
+        """
+        weights = [self.weights.get(char_class(c), 0.0) for c in text]
+        total = sum(weights)
+        if total <= 0:
+            # 重みのある文字がない場合は均等割り
+            weights = [1.0] * len(text)
+            total = float(len(text)) or 1.0
+
+        scale = (end - start) / total
+        starts, ends = [], []
+        t = start
+        for w in weights:
+            starts.append(t)
+            t += w * scale
+            ends.append(t)
+        return starts, ends
+
+    def build(
+        self,
+        chunks: Sequence[SynthesisChunk],
+        refined: Optional[Dict[int, Dict[str, List]]] = None
+    ) -> Dict[str, List]:
+        """
+        全チャンクの文字タイミングを生成
+
+        Args:
+            chunks: 合成順のチャンク
+            refined: チャンク番号 → ASR で得た alignment（チャンク先頭からの相対時刻）
+
+        Returns:
+            {
+                'characters': List[str],
+                'character_start_times_seconds': List[float],
+                'character_end_times_seconds': List[float]
+            }
+        """
+        refined = refined or {}
+        characters: List[str] = []
+        start_times: List[float] = []
+        end_times: List[float] = []
+
+        offset = 0.0
+        for i, chunk in enumerate(chunks):
+            alignment = refined.get(i)
+            if alignment and alignment.get('characters'):
+                # ASR 結果はチャンク内に収める
+                chars = list(alignment['characters'])
+                starts = [
+                    offset + min(max(float(t), 0.0), chunk.duration)
+                    for t in alignment['character_start_times_seconds']
+                ]
+                ends = [
+                    offset + min(max(float(t), 0.0), chunk.duration)
+                    for t in alignment['character_end_times_seconds']
+                ]
+            else:
+                lead = min(self.lead_in, chunk.duration / 2)
+                tail = min(self.tail, chunk.duration / 2)
+                chars = list(chunk.text)
+                starts, ends = self.sentence_timings(
+                    chunk.text,
+                    offset + lead,
+                    offset + chunk.duration - tail
+                )
+
+            characters.extend(chars)
+            start_times.extend(starts)
+            end_times.extend(ends)
+            offset += chunk.duration + chunk.pause_after
+
+        self.logger.debug(
+            f"Synthesis timing: {len(chunks)} chunks, {len(characters)} characters, "
+            f"{len(refined)} refined, total {offset:.2f}s"
+        )
+
+        return {
+            'characters': characters,
+            'character_start_times_seconds': start_times,
+            'character_end_times_seconds': end_times
+        }
@@ -0,0 +1,636 @@
+"""
+テレメトリ（スパン計測）
+
+実行ごとに JSON Lines ファイルへスパンを記録する。
+スパンは入れ子（phase → step → subprocess/API呼び出し）になっており、
+それぞれ以下を記録する:
+
+- 経過時間（wall）/ CPU時間（自プロセス + 子プロセス）
+- ピークRSS
+- 入出力バイト数（HTTP本文、subprocess の出力ファイルなど）
+- subprocess の argv 要約、HTTP のメソッド・ホスト、LLM のモデル・トークン数
+
+install_hooks() で subprocess.run / requests / Anthropic クライアントを
+ラップするため、既存の呼び出し箇所は変更なしで計測される。
+
+使用例:
+    telemetry = start_run(subject, log_dir)
+    with span("phase", kind="phase", phase=7):
+        with span("render_segments"):
+            subprocess.run([...])   # 自動で子スパンになる
+
+    # ワーカースレッドに投入する処理は submit_in_context / map_in_context で
+    # 現在のスパンを引き継ぐ（ContextVar は ThreadPoolExecutor に伝わらないため）
+    with span("render"):
+        futures = [submit_in_context(executor, encode, job) for job in jobs]
+
+    # 集計: python -m src.cli profile <subject>
+"""
+
+import contextvars
+import functools
+import itertools
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+
+# argv 要約の最大長
+ARGV_SUMMARY_MAX_ARGS = 12
+ARGV_SUMMARY_MAX_CHARS = 80
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """自プロセスのピークRSS（MB）"""
+    if not RESOURCE_AVAILABLE:
+        return None
+    # Linux は KB、macOS はバイト単位
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return rss / divisor
+
+
+def _children_cpu_seconds() -> float:
+    """終了済み子プロセスのCPU時間の累計"""
+    if not RESOURCE_AVAILABLE:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def summarize_argv(args: Any) -> str:
+    """
+    subprocess の引数を短い文字列に要約
+
+    長い引数（filter_complex など）は切り詰め、引数が多い場合は省略する。
+    """
+    if isinstance(args, (str, bytes, os.PathLike)):
+        text = os.fsdecode(args) if not isinstance(args, str) else args
+        return text[:ARGV_SUMMARY_MAX_CHARS * 2]
+
+    parts = []
+    args = [os.fsdecode(a) if isinstance(a, (bytes, os.PathLike)) else str(a) for a in args]
+    for arg in args[:ARGV_SUMMARY_MAX_ARGS]:
+        if len(arg) > ARGV_SUMMARY_MAX_CHARS:
+            arg = arg[:ARGV_SUMMARY_MAX_CHARS] + "…"
+        parts.append(arg)
+    if len(args) > ARGV_SUMMARY_MAX_ARGS:
+        parts.append(f"…(+{len(args) - ARGV_SUMMARY_MAX_ARGS} args)")
+    return " ".join(parts)
+
+
+class Span:
+    """計測中のスパン"""
+
+    def __init__(
+        self,
+        telemetry: "Telemetry",
+        name: str,
+        kind: str,
+        parent: Optional["Span"],
+        attrs: Dict[str, Any]
+    ):
+        self.telemetry = telemetry
+        self.span_id = telemetry._next_span_id()
+        self.parent_id = parent.span_id if parent else None
+        self.depth = parent.depth + 1 if parent else 0
+        self.name = name
+        self.kind = kind
+        self.attrs = attrs
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+        self._started_at = datetime.now()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        self._children_cpu_start = _children_cpu_seconds()
+
+    def set(self, **attrs):
+        """属性を追加"""
+        self.attrs.update(attrs)
+
+    def add_bytes(self, bytes_in: int = 0, bytes_out: int = 0):
+        """入出力バイト数を加算"""
+        self.bytes_in += bytes_in or 0
+        self.bytes_out += bytes_out or 0
+
+    def finish(self) -> Dict[str, Any]:
+        """スパンを終了してレコードを返す"""
+        record = {
+            "type": "span",
+            "run_id": self.telemetry.run_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "depth": self.depth,
+            "name": self.name,
+            "kind": self.kind,
+            "thread": threading.current_thread().name,
+            "started_at": self._started_at.isoformat(),
+            "wall_seconds": round(time.perf_counter() - self._wall_start, 6),
+            "cpu_seconds": round(time.thread_time() - self._cpu_start, 6),
+            "child_cpu_seconds": round(_children_cpu_seconds() - self._children_cpu_start, 6),
+            "peak_rss_mb": _peak_rss_mb(),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "status": self.status,
+        }
+        if self.error:
+            record["error"] = self.error
+        if self.attrs:
+            record["attrs"] = self.attrs
+        return record
+
+
+# 現在のスパン（スレッド・タスクごと）
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "telemetry_current_span", default=None
+)
+
+
+class Telemetry:
+    """
+    1回の実行分のテレメトリ
+
+    スパンは終了時に1行ずつ JSONL ファイルへ追記する。
+    """
+
+    def __init__(
+        self,
+        output_path: Optional[Path],
+        run_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        初期化
+
+        Args:
+            output_path: JSONLファイルのパス（Noneなら記録しない）
+            run_id: 実行ID（省略時は自動生成）
+            metadata: run レコードに書き込む付加情報
+            logger: ロガー
+        """
+        self.output_path = Path(output_path) if output_path else None
+        self.run_id = run_id or f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._span_ids = itertools.count(1)
+
+        if self.output_path:
+            self.output_path.parent.mkdir(parents=True, exist_ok=True)
+            self._write({
+                "type": "run",
+                "run_id": self.run_id,
+                "started_at": datetime.now().isoformat(),
+                "pid": os.getpid(),
+                **(metadata or {}),
+            })
+
+    @property
+    def enabled(self) -> bool:
+        return self.output_path is not None
+
+    def _next_span_id(self) -> int:
+        return next(self._span_ids)
+
+    def _write(self, record: Dict[str, Any]):
+        if not self.output_path:
+            return
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            try:
+                with open(self.output_path, 'a', encoding='utf-8') as f:
+                    f.write(line + "\n")
+            except OSError as e:
+                self.logger.debug(f"Telemetry write failed: {e}")
+
+    @contextmanager
+    def span(self, name: str, kind: str = "step", **attrs) -> Iterator[Span]:
+        """
+        スパンを開始（コンテキストマネージャー）
+
+        Args:
+            name: スパン名
+            kind: 種別（phase / step / subprocess / http / llm など）
+            **attrs: 任意の属性
+        """
+        current = Span(self, name, kind, _current_span.get(), attrs)
+        token = _current_span.set(current)
+        try:
+            yield current
+        except BaseException as e:
+            current.status = "error"
+            current.error = f"{type(e).__name__}: {e}"[:500]
+            raise
+        finally:
+            _current_span.reset(token)
+            self._write(current.finish())
+
+
+# ========================================
+# グローバルインスタンス
+# ========================================
+
+_telemetry = Telemetry(output_path=None)
+
+
+def get_telemetry() -> Telemetry:
+    """現在のテレメトリを取得（未開始なら記録しないインスタンス）"""
+    return _telemetry
+
+
+def start_run(
+    subject: str,
+    log_dir: Path,
+    command: Optional[str] = None,
+    enabled: bool = True,
+    logger: Optional[logging.Logger] = None
+) -> Telemetry:
+    """
+    実行ごとのテレメトリを開始
+
+    記録先: <log_dir>/telemetry/<subject>/<run_id>.jsonl
+
+    Args:
+        subject: 偉人名
+        log_dir: ログディレクトリ
+        command: 実行したコマンド（run レコードに記録）
+        enabled: Falseなら記録しない
+        logger: ロガー
+    """
+    global _telemetry
+
+    if not enabled:
+        _telemetry = Telemetry(output_path=None, logger=logger)
+        return _telemetry
+
+    run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+    output_path = Path(log_dir) / "telemetry" / subject / f"{run_id}.jsonl"
+    _telemetry = Telemetry(
+        output_path=output_path,
+        run_id=run_id,
+        metadata={"subject": subject, "command": command},
+        logger=logger
+    )
+    install_hooks()
+
+    if logger:
+        logger.debug(f"Telemetry: {output_path}")
+    return _telemetry
+
+
+@contextmanager
+def span(name: str, kind: str = "step", **attrs) -> Iterator[Span]:
+    """現在のテレメトリでスパンを開始"""
+    with _telemetry.span(name, kind=kind, **attrs) as s:
+        yield s
+
+
+def current_span() -> Optional[Span]:
+    """実行中のスパン（なければNone）"""
+    return _current_span.get()
+
+
+def submit_in_context(
+    executor: Executor,
+    fn: Callable[..., Any],
+    *args,
+    context: Optional[contextvars.Context] = None,
+    **kwargs
+) -> Future:
+    """
+    現在のコンテキスト（実行中のスパン）を引き継いで executor に投入
+
+    ThreadPoolExecutor のワーカーは投入元の ContextVar を引き継がないため、
+    そのまま submit するとワーカー内のスパンが親なし（フェーズの集計から漏れる）になる。
+
+    Args:
+        executor: 投入先
+        fn: 実行する関数
+        context: 引き継ぐコンテキスト（省略時は呼び出し時点のもの）。
+            投入ごとに複製するので、同じコンテキストを複数回渡してよい
+    """
+    context = context.copy() if context is not None else contextvars.copy_context()
+    return executor.submit(context.run, fn, *args, **kwargs)
+
+
+def map_in_context(executor: Executor, fn: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+    """
+    executor.map の代わり（現在のスパンを引き継ぐ。結果は items の順）
+
+    いずれかが例外を送出した場合は、executor.map と同様に最初の例外を送出する。
+    """
+    futures = [submit_in_context(executor, fn, item) for item in items]
+    return [future.result() for future in futures]
+
+
+# ========================================
+# フック
+# ========================================
+
+_hooks_installed = False
+_hooks_lock = threading.Lock()
+
+
+def _output_file_size(args: Any) -> int:
+    """ffmpeg 系コマンドの出力ファイル（最後の引数）のサイズ"""
+    if isinstance(args, (str, bytes)) or not isinstance(args, Sequence) or not args:
+        return 0
+    last = args[-1]
+    if not isinstance(last, (str, os.PathLike)) or str(last).startswith("-"):
+        return 0
+    try:
+        return os.path.getsize(last)
+    except (OSError, TypeError, ValueError):
+        return 0
+
+
+def _wrap_subprocess_run(original):
+    @functools.wraps(original)
+    def run(*popenargs, **kwargs):
+        if not _telemetry.enabled:
+            return original(*popenargs, **kwargs)
+
+        args = popenargs[0] if popenargs else kwargs.get("args")
+        if isinstance(args, (list, tuple)) and args:
+            program = os.path.basename(os.fsdecode(args[0]) if isinstance(args[0], (bytes, os.PathLike)) else str(args[0]))
+        else:
+            program = "shell"
+
+        with _telemetry.span(program, kind="subprocess", argv=summarize_argv(args)) as s:
+            result = original(*popenargs, **kwargs)
+            s.set(returncode=result.returncode)
+            for stream in (result.stdout, result.stderr):
+                if isinstance(stream, (bytes, str)):
+                    s.add_bytes(bytes_in=len(stream))
+            s.add_bytes(bytes_out=_output_file_size(args))
+            return result
+
+    run._telemetry_wrapped = True
+    return run
+
+
+def _wrap_requests(original):
+    @functools.wraps(original)
+    def request(self, method, url, *args, **kwargs):
+        if not _telemetry.enabled:
+            return original(self, method, url, *args, **kwargs)
+
+        from urllib.parse import urlsplit
+        parts = urlsplit(str(url))
+        with _telemetry.span(
+            f"{method.upper()} {parts.netloc}",
+            kind="http",
+            path=parts.path
+        ) as s:
+            body = kwargs.get("data") or kwargs.get("json")
+            if isinstance(body, (bytes, str)):
+                s.add_bytes(bytes_out=len(body))
+            elif body is not None:
+                s.add_bytes(bytes_out=len(json.dumps(body, default=str)))
+
+            response = original(self, method, url, *args, **kwargs)
+            s.set(status_code=response.status_code)
+            if not kwargs.get("stream"):
+                s.add_bytes(bytes_in=len(response.content or b""))
+            return response
+
+    request._telemetry_wrapped = True
+    return request
+
+
+def _wrap_anthropic(original):
+    @functools.wraps(original)
+    def create(self, *args, **kwargs):
+        if not _telemetry.enabled:
+            return original(self, *args, **kwargs)
+
+        with _telemetry.span(
+            "messages.create",
+            kind="llm",
+            provider="anthropic",
+            model=kwargs.get("model")
+        ) as s:
+            response = original(self, *args, **kwargs)
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                s.set(
+                    input_tokens=getattr(usage, "input_tokens", None),
+                    output_tokens=getattr(usage, "output_tokens", None)
+                )
+            return response
+
+    create._telemetry_wrapped = True
+    return create
+
+
+def install_hooks():
+    """
+    subprocess.run / requests / Anthropic クライアントに計測フックを設置
+
+    何度呼んでも1回だけ設置される。テレメトリが無効な間は素通しする。
+    """
+    global _hooks_installed
+
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+
+        if not getattr(subprocess.run, "_telemetry_wrapped", False):
+            subprocess.run = _wrap_subprocess_run(subprocess.run)
+
+        try:
+            import requests
+            if not getattr(requests.Session.request, "_telemetry_wrapped", False):
+                requests.Session.request = _wrap_requests(requests.Session.request)
+        except ImportError:
+            pass
+
+        try:
+            from anthropic.resources.messages import Messages
+            if not getattr(Messages.create, "_telemetry_wrapped", False):
+                Messages.create = _wrap_anthropic(Messages.create)
+        except ImportError:
+            pass
+
+        _hooks_installed = True
+
+
+# ========================================
+# 集計
+# ========================================
+
+def find_runs(log_dir: Path, subject: str) -> List[Path]:
+    """被写体のテレメトリファイル一覧（古い順）"""
+    run_dir = Path(log_dir) / "telemetry" / subject
+    if not run_dir.exists():
+        return []
+    return sorted(run_dir.glob("*.jsonl"))
+
+
+def load_spans(path: Path) -> List[Dict[str, Any]]:
+    """JSONLファイルからスパンを読み込み"""
+    spans = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # 中断された実行の末尾行
+            if record.get("type") == "span":
+                spans.append(record)
+    return spans
+
+
+def aggregate_spans(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    スパンを集計
+
+    Returns:
+        {
+            "phases": [{name, wall_seconds, ..., children: [...]}, ...],
+            "by_kind": {kind: {count, wall_seconds, cpu_seconds, ...}},
+            "by_name": [{kind, name, count, wall_seconds, ...}, ...]  # wall 降順
+        }
+    """
+    by_id = {s["span_id"]: s for s in spans}
+    children: Dict[Optional[int], List[Dict[str, Any]]] = {}
+    for s in spans:
+        children.setdefault(s.get("parent_id"), []).append(s)
+
+    def phase_of(s: Dict[str, Any]) -> Optional[int]:
+        while s is not None:
+            if s.get("kind") == "phase":
+                return s["span_id"]
+            s = by_id.get(s.get("parent_id"))
+        return None
+
+    phase_ids = {s["span_id"]: phase_of(s) for s in spans}
+
+    def empty() -> Dict[str, Any]:
+        return {"count": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+                "child_cpu_seconds": 0.0, "bytes_in": 0, "bytes_out": 0}
+
+    def add(total: Dict[str, Any], s: Dict[str, Any]):
+        total["count"] += 1
+        total["wall_seconds"] += s.get("wall_seconds", 0.0)
+        total["cpu_seconds"] += s.get("cpu_seconds", 0.0)
+        total["child_cpu_seconds"] += s.get("child_cpu_seconds", 0.0)
+        total["bytes_in"] += s.get("bytes_in", 0)
+        total["bytes_out"] += s.get("bytes_out", 0)
+
+    by_kind: Dict[str, Dict[str, Any]] = {}
+    by_name: Dict[tuple, Dict[str, Any]] = {}
+    for s in spans:
+        if s.get("kind") == "phase":
+            continue
+        add(by_kind.setdefault(s.get("kind", "step"), empty()), s)
+        key = (s.get("kind", "step"), s.get("name"))
+        entry = by_name.setdefault(key, {"kind": key[0], "name": key[1], **empty()})
+        add(entry, s)
+
+    phases = []
+    for s in spans:
+        if s.get("kind") != "phase":
+            continue
+        # フェーズ内の子孫をスパン名ごとに集計（直下の子の wall を内訳とする）
+        breakdown: Dict[tuple, Dict[str, Any]] = {}
+        for child in children.get(s["span_id"], []):
+            key = (child.get("kind", "step"), child.get("name"))
+            entry = breakdown.setdefault(key, {"kind": key[0], "name": key[1], **empty()})
+            add(entry, child)
+        descendants: Dict[str, Dict[str, Any]] = {}
+        for other in spans:
+            if other.get("kind") == "phase" or phase_ids[other["span_id"]] != s["span_id"]:
+                continue
+            add(descendants.setdefault(other.get("kind", "step"), empty()), other)
+
+        direct_wall = sum(e["wall_seconds"] for e in breakdown.values())
+        phases.append({
+            "name": s.get("name"),
+            "attrs": s.get("attrs", {}),
+            "status": s.get("status"),
+            "wall_seconds": s.get("wall_seconds", 0.0),
+            "cpu_seconds": s.get("cpu_seconds", 0.0),
+            "child_cpu_seconds": s.get("child_cpu_seconds", 0.0),
+            "peak_rss_mb": s.get("peak_rss_mb"),
+            "untracked_seconds": max(0.0, s.get("wall_seconds", 0.0) - direct_wall),
+            "children": sorted(breakdown.values(), key=lambda e: -e["wall_seconds"]),
+            "by_kind": descendants,
+        })
+
+    return {
+        "phases": phases,
+        "by_kind": by_kind,
+        "by_name": sorted(by_name.values(), key=lambda e: -e["wall_seconds"]),
+    }
+
+
+def format_report(summary: Dict[str, Any], top: int = 15) -> str:
+    """aggregate_spans() の結果を表形式の文字列にする"""
+    lines = []
+
+    def mb(value: int) -> str:
+        return f"{value / (1024 * 1024):.1f}"
+
+    lines.append("Phases")
+    lines.append(f"  {'phase':<36} {'wall[s]':>9} {'cpu[s]':>8} {'child[s]':>9} {'rss[MB]':>8}  status")
+    for p in summary["phases"]:
+        rss = f"{p['peak_rss_mb']:.0f}" if p.get("peak_rss_mb") is not None else "-"
+        lines.append(
+            f"  {p['name'][:36]:<36} {p['wall_seconds']:>9.2f} {p['cpu_seconds']:>8.2f} "
+            f"{p['child_cpu_seconds']:>9.2f} {rss:>8}  {p['status']}"
+        )
+        for child in p["children"][:top]:
+            label = f"[{child['kind']}] {child['name']}"
+            lines.append(
+                f"    {label[:46]:<46} {child['wall_seconds']:>9.2f}  x{child['count']}"
+            )
+        if p["untracked_seconds"] > 0.005:
+            lines.append(f"    {'(untracked)':<46} {p['untracked_seconds']:>9.2f}")
+        for kind, total in sorted(p["by_kind"].items()):
+            lines.append(
+                f"    total {kind:<40} {total['wall_seconds']:>9.2f}  x{total['count']}"
+            )
+
+    lines.append("")
+    lines.append("By kind")
+    lines.append(f"  {'kind':<14} {'count':>6} {'wall[s]':>9} {'cpu[s]':>8} {'child[s]':>9} {'in[MB]':>8} {'out[MB]':>8}")
+    for kind, total in sorted(summary["by_kind"].items(), key=lambda kv: -kv[1]["wall_seconds"]):
+        lines.append(
+            f"  {kind:<14} {total['count']:>6} {total['wall_seconds']:>9.2f} {total['cpu_seconds']:>8.2f} "
+            f"{total['child_cpu_seconds']:>9.2f} {mb(total['bytes_in']):>8} {mb(total['bytes_out']):>8}"
+        )
+
+    lines.append("")
+    lines.append(f"Top {top} spans by wall time")
+    lines.append(f"  {'kind':<11} {'name':<34} {'count':>6} {'wall[s]':>9} {'avg[s]':>8}")
+    for entry in summary["by_name"][:top]:
+        avg = entry["wall_seconds"] / entry["count"] if entry["count"] else 0.0
+        lines.append(
+            f"  {entry['kind']:<11} {str(entry['name'])[:34]:<34} {entry['count']:>6} "
+            f"{entry['wall_seconds']:>9.2f} {avg:>8.3f}"
+        )
+
+    return "\n".join(lines)
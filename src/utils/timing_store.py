@@ -0,0 +1,349 @@
+"""
+タイミングデータの列指向ストア
+
+audio_timing.json（セクションごとの characters / char_start_times / char_end_times）と
+subtitle_timing.json（字幕ごとの start_time / end_time）は、Phase 6・7・画像マッチャーが
+それぞれ何度も JSON から Python の float に読み直している。
+
+このモジュールは JSON の隣に列指向のストア（<name>.timing/）を書き、
+- 文字タイミングは全セクション分を連結した float32 列（char_start / char_end）と文字列
+- 字幕の開始・終了は float32 列（start_time / end_time）
+- それ以外の項目は index.json に元の構造のまま（列の位置だけを持つ）
+として保存する。列は .npy なので読み込み時はメモリマップされ、必要な部分だけが読まれる。
+
+- load_timing_store(): 配列ビューで扱う API（列をそのまま返す）
+- load_timing_data(): 従来の JSON と同じ構造を返す（プロセス内で1回だけ読み込み、以降は共有）
+- save_timing_data(): JSON（互換用）とストアを書く
+
+JSON が後から編集された場合（ストアより新しい場合）はストアを使わず JSON を読む。
+NumPy が無い環境では JSON のみで動作する。
+
+使用例:
+    save_timing_data(phase_dir / "audio_timing.json", timing_data)
+
+    store = load_timing_store(phase_dir / "audio_timing.json")
+    for section in store.records:
+        chars, starts, ends = store.char_timings(section)
+
+    audio_timing = load_timing_data(phase_dir / "audio_timing.json")  # 読み取り専用
+"""
+
+import json
+import logging
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+# 形式を変更したら上げる
+STORE_VERSION = 1
+STORE_SUFFIX = ".timing"
+
+# 列に移す文字タイミングのキー → 列名
+CHAR_COLUMNS = {
+    "characters": "chars",
+    "char_start_times": "char_start",
+    "char_end_times": "char_end",
+}
+
+# 字幕（subtitles の各要素）で列に移すキー
+SUBTITLE_COLUMNS = ("start_time", "end_time")
+
+# JSON に戻すときの丸め（float32 の誤差を表に出さない）
+EXPORT_DECIMALS = 4
+
+logger = logging.getLogger(__name__)
+
+
+def store_path_for(json_path: Path) -> Path:
+    """JSON に対応するストアのディレクトリ"""
+    return Path(json_path).with_suffix(STORE_SUFFIX)
+
+
+def _source_stamp(path: Path) -> Dict[str, int]:
+    stat = path.stat()
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+# ========================================
+# 書き込み
+# ========================================
+
+class _Encoder:
+    """JSON 構造から列を取り出し、元の位置に参照（{"__col__": 列名, ...}）を残す"""
+
+    def __init__(self):
+        self.columns: Dict[str, list] = {
+            "chars": [], "char_start": [], "char_end": [],
+            "start_time": [], "end_time": [],
+        }
+
+    def encode(self, obj: Any) -> Any:
+        if isinstance(obj, list):
+            return [self.encode(item) for item in obj]
+        if not isinstance(obj, dict):
+            return obj
+
+        lengths = {len(obj[k]) for k in CHAR_COLUMNS if isinstance(obj.get(k), list)}
+        has_chars = all(isinstance(obj.get(k), list) for k in CHAR_COLUMNS) and len(lengths) == 1
+
+        encoded = {}
+        for key, value in obj.items():
+            if has_chars and key in CHAR_COLUMNS:
+                column = self.columns[CHAR_COLUMNS[key]]
+                encoded[key] = {"__col__": CHAR_COLUMNS[key], "slice": [len(column), len(column) + len(value)]}
+                column.extend(value)
+            elif key == "subtitles" and isinstance(value, list):
+                encoded[key] = [self._encode_subtitle(item) for item in value]
+            else:
+                encoded[key] = self.encode(value)
+        return encoded
+
+    def _encode_subtitle(self, item: Any) -> Any:
+        if not isinstance(item, dict):
+            return item
+        encoded = {}
+        for key, value in item.items():
+            if key in SUBTITLE_COLUMNS and isinstance(value, (int, float)):
+                column = self.columns[key]
+                encoded[key] = {"__col__": key, "index": len(column)}
+                column.append(value)
+            else:
+                encoded[key] = self.encode(value)
+        return encoded
+
+    def arrays(self) -> Dict[str, Any]:
+        arrays = {}
+        for name, values in self.columns.items():
+            if name == "chars":
+                arrays[name] = np.array([str(c) for c in values], dtype=str) if values else np.array([], dtype="<U1")
+            else:
+                arrays[name] = np.asarray(values, dtype=np.float32)
+        return arrays
+
+
+def write_timing_store(json_path: Path, data: Any) -> Optional[Path]:
+    """
+    JSON（保存済み）に対応するストアを書く
+
+    Args:
+        json_path: 保存済みの JSON のパス（更新時刻をストアに記録する）
+        data: JSON と同じ内容
+
+    Returns:
+        ストアのディレクトリ。NumPy が無い場合は None
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+
+    json_path = Path(json_path)
+    store_dir = store_path_for(json_path)
+    tmp_dir = store_dir.with_name(store_dir.name + ".tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+
+    encoder = _Encoder()
+    records = encoder.encode(data)
+    arrays = encoder.arrays()
+    for name, array in arrays.items():
+        np.save(tmp_dir / f"{name}.npy", array)
+
+    index = {
+        "version": STORE_VERSION,
+        "source": _source_stamp(json_path),
+        "columns": {name: str(array.dtype) for name, array in arrays.items()},
+        "records": records,
+    }
+    with open(tmp_dir / "index.json", "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False)
+
+    if store_dir.exists():
+        shutil.rmtree(store_dir)
+    tmp_dir.rename(store_dir)
+    return store_dir
+
+
+def save_timing_data(json_path: Path, data: Any) -> Path:
+    """
+    タイミングデータを JSON（互換用）とストアに保存
+
+    Args:
+        json_path: JSON の保存先
+        data: タイミングデータ
+
+    Returns:
+        JSON のパス
+    """
+    json_path = Path(json_path)
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+    try:
+        write_timing_store(json_path, data)
+    except Exception as e:
+        # ストアは高速化のためのもので、無くても JSON から読める
+        logger.warning(f"Failed to write timing store for {json_path}: {e}")
+        shutil.rmtree(store_path_for(json_path), ignore_errors=True)
+
+    return json_path
+
+
+# ========================================
+# 読み込み
+# ========================================
+
+class TimingStore:
+    """メモリマップした列と、列の位置を持つ元の構造"""
+
+    def __init__(self, store_dir: Path, index: Dict[str, Any], columns: Dict[str, Any]):
+        self.store_dir = store_dir
+        self.source = index.get("source")
+        self.records = index["records"]
+        self.columns = columns
+        self.stamp = None
+
+    @classmethod
+    def open(cls, store_dir: Path) -> "TimingStore":
+        with open(store_dir / "index.json", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported timing store version: {index.get('version')}")
+        columns = {
+            name: np.load(store_dir / f"{name}.npy", mmap_mode="r")
+            for name in index["columns"]
+        }
+        return cls(store_dir, index, columns)
+
+    def _column(self, ref: Dict[str, Any]):
+        column = self.columns[ref["__col__"]]
+        if "slice" in ref:
+            start, end = ref["slice"]
+            return column[start:end]
+        return column[ref["index"]]
+
+    def char_timings(self, part: Dict[str, Any]) -> Optional[Tuple[Any, Any, Any]]:
+        """
+        セクション（または title_timing / narration_timing）の文字タイミング
+
+        Returns:
+            (文字, 開始時刻, 終了時刻) の配列ビュー。文字タイミングが無い場合は None
+        """
+        refs = [part.get(key) for key in CHAR_COLUMNS]
+        if not all(isinstance(ref, dict) and "__col__" in ref for ref in refs):
+            return None
+        return tuple(self._column(ref) for ref in refs)
+
+    def subtitle_times(self) -> Tuple[Any, Any]:
+        """字幕の (開始時刻, 終了時刻) 列（subtitle_timing のみ）"""
+        return self.columns["start_time"], self.columns["end_time"]
+
+    def to_data(self) -> Any:
+        """JSON と同じ構造に戻す"""
+        return self._decode(self.records)
+
+    def _decode(self, obj: Any) -> Any:
+        if isinstance(obj, list):
+            return [self._decode(item) for item in obj]
+        if not isinstance(obj, dict):
+            return obj
+        if "__col__" in obj:
+            value = self._column(obj)
+            if obj["__col__"] == "chars":
+                return value.tolist()
+            if "slice" in obj:
+                return np.round(value.astype(np.float64), EXPORT_DECIMALS).tolist()
+            return round(float(value), EXPORT_DECIMALS)
+        return {key: self._decode(value) for key, value in obj.items()}
+
+
+_cache_lock = threading.Lock()
+_store_cache: Dict[Path, Tuple[Any, TimingStore]] = {}
+_data_cache: Dict[Path, Tuple[Any, Any]] = {}
+
+
+def load_timing_store(json_path: Path) -> Optional[TimingStore]:
+    """
+    JSON に対応するストアを開く（プロセス内でキャッシュ）
+
+    Returns:
+        TimingStore。NumPy が無い・ストアが無い・JSON の方が新しい場合は None
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+
+    json_path = Path(json_path).resolve()
+    store_dir = store_path_for(json_path)
+    index_path = store_dir / "index.json"
+    if not index_path.exists():
+        return None
+
+    stamp = (
+        _source_stamp(json_path) if json_path.exists() else None,
+        _source_stamp(index_path),
+    )
+    with _cache_lock:
+        cached = _store_cache.get(json_path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+    try:
+        store = TimingStore.open(store_dir)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable timing store {store_dir}: {e}")
+        return None
+
+    # JSON が後から書き換えられていればストアは使わない
+    if stamp[0] is not None and store.source != stamp[0]:
+        logger.info(f"Timing store is older than {json_path.name}, using JSON")
+        return None
+
+    store.stamp = stamp
+    with _cache_lock:
+        _store_cache[json_path] = (stamp, store)
+    return store
+
+
+def load_timing_data(json_path: Path) -> Any:
+    """
+    タイミングデータを読み込む（プロセス内で1回だけ。返り値は共有なので変更しないこと）
+
+    ストアがあればそこから、無ければ JSON から読む。
+
+    Raises:
+        FileNotFoundError: JSON もストアも無い場合
+    """
+    json_path = Path(json_path).resolve()
+    store = load_timing_store(json_path)
+    if store is None and not json_path.exists():
+        raise FileNotFoundError(f"Timing data not found: {json_path}")
+
+    stamp = ("store", store.stamp) if store is not None else ("json", _source_stamp(json_path))
+    with _cache_lock:
+        cached = _data_cache.get(json_path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+    if store is not None:
+        data = store.to_data()
+    else:
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+    with _cache_lock:
+        _data_cache[json_path] = (stamp, data)
+    return data
+
+
+def clear_timing_cache():
+    """読み込みキャッシュをクリア（テスト・ベンチマーク用）"""
+    with _cache_lock:
+        _store_cache.clear()
+        _data_cache.clear()
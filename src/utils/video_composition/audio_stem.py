@@ -0,0 +1,280 @@
+"""
+音声ステム（ナレーション + BGM + 効果音のプリミックス）
+
+BGMミックスのフィルタグラフを映像エンコードから切り離し、
+1本のAACステムとして事前に描画する。
+
+- 入力ファイルと音量設定のハッシュをキーにキャッシュ
+  （映像だけを作り直す場合はミックスを再計算しない）
+- 最終合成ではステムを stream copy で多重化するだけ
+"""
+
+import hashlib
+import json
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# ステムの形式・ミックス処理を変更したら上げる
+AUDIO_STEM_VERSION = 1
+
+# 音声コーデック設定（最終動画と同一にして stream copy できるようにする）
+STEM_CODEC_ARGS = ['-c:a', 'aac', '-b:a', '192k', '-ar', '48000']
+
+
+class AudioStemRenderer:
+    """
+    音声ステムの描画とキャッシュ
+
+    使用例:
+        renderer = AudioStemRenderer(project_root, logger, bgm_processor, cache_dir)
+        stem_path = renderer.render(audio_path, bgm_data)
+    """
+
+    def __init__(
+        self,
+        project_root: Path,
+        logger,
+        bgm_processor,
+        cache_dir: Optional[Path] = None
+    ):
+        """
+        Args:
+            project_root: プロジェクトのルートパス
+            logger: ロガー
+            bgm_processor: BGMProcessorインスタンス
+            cache_dir: ステムの保存先（Noneの場合はキャッシュしない）
+        """
+        self.project_root = project_root
+        self.logger = logger
+        self.bgm_processor = bgm_processor
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
+        # (path, size, mtime) → 内容ハッシュ
+        self._file_hashes: Dict[tuple, str] = {}
+        self._lock = threading.Lock()
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # ----------------------------------------
+    # キャッシュキー
+    # ----------------------------------------
+
+    def _resolve(self, file_path) -> Path:
+        path = Path(file_path)
+        if not path.is_absolute():
+            path = self.project_root / path
+        return path
+
+    def _file_hash(self, path: Path) -> str:
+        """ファイル内容のハッシュ（サイズ・更新時刻が同じ間は再計算しない）"""
+        if not path.exists():
+            return "missing"
+
+        stat = path.stat()
+        memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._file_hashes.get(memo_key)
+        if cached:
+            return cached
+
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        value = digest.hexdigest()
+
+        with self._lock:
+            self._file_hashes[memo_key] = value
+        return value
+
+    def compute_key(
+        self,
+        audio_path: Path,
+        bgm_data: Optional[dict] = None,
+        sfx_inputs: Optional[List[dict]] = None,
+        title_segments: Optional[List[dict]] = None,
+        bgm_volume_multiplier: float = 1.0
+    ) -> str:
+        """
+        ステムのキャッシュキーを計算
+
+        ナレーション・BGM・効果音ファイルの内容と、
+        タイミング・音量・フェード設定をすべて含める。
+        """
+        bgm_segments = []
+        for segment in (bgm_data or {}).get('segments', []):
+            file_path = segment.get('file_path')
+            bgm_segments.append({
+                'file': self._file_hash(self._resolve(file_path)) if file_path else None,
+                'start_time': segment.get('start_time', 0),
+                'duration': segment.get('duration', 0),
+                'volume': segment.get('volume', 0.13),
+                'fade_in': segment.get('fade_in', self.bgm_processor.bgm_fade_in),
+                'fade_out': segment.get('fade_out', self.bgm_processor.bgm_fade_out),
+            })
+
+        sfx = [
+            {
+                'file': self._file_hash(self._resolve(item['file'])),
+                'start_time': item.get('start_time'),
+                'volume': item.get('volume'),
+                'fade_in': item.get('fade_in'),
+                'fade_out': item.get('fade_out'),
+            }
+            for item in (sfx_inputs or [])
+        ]
+
+        payload = {
+            'version': AUDIO_STEM_VERSION,
+            'codec': STEM_CODEC_ARGS,
+            'narration': self._file_hash(Path(audio_path)),
+            'bgm': bgm_segments,
+            'sfx': sfx,
+            'titles': [
+                {'start': seg.get('start'), 'end': seg.get('end')}
+                for seg in (title_segments or [])
+            ],
+            'bgm_volume_multiplier': bgm_volume_multiplier,
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        return hashlib.sha1(encoded).hexdigest()
+
+    # ----------------------------------------
+    # 描画
+    # ----------------------------------------
+
+    def build_command(
+        self,
+        audio_path: Path,
+        output_path: Path,
+        audio_duration: float,
+        bgm_data: Optional[dict] = None,
+        sfx_inputs: Optional[List[dict]] = None,
+        title_segments: Optional[List[dict]] = None,
+        bgm_volume_multiplier: float = 1.0
+    ) -> List[str]:
+        """
+        ステム描画用のffmpegコマンドを構築
+
+        効果音・タイトル区間の音量調整がある場合は
+        create_bgm_filter_for_background() と同じグラフ、
+        ない場合は build_audio_filter() と同じグラフを使う。
+        """
+        cmd = ['ffmpeg', '-y', '-i', str(audio_path)]
+        bgm_segments = (bgm_data or {}).get('segments', [])
+        use_background_graph = bool(sfx_inputs) or (
+            bool(title_segments) and bgm_volume_multiplier != 1.0
+        )
+
+        if use_background_graph:
+            # BGMはユニークなファイルごとに1入力、その後に効果音
+            seen_files = set()
+            for segment in bgm_segments:
+                file_path = segment.get('file_path')
+                if file_path and file_path not in seen_files:
+                    cmd.extend(['-i', str(self._resolve(file_path))])
+                    seen_files.add(file_path)
+            seen_sfx = set()
+            for sfx in sfx_inputs or []:
+                if str(sfx['file']) not in seen_sfx:
+                    cmd.extend(['-i', str(sfx['file'])])
+                    seen_sfx.add(str(sfx['file']))
+
+            audio_filter, _ = self.bgm_processor.create_bgm_filter_for_background(
+                bgm_data or {},
+                audio_path,
+                sfx_inputs=sfx_inputs,
+                title_segments=title_segments,
+                bgm_volume_multiplier=bgm_volume_multiplier,
+                narration_input=0
+            )
+            if audio_filter:
+                cmd.extend(['-filter_complex', audio_filter.lstrip(';'), '-map', '[audio]'])
+            else:
+                cmd.extend(['-map', '0:a'])
+        else:
+            # BGMはセグメントごとに1入力
+            for segment in bgm_segments:
+                file_path = segment.get('file_path')
+                if file_path and Path(file_path).exists():
+                    cmd.extend(['-i', str(Path(file_path))])
+
+            if bgm_segments:
+                audio_filter = self.bgm_processor.build_audio_filter(
+                    bgm_segments,
+                    narration_input=0,
+                    bgm_input_start=1
+                )
+                cmd.extend(['-filter_complex', audio_filter, '-map', '[audio]'])
+            else:
+                cmd.extend(['-map', '0:a'])
+
+        cmd.extend(['-vn', *STEM_CODEC_ARGS, '-t', f"{audio_duration:.3f}", str(output_path)])
+        return cmd
+
+    def render(
+        self,
+        audio_path: Path,
+        bgm_data: Optional[dict] = None,
+        sfx_inputs: Optional[List[dict]] = None,
+        title_segments: Optional[List[dict]] = None,
+        bgm_volume_multiplier: float = 1.0,
+        output_dir: Optional[Path] = None
+    ) -> Path:
+        """
+        ステムを描画（キャッシュにあれば再利用）
+
+        Args:
+            audio_path: ナレーション音声
+            bgm_data: BGMデータ
+            sfx_inputs: 効果音の入力情報リスト
+            title_segments: セクションタイトル区間のリスト
+            bgm_volume_multiplier: タイトル区間でのBGM音量倍率
+            output_dir: キャッシュ無効時の出力先
+
+        Returns:
+            ステム（.m4a）のパス
+        """
+        key = self.compute_key(
+            audio_path, bgm_data, sfx_inputs, title_segments, bgm_volume_multiplier
+        )
+        target_dir = self.cache_dir or output_dir or Path(audio_path).parent
+        stem_path = target_dir / f"audio_stem_{key[:16]}.m4a"
+
+        if stem_path.exists() and stem_path.stat().st_size > 0:
+            self.logger.info(f"🎧 Reusing cached audio stem: {stem_path.name}")
+            return stem_path
+
+        audio_duration = self.bgm_processor.get_audio_duration(audio_path)
+        tmp_path = stem_path.with_name(stem_path.stem + ".tmp.m4a")
+        cmd = self.build_command(
+            audio_path=audio_path,
+            output_path=tmp_path,
+            audio_duration=audio_duration,
+            bgm_data=bgm_data,
+            sfx_inputs=sfx_inputs,
+            title_segments=title_segments,
+            bgm_volume_multiplier=bgm_volume_multiplier
+        )
+
+        self.logger.info(f"🎧 Rendering audio stem ({audio_duration:.1f}s)...")
+        try:
+            subprocess.run(
+                cmd,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                stdin=subprocess.DEVNULL,
+                text=True
+            )
+        except subprocess.CalledProcessError as e:
+            tmp_path.unlink(missing_ok=True)
+            self.logger.error(f"Audio stem render failed: {(e.stderr or '')[-500:]}")
+            raise
+
+        tmp_path.replace(stem_path)
+        self.logger.info(f"✓ Audio stem ready: {stem_path.name}")
+        return stem_path
@@ -0,0 +1,415 @@
+"""
+背景動画メザニンライブラリ
+
+assets/background_videos/{opening,main,ending} の各クリップを
+合成用の正規化済み中間ファイル（メザニン）に一度だけ変換しておく。
+
+- 1920x864 にクロップ、トラックごとの再生速度を適用済み
+- 固定GOP・同一コーデック設定（concat demuxer でそのまま連結できる）
+- 長さの一覧を index.json に保存
+
+実行時は inpoint/outpoint 付きの concat エントリを並べるだけで
+任意の長さの背景トラックを組み立てられ、再エンコードが不要になる。
+"""
+
+import json
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..telemetry import submit_in_context
+
+# メザニンの形式・エンコード設定を変更したら上げる
+MEZZANINE_VERSION = 1
+
+MEZZANINE_WIDTH = 1920
+MEZZANINE_HEIGHT = 864
+MEZZANINE_FPS = 30
+# キーフレーム間隔（フレーム）。inpoint はこの倍数に丸める
+MEZZANINE_GOP = 30
+
+MEZZANINE_DIRNAME = ".mezzanine"
+INDEX_FILENAME = "index.json"
+
+TRACK_IDS = ("opening", "main", "ending")
+
+# トラックごとの再生速度（config/phases/background_video.yaml の categories.*.speed）
+DEFAULT_TRACK_SPEEDS = {
+    "opening": 0.5,
+    "main": 0.5,
+    "ending": 1.0,
+}
+
+
+def mezzanine_codec_args(preset: str = "medium", crf: int = 20) -> List[str]:
+    """全メザニン共通のエンコード設定"""
+    return [
+        '-c:v', 'libx264',
+        '-preset', preset,
+        '-crf', str(crf),
+        '-pix_fmt', 'yuv420p',
+        '-r', str(MEZZANINE_FPS),
+        '-g', str(MEZZANINE_GOP),
+        '-keyint_min', str(MEZZANINE_GOP),
+        '-sc_threshold', '0',
+        '-flags', '+cgop',
+        '-video_track_timescale', str(MEZZANINE_FPS * 512),
+        '-an',
+    ]
+
+
+class MezzanineLibrary:
+    """
+    背景動画メザニンライブラリ
+
+    使用例:
+        library = MezzanineLibrary(Path("assets/background_videos"), logger)
+        library.prepare()                                  # 一度だけ実行
+        lines = library.concat_entries(video_path, 95.0)   # 実行時は concat エントリを生成
+    """
+
+    def __init__(
+        self,
+        library_root: Path,
+        logger,
+        track_speeds: Optional[Dict[str, float]] = None,
+        preset: str = "medium",
+        crf: int = 20
+    ):
+        """
+        Args:
+            library_root: 背景動画ライブラリのルート（assets/background_videos）
+            logger: ロガー
+            track_speeds: トラックごとの再生速度
+            preset: メザニンのエンコードプリセット
+            crf: メザニンのCRF
+        """
+        self.library_root = Path(library_root)
+        self.logger = logger
+        self.track_speeds = {**DEFAULT_TRACK_SPEEDS, **(track_speeds or {})}
+        self.preset = preset
+        self.crf = crf
+
+        self.mezzanine_dir = self.library_root / MEZZANINE_DIRNAME
+        self.index_path = self.mezzanine_dir / INDEX_FILENAME
+        self._index: Optional[Dict] = None
+        self._lock = threading.Lock()
+
+    # ----------------------------------------
+    # インデックス
+    # ----------------------------------------
+
+    def _settings(self) -> Dict:
+        """インデックスの有効性判定に使う設定"""
+        return {
+            'version': MEZZANINE_VERSION,
+            'size': [MEZZANINE_WIDTH, MEZZANINE_HEIGHT],
+            'fps': MEZZANINE_FPS,
+            'gop': MEZZANINE_GOP,
+            'codec': mezzanine_codec_args(self.preset, self.crf),
+        }
+
+    def load_index(self) -> Dict:
+        """index.json を読み込み（設定が異なる場合は空として扱う）"""
+        if self._index is not None:
+            return self._index
+
+        index = {'settings': self._settings(), 'clips': {}}
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('settings') == self._settings():
+                    index = data
+                else:
+                    self.logger.info("Mezzanine settings changed, index will be rebuilt")
+            except Exception as e:
+                self.logger.warning(f"Failed to read mezzanine index: {e}")
+
+        self._index = index
+        return index
+
+    def save_index(self):
+        """index.json を保存"""
+        index = self.load_index()
+        self.mezzanine_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(self.index_path)
+
+    def _source_key(self, source: Path) -> str:
+        try:
+            return source.resolve().relative_to(self.library_root.resolve()).as_posix()
+        except ValueError:
+            return source.resolve().as_posix()
+
+    def _is_fresh(self, entry: Dict, source: Path) -> bool:
+        if not source.exists():
+            return False
+        stat = source.stat()
+        mezzanine = self.mezzanine_dir / entry.get('mezzanine', '')
+        return (
+            entry.get('source_size') == stat.st_size
+            and entry.get('source_mtime') == int(stat.st_mtime)
+            and mezzanine.exists()
+        )
+
+    def lookup(self, source: Path, track_id: Optional[str] = None) -> Optional[Dict]:
+        """
+        元クリップに対応するメザニン情報を取得
+
+        Args:
+            source: 元クリップのパス
+            track_id: トラックID（指定時は速度設定の一致も確認）
+
+        Returns:
+            {'path': Path, 'duration': float, 'track_id': str}（未準備・古い場合は None）
+        """
+        index = self.load_index()
+        entry = index['clips'].get(self._source_key(Path(source)))
+        if not entry or not self._is_fresh(entry, Path(source)):
+            return None
+        if track_id and entry.get('speed') != self.track_speeds.get(track_id, 1.0):
+            return None
+        return {
+            'path': self.mezzanine_dir / entry['mezzanine'],
+            'duration': entry['duration'],
+            'track_id': entry['track_id'],
+        }
+
+    # ----------------------------------------
+    # ライブラリ準備
+    # ----------------------------------------
+
+    def build_command(self, source: Path, output_path: Path, speed: float) -> List[str]:
+        """メザニン生成用のffmpegコマンド"""
+        # BackgroundVideoProcessor.process_segment() と同じ見た目（1920x1080 → 上部 864px）
+        vf = (
+            f"scale={MEZZANINE_WIDTH}:1080,"
+            f"crop={MEZZANINE_WIDTH}:{MEZZANINE_HEIGHT}:0:0,"
+            f"setpts=(PTS-STARTPTS)/{speed},"
+            f"fps={MEZZANINE_FPS}"
+        )
+        return [
+            'ffmpeg', '-y',
+            '-i', str(source),
+            '-vf', vf,
+            *mezzanine_codec_args(self.preset, self.crf),
+            '-movflags', '+faststart',
+            str(output_path)
+        ]
+
+    def probe_duration(self, video_path: Path) -> float:
+        """ffprobe で動画の長さを取得"""
+        cmd = [
+            'ffprobe', '-v', 'error',
+            '-show_entries', 'format=duration',
+            '-of', 'json',
+            str(video_path)
+        ]
+        result = subprocess.run(
+            cmd,
+            check=True,
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            errors='replace'
+        )
+        return float(json.loads(result.stdout)['format']['duration'])
+
+    def discover_sources(self) -> List[tuple]:
+        """ライブラリ内の元クリップ一覧 [(track_id, path), ...]"""
+        sources = []
+        for track_id in TRACK_IDS:
+            track_dir = self.library_root / track_id
+            if not track_dir.exists():
+                continue
+            for video_path in sorted(track_dir.glob('*.mp4')):
+                if video_path.name.endswith('.tmp.mp4'):
+                    continue
+                sources.append((track_id, video_path))
+        return sources
+
+    def _prepare_one(self, track_id: str, source: Path) -> Dict:
+        speed = self.track_speeds.get(track_id, 1.0)
+        key = self._source_key(source)
+        mezzanine_name = f"{track_id}/{source.stem}.mp4"
+        output_path = self.mezzanine_dir / mezzanine_name
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output_path.with_name(f"{output_path.stem}.tmp.mp4")
+
+        cmd = self.build_command(source, tmp_path, speed)
+        try:
+            subprocess.run(
+                cmd,
+                check=True,
+                capture_output=True,
+                text=True,
+                encoding='utf-8',
+                errors='replace'
+            )
+        except subprocess.CalledProcessError as e:
+            tmp_path.unlink(missing_ok=True)
+            raise RuntimeError(f"ffmpeg failed for {source.name}: {(e.stderr or '')[-500:]}")
+        tmp_path.replace(output_path)
+
+        stat = source.stat()
+        entry = {
+            'mezzanine': mezzanine_name,
+            'track_id': track_id,
+            'speed': speed,
+            'duration': self.probe_duration(output_path),
+            'source_size': stat.st_size,
+            'source_mtime': int(stat.st_mtime),
+        }
+        with self._lock:
+            self.load_index()['clips'][key] = entry
+        return entry
+
+    def prepare(self, force: bool = False, max_workers: int = 2) -> Dict[str, int]:
+        """
+        ライブラリ全体のメザニンを生成（未生成・元ファイル更新分のみ）
+
+        Args:
+            force: 既存のメザニンも作り直す
+            max_workers: 並列エンコード数
+
+        Returns:
+            {'prepared', 'skipped', 'failed'} の件数
+        """
+        index = self.load_index()
+        pending = []
+        skipped = 0
+        for track_id, source in self.discover_sources():
+            entry = index['clips'].get(self._source_key(source))
+            if (
+                not force
+                and entry
+                and self._is_fresh(entry, source)
+                and entry.get('speed') == self.track_speeds.get(track_id, 1.0)
+            ):
+                skipped += 1
+                continue
+            pending.append((track_id, source))
+
+        prepared = 0
+        failed = 0
+        if pending:
+            self.logger.info(f"Preparing {len(pending)} background mezzanines...")
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                futures = {
+                    submit_in_context(executor, self._prepare_one, track_id, source): source
+                    for track_id, source in pending
+                }
+                for future, source in futures.items():
+                    try:
+                        entry = future.result()
+                        prepared += 1
+                        self.logger.info(
+                            f"  ✓ {source.name} → {entry['mezzanine']} ({entry['duration']:.1f}s)"
+                        )
+                    except Exception as e:
+                        failed += 1
+                        self.logger.error(f"  ✗ {source.name}: {e}")
+
+        # 元ファイルが消えたエントリを除去
+        existing = {self._source_key(source) for _, source in self.discover_sources()}
+        for key in list(index['clips']):
+            if key not in existing:
+                del index['clips'][key]
+
+        self.save_index()
+        return {'prepared': prepared, 'skipped': skipped, 'failed': failed}
+
+    # ----------------------------------------
+    # 実行時の組み立て
+    # ----------------------------------------
+
+    def concat_entries(
+        self,
+        source: Path,
+        duration: float,
+        track_id: Optional[str] = None,
+        start: float = 0.0
+    ) -> Optional[List[str]]:
+        """
+        必要な長さの背景トラックを concat demuxer エントリで表現
+
+        メザニンを必要回数だけ繰り返し、最後の1回を outpoint で切り詰める。
+        開始位置はキーフレーム境界に丸めるため、stream copy でも頭が欠けない。
+
+        Args:
+            source: 元クリップのパス
+            duration: 必要な長さ（秒）
+            track_id: トラックID
+            start: クリップ内の開始位置（秒）
+
+        Returns:
+            concatファイルの行リスト（メザニン未準備の場合は None）
+        """
+        info = self.lookup(source, track_id)
+        if info is None or info['duration'] <= 0:
+            return None
+
+        clip_duration = info['duration']
+        gop_seconds = MEZZANINE_GOP / MEZZANINE_FPS
+        inpoint = int((start % clip_duration) / gop_seconds) * gop_seconds
+        path_str = str(info['path'].resolve()).replace('\\', '/').replace("'", "'\\''")
+
+        lines = []
+        remaining = duration
+        current_in = inpoint
+        while remaining > 1e-6:
+            available = clip_duration - current_in
+            lines.append(f"file '{path_str}'")
+            if current_in > 0:
+                lines.append(f"inpoint {current_in:.6f}")
+            if remaining < available:
+                lines.append(f"outpoint {current_in + remaining:.6f}")
+                remaining = 0.0
+            else:
+                remaining -= available
+            current_in = 0.0
+
+        return lines
+
+
+def load_mezzanine_library(project_root: Path, logger) -> Optional[MezzanineLibrary]:
+    """
+    config/phases/background_video.yaml からメザニンライブラリを構築
+
+    Returns:
+        MezzanineLibrary（mezzanine.enabled が false の場合は None）
+    """
+    import yaml
+
+    config_path = Path(project_root) / "config" / "phases" / "background_video.yaml"
+    bg_config = {}
+    if config_path.exists():
+        with open(config_path, 'r', encoding='utf-8') as f:
+            bg_config = yaml.safe_load(f) or {}
+
+    mezzanine_config = bg_config.get("mezzanine", {}) or {}
+    if not mezzanine_config.get("enabled", True):
+        return None
+
+    library_root = Path(bg_config.get("background_video_library_path", "assets/background_videos"))
+    if not library_root.is_absolute():
+        library_root = Path(project_root) / library_root
+
+    track_speeds = {
+        track_id: category.get("speed")
+        for track_id, category in (bg_config.get("categories", {}) or {}).items()
+        if isinstance(category, dict) and category.get("speed")
+    }
+
+    return MezzanineLibrary(
+        library_root,
+        logger,
+        track_speeds=track_speeds,
+        preset=mezzanine_config.get("preset", "medium"),
+        crf=mezzanine_config.get("crf", 20)
+    )
@@ -4,6 +4,8 @@ import subprocess
 from pathlib import Path
 from typing import List, Dict, Optional
 
+from ..encoder_profile import ROLE_DEFAULTS, EncodeSettings
+
 
 class BackgroundVideoProcessor:
     """
@@ -13,16 +15,27 @@ class BackgroundVideoProcessor:
     - concatファイル作成
     - 動画の長さ取得
     - セグメント処理（リサイズ、速度調整、ループ、トリミング）
+    - メザニンライブラリがあれば再エンコードせずに concat エントリで組み立て
     """
     
-    def __init__(self, project_root: Path, logger):
+    def __init__(
+        self,
+        project_root: Path,
+        logger,
+        mezzanine_library=None,
+        encode_settings: Optional[EncodeSettings] = None
+    ):
         """
         Args:
             project_root: プロジェクトのルートパス
             logger: ロガー
+            mezzanine_library: MezzanineLibraryインスタンス（Noneの場合は毎回エンコード）
+            encode_settings: セグメント加工のエンコード設定（省略時は ultrafast / crf 28）
         """
         self.project_root = project_root
         self.logger = logger
+        self.mezzanine_library = mezzanine_library
+        self.encode_settings = encode_settings or ROLE_DEFAULTS["background"]
     
     def create_concat_file(
         self, 
@@ -53,6 +66,8 @@ class BackgroundVideoProcessor:
         """
         concat_file = output_dir / "bg_concat.txt"
         temp_files = []
+        concat_lines = []
+        mezzanine_hits = 0
         
         self.logger.info(
             f"Creating background video concat file for {len(segments)} segments..."
@@ -70,6 +85,17 @@ class BackgroundVideoProcessor:
             
             duration = seg['duration']
             track_id = seg.get('track_id', '')
+
+            # メザニンがあれば stream copy 用のエントリを並べるだけ
+            if self.mezzanine_library is not None:
+                entries = self.mezzanine_library.concat_entries(
+                    video_path, duration, track_id=track_id
+                )
+                if entries:
+                    concat_lines.extend(entries)
+                    mezzanine_hits += 1
+                    continue
+
             temp_file = output_dir / f"bg_temp_{i}_{track_id}.mp4"
             
             # セグメント処理
@@ -81,6 +107,9 @@ class BackgroundVideoProcessor:
                     output_path=temp_file
                 )
                 temp_files.append(temp_file)
+                # Windowsパス対応
+                temp_path_str = str(temp_file).replace('\\', '/')
+                concat_lines.append(f"file '{temp_path_str}'")
             except Exception as e:
                 self.logger.error(
                     f"Failed to process background video {video_path.name}: {e}"
@@ -88,18 +117,15 @@ class BackgroundVideoProcessor:
                 continue
         
         # concatファイル作成
-        if not temp_files:
+        if not concat_lines:
             raise RuntimeError("No background videos were successfully processed")
         
         with open(concat_file, 'w', encoding='utf-8') as f:
-            for temp_file in temp_files:
-                # Windowsパス対応
-                temp_path_str = str(temp_file).replace('\\', '/')
-                f.write(f"file '{temp_path_str}'\n")
+            f.write('\n'.join(concat_lines) + '\n')
         
         self.logger.info(
             f"Background concat file created: {concat_file} "
-            f"({len(temp_files)} segments)"
+            f"({len(temp_files) + mezzanine_hits} segments, {mezzanine_hits} from mezzanine)"
         )
         
         return concat_file
@@ -182,8 +208,7 @@ class BackgroundVideoProcessor:
             '-i', str(video_path),
             '-vf', vf,
             '-c:v', 'libx264',
-            '-preset', 'ultrafast',
-            '-crf', '28',
+            *self.encode_settings.video_args(),
             '-an',
             '-y', str(output_path)
         ]
@@ -5,10 +5,12 @@
 """
 
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional
 
 from ...core.config_manager import ConfigManager
+from ..telemetry import submit_in_context
 
 
 class BackgroundVideoComposer:
@@ -49,12 +51,20 @@ class BackgroundVideoComposer:
         self.phase_config = phase_config or {}
 
         # 依存する他のプロセッサ
+        from .background_mezzanine import load_mezzanine_library
+        from ..encoder_profile import EncodeSettings, resolve_encode_settings
         from .background_processor import BackgroundVideoProcessor
         from .bgm_processor import BGMProcessor
 
+        # 最終動画のエンコード設定（ホストのエンコーダープロファイルがあればその値）
+        self.final_encode = resolve_encode_settings(config, "final", EncodeSettings(encode_preset, 23), logger)
+        self.encode_preset = self.final_encode.preset
+
         self.bg_processor = BackgroundVideoProcessor(
             config.project_root,
-            logger
+            logger,
+            mezzanine_library=load_mezzanine_library(config.project_root, logger),
+            encode_settings=resolve_encode_settings(config, "background", logger=logger)
         )
 
         bgm_fade_in = 3.0
@@ -66,6 +76,25 @@ class BackgroundVideoComposer:
             bgm_fade_out=bgm_fade_out
         )
 
+        # 音声ステム（ナレーション + BGM + 効果音のプリミックス）
+        stem_config = self.phase_config.get("performance", {}).get("audio_stem", {}) or {}
+        self.audio_stem_renderer = None
+        if stem_config.get("enabled", True):
+            from .audio_stem import AudioStemRenderer
+
+            stem_cache_dir = None
+            if stem_config.get("cache", True):
+                try:
+                    stem_cache_dir = config.get_path("cache_dir") / "audio_stems"
+                except Exception:
+                    stem_cache_dir = None
+            self.audio_stem_renderer = AudioStemRenderer(
+                config.project_root,
+                logger,
+                self.bgm_processor,
+                cache_dir=stem_cache_dir
+            )
+
     def compose_with_background(
         self,
         audio_path: Path,
@@ -195,14 +224,50 @@ class BackgroundVideoComposer:
         audio_duration = self.bgm_processor.get_audio_duration(audio_path)
         self.logger.info(f"Audio duration: {audio_duration:.2f} seconds")
 
-        # 1. 背景動画をconcatファイルとして準備
-        self.logger.info(f"Creating background video concat file for {len(background_videos)} segments...")
-        bg_concat_file = self._create_background_concat_file(background_videos)
-        self.logger.info(f"✓ Background video concat file created")
+        # 効果音（セクションタイトル）
+        if title_segments is None:
+            title_segments = []
+
+        section_title_config = self.phase_config.get('section_title', {})
+        sfx_inputs = self._build_sfx_inputs(title_segments)
+        bgm_volume_multiplier = section_title_config.get('bgm_volume_multiplier', 0.7)
+
+        # 音声ステムは背景動画の事前処理と並行して描画
+        stem_executor = None
+        stem_future = None
+        if self.audio_stem_renderer is not None:
+            stem_executor = ThreadPoolExecutor(max_workers=1)
+            stem_future = submit_in_context(
+                stem_executor,
+                self.audio_stem_renderer.render,
+                audio_path,
+                bgm_data,
+                sfx_inputs=sfx_inputs,
+                title_segments=title_segments,
+                bgm_volume_multiplier=bgm_volume_multiplier,
+                output_dir=self.phase_dir
+            )
 
-        # 2. 画像concatファイル作成
-        image_concat_file = self._create_image_concat_file(images, audio_duration)
-        self.logger.info(f"Image concat file created: {image_concat_file}")
+        try:
+            # 1. 背景動画をconcatファイルとして準備
+            self.logger.info(f"Creating background video concat file for {len(background_videos)} segments...")
+            bg_concat_file = self._create_background_concat_file(background_videos)
+            self.logger.info(f"✓ Background video concat file created")
+
+            # 2. 画像concatファイル作成
+            image_concat_file = self._create_image_concat_file(images, audio_duration)
+            self.logger.info(f"Image concat file created: {image_concat_file}")
+
+            # 音声ステム（キャッシュ済みならミックスを省略して stream copy）
+            audio_stem_path = None
+            if stem_future is not None:
+                try:
+                    audio_stem_path = stem_future.result()
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Audio stem unavailable, mixing BGM inline: {e}")
+        finally:
+            if stem_executor is not None:
+                stem_executor.shutdown(wait=True)
 
         # 3. ffmpegコマンド（シンプル版）
         cmd = [
@@ -215,13 +280,13 @@ class BackgroundVideoComposer:
             '-f', 'concat',
             '-safe', '0',
             '-i', str(image_concat_file),  # [1] 画像
-            # 音声
-            '-i', str(audio_path),  # [2] 音声
+            # 音声（ステムがあればそれを使う）
+            '-i', str(audio_stem_path or audio_path),  # [2] 音声
         ]
 
         # BGMファイルを追加
         bgm_input_start_index = 3
-        if bgm_data:
+        if bgm_data and audio_stem_path is None:
             seen_files = set()
             for segment in bgm_data.get('segments', []):
                 file_path = segment.get('file_path')
@@ -236,46 +301,20 @@ class BackgroundVideoComposer:
             self.logger.info(f"Added {len(seen_files)} BGM files")
 
         # 効果音ファイルを追加
-        sfx_inputs = []
-        if title_segments is None:
-            title_segments = []
-
-        section_title_config = self.phase_config.get('section_title', {})
-        sfx_config = section_title_config.get('sound_effect', {})
+        if sfx_inputs and audio_stem_path is None:
+            seen_sfx_files = set()
+            for sfx in sfx_inputs:
+                if str(sfx['file']) not in seen_sfx_files:
+                    cmd.extend(['-i', str(sfx['file'])])
+                    seen_sfx_files.add(str(sfx['file']))
 
-        if sfx_config.get('enabled', True) and title_segments:
-            sfx_path = self.config.project_root / sfx_config.get('file', 'assets/sfx/impact_title.mp3')
-
-            if sfx_path.exists():
-                original_volume = sfx_config.get('volume', 0.5)
-                debug_volume = 1.0  # デバッグ用に音量を上げる
-
-                for seg in title_segments:
-                    sfx_inputs.append({
-                        'file': sfx_path,
-                        'start_time': seg['start'],
-                        'volume': debug_volume,
-                        'fade_in': sfx_config.get('fade_in', 0.05),
-                        'fade_out': sfx_config.get('fade_out', 0.1)
-                    })
-
-                # 効果音ファイルを入力として追加（重複なし）
-                seen_sfx_files = set()
-                for sfx in sfx_inputs:
-                    if str(sfx['file']) not in seen_sfx_files:
-                        cmd.extend(['-i', str(sfx['file'])])
-                        seen_sfx_files.add(str(sfx['file']))
-
-                self.logger.info(f"🔊 Added {len(sfx_inputs)} sound effects")
-            else:
-                self.logger.warning(f"Sound effect file not found: {sfx_path}")
+            self.logger.info(f"🔊 Added {len(sfx_inputs)} sound effects")
 
         # BGMフィルターを作成
         bgm_filter = ""
         bgm_map = []
-        bgm_volume_multiplier = section_title_config.get('bgm_volume_multiplier', 0.7)
 
-        if bgm_data:
+        if bgm_data and audio_stem_path is None:
             bgm_filter, bgm_map = self._create_bgm_filter_for_background(
                 bgm_data=bgm_data,
                 audio_path=audio_path,
@@ -329,13 +368,16 @@ class BackgroundVideoComposer:
             '-map', '[audio_out]' if bgm_filter else '[2:a]',
         ])
 
-        # 出力設定
+        # 出力設定（ステムは同一設定でエンコード済みなのでコピー）
+        if audio_stem_path is not None:
+            audio_codec_args = ['-c:a', 'copy']
+        else:
+            audio_codec_args = ['-c:a', 'aac', '-b:a', '192k']
+
         cmd.extend([
             '-c:v', 'libx264',
-            '-preset', self.encode_preset,
-            '-crf', '23',
-            '-c:a', 'aac',
-            '-b:a', '192k',
+            *self.final_encode.video_args(),
+            *audio_codec_args,
             '-shortest',
             '-y',
             str(output_path)
@@ -358,6 +400,42 @@ class BackgroundVideoComposer:
             self.logger.error(f"STDERR: {e.stderr}")
             raise
 
+    def _build_sfx_inputs(self, title_segments: List[dict]) -> List[dict]:
+        """
+        セクションタイトルの効果音入力情報を作成
+
+        Args:
+            title_segments: セクションタイトル区間のリスト
+
+        Returns:
+            効果音の入力情報リスト
+        """
+        sfx_inputs = []
+        section_title_config = self.phase_config.get('section_title', {})
+        sfx_config = section_title_config.get('sound_effect', {})
+
+        if not (sfx_config.get('enabled', True) and title_segments):
+            return sfx_inputs
+
+        sfx_path = self.config.project_root / sfx_config.get('file', 'assets/sfx/impact_title.mp3')
+        if not sfx_path.exists():
+            self.logger.warning(f"Sound effect file not found: {sfx_path}")
+            return sfx_inputs
+
+        original_volume = sfx_config.get('volume', 0.5)
+        debug_volume = 1.0  # デバッグ用に音量を上げる
+
+        for seg in title_segments:
+            sfx_inputs.append({
+                'file': sfx_path,
+                'start_time': seg['start'],
+                'volume': debug_volume,
+                'fade_in': sfx_config.get('fade_in', 0.05),
+                'fade_out': sfx_config.get('fade_out', 0.1)
+            })
+
+        return sfx_inputs
+
     def _create_background_concat_file(
         self,
         background_videos: List[dict]
@@ -201,7 +201,8 @@ class BGMProcessor:
         num_bg_videos: int = 0,
         sfx_inputs: List[dict] = None,
         title_segments: List[dict] = None,
-        bgm_volume_multiplier: float = 1.0
+        bgm_volume_multiplier: float = 1.0,
+        narration_input: Optional[int] = None
     ) -> Tuple[str, List[str]]:
         """
         BGMフィルターを作成（タイムラインに基づいた切り替え対応、効果音とタイトル区間の音量調整対応）
@@ -213,11 +214,15 @@ class BGMProcessor:
             sfx_inputs: 効果音の入力情報リスト
             title_segments: セクションタイトル区間のリスト
             bgm_volume_multiplier: タイトル区間でのBGM音量倍率（デフォルト: 1.0）
+            narration_input: ナレーションの入力インデックス（指定時はBGM・効果音がその直後に続く。
+                音声ステム描画用）
 
         Returns:
             (bgm_filter, bgm_map) タプル
         """
         if not bgm_data or not bgm_data.get('segments'):
+            if narration_input is not None:
+                return "", ['-map', f'{narration_input}:a']
             # 音声のインデックスを決定
             if num_bg_videos == 0:
                 return "", ['-map', '2:a']  # [2] = 音声（背景動画が事前処理済み）
@@ -238,7 +243,11 @@ class BGMProcessor:
         # num_bg_videos>0 の場合（背景動画が個別入力）:
         #   [0] = 画像, [1] = 音声, [2]以降 = 背景動画, その後 = BGM
         
-        if num_bg_videos == 0:
+        if narration_input is not None:
+            # 音声ステム: [narration_input] = 音声, 以降 = BGM
+            audio_input_idx = narration_input
+            bgm_start_index = narration_input + 1
+        elif num_bg_videos == 0:
             # 背景動画が事前処理済みの場合
             audio_input_idx = 2  # [2] = 音声
             bgm_start_index = 3  # [3]以降 = BGM
@@ -17,6 +17,7 @@ except ImportError:
 
 from ...core.models import SubtitleEntry
 from ...core.config_manager import ConfigManager
+from ..timing_store import load_timing_data
 
 
 class Phase07DataLoader:
@@ -62,6 +63,7 @@ class Phase07DataLoader:
         # BGMProcessor（音声長取得に必要）
         from .bgm_processor import BGMProcessor
         from .background_processor import BackgroundVideoProcessor
+        from ..encoder_profile import resolve_encode_settings
 
         bgm_fade_in = 3.0
         bgm_fade_out = 3.0
@@ -73,7 +75,8 @@ class Phase07DataLoader:
         )
         self.bg_processor = BackgroundVideoProcessor(
             config.project_root,
-            logger
+            logger,
+            encode_settings=resolve_encode_settings(config, "background", logger=logger)
         )
 
     def load_all_data(self) -> Dict[str, Any]:
@@ -230,8 +233,7 @@ class Phase07DataLoader:
                 return None
 
         try:
-            with open(audio_timing_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_timing_data(audio_timing_path)
 
             # Phase 2がリスト形式で保存している場合、辞書形式に変換
             if isinstance(data, list):
@@ -347,8 +349,7 @@ class Phase07DataLoader:
             self.logger.warning("Subtitle data not found, using empty list")
             return []
 
-        with open(subtitle_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_timing_data(subtitle_path)
 
         subtitles = []
         for item in data.get("subtitles", []):
@@ -379,9 +380,8 @@ class Phase07DataLoader:
             return []
 
         try:
-            with open(subtitle_file, 'r', encoding='utf-8') as f:
-                subtitle_data = json.load(f)
-                subtitles = subtitle_data.get('subtitles', [])
+            subtitle_data = load_timing_data(subtitle_file)
+            subtitles = subtitle_data.get('subtitles', [])
 
             # セクションタイトル区間を検出
             title_segments = []
@@ -3,7 +3,7 @@
 import multiprocessing
 import platform
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 
 class FFmpegBuilder:
@@ -23,7 +23,8 @@ class FFmpegBuilder:
         logger,
         encode_preset: str = "faster",
         threads: int = 0,
-        bgm_processor=None
+        bgm_processor=None,
+        crf: int = 23
     ):
         """
         Args:
@@ -32,12 +33,14 @@ class FFmpegBuilder:
             encode_preset: エンコードプリセット
             threads: スレッド数（0の場合は自動）
             bgm_processor: BGMProcessorインスタンス
+            crf: 最終動画の CRF（エンコーダープロファイルがあればその値）
         """
         self.project_root = project_root
         self.logger = logger
         self.encode_preset = encode_preset
         self.threads = threads
         self.bgm_processor = bgm_processor
+        self.crf = crf
     
     def _normalize_path(self, p: Path) -> str:
         """WindowsパスをUnix形式に変換（ffmpeg互換）"""
@@ -131,7 +134,7 @@ class FFmpegBuilder:
         cmd.extend([
             '-c:v', 'libx264',
             '-preset', self.encode_preset,
-            '-crf', '23',
+            '-crf', str(self.crf),
             '-pix_fmt', 'yuv420p',
             '-c:a', 'aac',
             '-b:a', '192k',
@@ -230,7 +233,7 @@ class FFmpegBuilder:
         cmd.extend([
             '-c:v', 'libx264',
             '-preset', self.encode_preset,
-            '-crf', '23',
+            '-crf', str(self.crf),
             '-pix_fmt', 'yuv420p',
             '-c:a', 'aac',
             '-b:a', '192k',
@@ -329,7 +332,7 @@ class FFmpegBuilder:
         cmd.extend([
             '-c:v', 'libx264',
             '-preset', self.encode_preset,
-            '-crf', '23',
+            '-crf', str(self.crf),
             '-c:a', 'aac',
             '-b:a', '192k',
             '-ar', '48000',
@@ -347,7 +350,8 @@ class FFmpegBuilder:
         ass_path: Path,
         output_path: Path,
         bgm_data: Optional[dict],
-        gradient_path: Optional[Path] = None
+        gradient_path: Optional[Path] = None,
+        audio_stem_path: Optional[Path] = None
     ) -> List[str]:
         """
         最適化されたFFmpegコマンド（グラデーション対応）
@@ -357,6 +361,7 @@ class FFmpegBuilder:
         2. -shortest を削除（音声の長さに正確に合わせる）
         3. フォントディレクトリを明示的に指定
         4. グラデーションを最終合成時に適用（一番上のレイヤー）
+        5. audio_stem_path 指定時はプリミックス済みステムを stream copy（BGMミックスを省略）
         """
         threads = self._get_threads()
         is_windows = platform.system() == 'Windows'
@@ -376,14 +381,14 @@ class FFmpegBuilder:
             cmd.extend(['-loop', '1', '-i', self._normalize_path(gradient_path)])
             self.logger.info(f"🎨 Adding gradient overlay: {gradient_path.name}")
 
-        # 音声入力
+        # 音声入力（ステムがあればそれを使う）
         audio_input_idx = gradient_input_idx + (1 if (gradient_path and gradient_path.exists()) else 0)
-        cmd.extend(['-i', self._normalize_path(audio_path)])
+        cmd.extend(['-i', self._normalize_path(audio_stem_path or audio_path)])
 
-        # BGM入力
+        # BGM入力（ステム使用時はミックス済みのため不要）
         bgm_segments = []
         bgm_input_start = audio_input_idx + 1
-        if bgm_data and bgm_data.get("segments"):
+        if bgm_data and bgm_data.get("segments") and audio_stem_path is None:
             bgm_segments = bgm_data.get("segments", [])
             for segment in bgm_segments:
                 bgm_path = segment.get("file_path")
@@ -473,19 +478,279 @@ class FFmpegBuilder:
         else:
             audio_duration = 60.0  # デフォルト値
 
+        # 音声コーデック（ステムは同一設定でエンコード済みなのでコピー）
+        if audio_stem_path is not None:
+            audio_codec_args = ['-c:a', 'copy']
+        else:
+            audio_codec_args = ['-c:a', 'aac', '-b:a', '192k', '-ar', '48000']
+
         # エンコード設定
         cmd.extend([
             '-c:v', 'libx264',
             '-preset', self.encode_preset,
-            '-crf', '23',
+            '-crf', str(self.crf),
+            *audio_codec_args,
+            '-t', f"{audio_duration:.3f}",  # 小数点3桁まで指定
+            '-threads', str(threads),
+            self._normalize_path(output_path)
+        ])
+
+        return cmd
+
+
+
+    # ========================================
+    # チャンク並列エンコード
+    # ========================================
+
+    def _build_ass_filter(self, ass_path: Path) -> str:
+        """ass フィルタ文字列を構築（fontsdir 付き）"""
+        is_windows = platform.system() == 'Windows'
+        ass_path_str = str(ass_path.resolve())
+        fonts_dir_str = str((self.project_root / "assets" / "fonts" / "cinema").resolve()).replace('\\', '/')
+
+        if is_windows:
+            ass_path_str = ass_path_str.replace('\\', '/').replace(':', '\\:')
+            fonts_dir_str = fonts_dir_str.replace(':', '\\:')
+
+        return f"ass='{ass_path_str}':fontsdir='{fonts_dir_str}'"
+
+    def plan_chunks(
+        self,
+        durations: List[float],
+        num_chunks: int,
+        fps: int = 30,
+        min_chunk_duration: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """
+        タイムラインを画像境界でN個の時間範囲に分割
+
+        各チャンクの長さがなるべく均等になるよう、累積時間が
+        目標値を超えた画像境界で区切る。境界はフレーム単位に丸めるため、
+        チャンクのフレーム数の合計は全体のフレーム数と一致する。
+
+        Args:
+            durations: 画像ごとの表示時間（秒）
+            num_chunks: 分割数
+            fps: フレームレート
+            min_chunk_duration: チャンクの最小長（秒）。これを下回らないよう分割数を減らす
+
+        Returns:
+            チャンク情報のリスト
+            [{"index", "first", "last", "start_frame", "frames", "start", "duration"}, ...]
+            first/last は画像インデックス（last は含まない）
+        """
+        if not durations:
+            return []
+
+        total = sum(durations)
+        num_chunks = max(1, min(num_chunks, len(durations)))
+        if min_chunk_duration > 0:
+            num_chunks = max(1, min(num_chunks, int(total // min_chunk_duration)))
+
+        # 画像境界の累積時間
+        boundaries = [0.0]
+        for d in durations:
+            boundaries.append(boundaries[-1] + d)
+
+        # 目標時刻に最も近い画像境界を選ぶ（重複は除去）
+        cut_indices = [0]
+        for k in range(1, num_chunks):
+            target = total * k / num_chunks
+            best = min(
+                range(cut_indices[-1] + 1, len(durations)),
+                key=lambda i: abs(boundaries[i] - target),
+                default=None
+            )
+            if best is not None and best not in cut_indices:
+                cut_indices.append(best)
+        cut_indices.append(len(durations))
+
+        chunks = []
+        for first, last in zip(cut_indices, cut_indices[1:]):
+            start_frame = round(boundaries[first] * fps)
+            end_frame = round(boundaries[last] * fps)
+            chunks.append({
+                "index": len(chunks),
+                "first": first,
+                "last": last,
+                "start_frame": start_frame,
+                "frames": end_frame - start_frame,
+                "start": start_frame / fps,
+                "duration": (end_frame - start_frame) / fps,
+            })
+
+        return chunks
+
+    def _chunk_video_codec_args(self, fps: int, threads: int) -> List[str]:
+        """
+        チャンク共通のエンコード設定
+
+        stream copy で連結できるよう全チャンクで同一パラメータとし、
+        GOPを閉じてシーンカットによる参照の持ち越しを防ぐ。
+        """
+        keyint = fps * 2
+        return [
+            '-c:v', 'libx264',
+            '-preset', self.encode_preset,
+            '-crf', str(self.crf),
+            '-pix_fmt', 'yuv420p',
+            '-r', str(fps),
+            '-g', str(keyint),
+            '-flags', '+cgop',
+            '-x264-params', f'keyint={keyint}:min-keyint={keyint}:scenecut=0:open-gop=0',
+            '-video_track_timescale', str(fps * 512),
+            '-threads', str(threads),
+        ]
+
+    def build_chunk_video_command(
+        self,
+        concat_file: Path,
+        ass_path: Optional[Path],
+        output_path: Path,
+        chunk: Dict[str, Any],
+        gradient_path: Optional[Path] = None,
+        fps: int = 30,
+        threads: int = 1
+    ) -> List[str]:
+        """
+        1チャンク分の映像を描画するコマンド（音声なし）
+
+        build_ffmpeg_command_optimized() と同じフィルタ構成（concat → グラデーション →
+        スケーリング → ASS）を使い、ASSフィルタの直前でタイムスタンプを
+        チャンク開始時刻だけずらして全体タイムライン上の字幕を描画する。
+
+        Args:
+            concat_file: チャンクに含まれるセグメントのconcatファイル
+            ass_path: ASS字幕ファイル（全体タイムライン基準）
+            output_path: 出力パス
+            chunk: plan_chunks() の要素
+            gradient_path: グラデーション画像
+            fps: フレームレート
+            threads: このチャンクに割り当てるスレッド数
+        """
+        cmd = [
+            'ffmpeg',
+            '-y',
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', self._normalize_path(concat_file),
+        ]
+
+        use_gradient = bool(gradient_path and gradient_path.exists())
+        if use_gradient:
+            cmd.extend(['-loop', '1', '-i', self._normalize_path(gradient_path)])
+
+        video_filter_parts = ["[0:v]setpts=PTS-STARTPTS[v_concat]"]
+        current_video = "[v_concat]"
+
+        if use_gradient:
+            video_filter_parts.append(f"{current_video}[1:v]overlay=0:0:format=auto[v_grad]")
+            current_video = "[v_grad]"
+
+        video_filter_parts.append(
+            f"{current_video}scale=1920:1080:force_original_aspect_ratio=decrease,"
+            f"pad=1920:1080:(ow-iw)/2:(oh-ih)/2[v_scaled]"
+        )
+        current_video = "[v_scaled]"
+
+        if ass_path and ass_path.exists():
+            # 字幕は全体タイムライン基準なので、描画中だけチャンク開始時刻へずらす
+            offset = chunk["start"]
+            video_filter_parts.append(
+                f"{current_video}setpts=PTS+{offset:.6f}/TB,"
+                f"{self._build_ass_filter(ass_path)},"
+                f"setpts=PTS-STARTPTS[v_final]"
+            )
+        else:
+            video_filter_parts.append(f"{current_video}copy[v_final]")
+
+        cmd.extend(['-filter_complex', ";".join(video_filter_parts)])
+        cmd.extend(['-map', '[v_final]', '-an'])
+        cmd.extend(['-frames:v', str(chunk["frames"])])
+        cmd.extend(self._chunk_video_codec_args(fps, threads))
+        cmd.append(self._normalize_path(output_path))
+
+        return cmd
+
+    def build_audio_track_command(
+        self,
+        audio_path: Path,
+        output_path: Path,
+        bgm_data: Optional[dict],
+        audio_duration: float
+    ) -> List[str]:
+        """
+        全長の音声トラック（ナレーション + BGM）を単独で描画するコマンド
+
+        Args:
+            audio_path: ナレーション音声
+            output_path: 出力パス（.m4a）
+            bgm_data: BGMデータ
+            audio_duration: 音声の長さ（秒）
+        """
+        cmd = [
+            'ffmpeg',
+            '-y',
+            '-i', self._normalize_path(audio_path),
+        ]
+
+        bgm_segments = []
+        if bgm_data and bgm_data.get("segments"):
+            bgm_segments = bgm_data.get("segments", [])
+            for segment in bgm_segments:
+                bgm_path = segment.get("file_path")
+                if bgm_path and Path(bgm_path).exists():
+                    cmd.extend(['-i', self._normalize_path(Path(bgm_path))])
+
+        if bgm_segments and self.bgm_processor:
+            audio_filter = self.bgm_processor.build_audio_filter(
+                bgm_segments,
+                narration_input=0,
+                bgm_input_start=1
+            )
+            cmd.extend(['-filter_complex', audio_filter, '-map', '[audio]'])
+        else:
+            cmd.extend(['-map', '0:a'])
+
+        cmd.extend([
+            '-vn',
             '-c:a', 'aac',
             '-b:a', '192k',
             '-ar', '48000',
-            '-t', f"{audio_duration:.3f}",  # 小数点3桁まで指定
-            '-threads', str(threads),
+            '-t', f"{audio_duration:.3f}",
             self._normalize_path(output_path)
         ])
 
         return cmd
 
+    def build_chunk_concat_mux_command(
+        self,
+        chunk_list_file: Path,
+        audio_track_path: Path,
+        output_path: Path,
+        audio_duration: float
+    ) -> List[str]:
+        """
+        チャンク映像を stream copy で連結し、音声トラックと多重化するコマンド
 
+        Args:
+            chunk_list_file: チャンク映像のconcatファイル
+            audio_track_path: build_audio_track_command() の出力
+            output_path: 最終動画の出力パス
+            audio_duration: 音声の長さ（秒）
+        """
+        return [
+            'ffmpeg',
+            '-y',
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', self._normalize_path(chunk_list_file),
+            '-i', self._normalize_path(audio_track_path),
+            '-map', '0:v',
+            '-map', '1:a',
+            '-c', 'copy',
+            '-t', f"{audio_duration:.3f}",
+            '-movflags', '+faststart',
+            self._normalize_path(output_path)
+        ]
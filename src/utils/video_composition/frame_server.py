@@ -0,0 +1,539 @@
+"""
+フレームサーバー方式の動画合成
+
+MoviePy（クリップを全て開いたまま1フレームずつ Python で合成）や
+画像ごとのセグメントエンコード + concat の代わりに、
+- 各フレームを NumPy / OpenCV で直接生成（Ken Burns は cv2.warpAffine の1回のアフィン変換）
+- 字幕は事前に RGBA 画像へラスタライズし、表示区間だけアルファ合成
+- 黒バー・グラデーションは行ごとの係数（overlay_baker.overlay_multiplier）で適用
+- ワーカープロセスが共有メモリのリングバッファにフレームを書き、
+  親プロセスがフレーム番号順に1つの ffmpeg エンコーダーの stdin へ流す
+ことで合成する。メモリ使用量は動画の長さではなくリングのサイズ（ring_size フレーム分）で決まる。
+
+使用例:
+    plan = FramePlan(
+        width=1920, height=1080, fps=30, total_frames=int(duration * 30),
+        clips=build_frame_clips(image_timings, ken_burns=True),
+        overlays=rasterize_subtitles(subtitles, out_dir, font=font, width=1920, height=1080),
+        bar_height=216,
+    )
+    renderer = FrameServerRenderer(workers=4, ring_size=16, logger=logger)
+    renderer.render(plan, output_path, extra_inputs=['-i', audio_path], output_args=[...])
+"""
+
+import bisect
+import logging
+import multiprocessing
+import os
+import queue
+import random
+import subprocess
+import tempfile
+import time
+import traceback
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+    cv2 = None
+
+from .motion_filters import MOVES
+from .overlay_baker import overlay_multiplier
+
+# 1ワーカーが保持する画像キャッシュの上限（フレームはほぼ時間順に処理される）
+IMAGE_CACHE_SIZE = 4
+
+# ワーカーの異常終了を確認する間隔（秒）
+WORKER_POLL_SECONDS = 5.0
+
+
+@dataclass
+class FrameClip:
+    """1枚の画像の表示区間と動き"""
+    path: str
+    start: float             # 表示開始（秒）
+    end: float               # 表示終了（秒）
+    move: str = "none"       # "none"（静止）または MOVES のいずれか
+    fit: str = "pad"         # "pad"（全体表示・余白は黒）/ "cover"（画面を埋める）
+
+
+@dataclass
+class FrameOverlay:
+    """事前にラスタライズした RGBA 画像（字幕など）の表示区間と位置"""
+    path: str
+    start: float
+    end: float
+    x: int
+    y: int
+
+
+@dataclass
+class FramePlan:
+    """ワーカーに渡す合成計画（pickle できる値だけを持つ）"""
+    width: int
+    height: int
+    fps: int
+    total_frames: int
+    clips: List[FrameClip]
+    overlays: List[FrameOverlay] = field(default_factory=list)
+    bar_height: int = 0
+    gradient_ratio: float = 0.0
+    zoom_speed: float = 0.0003   # 1フレームあたりのズーム量
+    max_zoom: float = 1.15
+    pan_zoom: float = 1.1
+
+
+def build_frame_clips(
+    image_timings: Sequence[Dict[str, Any]],
+    ken_burns: bool = True,
+    seed: int = 0
+) -> List[FrameClip]:
+    """
+    Phase 7 の画像タイミング（{'path', 'duration'[, 'start_time', 'end_time']}）からクリップを作成
+
+    start_time が無い場合は duration を積算して配置する。
+    """
+    clips = []
+    t = 0.0
+    for i, timing in enumerate(image_timings):
+        start = timing.get('start_time', t)
+        end = timing.get('end_time', start + timing['duration'])
+        if ken_burns:
+            move = random.Random(seed + i).choice(MOVES)
+            fit = "cover"
+        else:
+            move = "none"
+            fit = "pad"
+        clips.append(FrameClip(str(timing['path']), float(start), float(end), move, fit))
+        t = end
+    return clips
+
+
+# ========================================
+# 字幕のラスタライズ
+# ========================================
+
+def rasterize_text(
+    lines: Sequence[str],
+    font,
+    fill=(255, 255, 255, 255),
+    stroke_width: int = 3,
+    stroke_fill=(0, 0, 0, 255),
+    line_spacing: float = 1.2
+):
+    """
+    複数行のテキストを中央揃え・縁取り付きで RGBA 画像に描画（余白なしに切り詰め）
+
+    Returns:
+        PIL Image (RGBA)
+    """
+    from PIL import Image, ImageDraw
+
+    measure = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+    boxes = [measure.textbbox((0, 0), line, font=font, stroke_width=stroke_width) for line in lines]
+    widths = [b[2] - b[0] for b in boxes]
+    ascent, descent = font.getmetrics() if hasattr(font, "getmetrics") else (boxes[0][3], 0)
+    line_height = int((ascent + descent) * line_spacing)
+
+    width = max(widths) + stroke_width * 2
+    height = line_height * (len(lines) - 1) + (ascent + descent) + stroke_width * 2
+    img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    for i, line in enumerate(lines):
+        x = (width - widths[i]) // 2 - boxes[i][0]
+        y = stroke_width + i * line_height
+        draw.text((x, y), line, font=font, fill=fill, stroke_width=stroke_width, stroke_fill=stroke_fill)
+
+    bbox = img.getbbox()
+    return img.crop(bbox) if bbox else img
+
+
+def rasterize_subtitles(
+    subtitles: Sequence[Dict[str, Any]],
+    out_dir: Path,
+    font,
+    width: int,
+    height: int,
+    margin_bottom: int = 70,
+    title_font=None,
+    title_fill=(255, 0, 0, 255),
+    stroke_width: int = 3
+) -> List[FrameOverlay]:
+    """
+    字幕を RGBA の PNG にラスタライズ
+
+    配置は ASS の Default スタイル（下中央・MarginV）と
+    SectionTitle スタイル（画面中央・赤）に合わせる。
+
+    Args:
+        subtitles: {'start_time', 'end_time', 'lines', 'section_title'(任意)} のリスト
+        out_dir: PNG の出力先
+        font: 通常字幕のフォント（PIL ImageFont）
+        width, height: 動画の解像度
+        margin_bottom: 画面下端から字幕下端までの距離（px）
+        title_font: セクションタイトルのフォント（None なら font）
+
+    Returns:
+        FrameOverlay のリスト（開始時刻順）
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    overlays = []
+    for i, sub in enumerate(subtitles):
+        lines = [line for line in sub['lines'] if line]
+        if not lines:
+            continue
+
+        if sub.get('section_title'):
+            img = rasterize_text(lines, title_font or font, fill=title_fill, stroke_width=stroke_width + 1)
+            x = (width - img.width) // 2
+            y = (height - img.height) // 2
+        else:
+            img = rasterize_text(lines, font, stroke_width=stroke_width)
+            x = (width - img.width) // 2
+            y = height - margin_bottom - img.height
+
+        path = out_dir / f"subtitle_{i:05d}.png"
+        img.save(path)
+        overlays.append(FrameOverlay(str(path), float(sub['start_time']), float(sub['end_time']), x, y))
+
+    overlays.sort(key=lambda o: o.start)
+    return overlays
+
+
+# ========================================
+# フレーム生成
+# ========================================
+
+def _imread(path: str, flags: int):
+    """日本語を含むパスでも読めるように np.fromfile 経由で読み込む"""
+    data = np.fromfile(path, dtype=np.uint8)
+    img = cv2.imdecode(data, flags)
+    if img is None:
+        raise ValueError(f"Failed to decode image: {path}")
+    return img
+
+
+class FrameComposer:
+    """合成計画から任意のフレームを生成する（1プロセス内で使用）"""
+
+    def __init__(self, plan: FramePlan):
+        if not CV2_AVAILABLE:
+            raise ImportError("opencv-python is required. Install with: pip install opencv-python")
+
+        self.plan = plan
+        self.clip_starts = [c.start for c in plan.clips]
+        self.overlay_starts = [o.start for o in plan.overlays]
+        self.max_overlay_duration = max((o.end - o.start for o in plan.overlays), default=0.0)
+        self._images: Dict[str, np.ndarray] = {}
+        self._overlays: Dict[str, tuple] = {}
+
+        # 行ごとの減光係数（黒バー・グラデーション）
+        multiplier = overlay_multiplier(plan.height, plan.gradient_ratio, plan.bar_height)
+        self.black_rows = np.flatnonzero(multiplier == 0.0)
+        fade_rows = np.flatnonzero((multiplier > 0.0) & (multiplier < 1.0))
+        self.fade_slice = slice(fade_rows[0], fade_rows[-1] + 1) if len(fade_rows) else None
+        self.fade = (
+            (multiplier[self.fade_slice] * 256).astype(np.uint16)[:, None, None]
+            if self.fade_slice else None
+        )
+
+    def _image(self, path: str) -> np.ndarray:
+        img = self._images.get(path)
+        if img is None:
+            if len(self._images) >= IMAGE_CACHE_SIZE:
+                self._images.pop(next(iter(self._images)))
+            img = _imread(path, cv2.IMREAD_COLOR)
+            self._images[path] = img
+        return img
+
+    def _overlay(self, path: str) -> tuple:
+        cached = self._overlays.get(path)
+        if cached is None:
+            rgba = _imread(path, cv2.IMREAD_UNCHANGED)
+            if rgba.ndim == 2 or rgba.shape[2] == 3:
+                alpha = np.full(rgba.shape[:2], 255, dtype=np.uint16)
+                bgr = rgba if rgba.ndim == 3 else cv2.cvtColor(rgba, cv2.COLOR_GRAY2BGR)
+            else:
+                alpha = rgba[:, :, 3].astype(np.uint16)
+                bgr = rgba[:, :, :3]
+            # 事前乗算しておき、合成時は dst * (255 - a) を足すだけにする
+            premultiplied = bgr.astype(np.uint16) * alpha[:, :, None]
+            cached = (premultiplied, (255 - alpha)[:, :, None])
+            self._overlays[path] = cached
+        return cached
+
+    def _affine(self, clip: FrameClip, src_w: int, src_h: int, frame_in_clip: int, clip_frames: int) -> np.ndarray:
+        """出力座標 = s * (入力座標 - 表示窓の左上) のアフィン行列"""
+        plan = self.plan
+        W, H = plan.width, plan.height
+        if clip.fit == "cover":
+            base = max(W / src_w, H / src_h)
+        else:
+            base = min(W / src_w, H / src_h)
+
+        # zoompan と同じズーム量・パン位置
+        zoom, progress = 1.0, 0.5
+        if clip.move == "zoom_in":
+            zoom = min(1.0 + plan.zoom_speed * frame_in_clip, plan.max_zoom)
+        elif clip.move == "zoom_out":
+            zoom = max(plan.max_zoom - plan.zoom_speed * frame_in_clip, 1.0)
+        elif clip.move == "pan_right":
+            zoom, progress = plan.pan_zoom, frame_in_clip / max(clip_frames, 1)
+        elif clip.move == "pan_left":
+            zoom, progress = plan.pan_zoom, 1.0 - frame_in_clip / max(clip_frames, 1)
+
+        s = base * zoom
+        x0 = (src_w - W / s) * progress
+        y0 = (src_h - H / s) / 2
+        return np.array([[s, 0.0, -s * x0], [0.0, s, -s * y0]], dtype=np.float64)
+
+    def render(self, index: int, out: np.ndarray):
+        """フレーム index を out（H×W×3 の BGR、uint8）に描画"""
+        plan = self.plan
+        t = index / plan.fps
+
+        i = bisect.bisect_right(self.clip_starts, t) - 1
+        if i < 0:
+            out[:] = 0
+        else:
+            clip = plan.clips[min(i, len(plan.clips) - 1)]
+            src = self._image(clip.path)
+            first = int(round(clip.start * plan.fps))
+            clip_frames = max(int(round(clip.end * plan.fps)) - first, 1)
+            matrix = self._affine(clip, src.shape[1], src.shape[0], index - first, clip_frames)
+            cv2.warpAffine(
+                src, matrix, (plan.width, plan.height), dst=out,
+                flags=cv2.INTER_LINEAR,
+                borderMode=cv2.BORDER_CONSTANT if clip.fit == "pad" else cv2.BORDER_REPLICATE,
+                borderValue=(0, 0, 0)
+            )
+
+        # 黒バー・グラデーション
+        if len(self.black_rows):
+            out[self.black_rows] = 0
+        if self.fade_slice is not None:
+            region = out[self.fade_slice]
+            region[:] = (region.astype(np.uint16) * self.fade) >> 8
+
+        # 字幕（表示中のものだけ。開始順なので最長の表示時間より前に始まったものは見ない）
+        for k in range(bisect.bisect_right(self.overlay_starts, t) - 1, -1, -1):
+            overlay = plan.overlays[k]
+            if t - overlay.start > self.max_overlay_duration:
+                break
+            if t < overlay.end:
+                self._blit(overlay, out)
+
+    def _blit(self, overlay: FrameOverlay, out: np.ndarray):
+        premultiplied, inv_alpha = self._overlay(overlay.path)
+        h, w = premultiplied.shape[:2]
+        x0, y0 = max(overlay.x, 0), max(overlay.y, 0)
+        x1, y1 = min(overlay.x + w, out.shape[1]), min(overlay.y + h, out.shape[0])
+        if x1 <= x0 or y1 <= y0:
+            return
+        sy, sx = slice(y0 - overlay.y, y1 - overlay.y), slice(x0 - overlay.x, x1 - overlay.x)
+        roi = out[y0:y1, x0:x1]
+        roi[:] = (premultiplied[sy, sx] + roi.astype(np.uint16) * inv_alpha[sy, sx] + 127) // 255
+
+
+# ========================================
+# ワーカー（共有メモリのリングバッファ）
+# ========================================
+
+def _worker_main(plan: FramePlan, shm_name: str, ring_size: int, tasks, done):
+    """ワーカープロセス: (フレーム番号, スロット) を受け取り、スロットに描画"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = None
+    try:
+        ring = np.ndarray((ring_size, plan.height, plan.width, 3), dtype=np.uint8, buffer=shm.buf)
+        composer = FrameComposer(plan)
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            index, slot = task
+            composer.render(index, ring[slot])
+            done.put((index, None))
+    except Exception:
+        done.put((-1, traceback.format_exc()))
+    finally:
+        # 共有メモリのビューを残したままでは close できない
+        ring = None
+        shm.close()
+
+
+class FrameServerRenderer:
+    """フレームを並列生成し、順番どおりに ffmpeg エンコーダーへ流す"""
+
+    def __init__(
+        self,
+        workers: int = 0,
+        ring_size: int = 16,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        初期化
+
+        Args:
+            workers: フレーム生成プロセス数（0=CPUコア数-1、1以下なら親プロセスで生成）
+            ring_size: リングバッファのフレーム数（メモリ使用量 = ring_size × W × H × 3）
+            logger: ロガー
+        """
+        if not CV2_AVAILABLE:
+            raise ImportError("opencv-python is required. Install with: pip install opencv-python")
+
+        self.workers = workers if workers > 0 else max((os.cpu_count() or 2) - 1, 1)
+        self.ring_size = max(ring_size, 2)
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats: Dict[str, float] = {}
+
+    @staticmethod
+    def raw_input_args(plan: FramePlan) -> List[str]:
+        """stdin の生フレームを入力0とする ffmpeg 引数"""
+        return [
+            '-f', 'rawvideo',
+            '-pix_fmt', 'bgr24',
+            '-s', f'{plan.width}x{plan.height}',
+            '-r', str(plan.fps),
+            '-i', 'pipe:0',
+        ]
+
+    def render(
+        self,
+        plan: FramePlan,
+        output_path: Path,
+        extra_inputs: Optional[List[str]] = None,
+        output_args: Optional[List[str]] = None
+    ) -> Path:
+        """
+        全フレームを生成してエンコード
+
+        Args:
+            plan: 合成計画
+            output_path: 出力動画
+            extra_inputs: 追加の入力（音声など、入力1以降）
+            output_args: 出力オプション（-map / コーデック指定など）
+
+        Returns:
+            出力動画のパス
+        """
+        cmd = ['ffmpeg', '-y', *self.raw_input_args(plan), *(extra_inputs or [])]
+        cmd.extend(output_args or ['-c:v', 'libx264', '-pix_fmt', 'yuv420p'])
+        cmd.append(str(output_path))
+
+        frame_mb = plan.width * plan.height * 3 / (1024 * 1024)
+        self.logger.info(
+            f"Frame server: {plan.total_frames} frames, {len(plan.clips)} clips, "
+            f"{len(plan.overlays)} overlays, {self.workers} workers, "
+            f"ring {self.ring_size} ({frame_mb * self.ring_size:.0f}MB)"
+        )
+
+        started = time.perf_counter()
+        with tempfile.TemporaryFile() as stderr:
+            encoder = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=stderr)
+            try:
+                if self.workers <= 1:
+                    self._render_inline(plan, encoder.stdin)
+                else:
+                    self._render_parallel(plan, encoder.stdin)
+                encoder.stdin.close()
+            except BrokenPipeError:
+                pass
+            except BaseException:
+                encoder.kill()
+                encoder.wait()
+                raise
+            returncode = encoder.wait()
+
+            if returncode != 0:
+                stderr.seek(0)
+                message = stderr.read().decode('utf-8', errors='ignore')[-2000:]
+                raise RuntimeError(f"ffmpeg encoder failed with code {returncode}: {message}")
+
+        seconds = time.perf_counter() - started
+        self.stats = {
+            "frames": plan.total_frames,
+            "seconds": seconds,
+            "fps": plan.total_frames / seconds if seconds > 0 else 0.0,
+        }
+        self.logger.info(
+            f"Frame server finished: {plan.total_frames} frames in {seconds:.1f}s "
+            f"({self.stats['fps']:.1f} fps)"
+        )
+        return Path(output_path)
+
+    def _render_inline(self, plan: FramePlan, sink):
+        """親プロセスで順番に生成（ワーカー1以下）"""
+        composer = FrameComposer(plan)
+        frame = np.empty((plan.height, plan.width, 3), dtype=np.uint8)
+        for index in range(plan.total_frames):
+            composer.render(index, frame)
+            sink.write(frame.data)
+
+    def _render_parallel(self, plan: FramePlan, sink):
+        """
+        ワーカーでリングバッファに生成し、番号順に書き出す
+
+        フレーム n はスロット n % ring_size に書かれ、フレーム n + ring_size は
+        フレーム n を書き出した後にしか依頼しないので、スロットの上書きは起きない。
+        """
+        ctx = multiprocessing.get_context("spawn")
+        frame_bytes = plan.height * plan.width * 3
+        shm = shared_memory.SharedMemory(create=True, size=frame_bytes * self.ring_size)
+        tasks = ctx.Queue()
+        done = ctx.Queue()
+        processes = []
+        ring = None
+        try:
+            ring = np.ndarray((self.ring_size, plan.height, plan.width, 3), dtype=np.uint8, buffer=shm.buf)
+            for _ in range(self.workers):
+                process = ctx.Process(
+                    target=_worker_main,
+                    args=(plan, shm.name, self.ring_size, tasks, done),
+                    daemon=True
+                )
+                process.start()
+                processes.append(process)
+
+            submitted = min(self.ring_size, plan.total_frames)
+            for index in range(submitted):
+                tasks.put((index, index % self.ring_size))
+
+            ready = set()
+            for index in range(plan.total_frames):
+                while index not in ready:
+                    try:
+                        finished, error = done.get(timeout=WORKER_POLL_SECONDS)
+                    except queue.Empty:
+                        if not all(p.is_alive() for p in processes):
+                            raise RuntimeError("Frame server worker exited unexpectedly")
+                        continue
+                    if error:
+                        raise RuntimeError(f"Frame server worker failed:\n{error}")
+                    ready.add(finished)
+                ready.discard(index)
+
+                sink.write(ring[index % self.ring_size].data)
+
+                if submitted < plan.total_frames:
+                    tasks.put((submitted, submitted % self.ring_size))
+                    submitted += 1
+        finally:
+            ring = None
+            for _ in processes:
+                tasks.put(None)
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            shm.close()
+            shm.unlink()
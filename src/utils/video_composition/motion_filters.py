@@ -0,0 +1,200 @@
+"""
+静止画セグメントの動き（ズーム・パン）の描画方式
+
+- zoompan_4k: 4K にアップスケール → 4K で zoompan → 1080p に縮小。
+  さらにブラー背景（縮小 → 拡大）を作って overlay する従来方式。
+  前景は画面全体を覆うので背景は見えない。
+- margin: 出力の margin 倍（既定 1.2 倍）の画像を1回だけ作り、その上で zoompan して
+  出力解像度で切り出す。入力は1フレームだけ（-loop なし）なので拡大・切り抜きは1回で済み、
+  毎フレームの処理は zoompan（出力解像度へのクロップ + スケール）のみ。背景ブランチもない。
+  ただし zoompan の切り出し位置は整数ピクセルなので、出力解像度では動きがガタつく
+  （zoompan_4k は 4K で切り出して縮小するため半分になる）。
+- affine: frame_server.FrameComposer（cv2.warpAffine のサブピクセル補間）で
+  フレームを生成して ffmpeg にパイプする。opencv-python が必要。
+
+どの方式でもズーム量・パン位置の式は同じ（zoompan の zoom は入力全体に対する倍率なので、
+入力の解像度を変えても見える範囲は変わらない）。
+
+使用例:
+    move = choose_move(seed=i)
+    cmd = motion_segment_command(img_path, 5.0, output_path, move, mode="margin")
+"""
+
+import random
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# 描画方式
+MOTION_MODES = ("zoompan_4k", "margin", "affine")
+DEFAULT_MOTION_MODE = "zoompan_4k"
+
+# 動きの種類（frame_server.MOVES と同じ）
+MOVES = ("zoom_in", "zoom_out", "pan_right", "pan_left")
+
+ZOOM_SPEED = 0.0003   # 1フレームあたりのズーム量
+MAX_ZOOM = 1.15
+PAN_ZOOM = 1.1
+DEFAULT_MARGIN = 1.2
+
+
+def choose_move(seed: int) -> str:
+    """セグメント番号から動きを決める（従来の random.seed(seed) + random.choice と同じ結果）"""
+    return random.Random(seed).choice(MOVES)
+
+
+def source_size(mode: str, width: int = 1920, height: int = 1080, margin: float = DEFAULT_MARGIN) -> Tuple[int, int]:
+    """動きの入力にする画像の解像度（オーバーレイを焼き込む場合のサイズ）"""
+    if mode == "zoompan_4k":
+        return width * 2, height * 2
+    return _even(width * margin), _even(height * margin)
+
+
+def _even(value: float) -> int:
+    return int(value) // 2 * 2
+
+
+def zoompan_expressions(
+    move: str,
+    frames: int,
+    zoom_speed: float = ZOOM_SPEED,
+    max_zoom: float = MAX_ZOOM,
+    pan_zoom: float = PAN_ZOOM
+) -> Tuple[str, str]:
+    """zoompan の z 式と x/y 式"""
+    if move == "zoom_in":
+        z_expr = f"z='min(zoom+{zoom_speed},{max_zoom})'"
+        pos = "x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)'"
+    elif move == "zoom_out":
+        z_expr = f"z='if(eq(on,0),{max_zoom},max(zoom-{zoom_speed},1.0))'"
+        pos = "x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)'"
+    elif move == "pan_right":
+        z_expr = f"z='{pan_zoom}'"
+        pos = f"x='(iw-iw/zoom)*(on/{frames})':y='ih/2-(ih/zoom/2)'"
+    else:  # pan_left
+        z_expr = f"z='{pan_zoom}'"
+        pos = f"x='(iw-iw/zoom)*(1-on/{frames})':y='ih/2-(ih/zoom/2)'"
+    return z_expr, pos
+
+
+def zoompan_4k_filter(
+    move: str,
+    frames: int,
+    fps: int = 30,
+    width: int = 1920,
+    height: int = 1080,
+    zoom_speed: float = ZOOM_SPEED,
+    max_zoom: float = MAX_ZOOM
+) -> str:
+    """従来方式（4K zoompan + ブラー背景）のフィルタグラフ"""
+    z_expr, pos = zoompan_expressions(move, frames, zoom_speed, max_zoom)
+    w4, h4 = width * 2, height * 2
+    return (
+        # 背景: 軽量擬似ブラー (1920 -> 192 -> 1920)
+        f"[0:v]scale={width // 10}:{height // 10},scale={width}:{height}:flags=bicubic,eq=brightness=-0.3[bg];"
+        # 前景: 4Kアップスケール -> Zoompan -> 1080pダウンコンバート
+        f"[0:v]scale={w4}:{h4}:force_original_aspect_ratio=increase,crop={w4}:{h4},"
+        f"zoompan={z_expr}:d={frames}:{pos}:s={w4}x{h4}:fps={fps},scale={width}:{height}[fg];"
+        # 合成
+        "[bg][fg]overlay=(W-w)/2:(H-h)/2,format=yuv420p[out]"
+    )
+
+
+def margin_filter(
+    move: str,
+    frames: int,
+    fps: int = 30,
+    width: int = 1920,
+    height: int = 1080,
+    margin: float = DEFAULT_MARGIN,
+    zoom_speed: float = ZOOM_SPEED,
+    max_zoom: float = MAX_ZOOM
+) -> str:
+    """余白付き画像（margin 倍）の上で zoompan し、出力解像度で直接切り出すフィルタグラフ"""
+    z_expr, pos = zoompan_expressions(move, frames, zoom_speed, max_zoom)
+    mw, mh = source_size("margin", width, height, margin)
+    return (
+        f"[0:v]scale={mw}:{mh}:force_original_aspect_ratio=increase,crop={mw}:{mh},"
+        f"zoompan={z_expr}:d={frames}:{pos}:s={width}x{height}:fps={fps},format=yuv420p[out]"
+    )
+
+
+def motion_segment_command(
+    img_path: Path,
+    duration: float,
+    output_path: Path,
+    move: str,
+    mode: str = DEFAULT_MOTION_MODE,
+    fps: int = 30,
+    width: int = 1920,
+    height: int = 1080,
+    margin: float = DEFAULT_MARGIN,
+    zoom_speed: float = ZOOM_SPEED,
+    max_zoom: float = MAX_ZOOM,
+    encode_args: Optional[List[str]] = None
+) -> List[str]:
+    """
+    ffmpeg で描画する方式（zoompan_4k / margin）のセグメント生成コマンド
+
+    Raises:
+        ValueError: affine など ffmpeg 以外の方式が指定された場合
+    """
+    frames = int(duration * fps)
+    encode_args = encode_args or ['-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '18']
+
+    if mode == "zoompan_4k":
+        inputs = ['-loop', '1', '-i', str(img_path)]
+        filter_complex = zoompan_4k_filter(move, frames, fps, width, height, zoom_speed, max_zoom)
+    elif mode == "margin":
+        # zoompan は1枚の入力から d フレームを出力するのでループ入力は不要
+        inputs = ['-i', str(img_path)]
+        filter_complex = margin_filter(move, frames, fps, width, height, margin, zoom_speed, max_zoom)
+    else:
+        raise ValueError(f"Not an ffmpeg motion mode: {mode}")
+
+    return [
+        'ffmpeg', '-y',
+        *inputs,
+        '-t', f"{duration:.6f}",
+        '-filter_complex', filter_complex,
+        '-map', '[out]',
+        *encode_args,
+        '-pix_fmt', 'yuv420p', '-r', str(fps),
+        str(output_path)
+    ]
+
+
+def render_affine_segment(
+    img_path: Path,
+    duration: float,
+    output_path: Path,
+    move: str,
+    fps: int = 30,
+    width: int = 1920,
+    height: int = 1080,
+    zoom_speed: float = ZOOM_SPEED,
+    max_zoom: float = MAX_ZOOM,
+    encode_args: Optional[List[str]] = None,
+    logger=None
+) -> Path:
+    """
+    cv2.warpAffine（サブピクセル補間）でセグメントを生成
+
+    Raises:
+        ImportError: opencv-python が無い場合
+    """
+    from .frame_server import FrameClip, FramePlan, FrameServerRenderer
+
+    plan = FramePlan(
+        width=width,
+        height=height,
+        fps=fps,
+        total_frames=int(duration * fps),
+        clips=[FrameClip(str(img_path), 0.0, duration, move, "cover")],
+        zoom_speed=zoom_speed,
+        max_zoom=max_zoom,
+        pan_zoom=PAN_ZOOM,
+    )
+    encode_args = encode_args or ['-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '18']
+    # 1セグメントは短いので親プロセスで生成する（ワーカー起動のコストの方が大きい）
+    renderer = FrameServerRenderer(workers=1, ring_size=2, logger=logger)
+    return renderer.render(plan, output_path, output_args=[*encode_args, '-pix_fmt', 'yuv420p'])
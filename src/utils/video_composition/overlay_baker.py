@@ -0,0 +1,189 @@
+"""
+静的オーバーレイの焼き込み
+
+グラデーション座布団（GradientProcessor.create_gradient_image）や
+字幕用の黒バー（drawbox）は画像ごとに不変なので、
+エンコード前に静止画へ一度だけ合成しておく。
+
+- 合成は行ごとの減光係数（H×1）をブロードキャストして一括計算
+- 複数画像をスレッドで並列処理（PIL のリサイズ・NumPy演算は GIL を解放する）
+- 入力画像と設定のハッシュをキーにキャッシュ
+
+これにより最終合成のフィルタグラフから overlay / drawbox を外せる。
+"""
+
+import hashlib
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from PIL import Image
+
+from ..telemetry import map_in_context
+
+# 焼き込み処理を変更したら上げる
+OVERLAY_BAKER_VERSION = 1
+
+
+def overlay_multiplier(height: int, gradient_ratio: float = 0.35, bar_height: int = 0) -> np.ndarray:
+    """
+    行ごとの減光係数を計算
+
+    GradientProcessor.create_gradient_image() の黒グラデーション
+    （alpha = int(255 * (y - start_y) / gradient_height)）を overlay した結果と、
+    drawbox=y=ih-bar_height:color=black@1.0 の塗りつぶしを再現する。
+
+    Args:
+        height: 画像の高さ
+        gradient_ratio: グラデーションの高さ比率（0でグラデーションなし）
+        bar_height: 下部の黒バーの高さ（px、0で黒バーなし）
+
+    Returns:
+        shape=(height,) の float32 配列（1.0 = そのまま、0.0 = 黒）
+    """
+    multiplier = np.ones(height, dtype=np.float32)
+
+    gradient_height = int(height * gradient_ratio)
+    if gradient_height > 0:
+        start_y = height - gradient_height
+        rows = np.arange(start_y, height, dtype=np.float32)
+        alpha = np.floor(255.0 * (rows - start_y) / gradient_height)
+        multiplier[start_y:] = 1.0 - alpha / 255.0
+
+    if bar_height > 0:
+        multiplier[max(0, height - bar_height):] = 0.0
+
+    return multiplier
+
+
+class StaticOverlayBaker:
+    """
+    静止画へのオーバーレイ焼き込み
+
+    使用例:
+        baker = StaticOverlayBaker(logger, cache_dir, width=1920, height=1080, gradient_ratio=0.35)
+        baked = baker.bake_many(image_paths)   # {元パス: 焼き込み済みパス}
+    """
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        cache_dir: Optional[Path] = None,
+        width: int = 1920,
+        height: int = 1080,
+        gradient_ratio: float = 0.35,
+        bar_height: int = 0,
+        fit: str = "pad",
+        max_workers: Optional[int] = None
+    ):
+        """
+        Args:
+            logger: ロガー
+            cache_dir: 焼き込み済み画像の保存先
+            width: 出力幅
+            height: 出力高さ
+            gradient_ratio: グラデーションの高さ比率（0でグラデーションなし）
+            bar_height: 下部の黒バーの高さ（出力解像度でのpx）
+            fit: "pad"（縮小して黒で余白埋め = scale=decrease,pad）
+                 "cover"（拡大して中央クロップ = scale=increase,crop）
+            max_workers: 並列数（Noneなら CPU数）
+        """
+        if fit not in ("pad", "cover"):
+            raise ValueError(f"Unknown fit mode: {fit}")
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.cwd() / ".overlay_cache"
+        self.width = width
+        self.height = height
+        self.gradient_ratio = gradient_ratio
+        self.bar_height = bar_height
+        self.fit = fit
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+        self._multiplier = overlay_multiplier(height, gradient_ratio, bar_height)[:, None, None]
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _cache_path(self, image_path: Path) -> Path:
+        stat = image_path.stat()
+        key = "|".join([
+            str(OVERLAY_BAKER_VERSION),
+            str(image_path.resolve()),
+            str(stat.st_size),
+            str(stat.st_mtime_ns),
+            f"{self.width}x{self.height}",
+            f"{self.gradient_ratio:.4f}",
+            str(self.bar_height),
+            self.fit,
+        ])
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{image_path.stem}_{digest}.png"
+
+    def _fit(self, img: Image.Image) -> Image.Image:
+        """出力解像度に合わせる（ffmpeg の scale/pad・scale/crop と同じ配置）"""
+        src_w, src_h = img.size
+        if self.fit == "pad":
+            scale = min(self.width / src_w, self.height / src_h)
+        else:
+            scale = max(self.width / src_w, self.height / src_h)
+
+        new_w = max(1, round(src_w * scale))
+        new_h = max(1, round(src_h * scale))
+        if (new_w, new_h) != (src_w, src_h):
+            img = img.resize((new_w, new_h), Image.BICUBIC)
+
+        if self.fit == "pad":
+            canvas = Image.new("RGB", (self.width, self.height), (0, 0, 0))
+            canvas.paste(img, ((self.width - new_w) // 2, (self.height - new_h) // 2))
+            return canvas
+
+        left = (new_w - self.width) // 2
+        top = (new_h - self.height) // 2
+        return img.crop((left, top, left + self.width, top + self.height))
+
+    def bake(self, image_path: Path) -> Path:
+        """
+        1枚の画像にオーバーレイを焼き込む（キャッシュがあれば再利用）
+
+        Returns:
+            焼き込み済み画像のパス
+        """
+        image_path = Path(image_path)
+        output_path = self._cache_path(image_path)
+        if output_path.exists():
+            return output_path
+
+        with Image.open(image_path) as img:
+            frame = self._fit(img.convert("RGB"))
+
+        pixels = np.asarray(frame, dtype=np.float32)
+        pixels *= self._multiplier
+        baked = Image.fromarray(np.clip(pixels + 0.5, 0, 255).astype(np.uint8), "RGB")
+
+        tmp_path = output_path.with_name(output_path.stem + ".tmp.png")
+        baked.save(tmp_path, "PNG", compress_level=1)
+        tmp_path.replace(output_path)
+        return output_path
+
+    def bake_many(self, image_paths: Sequence[Path]) -> Dict[Path, Path]:
+        """
+        複数画像を並列に焼き込む（同じ画像は1回だけ処理）
+
+        Returns:
+            {元画像のパス: 焼き込み済み画像のパス}
+        """
+        unique: List[Path] = list(dict.fromkeys(Path(p) for p in image_paths))
+        if not unique:
+            return {}
+
+        workers = min(self.max_workers, len(unique))
+        self.logger.info(
+            f"🎨 Baking static overlays into {len(unique)} images "
+            f"({self.width}x{self.height}, gradient={self.gradient_ratio:.2f}, bar={self.bar_height}px)"
+        )
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            baked = map_in_context(executor, self.bake, unique)
+
+        return dict(zip(unique, baked))
@@ -0,0 +1,294 @@
+"""
+セグメントの先行エンコード（ストリーミング受け渡し）
+
+Phase 7 の ffmpeg 直接統合は、画像ごとに静止画セグメント（ロスレス mp4）を作ってから連結する。
+セグメントに必要なのは「画像」と「表示時間（= セクションの尺 / 画像数）」だけなので、
+Phase 2 と Phase 3 がセクション単位で完了を通知（src/core/section_events.py）すれば、
+全体の完了を待たずにそのセクションのセグメントを作り始められる。
+
+- SegmentCache: 入力画像の内容・表示時間・エンコード引数をキーにしたセグメントのキャッシュ
+- SegmentPrefetcher: 通知を受けて、揃ったセクションからバックグラウンドでエンコード
+
+Phase 7 本体は通常どおりタイミングを計算し、キーが一致したセグメントだけを再利用する。
+通知の尺や画像が最終的な値と違っても、キーが一致しないので作り直されるだけで結果は変わらない。
+
+使用例:
+    cache = SegmentCache(phase_dir / "segment_cache")
+    prefetcher = SegmentPrefetcher(section_ids, cache, signature, plan_section, prepare_inputs, encode)
+    bus.subscribe(prefetcher.handle)
+    ...
+    prefetcher.wait()
+    cached = cache.lookup(image_path, duration, signature)
+"""
+
+import contextvars
+import hashlib
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.core.section_events import (
+    AUDIO_COMPLETE,
+    AUDIO_READY,
+    IMAGES_COMPLETE,
+    IMAGES_READY,
+    SectionEvent,
+)
+from src.utils.telemetry import span, submit_in_context
+
+# セグメントの作り方を変更したら上げる
+SEGMENT_CACHE_VERSION = 1
+
+
+class SegmentCache:
+    """
+    静止画セグメントのキャッシュ
+
+    キーは入力画像の内容のハッシュ・表示時間（ffmpeg に渡す文字列）・エンコード引数。
+    パスや更新日時には依存しないので、画像を書き直しても内容が同じなら再利用できる。
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+
+    def _content_digest(self, path: Path) -> str:
+        stat = path.stat()
+        stat_key = (str(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            digest = self._digests.get(stat_key)
+        if digest is None:
+            h = hashlib.sha1()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    h.update(chunk)
+            digest = h.hexdigest()
+            with self._lock:
+                self._digests[stat_key] = digest
+        return digest
+
+    def path_for(self, input_path: Path, duration: float, signature: str) -> Path:
+        """キャッシュ上のセグメントのパス（存在するとは限らない）"""
+        key = "|".join([
+            str(SEGMENT_CACHE_VERSION),
+            self._content_digest(Path(input_path)),
+            f"{duration:.6f}",
+            signature,
+        ])
+        return self.cache_dir / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]}.mp4"
+
+    def lookup(self, input_path: Path, duration: float, signature: str) -> Optional[Path]:
+        """キャッシュ済みのセグメント（無ければ None）"""
+        if not self.cache_dir.exists():
+            return None
+        path = self.path_for(input_path, duration, signature)
+        return path if path.exists() else None
+
+    def store(
+        self,
+        input_path: Path,
+        duration: float,
+        signature: str,
+        encode: Callable[[Path, float, Path], None]
+    ) -> Path:
+        """
+        セグメントを作ってキャッシュに置く（既にあれば何もしない）
+
+        一時ファイルに書いてから置き換えるので、途中で止まっても壊れたセグメントは残らない。
+        """
+        path = self.path_for(input_path, duration, signature)
+        if path.exists():
+            return path
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f".{path.stem}.{threading.get_ident()}.partial.mp4")
+        try:
+            encode(Path(input_path), duration, partial)
+            os.replace(partial, path)
+        finally:
+            if partial.exists():
+                partial.unlink()
+        return path
+
+    def clear(self):
+        """キャッシュを削除（最終動画ができた後）"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        with self._lock:
+            self._digests.clear()
+
+
+@dataclass
+class PrefetchState:
+    """通知から分かっているセクションの状態"""
+    section_ids: List[int]
+    audio_durations: Dict[int, float] = field(default_factory=dict)
+    section_images: Dict[int, List[Path]] = field(default_factory=dict)
+    audio_complete: bool = False
+    images_complete: bool = False
+
+
+class SegmentPrefetcher:
+    """
+    セクションの音声と画像が揃い次第、そのセクションのセグメントをエンコードする
+
+    どのセクションがいつ揃うか・各画像の表示時間は plan_section が決める:
+        plan_section(section_id, state) -> [(画像パス, 表示時間), ...]
+        （まだ決められなければ None、エンコードするものが無ければ []）
+
+    エンコードの失敗はログに残すだけで、Phase 7 本体がそのセグメントを作り直す。
+    """
+
+    def __init__(
+        self,
+        section_ids: Sequence[int],
+        cache: SegmentCache,
+        signature: str,
+        plan_section: Callable[[int, PrefetchState], Optional[List[Tuple[Path, float]]]],
+        prepare_inputs: Callable[[List[Path]], Dict[Path, Path]],
+        encode: Callable[[Path, float, Path], None],
+        load_audio_durations: Optional[Callable[[], Dict[int, float]]] = None,
+        load_section_images: Optional[Callable[[], Dict[int, List[Path]]]] = None,
+        logger: Optional[logging.Logger] = None,
+        max_workers: int = 1
+    ):
+        """
+        Args:
+            section_ids: 台本のセクションID
+            cache: 作ったセグメントを置くキャッシュ
+            signature: エンコード引数（キャッシュキーの一部）
+            plan_section: セクションの (画像, 表示時間) を決める関数
+            prepare_inputs: 画像 → エンコードに渡す入力（オーバーレイ焼き込みなど）
+            encode: (入力画像, 表示時間, 出力パス) でセグメントを作る関数
+            load_audio_durations: Phase 2 完了時にセクションの尺を出力ファイルから読み直す関数
+            load_section_images: Phase 3 完了時にセクションの画像を出力ファイルから読み直す関数
+            max_workers: 同時にエンコードするセクション数
+        """
+        self.cache = cache
+        self.signature = signature
+        self.plan_section = plan_section
+        self.prepare_inputs = prepare_inputs
+        self.encode = encode
+        self.load_audio_durations = load_audio_durations
+        self.load_section_images = load_section_images
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.state = PrefetchState(section_ids=sorted(section_ids))
+        # エンコードは通知元（Phase 2/3）のスレッドから投入されるが、
+        # Phase 2/3 の内訳に混ざらないよう作成時点のスパン（あれば）を親にする
+        self._context = contextvars.copy_context()
+        self._scheduled: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix="segment_prefetch"
+        )
+        self._closed = False
+        self.encoded = 0
+        self.failed = 0
+
+    # ----------------------------------------
+    # 通知の受け取り
+    # ----------------------------------------
+
+    def handle(self, event: SectionEvent):
+        """SectionEventBus の購読関数"""
+        # ファイルの読み直しはロックの外で（通知元のフェーズをなるべく待たせない）
+        durations = images = None
+        try:
+            if event.kind == AUDIO_COMPLETE and self.load_audio_durations:
+                durations = self.load_audio_durations()
+            elif event.kind == IMAGES_COMPLETE and self.load_section_images:
+                images = self.load_section_images()
+        except Exception as e:
+            self.logger.warning(f"Segment prefetch: could not reload {event.kind} outputs: {e}")
+
+        with self._lock:
+            if self._closed:
+                return
+            state = self.state
+            if event.kind == AUDIO_READY:
+                state.audio_durations[event.section_id] = event.data["duration"]
+            elif event.kind == IMAGES_READY:
+                state.section_images[event.section_id] = sorted(
+                    (Path(p) for p in event.data.get("paths", [])),
+                    key=lambda p: p.name
+                )
+            elif event.kind == AUDIO_COMPLETE:
+                state.audio_complete = True
+                if durations:
+                    # 出力ファイルの尺を正とする（Phase 7 本体と同じ値）
+                    state.audio_durations = dict(durations)
+                    state.section_ids = sorted(durations)
+            elif event.kind == IMAGES_COMPLETE:
+                state.images_complete = True
+                for section_id, paths in (images or {}).items():
+                    state.section_images.setdefault(section_id, paths)
+            else:
+                return
+            self._schedule_ready()
+
+    def _schedule_ready(self):
+        """揃ったセクションをエンコードに回す（ロック内で呼ぶ）"""
+        for section_id in self.state.section_ids:
+            if section_id in self._scheduled:
+                continue
+            plan = self.plan_section(section_id, self.state)
+            if plan is None:
+                continue
+            self._scheduled[section_id] = submit_in_context(
+                self._executor, self._encode_section, section_id, plan, context=self._context
+            )
+
+    # ----------------------------------------
+    # エンコード
+    # ----------------------------------------
+
+    def _encode_section(self, section_id: int, plan: List[Tuple[Path, float]]):
+        if not plan:
+            return
+        with span("segment_prefetch", section=section_id, segments=len(plan)):
+            self._encode_section_segments(section_id, plan)
+
+    def _encode_section_segments(self, section_id: int, plan: List[Tuple[Path, float]]):
+        try:
+            inputs = self.prepare_inputs([path for path, _ in plan])
+        except Exception as e:
+            self.logger.warning(f"Segment prefetch: section {section_id} preparation failed: {e}")
+            inputs = {}
+
+        for image_path, duration in plan:
+            if self._closed:
+                return
+            try:
+                self.cache.store(inputs.get(image_path, image_path), duration, self.signature, self.encode)
+                with self._lock:
+                    self.encoded += 1
+            except Exception as e:
+                with self._lock:
+                    self.failed += 1
+                self.logger.warning(f"Segment prefetch: {image_path.name} failed: {e}")
+
+        self.logger.info(f"Segment prefetch: section {section_id} ready ({len(plan)} segments)")
+
+    def wait(self) -> Tuple[int, int]:
+        """
+        開始済みのエンコードを待つ
+
+        Returns:
+            (作ったセグメント数, 失敗数)
+        """
+        with self._lock:
+            futures = list(self._scheduled.values())
+        wait(futures)
+        return self.encoded, self.failed
+
+    def close(self):
+        """未開始のエンコードを取り消して終了（実行中のものは終わるまで待つ）"""
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -5,14 +5,32 @@
 """
 
 import json
-import random
 import re
+import os
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional, Any
 
 from ...core.config_manager import ConfigManager
+from ..encoder_profile import EncodeSettings, load_encoder_profile, resolve_encode_settings
+from ..shorts_renderer import RENDER_SOURCES_FILE, save_render_sources
+from ..telemetry import map_in_context, submit_in_context
+from .motion_filters import (
+    DEFAULT_MARGIN,
+    DEFAULT_MOTION_MODE,
+    MAX_ZOOM,
+    MOTION_MODES,
+    ZOOM_SPEED,
+    choose_move,
+    motion_segment_command,
+    render_affine_segment,
+    source_size,
+)
+
+# グラデーション座布団の高さ比率
+GRADIENT_RATIO = 0.35
 
 
 class VideoSegmentGenerator:
@@ -51,7 +69,49 @@ class VideoSegmentGenerator:
         self.working_dir = working_dir
         self.phase_dir = phase_dir
         self.phase_config = phase_config or {}
-        self.encode_preset = encode_preset
+
+        # エンコード設定（ホストのエンコーダープロファイルがあればその値）
+        self.encoder_profile = load_encoder_profile(config, logger)
+        self.final_encode = resolve_encode_settings(
+            config, "final", EncodeSettings(encode_preset, 23), logger
+        )
+        self.intermediate_encode = resolve_encode_settings(
+            config, "intermediate", EncodeSettings(encode_preset, 18), logger
+        )
+        self.encode_preset = self.final_encode.preset
+
+        # チャンク並列エンコード設定
+        perf_config = self.phase_config.get("performance", {})
+        chunked_config = perf_config.get("chunked_encode", {}) or {}
+        self.chunked_encode = chunked_config.get("enabled", False)
+        self.chunk_count = chunked_config.get("chunks", 0)
+        self.min_chunk_duration = chunked_config.get("min_chunk_duration", 30.0)
+        self.fps = self.phase_config.get("output", {}).get("fps", 30)
+
+        # 静的オーバーレイ（グラデーション）を静止画に焼き込む
+        # ※ 焼き込んだグラデーションはズーム・パンに合わせて動く
+        self.bake_overlays = perf_config.get("bake_overlays", False)
+
+        # ズーム・パンの描画方式（motion_filters 参照）
+        effects_config = self.phase_config.get("visual_effects", {}) or {}
+        motion_config = effects_config.get("motion", {}) or {}
+        self.motion_mode = motion_config.get("mode", DEFAULT_MOTION_MODE)
+        self.motion_margin = motion_config.get("margin", DEFAULT_MARGIN)
+        self.zoom_speed = effects_config.get("zoom_speed", ZOOM_SPEED)
+        self.max_zoom = effects_config.get("max_zoom", MAX_ZOOM)
+        if self.motion_mode not in MOTION_MODES:
+            self.logger.warning(f"Unknown motion mode '{self.motion_mode}', using {DEFAULT_MOTION_MODE}")
+            self.motion_mode = DEFAULT_MOTION_MODE
+        if self.motion_mode == "affine":
+            from .frame_server import CV2_AVAILABLE
+            if not CV2_AVAILABLE:
+                self.logger.warning(f"Affine motion requires opencv-python, using {DEFAULT_MOTION_MODE}")
+                self.motion_mode = DEFAULT_MOTION_MODE
+
+        # 音声ステム設定（ナレーション + BGM を映像と並行して事前ミックス）
+        stem_config = perf_config.get("audio_stem", {}) or {}
+        self.use_audio_stem = stem_config.get("enabled", True)
+        self.audio_stem_cache = stem_config.get("cache", True)
 
         # 依存する他のプロセッサ
         from .bgm_processor import BGMProcessor
@@ -70,9 +130,10 @@ class VideoSegmentGenerator:
         self.ffmpeg_builder = FFmpegBuilder(
             config.project_root,
             logger,
-            encode_preset=encode_preset,
-            threads=0,
-            bgm_processor=self.bgm_processor
+            encode_preset=self.final_encode.preset,
+            threads=self.final_encode.threads,
+            bgm_processor=self.bgm_processor,
+            crf=self.final_encode.crf
         )
 
         self.gradient_processor = GradientProcessor(
@@ -80,6 +141,23 @@ class VideoSegmentGenerator:
             working_dir=working_dir
         )
 
+        self.audio_stem_renderer = None
+        if self.use_audio_stem:
+            from .audio_stem import AudioStemRenderer
+
+            stem_cache_dir = None
+            if self.audio_stem_cache:
+                try:
+                    stem_cache_dir = config.get_path("cache_dir") / "audio_stems"
+                except Exception:
+                    stem_cache_dir = None
+            self.audio_stem_renderer = AudioStemRenderer(
+                config.project_root,
+                logger,
+                self.bgm_processor,
+                cache_dir=stem_cache_dir
+            )
+
     def create_video_from_segments(
         self,
         audio_path: Path,
@@ -311,11 +389,29 @@ class VideoSegmentGenerator:
         """
         self.logger.info("🎬 Using segment-based approach for better subtitle sync...")
 
+        # 前回の描画ソースは今回の完成動画と一致しないため先に削除（保存は最終合成の成功後）
+        stale_sources = self.phase_dir / RENDER_SOURCES_FILE
+        if stale_sources.exists():
+            stale_sources.unlink()
+
         # 一時ディレクトリ作成
         temp_dir = Path(tempfile.mkdtemp(prefix="video_segments_"))
         segment_files = []
         concat_list = None
 
+        # 音声ステムはセグメント生成と並行して描画
+        stem_executor = None
+        stem_future = None
+        if self.audio_stem_renderer is not None:
+            stem_executor = ThreadPoolExecutor(max_workers=1)
+            stem_future = submit_in_context(
+                stem_executor,
+                self.audio_stem_renderer.render,
+                audio_path,
+                bgm_data,
+                output_dir=temp_dir
+            )
+
         try:
             # 画像タイミング計算（resolve_image_path は Phase07DataLoader から渡す必要がある）
             # ここでは簡易的に実装
@@ -348,6 +444,11 @@ class VideoSegmentGenerator:
             if not image_timings:
                 raise ValueError("No image timings calculated")
 
+            # グラデーションを静止画に焼き込む（最終合成の overlay を省略）
+            baked_images = {}
+            if self.bake_overlays:
+                baked_images = self._bake_static_overlays(image_timings)
+
             # 各画像をセグメント動画に変換（グラデーションなし）
             self.logger.info(f"Creating {len(image_timings)} video segments...")
             for i, timing in enumerate(image_timings):
@@ -358,8 +459,8 @@ class VideoSegmentGenerator:
                 self.logger.info(f"  [{i+1}/{len(image_timings)}] {img_path.name} ({duration:.2f}s)")
 
                 # ズーム処理でセグメント生成（グラデーションなし）
-                self._create_zoompan_segment(
-                    img_path=img_path,
+                self._create_motion_segment(
+                    img_path=baked_images.get(img_path, img_path),
                     duration=duration,
                     output_path=segment_file,
                     seed=i
@@ -375,13 +476,15 @@ class VideoSegmentGenerator:
                 output_path=concat_list
             )
 
-            # グラデーション画像を生成（最終合成時に使用）
-            gradient_path = self.gradient_processor.create_gradient_image(
-                width=1920,
-                height=1080,
-                gradient_ratio=0.35
-            )
-            self.logger.info(f"🎨 Gradient image ready: {gradient_path.name}")
+            # グラデーション画像を生成（最終合成時に使用、焼き込み済みなら不要）
+            gradient_path = None
+            if not baked_images:
+                gradient_path = self.gradient_processor.create_gradient_image(
+                    width=1920,
+                    height=1080,
+                    gradient_ratio=GRADIENT_RATIO
+                )
+                self.logger.info(f"🎨 Gradient image ready: {gradient_path.name}")
 
             # ASS字幕ファイルのパス（既に生成されている場合はそれを使用、なければNone）
             if ass_path is None:
@@ -394,6 +497,42 @@ class VideoSegmentGenerator:
                     self.logger.warning("⚠️ ASS file not found, video will be created without subtitles")
                     ass_path = None
 
+            audio_stem_path = self._wait_for_audio_stem(stem_future)
+
+            # Shorts 等の再利用向けの描画ソース（完成動画ができてから保存する）
+            render_sources = self._build_render_sources(
+                image_timings=image_timings,
+                audio_path=audio_path,
+                audio_stem_path=audio_stem_path,
+                ass_path=ass_path,
+                gradient_path=gradient_path,
+                baked_images=baked_images,
+                temp_dir=temp_dir
+            )
+
+            # チャンク並列エンコード（失敗時は単一パスへフォールバック）
+            if self.chunked_encode and len(image_timings) > 1:
+                try:
+                    self._render_final_chunked(
+                        segment_files=segment_files,
+                        image_timings=image_timings,
+                        audio_path=audio_path,
+                        ass_path=ass_path,
+                        bgm_data=bgm_data,
+                        gradient_path=gradient_path,
+                        output_path=output_path,
+                        temp_dir=temp_dir,
+                        audio_stem_path=audio_stem_path
+                    )
+                    save_render_sources(
+                        self.phase_dir / RENDER_SOURCES_FILE, render_sources, output_path, self.logger
+                    )
+                    return output_path
+                except Exception as e:
+                    self.logger.warning(
+                        f"⚠️ Chunked encode failed, falling back to single-pass merge: {e}"
+                    )
+
             # 動画を連結 + グラデーション + 音声 + 字幕 + BGM
             cmd = self.ffmpeg_builder.build_ffmpeg_command_optimized(
                 concat_file=concat_list,
@@ -401,22 +540,254 @@ class VideoSegmentGenerator:
                 ass_path=ass_path,
                 output_path=output_path,
                 bgm_data=bgm_data,
-                gradient_path=gradient_path
+                gradient_path=gradient_path,
+                audio_stem_path=audio_stem_path
             )
 
             self.logger.info("🎬 Running final FFmpeg merge...")
             subprocess.run(cmd, check=True, capture_output=True, text=True)
 
             self.logger.info(f"✅ Video created: {output_path}")
+            save_render_sources(
+                self.phase_dir / RENDER_SOURCES_FILE, render_sources, output_path, self.logger
+            )
             return output_path
 
         finally:
+            if stem_executor is not None:
+                stem_executor.shutdown(wait=True)
+
             # クリーンアップ
             if temp_dir.exists():
                 import shutil
                 shutil.rmtree(temp_dir, ignore_errors=True)
 
-    def _create_zoompan_segment(
+    def _bake_static_overlays(self, image_timings: List[dict]) -> Dict[Path, Path]:
+        """
+        グラデーションを各画像に焼き込む
+
+        ズーム処理の入力（描画方式ごとの解像度・中央クロップ）と同じ配置で合成するため、
+        ズーム倍率 1.0 のフレームは最終合成で overlay した場合と一致する。
+
+        Returns:
+            {元画像のパス: 焼き込み済み画像のパス}（失敗時は空）
+        """
+        try:
+            from .overlay_baker import StaticOverlayBaker
+
+            width, height = source_size(self.motion_mode, 1920, 1080, self.motion_margin)
+            baker = StaticOverlayBaker(
+                logger=self.logger,
+                cache_dir=self.working_dir / "04_processed" / ".overlay_cache",
+                width=width,
+                height=height,
+                gradient_ratio=GRADIENT_RATIO,
+                fit="cover"
+            )
+            return baker.bake_many([timing['path'] for timing in image_timings])
+        except Exception as e:
+            self.logger.warning(f"⚠️ Overlay baking failed, using per-frame gradient overlay: {e}")
+            return {}
+
+    def _build_render_sources(
+        self,
+        image_timings: List[dict],
+        audio_path: Path,
+        audio_stem_path: Optional[Path],
+        ass_path: Optional[Path],
+        gradient_path: Optional[Path],
+        baked_images: Dict[Path, Path],
+        temp_dir: Path
+    ) -> Dict[str, Any]:
+        """
+        最終合成の描画ソースを組み立てる
+
+        画像タイミング・音声ステム・ASS字幕を記録しておき、
+        Phase 10（Shorts）が完成動画を再エンコードせずにソースから直接描画できるようにする。
+        一時ディレクトリ内のファイル（キャッシュ無効時のステム）は記録しない。
+        """
+        def persistent(path: Optional[Path]) -> Optional[str]:
+            if path is None or not Path(path).exists():
+                return None
+            resolved = Path(path).resolve()
+            if temp_dir.resolve() in resolved.parents:
+                return None
+            return str(resolved)
+
+        images = []
+        start = 0.0
+        for timing in image_timings:
+            image_path = timing['path']
+            images.append({
+                'path': str(Path(baked_images.get(image_path, image_path)).resolve()),
+                'start': start,
+                'duration': timing['duration'],
+                'section_id': timing.get('section_id'),
+            })
+            start += timing['duration']
+
+        return {
+            'fps': self.fps,
+            'width': 1920,
+            'height': 1080,
+            'total_duration': start,
+            'audio_path': persistent(audio_path),
+            'audio_stem_path': persistent(audio_stem_path),
+            'ass_path': persistent(ass_path),
+            'gradient_path': persistent(gradient_path),
+            'overlays_baked': bool(baked_images),
+            'fit': 'cover',
+            'bar_height': 0,
+            'images': images,
+        }
+
+    def _wait_for_audio_stem(self, stem_future) -> Optional[Path]:
+        """音声ステムの完了を待つ（失敗時は None を返し、従来のインラインミックスに戻す）"""
+        if stem_future is None:
+            return None
+        try:
+            return stem_future.result()
+        except Exception as e:
+            self.logger.warning(f"⚠️ Audio stem unavailable, mixing BGM inline: {e}")
+            return None
+
+    def _resolve_chunk_count(self, num_images: int) -> int:
+        """チャンク数を決定（0 の場合はエンコーダープロファイル、無ければ CPU コア数から自動決定）"""
+        if self.chunk_count and self.chunk_count > 0:
+            return min(self.chunk_count, num_images)
+        if self.encoder_profile and self.encoder_profile.parallel_workers > 0:
+            return max(1, min(self.encoder_profile.parallel_workers, num_images))
+        # x264 は1プロセスでも数スレッドは使うため、1チャンクあたり2コアを目安にする
+        return max(1, min((os.cpu_count() or 2) // 2, num_images))
+
+    def _render_final_chunked(
+        self,
+        segment_files: List[Path],
+        image_timings: List[dict],
+        audio_path: Path,
+        ass_path: Optional[Path],
+        bgm_data: Optional[dict],
+        gradient_path: Optional[Path],
+        output_path: Path,
+        temp_dir: Path,
+        audio_stem_path: Optional[Path] = None
+    ) -> Path:
+        """
+        最終合成をチャンク単位で並列エンコード
+
+        処理フロー:
+        1. タイムラインを画像境界で N 個の時間範囲に分割
+        2. 各チャンクの映像（グラデーション + ASS字幕）を並列に描画
+        3. 全長の音声トラック（ナレーション + BGM）を並行して描画
+        4. チャンク映像を stream copy で連結し、音声と多重化
+
+        Args:
+            segment_files: セグメント動画のリスト
+            image_timings: 画像タイミング情報のリスト
+            audio_path: ナレーション音声
+            ass_path: ASS字幕ファイル
+            bgm_data: BGMデータ
+            gradient_path: グラデーション画像
+            output_path: 出力パス
+            temp_dir: 一時ディレクトリ
+            audio_stem_path: プリミックス済み音声ステム（ない場合はここで音声トラックを描画）
+
+        Returns:
+            最終動画のパス
+        """
+        durations = [timing['duration'] for timing in image_timings]
+        chunks = self.ffmpeg_builder.plan_chunks(
+            durations,
+            self._resolve_chunk_count(len(image_timings)),
+            fps=self.fps,
+            min_chunk_duration=self.min_chunk_duration
+        )
+        if len(chunks) < 2:
+            raise RuntimeError("timeline too short to split into chunks")
+
+        cpu_count = os.cpu_count() or 1
+        threads_per_chunk = max(1, cpu_count // len(chunks))
+        if (self.encoder_profile and self.encoder_profile.threads_per_worker > 0
+                and self.encoder_profile.parallel_workers == len(chunks)):
+            # 計測した並列数どおりに分割できた場合は計測時のスレッド数を使う
+            threads_per_chunk = self.encoder_profile.threads_per_worker
+        audio_duration = self.bgm_processor.get_audio_duration(audio_path)
+
+        self.logger.info(
+            f"🧩 Chunked encode: {len(chunks)} chunks × {threads_per_chunk} threads"
+        )
+
+        # チャンクごとのconcatファイルとコマンドを準備
+        chunk_jobs = []
+        for chunk in chunks:
+            first, last = chunk['first'], chunk['last']
+            chunk_concat = self._create_concat_file_with_duration(
+                segment_files=segment_files[first:last],
+                image_timings=image_timings[first:last],
+                output_path=temp_dir / f"concat_chunk_{chunk['index']:03d}.txt"
+            )
+            chunk_output = temp_dir / f"chunk_{chunk['index']:03d}.mp4"
+            cmd = self.ffmpeg_builder.build_chunk_video_command(
+                concat_file=chunk_concat,
+                ass_path=ass_path,
+                output_path=chunk_output,
+                chunk=chunk,
+                gradient_path=gradient_path,
+                fps=self.fps,
+                threads=threads_per_chunk
+            )
+            chunk_jobs.append((chunk, chunk_output, cmd))
+
+        audio_track = audio_stem_path or temp_dir / "audio_track.m4a"
+        audio_cmd = None
+        if audio_stem_path is None:
+            audio_cmd = self.ffmpeg_builder.build_audio_track_command(
+                audio_path=audio_path,
+                output_path=audio_track,
+                bgm_data=bgm_data,
+                audio_duration=audio_duration
+            )
+
+        def run_chunk(job):
+            chunk, chunk_output, cmd = job
+            if not self._run_ffmpeg_safe(cmd, timeout=1800):
+                raise RuntimeError(f"chunk {chunk['index']} failed")
+            self.logger.info(
+                f"  ✓ chunk {chunk['index'] + 1}/{len(chunks)} "
+                f"({chunk['start']:.1f}s +{chunk['duration']:.1f}s)"
+            )
+            return chunk_output
+
+        # 音声トラック（ステムがない場合）はチャンクと並行して描画
+        with ThreadPoolExecutor(max_workers=len(chunks) + 1) as executor:
+            audio_future = (
+                submit_in_context(executor, self._run_ffmpeg_safe, audio_cmd, 1800) if audio_cmd else None
+            )
+            chunk_outputs = map_in_context(executor, run_chunk, chunk_jobs)
+            if audio_future is not None and not audio_future.result():
+                raise RuntimeError("audio track render failed")
+
+        # stream copy で連結 + 多重化
+        chunk_list = temp_dir / "concat_chunks.txt"
+        with open(chunk_list, 'w', encoding='utf-8') as f:
+            for chunk_output in chunk_outputs:
+                path_str = str(chunk_output.resolve()).replace('\\', '/').replace("'", "'\\''")
+                f.write(f"file '{path_str}'\n")
+
+        mux_cmd = self.ffmpeg_builder.build_chunk_concat_mux_command(
+            chunk_list_file=chunk_list,
+            audio_track_path=audio_track,
+            output_path=output_path,
+            audio_duration=audio_duration
+        )
+        self.logger.info("🎬 Concatenating chunks (stream copy)...")
+        if not self._run_ffmpeg_safe(mux_cmd, timeout=600):
+            raise RuntimeError("chunk concat/mux failed")
+
+        self.logger.info(f"✅ Video created (chunked): {output_path}")
+        return output_path
+
+    def _create_motion_segment(
         self,
         img_path: Path,
         duration: float,
@@ -424,7 +795,10 @@ class VideoSegmentGenerator:
         seed: int
     ):
         """
-        4Kズーム処理（グラデーションなし）
+        ズーム・パン付きのセグメントを生成（グラデーションなし）
+
+        描画方式は visual_effects.motion.mode（zoompan_4k / margin / affine）。
+        動きの種類は seed から決まり、どの方式でも同じになる。
 
         Args:
             img_path: 画像ファイルのパス
@@ -432,50 +806,32 @@ class VideoSegmentGenerator:
             output_path: 出力パス
             seed: ランダムシード
         """
-        random.seed(seed)
-        move_type = random.choice(["zoom_in", "zoom_out", "pan_right", "pan_left"])
-
-        fps = 30
-        frames = int(duration * fps)
-        zoom_speed = 0.0003
-
-        # 4K処理用フィルタ
-        scale_4k = "scale=3840:2160:force_original_aspect_ratio=increase,crop=3840:2160"
-
-        if move_type == "zoom_in":
-            z_expr = f"z='min(zoom+{zoom_speed},{1.15})'"
-            pos = "x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)'"
-        elif move_type == "zoom_out":
-            z_expr = f"z='if(eq(on,0),{1.15},max(zoom-{zoom_speed},1.0))'"
-            pos = "x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)'"
-        elif move_type == "pan_right":
-            x_expr = f"x='(iw-iw/zoom)*(on/{frames})'"
-            z_expr = "z='1.1'"
-            pos = f"{x_expr}:y='ih/2-(ih/zoom/2)'"
-        else:  # pan_left
-            x_expr = f"x='(iw-iw/zoom)*(1-on/{frames})'"
-            z_expr = "z='1.1'"
-            pos = f"{x_expr}:y='ih/2-(ih/zoom/2)'"
-
-        filter_complex = (
-            # 背景: 軽量擬似ブラー (1920 -> 192 -> 1920)
-            f"[0:v]scale=192:108,scale=1920:1080:flags=bicubic,eq=brightness=-0.3[bg];"
-            # 前景: 4Kアップスケール -> Zoompan -> 1080pダウンコンバート
-            f"[0:v]{scale_4k},zoompan={z_expr}:d={frames}:{pos}:s=3840x2160:fps={fps},scale=1920:1080[fg];"
-            # 合成
-            "[bg][fg]overlay=(W-w)/2:(H-h)/2,format=yuv420p[out]"
-        )
+        move = choose_move(seed)
+        encode_args = ['-c:v', 'libx264', *self.intermediate_encode.video_args()]
 
-        cmd = [
-            'ffmpeg', '-y',
-            '-loop', '1', '-i', str(img_path),
-            '-t', f"{duration:.6f}",
-            '-filter_complex', filter_complex,
-            '-map', '[out]',
-            '-c:v', 'libx264', '-preset', self.encode_preset, '-crf', '18',
-            '-pix_fmt', 'yuv420p', '-r', '30',
-            str(output_path)
-        ]
+        if self.motion_mode == "affine":
+            try:
+                render_affine_segment(
+                    img_path, duration, output_path, move,
+                    fps=self.fps,
+                    zoom_speed=self.zoom_speed,
+                    max_zoom=self.max_zoom,
+                    encode_args=encode_args,
+                    logger=self.logger
+                )
+                return
+            except Exception as e:
+                raise RuntimeError(f"Failed to create affine segment: {img_path.name}: {e}") from e
+
+        cmd = motion_segment_command(
+            img_path, duration, output_path, move,
+            mode=self.motion_mode,
+            fps=self.fps,
+            margin=self.motion_margin,
+            zoom_speed=self.zoom_speed,
+            max_zoom=self.max_zoom,
+            encode_args=encode_args
+        )
 
         if not self._run_ffmpeg_safe(cmd, timeout=300):
             raise RuntimeError(f"Failed to create zoom segment: {img_path.name}")
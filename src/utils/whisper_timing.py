@@ -2,25 +2,64 @@
 Whisperを使用して音声から単語レベルのタイミング情報を取得するユーティリティ
 """
 
+import importlib
+import importlib.util
 import json
 import logging
+import threading
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 import tempfile
 
-try:
-    import whisper
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
-    whisper = None
+# whisper / stable_whisper は import に torch を伴い数秒かかるため、
+# ここでは有無だけを調べ、モデルを読み込むときに import する
+WHISPER_AVAILABLE = importlib.util.find_spec("whisper") is not None
+STABLE_WHISPER_AVAILABLE = importlib.util.find_spec("stable_whisper") is not None
 
-try:
-    import stable_whisper
-    STABLE_WHISPER_AVAILABLE = True
-except ImportError:
-    STABLE_WHISPER_AVAILABLE = False
-    stable_whisper = None
+
+def __getattr__(name: str):
+    """whisper_timing.whisper / whisper_timing.stable_whisper を初回参照時に import"""
+    if name in ("whisper", "stable_whisper"):
+        available = WHISPER_AVAILABLE if name == "whisper" else STABLE_WHISPER_AVAILABLE
+        module = importlib.import_module(name) if available else None
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# 読み込み済みモデル（プロセス内で共有。常駐ワーカーではジョブをまたいで再利用する）
+_model_cache: Dict[Tuple[str, str, str], Any] = {}
+_model_cache_lock = threading.Lock()
+
+
+def load_whisper_model(model_name: str, use_stable_ts: bool = True, device: Optional[str] = None):
+    """
+    Whisper / stable-ts モデルを読み込む（同じモデル・デバイスはプロセス内で1回だけ）
+
+    Args:
+        model_name: Whisperモデル名
+        use_stable_ts: stable-ts のモデルを読み込むか
+        device: "cuda" / "cpu"（省略時は自動検出）
+
+    Returns:
+        モデル（推論でモデルの状態は変わらないので複数の呼び出し元で共有する）
+    """
+    import torch
+    if device is None:
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+
+    module_name = "stable_whisper" if use_stable_ts else "whisper"
+    key = (module_name, model_name, device)
+    with _model_cache_lock:
+        if key not in _model_cache:
+            _model_cache[key] = importlib.import_module(module_name).load_model(model_name, device=device)
+        return _model_cache[key]
+
+
+# タイミング取得方式
+# - transcribe: 音声認識 → 認識テキストを元テキストにDTWで再アライメント
+# - align: 既知の台本テキストを音声に直接強制アライメント（デコードなし、stable-ts必須）
+TIMING_BACKENDS = ("transcribe", "align")
+DEFAULT_TIMING_BACKEND = "transcribe"
 
 
 class WhisperTimingExtractor:
@@ -34,7 +73,8 @@ class WhisperTimingExtractor:
         use_stable_ts: bool = True,
         suppress_silence: bool = True,
         vad: bool = True,
-        vad_threshold: float = 0.35
+        vad_threshold: float = 0.35,
+        backend: str = DEFAULT_TIMING_BACKEND
     ):
         """
         初期化
@@ -47,6 +87,7 @@ class WhisperTimingExtractor:
             suppress_silence: 無音区間を抑制するか（stable-ts使用時のみ）
             vad: Voice Activity Detectionを使用するか（stable-ts使用時のみ）
             vad_threshold: VADの閾値（0-1、低いほど厳格）
+            backend: タイミング取得方式（"transcribe" または "align"）
         """
         if not WHISPER_AVAILABLE:
             raise ImportError(
@@ -61,6 +102,13 @@ class WhisperTimingExtractor:
         self.vad = vad
         self.vad_threshold = vad_threshold
 
+        if backend not in TIMING_BACKENDS:
+            self.logger.warning(
+                f"Unknown whisper backend '{backend}', using '{DEFAULT_TIMING_BACKEND}'"
+            )
+            backend = DEFAULT_TIMING_BACKEND
+        self.backend = backend
+
         # stable-tsが利用可能だが、インストールされていない場合は警告
         if use_stable_ts and not STABLE_WHISPER_AVAILABLE:
             self.logger.warning(
@@ -69,6 +117,13 @@ class WhisperTimingExtractor:
             )
             self.use_stable_ts = False
 
+        # 強制アライメントは stable-ts の model.align() を使う
+        if self.backend == "align" and not self.use_stable_ts:
+            self.logger.warning(
+                "Forced alignment requires stable-ts. Falling back to transcribe backend."
+            )
+            self.backend = "transcribe"
+
         model_type = "stable-ts" if self.use_stable_ts else "Whisper"
         self.logger.info(f"Loading {model_type} model: {model_name}")
 
@@ -77,16 +132,13 @@ class WhisperTimingExtractor:
             import torch
             device = "cuda" if torch.cuda.is_available() else "cpu"
 
+            self.model = load_whisper_model(model_name, use_stable_ts=self.use_stable_ts, device=device)
             if self.use_stable_ts:
-                # stable-tsモデルをロード
-                self.model = stable_whisper.load_model(model_name, device=device)
                 self.logger.info(
                     f"stable-ts model loaded successfully on {device} "
                     f"(suppress_silence={suppress_silence}, vad={vad})"
                 )
             else:
-                # 標準Whisperモデルをロード
-                self.model = whisper.load_model(model_name, device=device)
                 self.logger.info(f"Whisper model loaded successfully on {device}")
         except Exception as e:
             self.logger.error(f"Failed to load model: {e}")
@@ -120,7 +172,14 @@ class WhisperTimingExtractor:
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
         
         self.logger.info(f"Extracting word timings from: {audio_path}")
-        
+
+        # 🔥 台本テキストが分かっている場合は認識（デコード）せずに直接アライメント
+        if text and self.backend == "align":
+            aligned_timings = self.align_known_text(audio_path, text)
+            if aligned_timings is not None:
+                return aligned_timings
+            self.logger.warning("Forced alignment failed, falling back to transcription")
+
         try:
             # Whisperで音声認識（word_timestamps=Trueで単語レベルのタイミングを取得）
             # CPUではFP16が使えないため、fp16=Falseを明示的に指定
@@ -265,6 +324,81 @@ class WhisperTimingExtractor:
             self.logger.error(f"Failed to extract word timings: {e}", exc_info=True)
             raise
     
+    def align_known_text(
+        self,
+        audio_path: Path,
+        text: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        既知のテキストを音声に強制アライメントし、文字単位のタイミングを取得
+
+        stable-ts の model.align() でエンコーダ出力のクロスアテンションから
+        各トークンの位置を求める。ビームサーチや温度フォールバックによる
+        デコードを行わないため transcribe より速く、固有名詞の誤認識もない。
+
+        Args:
+            audio_path: 音声ファイルのパス
+            text: 音声合成に使った元のテキスト
+
+        Returns:
+            元のテキストの各文字のタイミング情報
+            （align_text_with_whisper_timings と同じ形式）。失敗時はNone
+        """
+        if not audio_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        self.logger.info(f"Forced-aligning {len(text)} chars to: {audio_path}")
+        return self.align_audio(str(audio_path), text)
+
+    def align_audio(
+        self,
+        audio: Any,
+        text: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        既知のテキストを音声に強制アライメント（align_known_text の本体）
+
+        Args:
+            audio: 音声ファイルのパス文字列、または 16kHz モノラルの波形（numpy配列）
+            text: 音声に含まれるテキスト
+
+        Returns:
+            元のテキストの各文字のタイミング情報（音声先頭からの秒）。失敗時はNone
+        """
+        try:
+            result = self.model.align(
+                audio,
+                text,
+                language=self.language,
+                suppress_silence=self.suppress_silence,
+                vad=self.vad,
+                vad_threshold=self.vad_threshold
+            )
+        except Exception as e:
+            self.logger.warning(f"Forced alignment error: {e}")
+            return None
+
+        if result is None or not result.segments:
+            return None
+
+        word_timings = []
+        for segment in result.segments:
+            for word in getattr(segment, 'words', None) or []:
+                word_timings.append({
+                    "word": word.word.strip(),
+                    "start": word.start,
+                    "end": word.end,
+                    "probability": getattr(word, 'probability', 1.0)
+                })
+
+        aligned_timings = char_timings_from_aligned_words(text, word_timings)
+        self.logger.info(
+            f"✓ Forced alignment complete: {len(word_timings)} tokens, "
+            f"{len(aligned_timings)} characters "
+            f"(duration: {result.segments[-1].end:.1f}s)"
+        )
+        return aligned_timings
+
     def extract_sentence_timings(
         self,
         audio_path: Path,
@@ -581,6 +715,63 @@ def align_text_with_whisper_timings(
     return aligned_timings
 
 
+def char_timings_from_aligned_words(
+    original_text: str,
+    word_timings: List[Dict[str, Any]],
+    max_skip: int = 8
+) -> List[Dict[str, Any]]:
+    """
+    強制アライメントの単語タイミングを元テキストの文字タイミングに展開
+
+    強制アライメントの単語は元テキストをそのまま分割したものなので、
+    DTWは不要で先頭から順に照合するだけでよい。単語内の文字は均等に配分し、
+    単語に含まれない文字（空白・一部の句読点）は直前の終了時刻で瞬間表示にする。
+
+    Args:
+        original_text: 元のテキスト
+        word_timings: 強制アライメントの単語タイミング
+        max_skip: 照合時に読み飛ばす元テキスト文字数の上限
+
+    Returns:
+        元のテキストの各文字のタイミング情報
+    """
+    timings: List[Optional[Dict[str, Any]]] = [None] * len(original_text)
+    pos = 0
+
+    for word_info in word_timings:
+        word = word_info.get("word", "")
+        if not word:
+            continue
+        start = float(word_info.get("start", 0.0))
+        end = float(word_info.get("end", start))
+        probability = word_info.get("probability", 1.0)
+        char_duration = (end - start) / len(word)
+
+        for k, char in enumerate(word):
+            # 元テキスト上の位置を探す（トークナイザが落とした文字は読み飛ばす）
+            found = original_text.find(char, pos, pos + max_skip + 1)
+            if found < 0:
+                continue
+            timings[found] = {
+                "word": char,
+                "start": start + k * char_duration,
+                "end": start + (k + 1) * char_duration,
+                "probability": probability
+            }
+            pos = found + 1
+
+    # アライメントされなかった文字は直前の終了時刻で埋める
+    aligned_timings = []
+    last_end = 0.0
+    for char, timing in zip(original_text, timings):
+        if timing is None:
+            timing = {"word": char, "start": last_end, "end": last_end, "probability": 0.5}
+        aligned_timings.append(timing)
+        last_end = timing["end"]
+
+    return aligned_timings
+
+
 def create_whisper_extractor(
     model_name: str = "base",
     logger: Optional[logging.Logger] = None,
@@ -588,7 +779,8 @@ def create_whisper_extractor(
     use_stable_ts: bool = True,
     suppress_silence: bool = True,
     vad: bool = True,
-    vad_threshold: float = 0.35
+    vad_threshold: float = 0.35,
+    backend: str = DEFAULT_TIMING_BACKEND
 ) -> Optional[WhisperTimingExtractor]:
     """
     WhisperTimingExtractorを作成
@@ -601,6 +793,7 @@ def create_whisper_extractor(
         suppress_silence: 無音区間を抑制するか（stable-ts使用時のみ）
         vad: Voice Activity Detectionを使用するか（stable-ts使用時のみ）
         vad_threshold: VADの閾値（0-1、低いほど厳格）
+        backend: タイミング取得方式（"transcribe" または "align"）
 
     Returns:
         WhisperTimingExtractor（利用不可の場合はNone）
@@ -620,7 +813,8 @@ def create_whisper_extractor(
             use_stable_ts=use_stable_ts,
             suppress_silence=suppress_silence,
             vad=vad,
-            vad_threshold=vad_threshold
+            vad_threshold=vad_threshold,
+            backend=backend
         )
     except Exception as e:
         if logger:
@@ -8,7 +8,8 @@ import json
 import os
 from typing import Dict, Any, Optional
 import logging
-from anthropic import Anthropic
+
+from .llm_gateway import get_llm_gateway
 
 
 class YouTubeMetadataGenerator:
@@ -34,7 +35,7 @@ class YouTubeMetadataGenerator:
         if not api_key:
             raise ValueError("CLAUDE_API_KEY environment variable not set")
 
-        self.client = Anthropic(api_key=api_key)
+        self.llm = get_llm_gateway(api_key)
 
         # 設定値を取得
         self.model = config.get("model", "claude-sonnet-4-20250514")
@@ -82,7 +83,7 @@ class YouTubeMetadataGenerator:
 
         try:
             # Claude APIを呼び出し
-            response = self.client.messages.create(
+            response = self.llm.create(
                 model=self.model,
                 max_tokens=self.max_tokens,
                 temperature=self.temperature,
@@ -92,7 +93,8 @@ class YouTubeMetadataGenerator:
                         "role": "user",
                         "content": user_prompt
                     }
-                ]
+                ],
+                caller="YouTubeMetadataGenerator"
             )
 
             # レスポンスからテキストを取得
@@ -0,0 +1,772 @@
+"""
+YouTube 再開可能アップロードエンジン
+
+YouTube Data API の resumable upload プロトコルを直接扱い、
+Phase 9（本編）と Phase 10（Shorts）のアップロードを共通化する。
+
+- セッションURIをファイルに保存し、プロセスが落ちても続きから再開
+- 実測スループットに合わせてチャンクサイズを調整（256KiB 単位）
+- 5xx / 429 / 通信エラーは指数バックオフ（ジッター付き）で再試行し、
+  再試行前にサーバーが受け取り済みのオフセットを問い合わせる
+- 日次 Quota 予算をファイルで共有し（別プロセスのワーカーともファイルロックで排他）、
+  超える場合はアップロードを開始しない
+- 複数クリップを並列にアップロード（メタデータは呼び出し側で先読み可能）
+
+upload_url とセッションを差し替えれば、ローカルの偽エンドポイント
+（benchmarks/stub_servers.py の FakeYouTubeUploadServer）に対して動作確認できる。
+
+使用例:
+    uploader = ResumableUploader(
+        session_factory=lambda: AuthorizedSession(creds),
+        logger=logger,
+        session_store=UploadSessionStore(cache_dir / "youtube_upload_sessions.json"),
+        quota=QuotaBudget(10000, cache_dir / "youtube_quota.json")
+    )
+    response = uploader.upload(video_path, body)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+from ..core.exceptions import YouTubeQuotaExceededError, YouTubeUploadError
+from .telemetry import map_in_context
+
+YOUTUBE_UPLOAD_URL = "https://www.googleapis.com/upload/youtube/v3/videos"
+
+# resumable upload のチャンクは 256KiB の倍数（最後のチャンクを除く）
+CHUNK_ALIGNMENT = 256 * 1024
+
+# YouTube Data API v3 の Quota コスト
+QUOTA_COSTS = {
+    "videos.insert": 1600,
+    "thumbnails.set": 50,
+}
+
+# 再試行するHTTPステータス
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# セッションURIの有効期限（YouTube は約1週間。余裕を見て短めにする）
+DEFAULT_SESSION_MAX_AGE_HOURS = 144
+
+MB = 1024 * 1024
+
+
+def _align(size: int) -> int:
+    return max(CHUNK_ALIGNMENT, size // CHUNK_ALIGNMENT * CHUNK_ALIGNMENT)
+
+
+def _write_json_atomic(path: Path, data: Any):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """
+    path の隣のロックファイル（<name>.lock）で別プロセスと排他する
+
+    serve --workers N のワーカープロセスが同じ状態ファイルを読み書きするため、
+    スレッドのロックだけでは更新が失われる。
+    """
+    lock_path = path.with_name(path.name + ".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# ========================================
+# Quota 予算
+# ========================================
+
+class QuotaBudget:
+    """
+    YouTube Data API の日次 Quota 予算
+
+    使用量は state_path に日付ごとに保存し、Phase 9 / 10 で共有する。
+    読み込み〜保存はスレッドのロックとファイルロックの両方で囲み、
+    別プロセス（serve のワーカー）の同時確保でも更新が失われない。
+    日付は Quota がリセットされる太平洋時間で数える。
+    """
+
+    def __init__(
+        self,
+        daily_limit: int = 10000,
+        state_path: Optional[Path] = None,
+        alert_threshold: Optional[int] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Args:
+            daily_limit: 1日の Quota 上限
+            state_path: 使用量の保存先（None の場合はプロセス内のみ）
+            alert_threshold: この使用量を超えたら警告
+            logger: ロガー
+        """
+        self.daily_limit = daily_limit
+        self.state_path = Path(state_path) if state_path else None
+        self.alert_threshold = alert_threshold
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._memory: Dict[str, int] = {}
+
+    @staticmethod
+    def _today() -> str:
+        try:
+            from zoneinfo import ZoneInfo
+            return datetime.now(ZoneInfo("America/Los_Angeles")).date().isoformat()
+        except Exception:
+            return (datetime.now(timezone.utc) - timedelta(hours=8)).date().isoformat()
+
+    def _load(self) -> Dict[str, int]:
+        if self.state_path is None:
+            return dict(self._memory)
+        if not self.state_path.exists():
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get("used", {})
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save(self, used: Dict[str, int]):
+        # 直近の日付だけ残す
+        used = dict(sorted(used.items())[-7:])
+        if self.state_path is None:
+            self._memory = used
+            return
+        _write_json_atomic(self.state_path, {"daily_limit": self.daily_limit, "used": used})
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """使用量の読み込み〜保存を排他（プロセス内はスレッドロック、プロセス間はファイルロック）"""
+        with self._lock:
+            if self.state_path is None:
+                yield
+            else:
+                with _file_lock(self.state_path):
+                    yield
+
+    @property
+    def used(self) -> int:
+        with self._exclusive():
+            return self._load().get(self._today(), 0)
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.daily_limit - self.used)
+
+    def reserve(self, units: int, label: str = "") -> int:
+        """
+        Quota を確保（足りなければ YouTubeQuotaExceededError）
+
+        Returns:
+            確保後の当日使用量
+        """
+        with self._exclusive():
+            used = self._load()
+            today = self._today()
+            current = used.get(today, 0)
+            if current + units > self.daily_limit:
+                raise YouTubeQuotaExceededError(units, max(0, self.daily_limit - current))
+            used[today] = current + units
+            self._save(used)
+
+        total = current + units
+        if self.alert_threshold and current < self.alert_threshold <= total:
+            self.logger.warning(
+                f"⚠️ YouTube quota usage {total}/{self.daily_limit} units "
+                f"(alert threshold {self.alert_threshold})"
+            )
+        self.logger.debug(f"Quota reserved: {units} units for {label or 'request'} ({total}/{self.daily_limit})")
+        return total
+
+    def refund(self, units: int):
+        """確保したが API を呼ばなかった分を戻す"""
+        with self._exclusive():
+            used = self._load()
+            today = self._today()
+            used[today] = max(0, used.get(today, 0) - units)
+            self._save(used)
+
+
+# ========================================
+# セッションの永続化
+# ========================================
+
+class UploadSessionStore:
+    """
+    resumable upload のセッションURIをファイルに保存
+
+    キーはファイル（パス・サイズ・更新時刻）とリクエスト内容のハッシュ。
+    同じ動画を同じメタデータで再実行すると、前回のセッションから再開する。
+    """
+
+    def __init__(self, path: Path, max_age_hours: float = DEFAULT_SESSION_MAX_AGE_HOURS):
+        self.path = Path(path)
+        self.max_age = timedelta(hours=max_age_hours)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(file_path: Path, body: Dict[str, Any], part: str) -> str:
+        stat = Path(file_path).stat()
+        payload = json.dumps(
+            {
+                "file": str(Path(file_path).resolve()),
+                "size": stat.st_size,
+                "mtime": stat.st_mtime_ns,
+                "body": body,
+                "part": part,
+            },
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def get(self, key: str) -> Optional[str]:
+        """有効なセッションURIを取得（期限切れは None）"""
+        with self._lock:
+            entry = self._load().get(key)
+        if not entry:
+            return None
+        try:
+            created = datetime.fromisoformat(entry["created_at"])
+        except (KeyError, ValueError):
+            return None
+        if datetime.now() - created > self.max_age:
+            return None
+        return entry.get("session_uri")
+
+    def put(self, key: str, session_uri: str, file_path: Path, size: int):
+        with self._lock:
+            sessions = self._load()
+            now = datetime.now()
+            sessions = {
+                k: v for k, v in sessions.items()
+                if now - datetime.fromisoformat(v.get("created_at", now.isoformat())) <= self.max_age
+            }
+            sessions[key] = {
+                "session_uri": session_uri,
+                "file": str(file_path),
+                "size": size,
+                "created_at": now.isoformat(),
+            }
+            _write_json_atomic(self.path, sessions)
+
+    def remove(self, key: str):
+        with self._lock:
+            sessions = self._load()
+            if sessions.pop(key, None) is not None:
+                _write_json_atomic(self.path, sessions)
+
+
+# ========================================
+# チャンクサイズの調整
+# ========================================
+
+class AdaptiveChunker:
+    """
+    実測スループットからチャンクサイズを決める
+
+    1チャンクの送信時間が target_seconds 前後になるよう調整する。
+    失敗時は半分に縮め、回線が不安定なときの再送量を抑える。
+    """
+
+    def __init__(
+        self,
+        initial_size: int = 8 * MB,
+        min_size: int = CHUNK_ALIGNMENT,
+        max_size: int = 64 * MB,
+        target_seconds: float = 8.0
+    ):
+        self.min_size = _align(min_size)
+        self.max_size = max(self.min_size, _align(max_size))
+        self.target_seconds = target_seconds
+        self._size = min(self.max_size, max(self.min_size, _align(initial_size)))
+        self._throughput: Optional[float] = None
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def record(self, sent_bytes: int, seconds: float):
+        """送信結果を反映（スループットは指数移動平均）"""
+        if sent_bytes <= 0 or seconds <= 0:
+            return
+        throughput = sent_bytes / seconds
+        if self._throughput is None:
+            self._throughput = throughput
+        else:
+            self._throughput = 0.7 * self._throughput + 0.3 * throughput
+        target = int(self._throughput * self.target_seconds)
+        # 1回で最大2倍までしか増やさない
+        target = min(target, self._size * 2)
+        self._size = min(self.max_size, max(self.min_size, _align(target)))
+
+    def shrink(self):
+        self._size = max(self.min_size, _align(self._size // 2))
+
+
+# ========================================
+# アップロード
+# ========================================
+
+@dataclass
+class UploadJob:
+    """
+    アップロード1件
+
+    body は dict またはそれを返す関数（先読み中のメタデータを待つ場合など）。
+    関数はアップロードを担当するスレッドで呼ばれる。
+    """
+    file_path: Path
+    body: Union[Dict[str, Any], Callable[[], Dict[str, Any]]]
+    part: str = "snippet,status"
+    label: str = ""
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+class ResumableUploader:
+    """
+    YouTube resumable upload の実行
+
+    session_factory はスレッドごとに1回呼ばれ、requests.Session 互換の
+    オブジェクト（本番は google.auth の AuthorizedSession）を返す。
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        logger: Optional[logging.Logger] = None,
+        upload_url: str = YOUTUBE_UPLOAD_URL,
+        session_store: Optional[UploadSessionStore] = None,
+        quota: Optional[QuotaBudget] = None,
+        initial_chunk_size: int = 8 * MB,
+        min_chunk_size: int = CHUNK_ALIGNMENT,
+        max_chunk_size: int = 64 * MB,
+        target_chunk_seconds: float = 8.0,
+        max_retries: int = 8,
+        backoff_base: float = 1.0,
+        backoff_max: float = 64.0,
+        timeout: float = 300.0,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            session_factory: HTTPセッションを作る関数
+            logger: ロガー
+            upload_url: videos.insert のアップロードURL（偽エンドポイントに差し替え可能）
+            session_store: セッションURIの保存先（None の場合は再開しない）
+            quota: Quota 予算（None の場合は管理しない）
+            initial_chunk_size: 初回のチャンクサイズ（バイト）
+            min_chunk_size: 最小チャンクサイズ
+            max_chunk_size: 最大チャンクサイズ
+            target_chunk_seconds: 1チャンクの目標送信時間
+            max_retries: 連続失敗の上限
+            backoff_base: バックオフの初期待ち時間（秒）
+            backoff_max: バックオフの最大待ち時間（秒）
+            timeout: 1リクエストのタイムアウト（秒）
+            sleep: 待機関数（テスト用に差し替え可能）
+        """
+        if not REQUESTS_AVAILABLE:
+            raise ImportError("requests is required for ResumableUploader")
+
+        self.session_factory = session_factory
+        self.logger = logger or logging.getLogger(__name__)
+        self.upload_url = upload_url
+        self.session_store = session_store
+        self.quota = quota
+        self.chunk_settings = {
+            "initial_size": initial_chunk_size,
+            "min_size": min_chunk_size,
+            "max_size": max_chunk_size,
+            "target_seconds": target_chunk_seconds,
+        }
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.sleep = sleep
+        self._local = threading.local()
+
+    # ----------------------------------------
+    # HTTP
+    # ----------------------------------------
+
+    @property
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self.session_factory()
+            self._local.session = session
+        return session
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return delay * (0.5 + random.random() / 2)
+
+    @staticmethod
+    def _parse_range(response) -> int:
+        """308 応答の Range ヘッダから次の送信開始位置を得る"""
+        value = response.headers.get("Range")
+        if not value:
+            return 0
+        # "bytes=0-12345"
+        return int(value.split("-")[-1]) + 1
+
+    @staticmethod
+    def _is_quota_error(response) -> bool:
+        if response.status_code != 403:
+            return False
+        text = response.text or ""
+        return "quotaExceeded" in text or "dailyLimitExceeded" in text
+
+    def _start_session(self, file_path: Path, size: int, body: Dict[str, Any], part: str) -> str:
+        """アップロードセッションを開始してセッションURIを得る"""
+        attempt = 0
+        while True:
+            try:
+                response = self._session.post(
+                    self.upload_url,
+                    params={"uploadType": "resumable", "part": part},
+                    json=body,
+                    headers={
+                        "X-Upload-Content-Length": str(size),
+                        "X-Upload-Content-Type": "video/mp4",
+                    },
+                    timeout=self.timeout
+                )
+            except requests.RequestException as e:
+                response = None
+                error = str(e)
+            else:
+                if response.status_code in (200, 201) and response.headers.get("Location"):
+                    return response.headers["Location"]
+                if self._is_quota_error(response):
+                    raise YouTubeQuotaExceededError(QUOTA_COSTS["videos.insert"], 0)
+                error = f"HTTP {response.status_code}: {(response.text or '')[:300]}"
+                if response.status_code not in RETRYABLE_STATUS:
+                    raise YouTubeUploadError(f"Failed to start upload session: {error}", response.status_code)
+
+            attempt += 1
+            if attempt > self.max_retries:
+                raise YouTubeUploadError(f"Failed to start upload session after {attempt} attempts: {error}")
+            delay = self._backoff(attempt)
+            self.logger.warning(f"Upload session start failed ({error}), retrying in {delay:.1f}s...")
+            self.sleep(delay)
+
+    def _query_offset(self, session_uri: str, size: int) -> Union[int, Dict[str, Any], None]:
+        """
+        サーバーが受け取り済みのバイト数を問い合わせる
+
+        Returns:
+            次の送信開始位置 / 完了済みなら応答JSON / セッション失効なら None
+        """
+        attempt = 0
+        while True:
+            try:
+                response = self._session.put(
+                    session_uri,
+                    headers={"Content-Range": f"bytes */{size}", "Content-Length": "0"},
+                    timeout=self.timeout
+                )
+            except requests.RequestException as e:
+                response = None
+                error = str(e)
+            else:
+                if response.status_code == 308:
+                    return self._parse_range(response)
+                if response.status_code in (200, 201):
+                    return response.json()
+                if response.status_code in (404, 410):
+                    return None
+                error = f"HTTP {response.status_code}"
+                if response.status_code not in RETRYABLE_STATUS:
+                    raise YouTubeUploadError(f"Upload status query failed: {error}", response.status_code)
+
+            attempt += 1
+            if attempt > self.max_retries:
+                raise YouTubeUploadError(f"Upload status query failed after {attempt} attempts: {error}")
+            self.sleep(self._backoff(attempt))
+
+    # ----------------------------------------
+    # アップロード
+    # ----------------------------------------
+
+    def upload(
+        self,
+        file_path: Path,
+        body: Dict[str, Any],
+        part: str = "snippet,status",
+        label: str = "",
+        progress: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        1ファイルをアップロード（保存済みセッションがあれば続きから）
+
+        Args:
+            file_path: 動画ファイル
+            body: videos.insert のリクエストボディ
+            part: videos.insert の part
+            label: ログ用の名前
+            progress: 進捗コールバック（送信済みバイト, 全体バイト）
+
+        Returns:
+            videos.insert の応答JSON（"id" を含む）
+        """
+        file_path = Path(file_path)
+        label = label or file_path.name
+        size = file_path.stat().st_size
+        key = UploadSessionStore.key_for(file_path, body, part) if self.session_store else None
+        chunker = AdaptiveChunker(**self.chunk_settings)
+
+        session_uri = self.session_store.get(key) if self.session_store else None
+        offset = 0
+        if session_uri:
+            state = self._query_offset(session_uri, size)
+            if isinstance(state, dict):
+                self.logger.info(f"✓ {label}: already uploaded in a previous run")
+                self.session_store.remove(key)
+                return state
+            if state is None:
+                self.logger.info(f"{label}: saved upload session expired, starting over")
+                self.session_store.remove(key)
+                session_uri = None
+            else:
+                offset = state
+                self.logger.info(f"↻ {label}: resuming upload at {offset / MB:.1f}/{size / MB:.1f}MB")
+
+        restarts = 0
+        attempt = 0
+        with open(file_path, 'rb') as f:
+            while True:
+                if session_uri is None:
+                    if self.quota is not None:
+                        self.quota.reserve(QUOTA_COSTS["videos.insert"], label)
+                    try:
+                        session_uri = self._start_session(file_path, size, body, part)
+                    except Exception:
+                        if self.quota is not None:
+                            self.quota.refund(QUOTA_COSTS["videos.insert"])
+                        raise
+                    if self.session_store:
+                        self.session_store.put(key, session_uri, file_path, size)
+                    offset = 0
+
+                f.seek(offset)
+                data = f.read(chunker.size)
+                end = offset + len(data) - 1
+                headers = {"Content-Length": str(len(data))}
+                headers["Content-Range"] = f"bytes {offset}-{end}/{size}" if data else f"bytes */{size}"
+
+                started = time.perf_counter()
+                try:
+                    response = self._session.put(session_uri, data=data, headers=headers, timeout=self.timeout)
+                    status_code = response.status_code
+                except requests.RequestException as e:
+                    response = None
+                    status_code = None
+                    error = str(e)
+                elapsed = time.perf_counter() - started
+
+                if status_code in (200, 201):
+                    if self.session_store:
+                        self.session_store.remove(key)
+                    if progress:
+                        progress(size, size)
+                    result = response.json()
+                    self.logger.info(f"✓ {label}: upload complete ({size / MB:.1f}MB, id={result.get('id')})")
+                    return result
+
+                if status_code == 308:
+                    new_offset = self._parse_range(response)
+                    chunker.record(new_offset - offset, elapsed)
+                    offset = new_offset
+                    attempt = 0
+                    if progress:
+                        progress(offset, size)
+                    self.logger.debug(
+                        f"{label}: {offset / MB:.1f}/{size / MB:.1f}MB "
+                        f"(next chunk {chunker.size / MB:.2f}MB)"
+                    )
+                    continue
+
+                if status_code in (404, 410):
+                    # セッション失効: 最初からやり直す（1回まで）
+                    if self.session_store:
+                        self.session_store.remove(key)
+                    restarts += 1
+                    if restarts > 1:
+                        raise YouTubeUploadError(f"{label}: upload session expired repeatedly", status_code)
+                    self.logger.warning(f"{label}: upload session expired, restarting")
+                    session_uri = None
+                    continue
+
+                if response is not None:
+                    if self._is_quota_error(response):
+                        raise YouTubeQuotaExceededError(QUOTA_COSTS["videos.insert"], 0)
+                    error = f"HTTP {status_code}: {(response.text or '')[:300]}"
+                    if status_code not in RETRYABLE_STATUS:
+                        raise YouTubeUploadError(f"{label}: upload failed: {error}", status_code)
+
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise YouTubeUploadError(f"{label}: upload failed after {self.max_retries} retries: {error}")
+                chunker.shrink()
+                delay = self._backoff(attempt)
+                self.logger.warning(
+                    f"{label}: chunk failed ({error}), retry {attempt}/{self.max_retries} in {delay:.1f}s"
+                )
+                self.sleep(delay)
+
+                # サーバーが一部を受け取っている可能性があるので位置を問い合わせる
+                state = self._query_offset(session_uri, size)
+                if isinstance(state, dict):
+                    if self.session_store:
+                        self.session_store.remove(key)
+                    return state
+                if state is None:
+                    session_uri = None
+                else:
+                    offset = state
+
+    def upload_many(self, jobs: List[UploadJob], max_workers: int = 3) -> List[Dict[str, Any]]:
+        """
+        複数ファイルを並列にアップロード
+
+        1件の失敗は他に影響しない。Quota 不足になった時点で、
+        まだ開始していないジョブはアップロードせずに失敗として返す。
+
+        Returns:
+            jobs と同じ順の結果リスト
+            [{'label', 'file_path', 'response', 'video_id', 'error', 'extra'}, ...]
+        """
+        quota_exhausted = threading.Event()
+
+        def run(job: UploadJob) -> Dict[str, Any]:
+            result = {
+                "label": job.label or Path(job.file_path).name,
+                "file_path": str(job.file_path),
+                "response": None,
+                "video_id": None,
+                "error": None,
+                "extra": job.extra,
+            }
+            if quota_exhausted.is_set():
+                result["error"] = "quota budget exhausted"
+                return result
+            try:
+                body = job.body() if callable(job.body) else job.body
+                response = self.upload(job.file_path, body, part=job.part, label=result["label"])
+                result["response"] = response
+                result["video_id"] = response.get("id")
+            except YouTubeQuotaExceededError as e:
+                quota_exhausted.set()
+                result["error"] = str(e)
+                self.logger.error(f"{result['label']}: {e}")
+            except Exception as e:
+                result["error"] = str(e)
+                self.logger.error(f"{result['label']}: upload failed: {e}")
+            return result
+
+        if not jobs:
+            return []
+        workers = max(1, min(max_workers, len(jobs)))
+        self.logger.info(f"⬆ Uploading {len(jobs)} files ({workers} parallel)")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return map_in_context(executor, run, jobs)
+
+
+def create_uploader_from_config(
+    credentials,
+    upload_config: Dict[str, Any],
+    quota_config: Dict[str, Any],
+    cache_dir: Path,
+    logger: logging.Logger
+) -> ResumableUploader:
+    """
+    フェーズ設定から ResumableUploader を作成
+
+    Args:
+        credentials: google.oauth2 の認証情報
+        upload_config: upload_engine セクション
+        quota_config: quota セクション
+        cache_dir: セッション・Quota 状態の保存先
+        logger: ロガー
+    """
+    from google.auth.transport.requests import AuthorizedSession
+
+    session_store = None
+    if upload_config.get("persist_sessions", True):
+        session_store = UploadSessionStore(
+            cache_dir / upload_config.get("session_file", "youtube_upload_sessions.json"),
+            max_age_hours=upload_config.get("session_max_age_hours", DEFAULT_SESSION_MAX_AGE_HOURS)
+        )
+
+    quota = QuotaBudget(
+        daily_limit=quota_config.get("daily_limit", 10000),
+        state_path=cache_dir / quota_config.get("state_file", "youtube_quota.json"),
+        alert_threshold=quota_config.get("alert_threshold"),
+        logger=logger
+    )
+
+    return ResumableUploader(
+        session_factory=lambda: AuthorizedSession(credentials),
+        logger=logger,
+        upload_url=upload_config.get("upload_url", YOUTUBE_UPLOAD_URL),
+        session_store=session_store,
+        quota=quota,
+        initial_chunk_size=int(upload_config.get("initial_chunk_mb", 8) * MB),
+        min_chunk_size=int(upload_config.get("min_chunk_mb", 1) * MB),
+        max_chunk_size=int(upload_config.get("max_chunk_mb", 64) * MB),
+        target_chunk_seconds=upload_config.get("target_chunk_seconds", 8.0),
+        max_retries=upload_config.get("max_retries", 8),
+        backoff_base=upload_config.get("backoff_base_seconds", 1.0),
+        backoff_max=upload_config.get("backoff_max_seconds", 64.0)
+    )
@@ -0,0 +1,59 @@
+"""
+ジョブ API（入力の検証）のテスト
+"""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.api import create_server
+from src.core.job_queue import JobQueue
+
+
+@pytest.fixture
+def api(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite3")
+    server = create_server(queue, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", queue
+    server.shutdown()
+    server.server_close()
+
+
+def request(url, method="GET", body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_submit_and_list_events(api):
+    base, _ = api
+    status, job = request(f"{base}/jobs", "POST", {"subject": "織田信長", "from_phase": 2, "until_phase": 7})
+    assert status == 201
+    status, events = request(f"{base}/jobs/{job['id']}/events?after=0")
+    assert status == 200
+    assert [event["type"] for event in events] == ["queued"]
+
+
+def test_events_with_invalid_after_is_bad_request(api):
+    base, queue = api
+    job = queue.submit("織田信長")
+    status, body = request(f"{base}/jobs/{job.id}/events?after=abc")
+    assert status == 400
+    assert "error" in body
+
+
+def test_submit_rejects_reversed_phase_range(api):
+    base, queue = api
+    status, body = request(f"{base}/jobs", "POST", {"subject": "織田信長", "from_phase": 8, "until_phase": 3})
+    assert status == 400
+    assert "until_phase" in body["error"]
+    assert queue.list_jobs() == []
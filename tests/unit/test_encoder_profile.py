@@ -0,0 +1,38 @@
+"""
+エンコーダープロファイル（ロールごとの設定解決）のテスト
+"""
+
+import src.utils.encoder_profile as encoder_profile
+from src.utils.encoder_profile import EncodeSettings, resolve_encode_settings
+
+
+class _Profile:
+    def __init__(self, roles):
+        self.roles = roles
+
+    def settings(self, role):
+        return self.roles.get(role)
+
+
+def use_profile(monkeypatch, roles):
+    monkeypatch.setattr(encoder_profile, "load_encoder_profile", lambda config, logger=None: _Profile(roles))
+
+
+def test_profile_overrides_role(monkeypatch):
+    use_profile(monkeypatch, {"final": EncodeSettings("medium", 21, threads=4)})
+    assert resolve_encode_settings(object(), "final") == EncodeSettings("medium", 21, threads=4)
+
+
+def test_missing_role_uses_fallback(monkeypatch):
+    use_profile(monkeypatch, {})
+    assert resolve_encode_settings(object(), "intermediate") == EncodeSettings("ultrafast", 18)
+
+
+def test_still_segment_stays_lossless(monkeypatch):
+    use_profile(monkeypatch, {"still_segment": EncodeSettings("superfast", 12, threads=2)})
+    # preset / threads はプロファイルの値、crf は 0 に固定
+    assert resolve_encode_settings(object(), "still_segment") == EncodeSettings("superfast", 0, threads=2)
+
+
+def test_still_segment_fallback_is_lossless():
+    assert resolve_encode_settings(None, "still_segment", EncodeSettings("ultrafast", 18)).crf == 0
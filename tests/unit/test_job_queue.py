@@ -0,0 +1,46 @@
+"""
+JobQueue（ジョブの取得・リース）のテスト
+"""
+
+import pytest
+
+from src.core.job_queue import JobQueue
+from src.core.models import JobStatus
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(tmp_path / "jobs.sqlite3", lease_seconds=60.0)
+
+
+def test_claim_in_priority_order(queue):
+    low = queue.submit("織田信長")
+    high = queue.submit("豊臣秀吉", priority=5)
+    assert queue.claim("w1").id == high.id
+    assert queue.claim("w2").id == low.id
+    assert queue.claim("w3") is None
+
+
+def test_claim_skips_subject_with_running_job(queue):
+    first = queue.submit("織田信長")
+    second = queue.submit("織田信長")
+    other = queue.submit("徳川家康")
+
+    assert queue.claim("w1").id == first.id
+    # 同じ題材は実行中なので後回しにし、別の題材を取る
+    assert queue.claim("w2").id == other.id
+    assert queue.claim("w3") is None
+
+    assert queue.finish(first.id, "w1", JobStatus.COMPLETED)
+    assert queue.claim("w3").id == second.id
+
+
+def test_expired_lease_frees_subject(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite3", lease_seconds=-1.0, max_attempts=1)
+    first = queue.submit("織田信長")
+    second = queue.submit("織田信長")
+    assert queue.claim("w1").id == first.id
+
+    # w1 のリースは切れている（max_attempts 到達で failed）ので次のジョブを取れる
+    assert queue.claim("w2").id == second.id
+    assert queue.get(first.id).status == JobStatus.FAILED
@@ -0,0 +1,151 @@
+"""
+LineBreaker（動的計画法による改行位置の決定）のテスト
+"""
+
+import pytest
+
+from src.generators.subtitle_generator import LineBreaker
+from src.generators.subtitle_generator.generator import SubtitleGenerator
+
+
+def split_lines(text, breaks):
+    edges = [0] + breaks + [len(text)]
+    return [text[a:b] for a, b in zip(edges, edges[1:])]
+
+
+@pytest.fixture
+def breaker():
+    return LineBreaker({})
+
+
+def make_generator(engine="dp"):
+    return SubtitleGenerator({
+        "whisper": {"enabled": False},
+        "splitting": {"engine": engine},
+    })
+
+
+# ========================================
+# 分割位置
+# ========================================
+
+def test_no_break_when_text_fits(breaker):
+    assert breaker.find_breaks(list("織田信長"), max_len=10) == []
+
+
+def test_breaks_after_particle(breaker):
+    text = "織田信長は尾張の国に生まれた"
+    breaks = breaker.find_breaks(list(text), max_len=10)
+    assert split_lines(text, breaks) == ["織田信長は", "尾張の国に生まれた"]
+
+
+def test_breaks_after_sentence_punctuation(breaker):
+    text = "今日は晴れ。明日は雨"
+    breaks = breaker.find_breaks(list(text), max_len=6)
+    assert split_lines(text, breaks) == ["今日は晴れ。", "明日は雨"]
+
+
+def test_line_never_starts_with_comma(breaker):
+    text = "あいうえお、かきくけこ"
+    breaks = breaker.find_breaks(list(text), max_len=6)
+    assert all(not line.startswith("、") for line in split_lines(text, breaks))
+
+
+def test_does_not_split_numbers(breaker):
+    text = "西暦1560年に桶狭間の戦い"
+    scores = breaker.compute_break_scores(list(text))
+    digits = [i for i, c in enumerate(text) if c.isdigit()]
+    # 数字の途中は数字の直後より低いスコア
+    assert max(scores[p] for p in digits[1:]) < scores[digits[-1] + 1]
+
+
+# ========================================
+# 文字数・行数の上限
+# ========================================
+
+def test_every_line_within_max_chars(breaker):
+    text = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめも"
+    breaks = breaker.find_breaks(list(text), max_len=8)
+    lines = split_lines(text, breaks)
+    assert "".join(lines) == text
+    assert all(len(line) <= 8 for line in lines)
+    assert len(lines) == -(-len(text) // 8)
+
+
+def test_lines_are_balanced(breaker):
+    text = "あいうえおかきくけこさしすせそたちつてと"
+    breaks = breaker.find_breaks(list(text), max_len=15)
+    lengths = [len(line) for line in split_lines(text, breaks)]
+    assert max(lengths) - min(lengths) <= 2
+
+
+def test_respects_max_lines(breaker):
+    text = "戦国時代の武将である織田信長は尾張の国に生まれました"
+    breaks = breaker.find_breaks(list(text), max_len=20, max_segments=2)
+    lines = split_lines(text, breaks)
+    assert len(lines) == 2
+    assert all(len(line) <= 20 for line in lines)
+
+
+def test_overflow_goes_to_last_line(breaker):
+    # 2行に収まらない場合は最終行に残りをまとめる（従来挙動）
+    text = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめも"
+    breaks = breaker.find_breaks(list(text), max_len=10, max_segments=2)
+    lines = split_lines(text, breaks)
+    assert len(lines) == 2
+    assert len(lines[0]) <= 10
+    assert "".join(lines) == text
+
+
+# ========================================
+# SubtitleGenerator からの利用
+# ========================================
+
+def test_generator_uses_dp_engine_by_default():
+    generator = make_generator()
+    characters = list("戦国時代の武将である織田信長は尾張の国に生まれました")
+    lines = generator._split_into_balanced_lines("".join(characters), characters, 20, 2, {}, {})
+    assert lines == ["戦国時代の武将である織田信長は", "尾張の国に生まれました"]
+
+
+def test_generator_falls_back_to_greedy_on_dp_failure(monkeypatch):
+    characters = list("戦国時代の武将である織田信長は尾張の国に生まれました")
+    text = "".join(characters)
+    expected = make_generator("greedy")._split_into_balanced_lines(text, characters, 20, 2, {}, {})
+
+    generator = make_generator("dp")
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(generator.line_breaker, "find_breaks", fail)
+    assert generator._split_into_balanced_lines(text, characters, 20, 2, {}, {}) == expected
+
+
+def test_greedy_engine_does_not_use_line_breaker(monkeypatch):
+    generator = make_generator("greedy")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("LineBreaker should not be called")
+
+    monkeypatch.setattr(generator.line_breaker, "find_breaks", fail)
+    characters = list("戦国時代の武将である織田信長は尾張の国に生まれました")
+    lines = generator._split_into_balanced_lines("".join(characters), characters, 20, 2, {}, {})
+    assert "".join(lines) == "".join(characters)
+
+
+def test_large_chunk_falls_back_to_greedy_on_dp_failure(monkeypatch):
+    characters = list("戦国時代の武将である織田信長は尾張の国に生まれ今川義元を桶狭間で破りました")
+    starts = [i * 0.1 for i in range(len(characters))]
+    ends = [s + 0.1 for s in starts]
+    expected = make_generator("greedy")._split_large_chunk(characters, starts, ends, 20, {})
+
+    generator = make_generator("dp")
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(generator.line_breaker, "find_breaks", fail)
+    chunks = generator._split_large_chunk(characters, starts, ends, 20, {})
+    assert chunks == expected
+    assert sum((chunk["characters"] for chunk in chunks), []) == characters
@@ -0,0 +1,135 @@
+"""
+MorphologyService（形態素解析結果のスライス問い合わせ）のテスト
+
+MeCab が無くても動くよう、解析結果を直接キャッシュに登録して prime() する。
+"""
+
+import src.utils.morphology as morphology
+from src.utils.morphology import (
+    Morpheme,
+    MorphAnalysis,
+    MorphologyService,
+    _parse_with_tagger,
+    get_morphology_service,
+)
+
+
+def make_analysis(pieces):
+    """[(表層, 品詞), ...] から解析結果を作る"""
+    text = "".join(surface for surface, _ in pieces)
+    morphemes = []
+    pos = 0
+    for surface, part_of_speech in pieces:
+        morphemes.append(Morpheme(surface=surface, pos=part_of_speech, start=pos, end=pos + len(surface)))
+        pos += len(surface)
+    return MorphAnalysis(text=text, morphemes=morphemes)
+
+
+def primed_service(*analyses):
+    service = MorphologyService()
+    for analysis in analyses:
+        service._store(analysis)
+    service.prime([analysis.text for analysis in analyses])
+    return service
+
+
+# 「AB」が2回現れ、1回目は1語・2回目は2語に解析されている文脈
+REPEATED = make_analysis([
+    ("AB", "名詞"), ("は", "助詞"), ("CD", "名詞"), ("。", "記号"),
+    ("A", "名詞"), ("B", "名詞"), ("は", "助詞"), ("CD", "名詞"), ("。", "記号"),
+])
+
+
+def test_query_slices_primed_context():
+    service = primed_service(REPEATED)
+    info = service.query("ABはCD。")
+    assert info["boundaries"] == [2, 3, 5]
+    assert [m["surface"] for m in info["morphemes"]] == ["AB", "は", "CD", "。"]
+
+
+def test_repeated_text_maps_to_next_occurrence():
+    service = primed_service(REPEATED)
+    first = service.query("ABはCD。")
+    second = service.query("ABはCD。")
+    assert first["boundaries"] == [2, 3, 5]
+    # 2回目は文脈の後半（「A」「B」が別の形態素）から切り出される
+    assert second["boundaries"] == [1, 2, 3, 5]
+
+
+def test_repeated_particle_uses_running_cursor():
+    service = primed_service(REPEATED)
+    service.query("ABはCD。")
+    info = service.query("Bは")
+    # 前半の「ABは」ではなく後半の「A|B|は」の位置
+    assert [m["surface"] for m in info["morphemes"]] == ["B", "は"]
+    assert info["boundaries"] == [1]
+
+
+def test_nested_queries_stay_in_current_chunk():
+    service = primed_service(REPEATED)
+    service.query("ABはCD。ABはCD。")
+    # チャンクの後に、その中の行が先頭から問い合わせられる
+    assert service.query("ABはCD")["boundaries"] == [2, 3]
+    assert service.query("ABはCD")["boundaries"] == [1, 2, 3]
+
+
+def test_query_falls_back_to_start_of_context():
+    service = primed_service(REPEATED)
+    service.query("ABはCD。")
+    service.query("ABはCD。")
+    # 直前の位置より前にしか無い文字列は文脈の先頭から探す
+    assert service.query("ABはCD。A")["boundaries"] == [2, 3, 5, 6]
+
+
+def test_clear_contexts_resets_cursor():
+    service = primed_service(REPEATED)
+    service.query("ABはCD。")
+    service.clear_contexts()
+    service.prime([REPEATED.text])
+    assert service.query("ABはCD。")["boundaries"] == [2, 3, 5]
+
+
+def test_memo_is_bounded(monkeypatch):
+    monkeypatch.setattr(morphology, "MEMO_MAX_ENTRIES", 3)
+    service = MorphologyService()
+    for text in ["あ", "い", "う", "え"]:
+        service._store(make_analysis([(text, "名詞")]))
+    assert len(service._memo) == 3
+    # 最も古い「あ」から破棄される
+    assert service._load_cached("あ") is None
+    assert service._load_cached("え") is not None
+
+
+def test_global_service_is_per_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(morphology, "_global_services", {})
+    cached = get_morphology_service(cache_dir=tmp_path / "morphology")
+    # キャッシュ無効の呼び出しが先の呼び出しのキャッシュ設定を引き継がない
+    uncached = get_morphology_service(cache_dir=None)
+    assert uncached is not cached
+    assert uncached.cache_dir is None
+    assert get_morphology_service(cache_dir=tmp_path / "morphology") is cached
+
+
+class _Node:
+    def __init__(self, surface, feature, next_node=None):
+        self.surface = surface
+        self.feature = feature
+        self.next = next_node
+
+
+class _FakeTagger:
+    def __init__(self, pieces):
+        self.pieces = pieces
+
+    def parseToNode(self, text):
+        node = _Node("", "BOS/EOS,*,*,*,*,*,*,*,*")
+        for surface, part_of_speech in reversed(self.pieces):
+            node = _Node(surface, f"{part_of_speech},*,*,*,*,*,*,*,*", node)
+        return _Node("", "BOS/EOS,*,*,*,*,*,*,*,*", node)
+
+
+def test_parse_offsets_for_repeated_surfaces_and_spaces():
+    text = "はは は"
+    tagger = _FakeTagger([("は", "助詞"), ("は", "助詞"), ("は", "助詞")])
+    analysis = _parse_with_tagger(tagger, text)
+    assert [(m.start, m.end) for m in analysis.morphemes] == [(0, 1), (1, 2), (3, 4)]
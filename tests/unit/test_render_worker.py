@@ -0,0 +1,88 @@
+"""
+RenderWorker（リースを失ったジョブの中断）のテスト
+"""
+
+import logging
+
+import pytest
+
+import src.core.orchestrator as orchestrator_module
+import src.utils.morphology as morphology
+from src.core.job_queue import JobQueue
+from src.core.models import JobStatus, PhaseStatus, ProjectStatus
+from src.core.render_worker import RenderWorker
+
+
+class _Config:
+    def __init__(self, tmp_path):
+        self.tmp_path = tmp_path
+
+    def get(self, key, default=None):
+        return False if key == "telemetry.enabled" else default
+
+    def get_path(self, key):
+        return self.tmp_path / key
+
+
+class _LosingQueue(JobQueue):
+    """heartbeat が常に失敗する（別のワーカーにジョブを取られた）キュー"""
+
+    def heartbeat(self, job_id, worker_id):
+        return False
+
+
+class _Orchestrator:
+    """abort_event がセットされるまで次のフェーズを待つオーケストレーター"""
+
+    def __init__(self, **kwargs):
+        self.event_callback = kwargs["event_callback"]
+
+    def run_all_phases(self, subject, abort_event=None, **kwargs):
+        self.event_callback("phase_started", {"phase": 1})
+        aborted = abort_event.wait(timeout=10)
+        return ProjectStatus(
+            subject=subject,
+            overall_status=PhaseStatus.FAILED if aborted else PhaseStatus.COMPLETED,
+            phases=[]
+        )
+
+
+@pytest.fixture
+def worker(tmp_path, monkeypatch):
+    monkeypatch.setattr(orchestrator_module, "PhaseOrchestrator", _Orchestrator)
+    queue = _LosingQueue(tmp_path / "jobs.sqlite3", lease_seconds=1.0)
+    return RenderWorker(config=_Config(tmp_path), queue=queue, logger=logging.getLogger("test"), worker_id="w1")
+
+
+def test_lost_lease_aborts_and_does_not_record_result(worker):
+    worker.queue.submit("織田信長")
+    job = worker.queue.claim("w1")
+
+    status = worker.run_job(job)
+
+    assert status == JobStatus.FAILED
+    stored = worker.queue.get(job.id)
+    # 最終状態は書かれない（リース切れで再キューされ、別のワーカーが実行する）
+    assert stored.status == JobStatus.RUNNING
+    assert stored.finished_at is None
+    assert [event["type"] for event in worker.queue.events(job.id)] == ["queued", "started", "phase_started"]
+
+
+def test_warm_up_reports_each_target(worker, monkeypatch):
+    class _Service:
+        available = False  # MorphologyService.available はプロパティ
+
+    monkeypatch.setattr(morphology, "get_morphology_service", lambda **kwargs: _Service())
+    worker.warm_up_targets = ["mecab", "unknown"]
+    assert worker.warm_up() == {
+        "mecab": "skipped: MeCab not available",
+        "unknown": "skipped: unknown target",
+    }
+
+
+def test_warm_up_mecab_uses_real_service(worker, monkeypatch):
+    monkeypatch.setattr(morphology, "_global_services", {})
+    worker.warm_up_targets = ["mecab"]
+    result = worker.warm_up()["mecab"]
+    # MeCab の有無で結果は変わるが、失敗（例外）にはならない
+    assert result in ("ok", "skipped: MeCab not available")
@@ -0,0 +1,112 @@
+"""
+ShortsRenderer（描画ソースと完成動画の照合）のテスト
+"""
+
+import json
+import logging
+
+import pytest
+
+from src.phases.phase_07_composition import Phase07Composition
+from src.utils.shorts_renderer import ShortsRenderer, video_fingerprint
+
+
+@pytest.fixture
+def renderer(tmp_path):
+    return ShortsRenderer(project_root=tmp_path)
+
+
+def write_sources(tmp_path, video_path, **extra):
+    image_path = tmp_path / "image.png"
+    image_path.write_bytes(b"png")
+    sources = {
+        "version": 2,
+        "images": [{"path": str(image_path), "start": 0.0, "duration": 5.0}],
+    }
+    if video_path is not None:
+        sources["final_video"] = video_fingerprint(video_path)
+    sources.update(extra)
+    sources_path = tmp_path / "render_sources.json"
+    sources_path.write_text(json.dumps(sources), encoding="utf-8")
+    return sources_path
+
+
+def test_fingerprint_survives_copy_and_detects_change(tmp_path):
+    video = tmp_path / "a.mp4"
+    video.write_bytes(b"x" * (3 << 20))
+    copied = tmp_path / "b.mp4"
+    copied.write_bytes(video.read_bytes())
+    assert video_fingerprint(copied) == video_fingerprint(video)
+
+    copied.write_bytes(b"x" * ((3 << 20) - 1) + b"y")
+    assert video_fingerprint(copied) != video_fingerprint(video)
+
+
+def test_load_sources_matching_video(renderer, tmp_path):
+    video = tmp_path / "final.mp4"
+    video.write_bytes(b"video")
+    sources_path = write_sources(tmp_path, video)
+    assert renderer.load_sources(sources_path, video_path=video) is not None
+
+
+def test_load_sources_rejects_stale_video(renderer, tmp_path):
+    video = tmp_path / "final.mp4"
+    video.write_bytes(b"video")
+    sources_path = write_sources(tmp_path, video)
+    # 描画ソースを書いた後に完成動画が別の方法で作り直された
+    video.write_bytes(b"re-rendered video")
+    assert renderer.load_sources(sources_path, video_path=video) is None
+
+
+def test_load_sources_rejects_missing_fingerprint(renderer, tmp_path):
+    video = tmp_path / "final.mp4"
+    video.write_bytes(b"video")
+    sources_path = write_sources(tmp_path, None)
+    assert renderer.load_sources(sources_path, video_path=video) is None
+
+
+class _Phase7:
+    """Phase07Composition._save_render_sources が使う属性だけを持つ"""
+
+    def __init__(self, phase_dir):
+        self.phase_dir = phase_dir
+        self.logger = logging.getLogger("test")
+
+
+def test_phase07_sources_round_trip(renderer, tmp_path):
+    image = tmp_path / "image.png"
+    image.write_bytes(b"png")
+    ass = tmp_path / "subtitles.ass"
+    ass.write_text("[Script Info]", encoding="utf-8")
+    video = tmp_path / "final.mp4"
+    video.write_bytes(b"video")
+
+    saved = Phase07Composition._save_render_sources(
+        _Phase7(tmp_path), [{"path": image, "duration": 4.0}, {"path": image, "duration": 2.5}],
+        {}, ass, tmp_path / "narration.wav", video
+    )
+
+    sources = renderer.load_sources(saved, video_path=video)
+    assert sources is not None
+    assert sources["total_duration"] == 6.5
+    assert [i["start"] for i in sources["images"]] == [0.0, 4.0]
+    # 静止画セグメントと同じ配置（縮小 + 余白）と黒バー
+    assert sources["fit"] == "pad"
+    assert sources["bar_height"] == 216
+
+
+def test_clip_command_reproduces_padded_frame_and_bar(renderer, tmp_path):
+    sources = {"images": [], "fit": "pad", "bar_height": 216}
+    cut = {"start": 0.0, "duration": 3.0}
+    cmd = renderer.build_clip_command(sources, cut, tmp_path / "concat.txt", tmp_path / "out.mp4")
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert "force_original_aspect_ratio=decrease,pad=1920:1080" in graph
+    assert "drawbox=y=ih-216" in graph
+
+
+def test_clip_command_defaults_to_cover(renderer, tmp_path):
+    cut = {"start": 0.0, "duration": 3.0}
+    cmd = renderer.build_clip_command({"images": []}, cut, tmp_path / "concat.txt", tmp_path / "out.mp4")
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert "crop=1920:1080" in graph
+    assert "drawbox" not in graph
@@ -0,0 +1,91 @@
+"""
+テレメトリ（スパンの親子関係・集計）のテスト
+"""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.utils.telemetry import Telemetry, aggregate_spans, load_spans, map_in_context, submit_in_context
+
+
+@pytest.fixture
+def telemetry(tmp_path):
+    return Telemetry(output_path=tmp_path / "run.jsonl")
+
+
+def spans_by_name(telemetry):
+    return {s["name"]: s for s in load_spans(telemetry.output_path)}
+
+
+def test_nested_span_has_parent(telemetry):
+    with telemetry.span("phase_07", kind="phase"):
+        with telemetry.span("encode"):
+            pass
+
+    spans = spans_by_name(telemetry)
+    assert spans["encode"]["parent_id"] == spans["phase_07"]["span_id"]
+
+
+def test_submit_in_context_keeps_phase_parent(telemetry):
+    def work():
+        with telemetry.span("worker_step", kind="subprocess"):
+            pass
+
+    with telemetry.span("phase_07", kind="phase"):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            submit_in_context(executor, work).result()
+
+    spans = spans_by_name(telemetry)
+    assert spans["worker_step"]["parent_id"] == spans["phase_07"]["span_id"]
+    assert spans["worker_step"]["thread"] != spans["phase_07"]["thread"]
+
+
+def test_map_in_context_keeps_parent_and_order(telemetry):
+    def work(index):
+        with telemetry.span(f"chunk_{index}", kind="subprocess"):
+            return index * 10
+
+    with telemetry.span("phase_07", kind="phase"):
+        with telemetry.span("render"):
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                results = map_in_context(executor, work, range(5))
+
+    assert results == [0, 10, 20, 30, 40]
+    spans = spans_by_name(telemetry)
+    for index in range(5):
+        assert spans[f"chunk_{index}"]["parent_id"] == spans["render"]["span_id"]
+
+    phase = aggregate_spans(load_spans(telemetry.output_path))["phases"][0]
+    assert phase["by_kind"]["subprocess"]["count"] == 5
+
+
+def test_map_in_context_raises_first_error(telemetry):
+    def work(index):
+        if index == 2:
+            raise ValueError("boom")
+        return index
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with pytest.raises(ValueError):
+            map_in_context(executor, work, range(4))
+
+
+def test_explicit_context_can_be_reused(telemetry):
+    with telemetry.span("phase_07", kind="phase"):
+        context = contextvars.copy_context()
+
+    def work(index):
+        with telemetry.span(f"prefetch_{index}"):
+            pass
+
+    # 作成時に保存したコンテキストを複数回・並行に使える
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [submit_in_context(executor, work, i, context=context) for i in range(3)]
+        for future in futures:
+            future.result()
+
+    spans = spans_by_name(telemetry)
+    for index in range(3):
+        assert spans[f"prefetch_{index}"]["parent_id"] == spans["phase_07"]["span_id"]
@@ -0,0 +1,43 @@
+"""
+QuotaBudget（日次 Quota 予算の共有）のテスト
+"""
+
+import multiprocessing
+
+import pytest
+
+from src.core.exceptions import YouTubeQuotaExceededError
+from src.utils.youtube_uploader import QuotaBudget
+
+RESERVATIONS_PER_PROCESS = 20
+
+
+def _reserve_many(state_path):
+    budget = QuotaBudget(daily_limit=100000, state_path=state_path)
+    for _ in range(RESERVATIONS_PER_PROCESS):
+        budget.reserve(10)
+
+
+def test_reserve_and_refund(tmp_path):
+    budget = QuotaBudget(daily_limit=100, state_path=tmp_path / "quota.json")
+    budget.reserve(60)
+    with pytest.raises(YouTubeQuotaExceededError):
+        budget.reserve(50)
+    budget.refund(20)
+    assert budget.reserve(50) == 90
+    # 別インスタンス（別プロセス相当）からも同じ使用量が見える
+    assert QuotaBudget(daily_limit=100, state_path=tmp_path / "quota.json").used == 90
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="fork not available")
+def test_concurrent_processes_do_not_lose_reservations(tmp_path):
+    state_path = tmp_path / "quota.json"
+    ctx = multiprocessing.get_context("fork")
+    processes = [ctx.Process(target=_reserve_many, args=(state_path,)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    assert QuotaBudget(daily_limit=100000, state_path=state_path).used == 4 * RESERVATIONS_PER_PROCESS * 10